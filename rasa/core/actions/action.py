@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import json
 import logging
@@ -732,18 +733,29 @@ class RemoteAction(Action):
         tracker: "DialogueStateTracker",
     ) -> List[BotUttered]:
         """Use the responses generated by the action endpoint and utter them."""
-        bot_messages = []
-        for response in responses:
+
+        async def generate_draft(response: Dict[Text, Any]) -> Optional[Dict]:
             generated_response = response.pop("response", None)
-            if generated_response:
-                draft = await nlg.generate(
-                    generated_response, tracker, output_channel.name(), **response
-                )
-                if not draft:
-                    continue
-                draft["utter_action"] = generated_response
-            else:
-                draft = {}
+            if not generated_response:
+                return {}
+
+            draft = await nlg.generate(
+                generated_response, tracker, output_channel.name(), **response
+            )
+            if not draft:
+                return None
+            draft["utter_action"] = generated_response
+            return draft
+
+        # generate the responses concurrently, the order of the drafts is kept
+        drafts = await asyncio.gather(
+            *[generate_draft(response) for response in responses]
+        )
+
+        bot_messages = []
+        for response, draft in zip(responses, drafts):
+            if draft is None:
+                continue
 
             buttons = response.pop("buttons", []) or []
             if buttons:
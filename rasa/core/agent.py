@@ -419,20 +419,20 @@ class Agent:
         self, sender_id: Text
     ) -> Optional[Dict[Text, Any]]:
         """Predict the next action for a sender id."""
-        return await self.processor.predict_next_for_sender_id(  # type: ignore[union-attr] # noqa:E501
-            sender_id
-        )
+        if self.processor is None:
+            raise AgentNotReady("Agent needs to be prepared before usage.")
+        return await self.processor.predict_next_for_sender_id(sender_id)
 
     @agent_must_be_ready
-    def predict_next_with_tracker(
+    async def predict_next_with_tracker(
         self,
         tracker: DialogueStateTracker,
         verbosity: EventVerbosity = EventVerbosity.AFTER_RESTART,
     ) -> Optional[Dict[Text, Any]]:
         """Predicts the next action."""
-        return self.processor.predict_next_with_tracker(  # type: ignore[union-attr]
-            tracker, verbosity
-        )
+        if self.processor is None:
+            raise AgentNotReady("Agent needs to be prepared before usage.")
+        return await self.processor.predict_next_with_tracker(tracker, verbosity)
 
     @agent_must_be_ready
     async def log_message(self, message: UserMessage) -> DialogueStateTracker:
@@ -4,13 +4,15 @@ from contextlib import asynccontextmanager
 import json
 import logging
 import os
+import time
+from collections import deque
 
 from typing import AsyncGenerator, Dict, Optional, Text, Union
 
 from rasa.shared.exceptions import RasaException, ConnectionException
 import rasa.shared.utils.common
 from rasa.core.constants import DEFAULT_LOCK_LIFETIME
-from rasa.core.lock import TicketLock
+from rasa.core.lock import Ticket, TicketLock
 from rasa.utils.endpoints import EndpointConfig
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,32 @@ LOCK_LIFETIME = _get_lock_lifetime()
 DEFAULT_SOCKET_TIMEOUT_IN_SECONDS = 10
 
 DEFAULT_REDIS_LOCK_STORE_KEY_PREFIX = "lock:"
+REDIS_TICKETS_KEY_INFIX = "tickets:"
+REDIS_RELEASE_CHANNEL = "released"
+
+# Issues a ticket atomically. The tickets of a conversation are stored in a sorted
+# set which maps ticket numbers to their expiration time.
+# KEYS[1]: tickets key, ARGV[1]: current time, ARGV[2]: expiration of the new ticket
+REDIS_ISSUE_TICKET_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])
+local last_issued = -1
+for _, number in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    last_issued = math.max(last_issued, tonumber(number))
+end
+local ticket = last_issued + 1
+redis.call('ZADD', KEYS[1], ARGV[2], ticket)
+return ticket
+"""
+
+# Removes a served ticket as well as expired tickets atomically and notifies waiting
+# Rasa instances. Redis deletes the sorted set once it is empty.
+# KEYS[1]: tickets key, KEYS[2]: release channel, ARGV[1]: served ticket number,
+# ARGV[2]: current time, ARGV[3]: conversation ID
+REDIS_RELEASE_TICKET_SCRIPT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[2])
+return redis.call('PUBLISH', KEYS[2], ARGV[3])
+"""
 
 
 # noinspection PyUnresolvedReferences
@@ -95,8 +123,9 @@ class LockStore:
     ) -> AsyncGenerator[TicketLock, None]:
         """Acquire lock with lifetime `lock_lifetime`for `conversation_id`.
 
-        Try acquiring lock with a wait time of `wait_time_in_seconds` seconds
-        between attempts. Raise a `LockError` if lock has expired.
+        Try acquiring lock whenever the lock was released by another ticket, but
+        at least every `wait_time_in_seconds` seconds. Raise a `LockError` if lock
+        has expired.
         """
         ticket = self.issue_ticket(conversation_id, lock_lifetime)
         try:
@@ -112,6 +141,10 @@ class LockStore:
     ) -> TicketLock:
         logger.debug(f"Acquiring lock for conversation '{conversation_id}'.")
         while True:
+            # get the release event before fetching the lock so that a release in
+            # between isn't missed
+            released = self._release_event(conversation_id)
+
             # fetch lock in every iteration because lock might no longer exist
             lock = self.get_lock(conversation_id)
 
@@ -133,14 +166,50 @@ class LockStore:
                 f"Retrying in {wait_time_in_seconds} seconds ..."
             )
 
-            # sleep and update lock
-            await asyncio.sleep(wait_time_in_seconds)
+            # wait for the release of the lock and update lock
+            await self._wait_for_release(
+                conversation_id, released, wait_time_in_seconds
+            )
             self.update_lock(conversation_id)
 
         raise LockError(
             f"Could not acquire lock for conversation_id '{conversation_id}'."
         )
 
+    def _release_event(self, conversation_id: Text) -> asyncio.Event:
+        """Returns the event which is set once a ticket for `conversation_id` is done.
+
+        The event is created lazily as subclasses don't necessarily call
+        `LockStore.__init__`.
+        """
+        if not hasattr(self, "_release_events"):
+            self._release_events: Dict[Text, asyncio.Event] = {}
+
+        if conversation_id not in self._release_events:
+            self._release_events[conversation_id] = asyncio.Event()
+        return self._release_events[conversation_id]
+
+    def _notify_release(self, conversation_id: Text) -> None:
+        """Wakes up everyone in this process who waits for `conversation_id`."""
+        released = getattr(self, "_release_events", {}).pop(conversation_id, None)
+        if released:
+            released.set()
+
+    async def _wait_for_release(
+        self,
+        conversation_id: Text,
+        released: asyncio.Event,
+        wait_time_in_seconds: float,
+    ) -> None:
+        """Waits until `released` is set, but at most `wait_time_in_seconds`.
+
+        Waiting is time-boxed since tickets can also expire without being released.
+        """
+        try:
+            await asyncio.wait_for(released.wait(), wait_time_in_seconds)
+        except asyncio.TimeoutError:
+            pass
+
     def update_lock(self, conversation_id: Text) -> None:
         """Fetch lock for `conversation_id`, remove expired tickets and save lock."""
         lock = self.get_lock(conversation_id)
@@ -183,6 +252,7 @@ class LockStore:
         self.finish_serving(conversation_id, ticket_number)
         if not self.is_someone_waiting(conversation_id):
             self.delete_lock(conversation_id)
+        self._notify_release(conversation_id)
 
     @staticmethod
     def _log_deletion(conversation_id: Text, deletion_successful: bool) -> None:
@@ -208,6 +278,7 @@ class RedisLockStore(LockStore):
         ssl_ca_certs: Optional[Text] = None,
         key_prefix: Optional[Text] = None,
         socket_timeout: float = DEFAULT_SOCKET_TIMEOUT_IN_SECONDS,
+        event_driven: bool = False,
     ) -> None:
         """Create a lock store which uses Redis for persistence.
 
@@ -228,10 +299,15 @@ class RedisLockStore(LockStore):
                 alphanumeric.
             socket_timeout: Timeout in seconds after which an exception will be raised
                 in case Redis doesn't respond within `socket_timeout` seconds.
+            event_driven: If `True`, tickets are issued and released atomically by
+                Lua scripts and waiting messages are woken up via Redis pub/sub as
+                soon as the lock is released instead of polling the lock. All Rasa
+                instances which share the lock store must use the same setting.
         """
         import redis
+        import redis.asyncio
 
-        self.red = redis.StrictRedis(
+        connection_args = dict(
             host=host,
             port=int(port),
             db=int(db),
@@ -241,8 +317,14 @@ class RedisLockStore(LockStore):
             ssl_certfile=ssl_certfile,
             ssl_keyfile=ssl_keyfile,
             ssl_ca_certs=ssl_ca_certs,
-            socket_timeout=socket_timeout,
         )
+        self.red = redis.StrictRedis(socket_timeout=socket_timeout, **connection_args)
+
+        self.event_driven = event_driven
+        # the pub/sub connection blocks until a lock is released and hence must
+        # neither time out nor block the event loop
+        self.async_red = redis.asyncio.StrictRedis(**connection_args)
+        self._init_event_driven_locking()
 
         self.key_prefix = DEFAULT_REDIS_LOCK_STORE_KEY_PREFIX
         if key_prefix:
@@ -251,6 +333,14 @@ class RedisLockStore(LockStore):
 
         super().__init__()
 
+    def _init_event_driven_locking(self) -> None:
+        self._issue_ticket_script = self.red.register_script(REDIS_ISSUE_TICKET_SCRIPT)
+        self._release_ticket_script = self.red.register_script(
+            REDIS_RELEASE_TICKET_SCRIPT
+        )
+        self._release_listener: Optional[asyncio.Task] = None
+        self._release_listener_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def _set_key_prefix(self, key_prefix: Text) -> None:
         if isinstance(key_prefix, str) and key_prefix.isalnum():
             self.key_prefix = key_prefix + ":" + DEFAULT_REDIS_LOCK_STORE_KEY_PREFIX
@@ -260,9 +350,30 @@ class RedisLockStore(LockStore):
                 f"Using default '{self.key_prefix}' instead."
             )
 
+    def _lock_key(self, conversation_id: Text) -> Text:
+        if self.event_driven:
+            return self.key_prefix + REDIS_TICKETS_KEY_INFIX + conversation_id
+        return self.key_prefix + conversation_id
+
+    @property
+    def _release_channel(self) -> Text:
+        return self.key_prefix + REDIS_RELEASE_CHANNEL
+
     def get_lock(self, conversation_id: Text) -> Optional[TicketLock]:
         """Retrieves lock (see parent docstring for more information)."""
-        serialised_lock = self.red.get(self.key_prefix + conversation_id)
+        if self.event_driven:
+            tickets = self.red.zrange(
+                self._lock_key(conversation_id), 0, -1, withscores=True
+            )
+            if not tickets:
+                return None
+            tickets = sorted(
+                (Ticket(int(number), expires) for number, expires in tickets),
+                key=lambda ticket: ticket.number,
+            )
+            return TicketLock(conversation_id, deque(tickets))
+
+        serialised_lock = self.red.get(self._lock_key(conversation_id))
         if serialised_lock:
             return TicketLock.from_dict(json.loads(serialised_lock))
 
@@ -270,11 +381,121 @@ class RedisLockStore(LockStore):
 
     def delete_lock(self, conversation_id: Text) -> None:
         """Deletes lock for conversation ID."""
-        deletion_successful = self.red.delete(self.key_prefix + conversation_id)
+        deletion_successful = self.red.delete(self._lock_key(conversation_id))
         self._log_deletion(conversation_id, deletion_successful)
 
     def save_lock(self, lock: TicketLock) -> None:
-        self.red.set(self.key_prefix + lock.conversation_id, lock.dumps())
+        """Commits `lock` to Redis."""
+        key = self._lock_key(lock.conversation_id)
+        if not self.event_driven:
+            self.red.set(key, lock.dumps())
+            return
+
+        pipeline = self.red.pipeline()
+        pipeline.delete(key)
+        if lock.tickets:
+            pipeline.zadd(key, {t.number: t.expires for t in lock.tickets})
+        pipeline.execute()
+
+    def issue_ticket(
+        self, conversation_id: Text, lock_lifetime: float = LOCK_LIFETIME
+    ) -> int:
+        """Issues new ticket (see parent docstring for more information)."""
+        if not self.event_driven:
+            return super().issue_ticket(conversation_id, lock_lifetime)
+
+        logger.debug(f"Issuing ticket for conversation '{conversation_id}'.")
+        try:
+            now = time.time()
+            return int(
+                self._issue_ticket_script(
+                    keys=[self._lock_key(conversation_id)],
+                    args=[now, now + lock_lifetime],
+                )
+            )
+        except Exception as e:
+            raise LockError(f"Error while acquiring lock. Error:\n{e}")
+
+    def update_lock(self, conversation_id: Text) -> None:
+        """Removes expired tickets (see parent docstring for more information)."""
+        if not self.event_driven:
+            return super().update_lock(conversation_id)
+
+        self.red.zremrangebyscore(
+            self._lock_key(conversation_id), "-inf", f"({time.time()}"
+        )
+
+    def finish_serving(self, conversation_id: Text, ticket_number: int) -> None:
+        """Removes ticket (see parent docstring for more information)."""
+        if not self.event_driven:
+            return super().finish_serving(conversation_id, ticket_number)
+
+        self.red.zrem(self._lock_key(conversation_id), ticket_number)
+
+    def cleanup(self, conversation_id: Text, ticket_number: int) -> None:
+        """Removes ticket and notifies all Rasa instances waiting for the lock."""
+        if not self.event_driven:
+            return super().cleanup(conversation_id, ticket_number)
+
+        self._release_ticket_script(
+            keys=[self._lock_key(conversation_id), self._release_channel],
+            args=[ticket_number, time.time(), conversation_id],
+        )
+        self._notify_release(conversation_id)
+
+    async def _wait_for_release(
+        self,
+        conversation_id: Text,
+        released: asyncio.Event,
+        wait_time_in_seconds: float,
+    ) -> None:
+        if self.event_driven and await self._start_release_listener():
+            # releases which happened before the subscription are missed, hence
+            # the lock has to be checked again
+            return
+
+        await super()._wait_for_release(conversation_id, released, wait_time_in_seconds)
+
+    async def _start_release_listener(self) -> bool:
+        """Starts listening for lock releases published by any Rasa instance.
+
+        Returns:
+            `True` if a new listener was started and subscribed successfully.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._release_listener is not None
+            and not self._release_listener.done()
+            and self._release_listener_loop is loop
+        ):
+            return False
+
+        subscribed = loop.create_future()
+        self._release_listener = loop.create_task(self._listen_for_releases(subscribed))
+        self._release_listener_loop = loop
+        return await subscribed
+
+    async def _listen_for_releases(self, subscribed: asyncio.Future) -> None:
+        pubsub = self.async_red.pubsub()
+        try:
+            await pubsub.subscribe(self._release_channel)
+            async for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    subscribed.set_result(True)
+                elif message["type"] == "message":
+                    conversation_id = message["data"]
+                    if isinstance(conversation_id, bytes):
+                        conversation_id = conversation_id.decode()
+                    self._notify_release(conversation_id)
+        except Exception as e:
+            logger.warning(
+                f"Stopped listening for lock releases. Falling back to polling the "
+                f"lock store. Error: {e}"
+            )
+        finally:
+            if not subscribed.done():
+                subscribed.set_result(False)
+            await pubsub.close()
 
 
 class InMemoryLockStore(LockStore):
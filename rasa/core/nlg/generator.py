@@ -29,6 +29,10 @@ class NaturalLanguageGenerator:
         """
         raise NotImplementedError
 
+    async def close(self) -> None:
+        """Closes the connections of the generator."""
+        pass
+
     @staticmethod
     def create(
         obj: Union["NaturalLanguageGenerator", EndpointConfig, None],
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from rasa.core.channels import UserMessage
+from rasa.shared.exceptions import RasaException
+from rasa.shared.nlu.training_data.message import Message
+
+logger = logging.getLogger(__name__)
+
+
+class NLUBatcher:
+    """Coalesces concurrently arriving messages into batched NLU runs.
+
+    Messages are collected until either `max_batch_size` messages are waiting or
+    `max_wait_time_in_seconds` passed since the first message of the batch arrived.
+    The whole batch is then parsed with a single call of `parse_batch` and the parsed
+    messages are handed back to the waiting callers.
+    """
+
+    def __init__(
+        self,
+        parse_batch: Callable[[List[UserMessage]], Awaitable[List[Message]]],
+        max_batch_size: int,
+        max_wait_time_in_seconds: float,
+    ) -> None:
+        """Initializes a `NLUBatcher`.
+
+        Args:
+            parse_batch: Coroutine function which parses a list of messages and
+                returns the parsed messages in the same order.
+            max_batch_size: Maximum number of messages which are parsed together.
+            max_wait_time_in_seconds: Maximum time the first message of a batch waits
+                for other messages to arrive.
+        """
+        self._parse_batch = parse_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_time_in_seconds = max_wait_time_in_seconds
+
+        self._pending: List[Tuple[UserMessage, "asyncio.Future[Message]"]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # keep references so that running batches are not garbage collected
+        self._running_batches: Set["asyncio.Task[None]"] = set()
+
+    async def parse(self, message: UserMessage) -> Message:
+        """Parses a message as part of the next batch.
+
+        Args:
+            message: The message which should be parsed.
+
+        Returns:
+            The parsed message.
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Message]" = loop.create_future()
+        self._pending.append((message, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self.max_wait_time_in_seconds, self._flush
+            )
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._running_batches.add(task)
+        task.add_done_callback(self._running_batches.discard)
+
+    async def _run_batch(
+        self, batch: List[Tuple[UserMessage, "asyncio.Future[Message]"]]
+    ) -> None:
+        logger.debug(f"Parsing a batch of {len(batch)} message(s).")
+        try:
+            parsed_messages = await self._parse_batch([message for message, _ in batch])
+            if len(parsed_messages) != len(batch):
+                raise RasaException(
+                    f"Parsing a batch of {len(batch)} message(s) returned "
+                    f"{len(parsed_messages)} parsed message(s)."
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), parsed_message in zip(batch, parsed_messages):
+            if not future.done():
+                future.set_result(parsed_message)
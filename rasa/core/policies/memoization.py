@@ -1,5 +1,8 @@
 from __future__ import annotations
 import copy
+import functools
+import hashlib
+import re
 import zlib
 
 import base64
@@ -8,7 +11,7 @@ import logging
 import structlog
 
 from tqdm import tqdm
-from typing import Optional, Any, Dict, List, Text
+from typing import Optional, Any, Dict, List, Text, Tuple
 from pathlib import Path
 
 import rasa.utils.io
@@ -24,7 +27,7 @@ from rasa.core.featurizers.tracker_featurizers import MaxHistoryTrackerFeaturize
 from rasa.core.featurizers.tracker_featurizers import FEATURIZER_FILE
 from rasa.shared.exceptions import FileIOException
 from rasa.core.policies.policy import PolicyPrediction, Policy, SupportedData
-from rasa.shared.core.trackers import DialogueStateTracker
+from rasa.shared.core.trackers import DialogueStateTracker, FrozenState
 from rasa.shared.core.generator import TrackerWithCachedStates
 from rasa.shared.utils.io import is_logging_disabled
 from rasa.core.constants import (
@@ -33,11 +36,19 @@ from rasa.core.constants import (
     POLICY_MAX_HISTORY,
     POLICY_PRIORITY,
 )
-from rasa.shared.core.constants import ACTION_LISTEN_NAME
+from rasa.shared.core.constants import ACTION_LISTEN_NAME, SLOTS
 
 logger = logging.getLogger(__name__)
 structlogger = structlog.get_logger()
 
+FEATURE_KEY_FORMAT = "feature_key_format"
+# lookups which were persisted without a key format use JSON feature strings
+LEGACY_FEATURE_KEY_FORMAT = "json"
+HASHED_FEATURE_KEY_FORMAT = "blake2b"
+
+STATE_DIGEST_SIZE = 16
+STATE_DIGEST_CACHE_SIZE = 10000
+
 
 @DefaultV1Recipe.register(
     DefaultV1Recipe.ComponentType.POLICY_WITHOUT_END_TO_END_SUPPORT, is_trainable=True
@@ -62,6 +73,10 @@ class MemoizationPolicy(Policy):
     training stories for this, use AugmentedMemoizationPolicy.
     """
 
+    # whether `_create_feature_key` creates hashed keys, lookups of policies which
+    # build their own keys are never migrated
+    _uses_hashed_feature_keys = True
+
     @staticmethod
     def get_default_config() -> Dict[Text, Any]:
         """Returns the default config (see parent class for full docstring)."""
@@ -92,6 +107,8 @@ class MemoizationPolicy(Policy):
         """Initialize the policy."""
         super().__init__(config, model_storage, resource, execution_context, featurizer)
         self.lookup = lookup or {}
+        # set when a lookup with JSON feature strings couldn't be migrated on load
+        self._use_legacy_feature_keys = False
 
     def _create_lookup_from_states(
         self,
@@ -145,6 +162,12 @@ class MemoizationPolicy(Policy):
         return lookup
 
     def _create_feature_key(self, states: List[State]) -> Optional[Text]:
+        if self._use_legacy_feature_keys:
+            return self._create_legacy_feature_key(states)
+
+        return _hashed_feature_key(states)
+
+    def _create_legacy_feature_key(self, states: List[State]) -> Optional[Text]:
         if not states:
             return None
 
@@ -182,6 +205,8 @@ class MemoizationPolicy(Policy):
             trackers_as_states,
             trackers_as_actions,
         ) = self.featurizer.training_states_and_labels(training_trackers, domain)
+        # the lookup is created from scratch, so it can always use hashed keys
+        self._use_legacy_feature_keys = False
         self.lookup = self._create_lookup_from_states(
             trackers_as_states, trackers_as_actions
         )
@@ -269,12 +294,42 @@ class MemoizationPolicy(Policy):
         return self._prediction(result)
 
     def _metadata(self) -> Dict[Text, Any]:
-        return {"lookup": self.lookup}
+        return {
+            "lookup": self.lookup,
+            FEATURE_KEY_FORMAT: LEGACY_FEATURE_KEY_FORMAT
+            if self._use_legacy_feature_keys
+            else HASHED_FEATURE_KEY_FORMAT,
+        }
 
     @classmethod
     def _metadata_filename(cls) -> Text:
         return "memorized_turns.json"
 
+    @classmethod
+    def _migrate_legacy_lookup(
+        cls, lookup: Dict[Text, Text], config: Dict[Text, Any]
+    ) -> Optional[Dict[Text, Text]]:
+        """Converts a lookup with JSON feature strings to hashed feature keys.
+
+        Args:
+            lookup: The lookup which was persisted with JSON feature strings.
+            config: The configuration of the policy which created the lookup.
+
+        Returns:
+            The lookup with hashed feature keys or `None` if any of the feature
+            strings couldn't be converted.
+        """
+        migrated_lookup = {}
+        for feature_key, action in lookup.items():
+            states = _states_from_legacy_feature_key(
+                feature_key, config["enable_feature_string_compression"]
+            )
+            if states is None:
+                return None
+            migrated_lookup[_hashed_feature_key(states)] = action
+
+        return migrated_lookup
+
     def persist(self) -> None:
         """Persists the policy to storage."""
         with self._model_storage.write_to(self._resource) as path:
@@ -299,6 +354,7 @@ class MemoizationPolicy(Policy):
         """Loads a trained policy (see parent class for full docstring)."""
         featurizer = None
         lookup = None
+        use_legacy_feature_keys = False
 
         try:
             with model_storage.read_from(resource) as path:
@@ -306,6 +362,21 @@ class MemoizationPolicy(Policy):
                 metadata = rasa.shared.utils.io.read_json_file(metadata_file)
                 lookup = metadata["lookup"]
 
+                if cls._uses_hashed_feature_keys and (
+                    metadata.get(FEATURE_KEY_FORMAT, LEGACY_FEATURE_KEY_FORMAT)
+                    == LEGACY_FEATURE_KEY_FORMAT
+                ):
+                    migrated_lookup = cls._migrate_legacy_lookup(lookup, config)
+                    if migrated_lookup is None:
+                        logger.warning(
+                            f"Couldn't convert the memorized turns of policy "
+                            f"'{cls.__name__}' to the current format. Retrain "
+                            f"your model to speed up predictions of this policy."
+                        )
+                        use_legacy_feature_keys = True
+                    else:
+                        lookup = migrated_lookup
+
                 if (Path(path) / FEATURIZER_FILE).is_file():
                     featurizer = TrackerFeaturizer.load(path)
 
@@ -315,7 +386,7 @@ class MemoizationPolicy(Policy):
                 f"metadata couldn't be loaded."
             )
 
-        return cls(
+        policy = cls(
             config,
             model_storage,
             resource,
@@ -323,6 +394,8 @@ class MemoizationPolicy(Policy):
             featurizer=featurizer,
             lookup=lookup,
         )
+        policy._use_legacy_feature_keys = use_legacy_feature_keys
+        return policy
 
 
 @DefaultV1Recipe.register(
@@ -533,3 +606,179 @@ def _trim_tracker_by_max_history(
     for event in applied_events:
         new_tracker.update(event)
     return new_tracker
+
+
+def _canonical_value(value: Any) -> Any:
+    """Normalizes a value of a state so that equal states are encoded equally."""
+    if isinstance(value, (bool, int, float)):
+        # `1`, `1.0` and `True` are equal when states are frozen
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(element) for element in value]
+    return value
+
+
+@functools.lru_cache(maxsize=STATE_DIGEST_CACHE_SIZE)
+def _frozen_state_digest(frozen_state: FrozenState) -> bytes:
+    """Computes a digest of a frozen state which doesn't depend on the item order."""
+    canonical_state = sorted(
+        (
+            state_type,
+            sorted(
+                json.dumps(_canonical_value(item), sort_keys=True) for item in sub_state
+            ),
+        )
+        for state_type, sub_state in frozen_state
+    )
+    return hashlib.blake2b(
+        json.dumps(canonical_state).encode(rasa.shared.utils.io.DEFAULT_ENCODING),
+        digest_size=STATE_DIGEST_SIZE,
+    ).digest()
+
+
+def _state_digest(state: State) -> bytes:
+    try:
+        frozen_state = DialogueStateTracker.freeze_current_state(state)
+    except TypeError:
+        # states which aren't made of sub-states with hashable values can't be
+        # frozen, they are hashed without caching
+        return hashlib.blake2b(
+            json.dumps(state, sort_keys=True, default=str).encode(
+                rasa.shared.utils.io.DEFAULT_ENCODING
+            ),
+            digest_size=STATE_DIGEST_SIZE,
+        ).digest()
+
+    return _frozen_state_digest(frozen_state)
+
+
+def _hashed_feature_key(states: List[State]) -> Optional[Text]:
+    """Creates the lookup key for a sequence of states.
+
+    The key is a hash of the digests of the single states. The digests are cached
+    per frozen state, so that states which are seen repeatedly (e.g. when the
+    tracker is truncated by `AugmentedMemoizationPolicy`) are only encoded once.
+
+    Args:
+        states: The states which should be converted to a key.
+
+    Returns:
+        The key or `None` if there are no states.
+    """
+    if not states:
+        return None
+
+    key = hashlib.blake2b(digest_size=STATE_DIGEST_SIZE)
+    for state in states:
+        key.update(_state_digest(state))
+    return key.hexdigest()
+
+
+def _states_from_legacy_feature_key(
+    feature_key: Text, is_compressed: bool
+) -> Optional[List[State]]:
+    """Restores the states from a JSON feature string of an old lookup.
+
+    Args:
+        feature_key: The key which was created by `_create_legacy_feature_key`.
+        is_compressed: Whether the feature string was compressed.
+
+    Returns:
+        The states or `None` if the states couldn't be restored unambiguously.
+    """
+    feature_str = feature_key
+    if is_compressed:
+        try:
+            feature_str = zlib.decompress(base64.b64decode(feature_key)).decode(
+                rasa.shared.utils.io.DEFAULT_ENCODING
+            )
+        except (ValueError, zlib.error):
+            return None
+
+    try:
+        states = _LegacyFeatureStringParser(feature_str).parse()
+    except ValueError:
+        return None
+
+    # quotes were removed from the feature strings, so the states are only
+    # restored correctly if they result in the exact same feature string
+    if json.dumps(states, sort_keys=True).replace('"', "") != feature_str:
+        return None
+    return states
+
+
+class _LegacyFeatureStringParser:
+    """Parses the JSON feature strings without quotes of old lookups."""
+
+    _TOKEN_PATTERN = re.compile(r"[^,:\[\]{}]*")
+
+    def __init__(self, feature_str: Text) -> None:
+        self._text = feature_str
+        self._position = 0
+
+    def parse(self) -> List[State]:
+        states = self._parse_value(in_slots=False)
+        if self._position != len(self._text) or not isinstance(states, tuple):
+            raise ValueError(f"'{self._text}' is not a list of states.")
+        if not all(isinstance(state, dict) for state in states):
+            raise ValueError(f"'{self._text}' is not a list of states.")
+        return list(states)
+
+    def _consume(self, token: Text) -> bool:
+        if self._text.startswith(token, self._position):
+            self._position += len(token)
+            return True
+        return False
+
+    def _expect(self, token: Text) -> None:
+        if not self._consume(token):
+            raise ValueError(
+                f"Expected '{token}' at position {self._position} of '{self._text}'."
+            )
+
+    def _parse_value(self, in_slots: bool) -> Any:
+        if self._consume("{"):
+            return self._parse_object(in_slots)
+        if self._consume("["):
+            return self._parse_array(in_slots)
+
+        return json.loads(f'"{self._parse_token()}"')
+
+    def _parse_object(self, in_slots: bool) -> Dict[Text, Any]:
+        parsed: Dict[Text, Any] = {}
+        if self._consume("}"):
+            return parsed
+
+        while True:
+            key = json.loads(f'"{self._parse_token()}"')
+            self._expect(": ")
+            parsed[key] = self._parse_value(in_slots or key == SLOTS)
+            if not self._consume(", "):
+                self._expect("}")
+                return parsed
+
+    def _parse_array(self, in_slots: bool) -> Tuple[Any, ...]:
+        parsed: List[Any] = []
+        if self._consume("]"):
+            return tuple(parsed)
+
+        while True:
+            if in_slots:
+                parsed.append(self._parse_number())
+            else:
+                parsed.append(self._parse_value(in_slots))
+            if not self._consume(", "):
+                self._expect("]")
+                return tuple(parsed)
+
+    def _parse_number(self) -> float:
+        token = self._parse_token()
+        try:
+            return int(token)
+        except ValueError:
+            return float(token)
+
+    def _parse_token(self) -> Text:
+        match = self._TOKEN_PATTERN.match(self._text, self._position)
+        self._position = match.end()
+        return match.group()
@@ -1,15 +1,40 @@
 from __future__ import annotations
+import concurrent.futures
+import contextlib
 import copy
+import dataclasses
 import functools
+import itertools
 import logging
+import math
+import os
+from pathlib import Path
 import structlog
-from typing import Any, List, DefaultDict, Dict, Text, Optional, Set, Tuple, cast
+from typing import (
+    Any,
+    ContextManager,
+    List,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Text,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 
 from tqdm import tqdm
 import numpy as np
 import json
 from collections import defaultdict
 
+import rasa
+from rasa.engine.caching import (
+    CACHE_SIZE_ENV,
+    DEFAULT_CACHE_SIZE_MB,
+    get_cache_location,
+)
 from rasa.engine.graph import ExecutionContext
 from rasa.engine.recipes.default_recipe import DefaultV1Recipe
 from rasa.engine.storage.resource import Resource
@@ -78,6 +103,11 @@ DEFAULT_RULES = "predicting default action with intent "
 LOOP_RULES = "handling active loops and forms - "
 LOOP_RULES_SEPARATOR = " - "
 
+CONTRADICTION_CHECK_CACHE_DIRECTORY = "rule_policy"
+CONTRADICTION_CHECK_CACHE_FILE_PREFIX = "contradiction_checks_"
+# number of projects whose contradiction checks are cached
+MAX_CONTRADICTION_CHECK_CACHE_FILES = 10
+
 
 class InvalidRule(RasaException):
     """Exception that can be raised when rules are not valid."""
@@ -93,12 +123,393 @@ class InvalidRule(RasaException):
         )
 
 
+@dataclasses.dataclass
+class _TrackerAnalysis:
+    """Results of checking a single tracker for contradictions with the rules."""
+
+    error_messages: List[Text] = dataclasses.field(default_factory=list)
+    rules_used_in_stories: List[Optional[Text]] = dataclasses.field(
+        default_factory=list
+    )
+    # tuples of prediction source, rule name and the action predicted by the rule
+    rule_sources: List[Tuple[Text, Text, Optional[Text]]] = dataclasses.field(
+        default_factory=list
+    )
+    # rules which were removed from the lookup while checking the tracker
+    deleted_rules: List[Text] = dataclasses.field(default_factory=list)
+
+
+class _ContradictionCheckCache:
+    """Persists the results of checking trackers for contradictions across trainings.
+
+    Results are stored by a key which combines the fingerprint of the tracker and the
+    fingerprint of everything else which influences the check (learned rules,
+    domain, configuration). Every domain and configuration has its own cache file in
+    which only the results which were used during the last check are kept. Only the
+    most recently used files are kept.
+    """
+
+    def __init__(self, path: Optional[Path]) -> None:
+        """Loads the cache.
+
+        Args:
+            path: Location of the cache file. `None` disables the cache.
+        """
+        self._path = path
+        self._cached_results: Dict[Text, Dict[Text, Any]] = {}
+        self._used_results: Dict[Text, Dict[Text, Any]] = {}
+
+        if path is not None and path.exists():
+            try:
+                self._cached_results = rasa.shared.utils.io.read_json_file(path)
+            except Exception as e:
+                logger.debug(f"Ignoring corrupt contradiction check cache. Error: {e}")
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether results are cached."""
+        return self._path is not None
+
+    def get(self, key: Optional[Text]) -> Optional[_TrackerAnalysis]:
+        """Returns the cached result for `key` if there is one."""
+        if key is None or key not in self._cached_results:
+            return None
+        return _TrackerAnalysis(**self._cached_results[key])
+
+    def add(self, key: Optional[Text], analysis: _TrackerAnalysis) -> None:
+        """Marks `analysis` as result which should be persisted."""
+        if key is not None:
+            self._used_results[key] = dataclasses.asdict(analysis)
+
+    def persist(self) -> None:
+        """Persists all results which were used or added since loading the cache."""
+        if self._path is None:
+            return
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self._path.with_suffix(f".{os.getpid()}.tmp")
+        rasa.shared.utils.io.dump_obj_as_json_to_file(
+            temporary_path, self._used_results
+        )
+        os.replace(temporary_path, self._path)
+
+        cache_files = sorted(
+            self._path.parent.glob(f"{CONTRADICTION_CHECK_CACHE_FILE_PREFIX}*.json"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for path in cache_files[MAX_CONTRADICTION_CHECK_CACHE_FILES:]:
+            path.unlink(missing_ok=True)
+
+
+# state of a process which checks trackers for contradictions, which is set once when
+# the process is started
+_contradiction_check_worker: Dict[Text, Any] = {}
+
+
+def _init_contradiction_check_worker(
+    policy: RulePolicy,
+    domain: Domain,
+    tracker_lists: List[List[TrackerWithCachedStates]],
+) -> None:
+    _contradiction_check_worker.update(
+        policy=policy, domain=domain, tracker_lists=tracker_lists
+    )
+
+
+def _analyze_trackers_independently(
+    list_index: int,
+    positions: List[int],
+    lookup: Dict[Text, Any],
+    rules_sources: Dict[Text, List[Tuple[Text, Text]]],
+    collect_sources: bool,
+) -> List[_TrackerAnalysis]:
+    """Checks trackers in a worker process.
+
+    Every tracker is checked against the same rules, i.e. rules which are deleted
+    while checking a tracker are restored before checking the next tracker.
+
+    Args:
+        list_index: Index of the list which contains the trackers.
+        positions: Positions of the trackers in this list.
+        lookup: Current lookup of the policy.
+        rules_sources: Sources of the rules of the policy.
+        collect_sources: Whether rule sources are collected.
+
+    Returns:
+        The results of checking the trackers.
+    """
+    policy = _contradiction_check_worker["policy"]
+    trackers = _contradiction_check_worker["tracker_lists"][list_index]
+    policy.lookup = lookup
+    policy._rules_sources = defaultdict(list, rules_sources)
+
+    rules = dict(lookup[RULES])
+    analyses = []
+    for position in positions:
+        analysis = policy._analyze_tracker(
+            trackers[position], _contradiction_check_worker["domain"], collect_sources
+        )
+        lookup[RULES].update(
+            {rule_key: rules[rule_key] for rule_key in analysis.deleted_rules}
+        )
+        analyses.append(analysis)
+
+    return analyses
+
+
+class _ContradictionCheckPool:
+    """Processes which check trackers for contradictions in parallel.
+
+    The policy, the domain and the trackers are sent to each process once when it
+    is started. Checks only send the current lookup and the positions of the
+    trackers which should be checked.
+    """
+
+    def __init__(
+        self,
+        policy: RulePolicy,
+        domain: Domain,
+        tracker_lists: List[List[TrackerWithCachedStates]],
+        number_of_processes: int,
+    ) -> None:
+        """Creates the pool.
+
+        Args:
+            policy: The policy which checks the trackers.
+            domain: The domain.
+            tracker_lists: All lists of trackers which will be checked.
+            number_of_processes: Maximum number of worker processes.
+        """
+        # the lookup changes between checks and is sent with every check
+        worker_policy = copy.copy(policy)
+        worker_policy.lookup = {}
+        worker_policy._rules_sources = defaultdict(list)
+        worker_policy._rule_indices = {}
+
+        self._tracker_lists = tracker_lists
+        self._number_of_processes = number_of_processes
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            number_of_processes,
+            initializer=_init_contradiction_check_worker,
+            initargs=(worker_policy, domain, tracker_lists),
+        )
+
+    def __enter__(self) -> _ContradictionCheckPool:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._executor.shutdown()
+
+    def analyze(
+        self,
+        policy: RulePolicy,
+        trackers: List[TrackerWithCachedStates],
+        positions: List[int],
+        collect_sources: bool,
+    ) -> List[_TrackerAnalysis]:
+        """Checks trackers against the current lookup of `policy`.
+
+        Args:
+            policy: The policy which holds the current lookup.
+            trackers: One of the lists of trackers the pool was created with.
+            positions: Positions of the trackers in `trackers` which are checked.
+            collect_sources: Whether rule sources are collected.
+
+        Returns:
+            The results of checking the trackers in the order of `positions`.
+        """
+        list_index = next(
+            index
+            for index, tracker_list in enumerate(self._tracker_lists)
+            if tracker_list is trackers
+        )
+        number_of_chunks = min(self._number_of_processes, len(positions))
+        chunk_size = math.ceil(len(positions) / number_of_chunks)
+        chunks = [
+            positions[start : start + chunk_size]
+            for start in range(0, len(positions), chunk_size)
+        ]
+        results = self._executor.map(
+            _analyze_trackers_independently,
+            itertools.repeat(list_index),
+            chunks,
+            itertools.repeat(policy.lookup),
+            itertools.repeat(dict(policy._rules_sources)),
+            itertools.repeat(collect_sources),
+        )
+        return [analysis for chunk in results for analysis in chunk]
+
+
+class _TurnIndex:
+    """Index of the rule states which rules expect at one specific dialogue turn."""
+
+    def __init__(self) -> None:
+        """Creates an empty index."""
+        # all rules which have a state at this turn
+        self.rule_ids: Set[int] = set()
+        # rules which expect the conversation to start at this turn
+        self.conversation_starters: Set[int] = set()
+        # maps `(state type, key, value)` to the rules which require the feature
+        self.rules_by_required_feature: DefaultDict[
+            Tuple[Text, Text, Any], List[int]
+        ] = defaultdict(list)
+        self.number_of_required_features: Dict[int, int] = {}
+        self.rules_without_required_features: Set[int] = set()
+        # maps `(state type, key)` to the rules which require the feature to be unset
+        self.rules_by_forbidden_feature: DefaultDict[
+            Tuple[Text, Text], List[int]
+        ] = defaultdict(list)
+        # rule states with values which can't be indexed
+        self.unindexed_rule_states: Dict[int, State] = {}
+
+    def add(self, rule_id: int, rule_state: State) -> None:
+        """Adds the state which the rule `rule_id` expects at this turn."""
+        self.rule_ids.add(rule_id)
+        if not rule_state.get(PREVIOUS_ACTION):
+            self.conversation_starters.add(rule_id)
+            return
+
+        required_features = []
+        forbidden_features = []
+        for state_type, rule_sub_state in rule_state.items():
+            for key, value_from_rules in rule_sub_state.items():
+                if isinstance(value_from_rules, list):
+                    # json dumps and loads tuples as lists,
+                    # so we need to convert them back
+                    value_from_rules = tuple(value_from_rules)
+                if value_from_rules == SHOULD_NOT_BE_SET:
+                    forbidden_features.append((state_type, key))
+                elif value_from_rules:
+                    required_features.append((state_type, key, value_from_rules))
+
+        try:
+            hash(tuple(required_features))
+        except TypeError:
+            self.unindexed_rule_states[rule_id] = rule_state
+            return
+
+        for feature in required_features:
+            self.rules_by_required_feature[feature].append(rule_id)
+        self.number_of_required_features[rule_id] = len(required_features)
+        if not required_features:
+            self.rules_without_required_features.add(rule_id)
+        for forbidden_feature in forbidden_features:
+            self.rules_by_forbidden_feature[forbidden_feature].append(rule_id)
+
+    def matching_rules(self, conversation_state: State) -> Set[int]:
+        """Finds the rules whose state at this turn matches `conversation_state`.
+
+        Args:
+            conversation_state: The conversation state at this turn.
+
+        Returns:
+            IDs of the matching rules.
+        """
+        # a state has previous action if and only if it is not a conversation start
+        # state
+        if not conversation_state.get(PREVIOUS_ACTION):
+            return self.conversation_starters
+
+        number_of_present_features: DefaultDict[int, int] = defaultdict(int)
+        set_features = []
+        for state_type, conversation_sub_state in conversation_state.items():
+            for key, value in conversation_sub_state.items():
+                if value and value != SHOULD_NOT_BE_SET:
+                    set_features.append((state_type, key))
+                try:
+                    rule_ids = self.rules_by_required_feature.get(
+                        (state_type, key, value), []
+                    )
+                except TypeError:
+                    # unhashable values can't be equal to any indexed value
+                    continue
+                for rule_id in rule_ids:
+                    number_of_present_features[rule_id] += 1
+
+        matching = {
+            rule_id
+            for rule_id, number in number_of_present_features.items()
+            if number == self.number_of_required_features[rule_id]
+        }
+        matching.update(self.rules_without_required_features)
+        for feature in set_features:
+            matching.difference_update(self.rules_by_forbidden_feature.get(feature, []))
+        for rule_id, rule_state in self.unindexed_rule_states.items():
+            if RulePolicy._does_rule_match_state(rule_state, conversation_state):
+                matching.add(rule_id)
+
+        return matching
+
+
+class _RuleIndex:
+    """Inverted index which finds the rules applicable to a conversation.
+
+    Instead of matching every rule against every turn of the conversation, the rules
+    are indexed by the features they require per turn (counted backwards from the
+    latest state). The rules matching a turn are then found by counting how many of
+    their required features are present in the conversation state.
+    """
+
+    def __init__(self, lookup: Dict[Text, Text]) -> None:
+        """Compiles the rule keys of `lookup`.
+
+        Args:
+            lookup: Maps rule keys to their predictions.
+        """
+        self._lookup = lookup
+        self._rule_keys = list(lookup.keys())
+        self._rule_key_set = frozenset(self._rule_keys)
+        self._all_rule_ids: FrozenSet[int] = frozenset(range(len(self._rule_keys)))
+        self._turns: List[_TurnIndex] = []
+
+        for rule_id, rule_key in enumerate(self._rule_keys):
+            rule_states = json.loads(rule_key)
+            for turn_index, rule_state in enumerate(reversed(rule_states)):
+                if turn_index == len(self._turns):
+                    self._turns.append(_TurnIndex())
+                self._turns[turn_index].add(rule_id, rule_state)
+
+    def is_index_for(self, lookup: Dict[Text, Text]) -> bool:
+        """Checks whether the index was compiled for the current state of `lookup`.
+
+        The contradiction checks add and remove rules of the lookup in place, so its
+        rule keys are compared as well.
+        """
+        return self._lookup is lookup and lookup.keys() == self._rule_key_set
+
+    def possible_keys(self, states: List[State]) -> Set[Text]:
+        """Finds the rules which are applicable to the conversation.
+
+        Args:
+            states: The states of the conversation.
+
+        Returns:
+            The keys of the applicable rules.
+        """
+        applicable: Set[int] = set()
+        candidates: Set[int] = set(self._all_rule_ids)
+        for turn_index, state in enumerate(reversed(states)):
+            if turn_index >= len(self._turns) or not candidates:
+                break
+            turn = self._turns[turn_index]
+            # the rule must be applicable because we got (without any applicability
+            # issues) further in the conversation history than the rule's length
+            applicable.update(candidates - turn.rule_ids)
+            candidates.intersection_update(turn.matching_rules(state))
+
+        return {self._rule_keys[rule_id] for rule_id in applicable | candidates}
+
+
 @DefaultV1Recipe.register(
     DefaultV1Recipe.ComponentType.POLICY_WITHOUT_END_TO_END_SUPPORT, is_trainable=True
 )
 class RulePolicy(MemoizationPolicy):
     """Policy which handles all the rules."""
 
+    # rules are looked up by their JSON feature strings
+    _uses_hashed_feature_keys = False
+
     # rules use explicit json strings
     ENABLE_FEATURE_STRING_COMPRESSION = False
 
@@ -138,6 +549,15 @@ class RulePolicy(MemoizationPolicy):
             # the policy will use the confidence of NLU on the latest
             # user message to set the confidence of the action
             "use_nlu_confidence_as_score": False,
+            # Number of processes which check trackers for contradictions in
+            # parallel.
+            "contradiction_check_processes": 1,
+            # If `True` the results of checking trackers for contradictions are
+            # cached in the Rasa cache directory so that only changed trackers are
+            # checked again if the rules, domain and configuration didn't change.
+            # The cached results are not part of the training cache and are
+            # deleted if the cache runs out of space.
+            "cache_contradiction_checks": False,
         }
 
     def __init__(
@@ -164,6 +584,8 @@ class RulePolicy(MemoizationPolicy):
         self._rules_sources: DefaultDict[Text, List[Tuple[Text, Text]]] = defaultdict(
             list
         )
+        # compiled rule lookups by the name of the lookup (e.g. `RULES`)
+        self._rule_indices: Dict[Text, _RuleIndex] = {}
 
     @classmethod
     def raise_if_incompatible_with_domain(
@@ -493,13 +915,13 @@ class RulePolicy(MemoizationPolicy):
 
         return predicted_action_name, prediction_source
 
-    def _collect_sources(
-        self,
+    @staticmethod
+    def _rule_source(
         tracker: TrackerWithCachedStates,
         predicted_action_name: Optional[Text],
         gold_action_name: Optional[Text],
         prediction_source: Text,
-    ) -> None:
+    ) -> Tuple[Text, Text, Optional[Text]]:
         # we need to remember which action should be predicted by the rule
         # in order to correctly output the names of the contradicting rules
         rule_name = tracker.sender_id
@@ -512,7 +934,7 @@ class RulePolicy(MemoizationPolicy):
             gold_action_name = predicted_action_name
             rule_name = prediction_source
 
-        self._rules_sources[prediction_source].append((rule_name, gold_action_name))
+        return prediction_source, rule_name, gold_action_name
 
     @staticmethod
     def _default_sources() -> Set[Text]:
@@ -606,87 +1028,267 @@ class RulePolicy(MemoizationPolicy):
 
         return [error_message + "."]
 
-    def _run_prediction_on_trackers(
+    def _analyze_tracker(
+        self, tracker: TrackerWithCachedStates, domain: Domain, collect_sources: bool
+    ) -> _TrackerAnalysis:
+        analysis = _TrackerAnalysis()
+        # only stories can lead to the deletion of rules
+        rules_before_analysis = (
+            dict(self.lookup[RULES])
+            if not collect_sources and not tracker.is_rule_tracker
+            else None
+        )
+
+        running_tracker = tracker.init_copy()
+        running_tracker.sender_id = tracker.sender_id
+        # the first action is always unpredictable
+        next_action_is_unpredictable = True
+        for event in tracker.applied_events():
+            if not isinstance(event, ActionExecuted):
+                running_tracker.update(event)
+                continue
+
+            if event.action_name == RULE_SNIPPET_ACTION_NAME:
+                # notify that the action after RULE_SNIPPET_ACTION_NAME is
+                # unpredictable
+                next_action_is_unpredictable = True
+                running_tracker.update(event)
+                continue
+
+            # do not run prediction on unpredictable actions
+            if next_action_is_unpredictable or event.unpredictable:
+                next_action_is_unpredictable = False  # reset unpredictability
+                running_tracker.update(event)
+                continue
+
+            gold_action_name = event.action_name or event.action_text
+            predicted_action_name, prediction_source = self._predicted_action_name(
+                running_tracker, domain, gold_action_name
+            )
+            if collect_sources:
+                if prediction_source:
+                    analysis.rule_sources.append(
+                        self._rule_source(
+                            running_tracker,
+                            predicted_action_name,
+                            gold_action_name,
+                            prediction_source,
+                        )
+                    )
+            else:
+                # to be able to remove only rules turns from the dialogue history
+                # for ML policies,
+                # we need to know which rules were used in ML trackers
+                if (
+                    not tracker.is_rule_tracker
+                    and predicted_action_name == gold_action_name
+                ):
+                    analysis.rules_used_in_stories.append(prediction_source)
+
+                analysis.error_messages += self._check_prediction(
+                    running_tracker,
+                    predicted_action_name,
+                    gold_action_name,
+                    prediction_source,
+                )
+
+            running_tracker.update(event)
+
+        if rules_before_analysis is not None and len(rules_before_analysis) != len(
+            self.lookup[RULES]
+        ):
+            analysis.deleted_rules = [
+                rule_key
+                for rule_key in rules_before_analysis
+                if rule_key not in self.lookup[RULES]
+            ]
+
+        return analysis
+
+    def _contradiction_check_config(self) -> Dict[Text, Any]:
+        """Returns the configuration which affects the contradiction check."""
+        return {
+            key: value
+            for key, value in self.config.items()
+            if key
+            not in ["contradiction_check_processes", "cache_contradiction_checks"]
+        }
+
+    def _contradiction_check_fingerprint(
+        self, domain: Domain, collect_sources: bool
+    ) -> Text:
+        """Fingerprints everything apart from the tracker which affects its check."""
+        return rasa.shared.utils.io.deep_container_fingerprint(
+            [
+                rasa.__version__,
+                self._contradiction_check_config(),
+                self.lookup,
+                {} if collect_sources else dict(self._rules_sources),
+                domain.fingerprint(),
+                collect_sources,
+            ]
+        )
+
+    def _analyze_trackers(
         self,
         trackers: List[TrackerWithCachedStates],
         domain: Domain,
         collect_sources: bool,
-    ) -> Tuple[List[Text], Set[Optional[Text]]]:
-        if collect_sources:
-            self._rules_sources = defaultdict(list)
+        cache: _ContradictionCheckCache,
+        pool: Optional[_ContradictionCheckPool] = None,
+    ) -> List[_TrackerAnalysis]:
+        """Checks the trackers in order.
+
+        The results are identical to checking the trackers one after another:
+        trackers which are checked in parallel are checked against the same rules.
+        Their results are only used as long as no previous tracker deleted a rule.
+        """
+        context = self._contradiction_check_fingerprint(domain, collect_sources)
+        tracker_fingerprints = [
+            f"{tracker.fingerprint()}{tracker.is_rule_tracker}"
+            if cache.is_enabled
+            else None
+            for tracker in trackers
+        ]
 
-        error_messages = []
-        rules_used_in_stories = set()
+        def cache_key(position: int) -> Optional[Text]:
+            if tracker_fingerprints[position] is None:
+                return None
+            return rasa.shared.utils.io.get_text_hash(
+                context + tracker_fingerprints[position]
+            )
+
+        # results of trackers which were checked in parallel against the rules of
+        # `parallel_context`
+        parallel_analyses: Dict[int, _TrackerAnalysis] = {}
+        parallel_context = None
+
+        analyses = []
         pbar = tqdm(
-            trackers,
+            range(len(trackers)),
             desc="Processed trackers",
             disable=rasa.shared.utils.io.is_logging_disabled(),
         )
-        for tracker in pbar:
-            running_tracker = tracker.init_copy()
-            running_tracker.sender_id = tracker.sender_id
-            # the first action is always unpredictable
-            next_action_is_unpredictable = True
-            for event in tracker.applied_events():
-                if not isinstance(event, ActionExecuted):
-                    running_tracker.update(event)
-                    continue
-
-                if event.action_name == RULE_SNIPPET_ACTION_NAME:
-                    # notify that the action after RULE_SNIPPET_ACTION_NAME is
-                    # unpredictable
-                    next_action_is_unpredictable = True
-                    running_tracker.update(event)
-                    continue
-
-                # do not run prediction on unpredictable actions
-                if next_action_is_unpredictable or event.unpredictable:
-                    next_action_is_unpredictable = False  # reset unpredictability
-                    running_tracker.update(event)
-                    continue
-
-                gold_action_name = event.action_name or event.action_text
-                predicted_action_name, prediction_source = self._predicted_action_name(
-                    running_tracker, domain, gold_action_name
-                )
-                if collect_sources:
-                    if prediction_source:
-                        self._collect_sources(
-                            running_tracker,
-                            predicted_action_name,
-                            gold_action_name,
-                            prediction_source,
+        for position in pbar:
+            key = cache_key(position)
+            analysis = cache.get(key)
+            if analysis is None and parallel_context == context:
+                analysis = parallel_analyses.get(position)
+
+            if analysis is None:
+                if pool is not None:
+                    pending = [
+                        pending_position
+                        for pending_position in range(position, len(trackers))
+                        if cache.get(cache_key(pending_position)) is None
+                    ]
+                    parallel_analyses = dict(
+                        zip(
+                            pending,
+                            pool.analyze(self, trackers, pending, collect_sources),
                         )
+                    )
+                    parallel_context = context
+                    analysis = parallel_analyses[position]
                 else:
-                    # to be able to remove only rules turns from the dialogue history
-                    # for ML policies,
-                    # we need to know which rules were used in ML trackers
-                    if (
-                        not tracker.is_rule_tracker
-                        and predicted_action_name == gold_action_name
-                    ):
-                        rules_used_in_stories.add(prediction_source)
-
-                    error_messages += self._check_prediction(
-                        running_tracker,
-                        predicted_action_name,
-                        gold_action_name,
-                        prediction_source,
+                    analysis = self._analyze_tracker(
+                        trackers[position], domain, collect_sources
                     )
 
-                running_tracker.update(event)
+            cache.add(key, analysis)
+            analyses.append(analysis)
+
+            if analysis.deleted_rules:
+                for rule_key in analysis.deleted_rules:
+                    self.lookup[RULES].pop(rule_key, None)
+                context = rasa.shared.utils.io.get_list_fingerprint(
+                    [context, *analysis.deleted_rules]
+                )
+
+        return analyses
+
+    def _run_prediction_on_trackers(
+        self,
+        trackers: List[TrackerWithCachedStates],
+        domain: Domain,
+        collect_sources: bool,
+        cache: Optional[_ContradictionCheckCache] = None,
+        pool: Optional[_ContradictionCheckPool] = None,
+    ) -> Tuple[List[Text], Set[Optional[Text]]]:
+        if collect_sources:
+            self._rules_sources = defaultdict(list)
+
+        error_messages = []
+        rules_used_in_stories = set()
+        for analysis in self._analyze_trackers(
+            trackers,
+            domain,
+            collect_sources,
+            cache or _ContradictionCheckCache(None),
+            pool,
+        ):
+            for prediction_source, rule_name, gold_action_name in analysis.rule_sources:
+                self._rules_sources[prediction_source].append(
+                    (rule_name, gold_action_name)
+                )
+            rules_used_in_stories.update(analysis.rules_used_in_stories)
+            error_messages += analysis.error_messages
 
         return error_messages, rules_used_in_stories
 
     def _collect_rule_sources(
-        self, rule_trackers: List[TrackerWithCachedStates], domain: Domain
+        self,
+        rule_trackers: List[TrackerWithCachedStates],
+        domain: Domain,
+        cache: Optional[_ContradictionCheckCache] = None,
+        pool: Optional[_ContradictionCheckPool] = None,
     ) -> None:
-        self._run_prediction_on_trackers(rule_trackers, domain, collect_sources=True)
+        self._run_prediction_on_trackers(
+            rule_trackers, domain, collect_sources=True, cache=cache, pool=pool
+        )
 
     def _find_contradicting_and_used_in_stories_rules(
-        self, trackers: List[TrackerWithCachedStates], domain: Domain
+        self,
+        trackers: List[TrackerWithCachedStates],
+        domain: Domain,
+        cache: Optional[_ContradictionCheckCache] = None,
+        pool: Optional[_ContradictionCheckPool] = None,
     ) -> Tuple[List[Text], Set[Optional[Text]]]:
-        return self._run_prediction_on_trackers(trackers, domain, collect_sources=False)
+        return self._run_prediction_on_trackers(
+            trackers, domain, collect_sources=False, cache=cache, pool=pool
+        )
+
+    def _contradiction_check_cache(self, domain: Domain) -> _ContradictionCheckCache:
+        cache_size = float(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE_MB))
+        if not self.config["cache_contradiction_checks"] or cache_size == 0:
+            return _ContradictionCheckCache(None)
+
+        # results of different projects are stored in separate files so that they
+        # don't replace each other
+        project_fingerprint = rasa.shared.utils.io.deep_container_fingerprint(
+            [self._contradiction_check_config(), domain.fingerprint()]
+        )
+        return _ContradictionCheckCache(
+            get_cache_location()
+            / CONTRADICTION_CHECK_CACHE_DIRECTORY
+            / f"{CONTRADICTION_CHECK_CACHE_FILE_PREFIX}{project_fingerprint}.json"
+        )
+
+    def _contradiction_check_pool(
+        self,
+        domain: Domain,
+        rule_trackers: List[TrackerWithCachedStates],
+        all_trackers: List[TrackerWithCachedStates],
+    ) -> ContextManager[Optional[_ContradictionCheckPool]]:
+        if self.config["contradiction_check_processes"] <= 1:
+            return contextlib.nullcontext()
+
+        return _ContradictionCheckPool(
+            self,
+            domain,
+            [rule_trackers, all_trackers],
+            self.config["contradiction_check_processes"],
+        )
 
     def _analyze_rules(
         self,
@@ -714,13 +1316,21 @@ class RulePolicy(MemoizationPolicy):
         logger_level = logger.level
         logger.setLevel(logging.WARNING)
 
-        # we need to run prediction on rule trackers twice, because we need to collect
-        # the information about which rule snippets contributed to the learned rules
-        self._collect_rule_sources(rule_trackers, domain)
-        (
-            error_messages,
-            rules_used_in_stories,
-        ) = self._find_contradicting_and_used_in_stories_rules(all_trackers, domain)
+        cache = self._contradiction_check_cache(domain)
+        with self._contradiction_check_pool(
+            domain, rule_trackers, all_trackers
+        ) as pool:
+            # we need to run prediction on rule trackers twice, because we need to
+            # collect the information about which rule snippets contributed to the
+            # learned rules
+            self._collect_rule_sources(rule_trackers, domain, cache, pool)
+            (
+                error_messages,
+                rules_used_in_stories,
+            ) = self._find_contradicting_and_used_in_stories_rules(
+                all_trackers, domain, cache, pool
+            )
+        cache.persist()
 
         logger.setLevel(logger_level)  # reset logger level
         if error_messages:
@@ -910,18 +1520,17 @@ class RulePolicy(MemoizationPolicy):
             reversed_rule_states[turn_index], conversation_state
         )
 
-    def _get_possible_keys(
-        self, lookup: Dict[Text, Text], states: List[State]
-    ) -> Set[Text]:
-        possible_keys = set(lookup.keys())
-        for i, state in enumerate(reversed(states)):
-            # find rule keys that correspond to current state
-            possible_keys = set(
-                filter(
-                    lambda _key: self._is_rule_applicable(_key, i, state), possible_keys
-                )
-            )
-        return possible_keys
+    def _rule_index(self, lookup_name: Text) -> _RuleIndex:
+        lookup = self.lookup[lookup_name]
+        rule_index = self._rule_indices.get(lookup_name)
+        if rule_index is None or not rule_index.is_index_for(lookup):
+            # replaces the index of a previous lookup so that it can be released
+            rule_index = _RuleIndex(lookup)
+            self._rule_indices[lookup_name] = rule_index
+        return rule_index
+
+    def _get_possible_keys(self, lookup_name: Text, states: List[State]) -> Set[Text]:
+        return self._rule_index(lookup_name).possible_keys(states)
 
     @staticmethod
     def _find_action_from_default_actions(
@@ -1033,7 +1642,7 @@ class RulePolicy(MemoizationPolicy):
         # to skip the validation of slots for its first execution after an unhappy path.
         returning_from_unhappy_path = False
 
-        rule_keys = self._get_possible_keys(self.lookup[RULES], states)
+        rule_keys = self._get_possible_keys(RULES, states)
         predicted_action_name = None
         best_rule_key = ""
         if rule_keys:
@@ -1047,7 +1656,7 @@ class RulePolicy(MemoizationPolicy):
         if active_loop_name:
             # find rules for unhappy path of the loop
             loop_unhappy_keys = self._get_possible_keys(
-                self.lookup[RULES_FOR_LOOP_UNHAPPY_PATH], states
+                RULES_FOR_LOOP_UNHAPPY_PATH, states
             )
             # there could be several unhappy path conditions
             unhappy_path_conditions = [
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import inspect
 import copy
 import logging
@@ -5,7 +7,9 @@ import structlog
 import os
 from pathlib import Path
 import tarfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from types import LambdaType
 from typing import Any, Dict, List, Optional, Text, Tuple, Union
 
@@ -58,6 +62,7 @@ from rasa.shared.constants import (
 )
 from rasa.core.nlg import NaturalLanguageGenerator
 from rasa.core.lock_store import LockStore
+from rasa.core.nlu_batcher import NLUBatcher
 from rasa.utils.common import TempDirectoryPath, get_temp_dir_name
 import rasa.core.tracker_store
 import rasa.core.actions.action
@@ -80,6 +85,34 @@ logger = logging.getLogger(__name__)
 structlogger = structlog.get_logger()
 
 MAX_NUMBER_OF_PREDICTIONS = int(os.environ.get("MAX_NUMBER_OF_PREDICTIONS", "10"))
+# number of threads which run the model graph outside of the event loop,
+# `0` runs the graph directly in the event loop
+GRAPH_EXECUTOR_WORKERS = int(os.environ.get("GRAPH_EXECUTOR_WORKERS", "0"))
+# maximum number of graph runs which are executed at the same time, `0` means unbound
+MAX_CONCURRENT_INFERENCES = int(os.environ.get("MAX_CONCURRENT_INFERENCES", "0"))
+# maximum number of concurrently arriving messages which are parsed together,
+# `0` or `1` parse every message on its own
+NLU_BATCH_SIZE = int(os.environ.get("NLU_BATCH_SIZE", "0"))
+# maximum time a message waits for other messages to be parsed together with
+NLU_BATCH_WAIT_TIME_IN_MS = float(os.environ.get("NLU_BATCH_WAIT_TIME_IN_MS", "2"))
+
+_graph_executors: Dict[int, ThreadPoolExecutor] = {}
+_graph_executors_lock = threading.Lock()
+
+
+def _shared_graph_executor(workers: int) -> ThreadPoolExecutor:
+    """Returns the thread pool with `workers` threads which runs model graphs.
+
+    The pool is shared by all processors so that replacing the processor when a new
+    model is loaded doesn't leave threads behind, while runs of the previous model
+    which are still in progress can finish.
+    """
+    with _graph_executors_lock:
+        if workers not in _graph_executors:
+            _graph_executors[workers] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="rasa_graph"
+            )
+        return _graph_executors[workers]
 
 
 class MessageProcessor:
@@ -95,8 +128,33 @@ class MessageProcessor:
         max_number_of_predictions: int = MAX_NUMBER_OF_PREDICTIONS,
         on_circuit_break: Optional[LambdaType] = None,
         http_interpreter: Optional[RasaNLUHttpInterpreter] = None,
+        graph_executor_workers: int = GRAPH_EXECUTOR_WORKERS,
+        max_concurrent_inferences: int = MAX_CONCURRENT_INFERENCES,
+        nlu_batch_size: int = NLU_BATCH_SIZE,
+        nlu_batch_wait_time_in_ms: float = NLU_BATCH_WAIT_TIME_IN_MS,
     ) -> None:
-        """Initializes a `MessageProcessor`."""
+        """Initializes a `MessageProcessor`.
+
+        Args:
+            model_path: Path to the model or to a directory containing models.
+            tracker_store: Store which persists the conversation trackers.
+            lock_store: Store which locks conversations while they are processed.
+            generator: Generator for the bot responses.
+            action_endpoint: Endpoint of the action server.
+            max_number_of_predictions: Maximum number of actions predicted per turn.
+            on_circuit_break: Callback which is called if the action limit is reached.
+            http_interpreter: Interpreter which parses messages via HTTP.
+            graph_executor_workers: Number of threads which run the model graph so
+                that the event loop is not blocked during inference. If `0`, the
+                graph is run directly in the event loop.
+            max_concurrent_inferences: Maximum number of graph runs which are
+                executed at the same time. If `0`, the number is not bound.
+            nlu_batch_size: Maximum number of concurrently arriving messages which
+                are parsed together in one run of the NLU part of the graph. If `0`
+                or `1`, every message is parsed on its own.
+            nlu_batch_wait_time_in_ms: Maximum time a message waits for other
+                messages before its batch is parsed.
+        """
         self.nlg = generator
         self.tracker_store = tracker_store
         self.lock_store = lock_store
@@ -121,6 +179,27 @@ class MessageProcessor:
         self.domain = self.model_metadata.domain
         self.http_interpreter = http_interpreter
 
+        self._graph_executor: Optional[ThreadPoolExecutor] = None
+        if graph_executor_workers > 0:
+            self._graph_executor = _shared_graph_executor(graph_executor_workers)
+        self.max_concurrent_inferences = max_concurrent_inferences
+        # created lazily as it has to be bound to the running event loop
+        self._inference_semaphore: Optional[asyncio.Semaphore] = None
+
+        self._nlu_batcher: Optional[NLUBatcher] = None
+        if nlu_batch_size > 1 and not self._nlu_target_needs_tracker():
+            self._nlu_batcher = NLUBatcher(
+                self._parse_messages_with_graph,
+                max_batch_size=nlu_batch_size,
+                max_wait_time_in_seconds=nlu_batch_wait_time_in_ms / 1000,
+            )
+        elif nlu_batch_size > 1:
+            logger.warning(
+                "The NLU part of the model depends on the conversation tracker. "
+                "Messages of different conversations can't be parsed together and "
+                "will be parsed on their own instead."
+            )
+
     @staticmethod
     def _load_model(
         model_path: Union[Text, Path]
@@ -242,14 +321,14 @@ class MessageProcessor:
             The prediction for the next action. `None` if no domain or policies loaded.
         """
         tracker = await self.fetch_tracker_and_update_session(sender_id)
-        result = self.predict_next_with_tracker(tracker)
+        result = await self.predict_next_with_tracker(tracker)
 
         # save tracker state to continue conversation from this state
         await self.save_tracker(tracker)
 
         return result
 
-    def predict_next_with_tracker(
+    async def predict_next_with_tracker(
         self,
         tracker: DialogueStateTracker,
         verbosity: EventVerbosity = EventVerbosity.AFTER_RESTART,
@@ -270,7 +349,7 @@ class MessageProcessor:
             )
             return None
 
-        prediction = self._predict_next_with_tracker(tracker)
+        prediction = await self._predict_next_with_tracker(tracker)
 
         scores = [
             {"action": a, "score": p}
@@ -507,7 +586,7 @@ class MessageProcessor:
 
         return tracker
 
-    def predict_next_with_tracker_if_should(
+    async def predict_next_with_tracker_if_should(
         self, tracker: DialogueStateTracker
     ) -> Tuple[rasa.core.actions.action.Action, PolicyPrediction]:
         """Predicts the next action the bot should take after seeing x.
@@ -530,7 +609,7 @@ class MessageProcessor:
                 "The limit of actions to predict has been reached."
             )
 
-        prediction = self._predict_next_with_tracker(tracker)
+        prediction = await self._predict_next_with_tracker(tracker)
 
         action = rasa.core.actions.action.action_for_index(
             prediction.max_confidence_index, self.domain, self.action_endpoint
@@ -725,7 +804,7 @@ class MessageProcessor:
             )
             # Intent is not explicitly present. Pass message to graph.
             if msg.data.get(INTENT) is None:
-                parse_data = self._parse_message_with_graph(
+                parse_data = await self._parse_message_with_graph(
                     message, tracker, only_output_properties
                 )
             else:
@@ -749,7 +828,7 @@ class MessageProcessor:
 
         return parse_data
 
-    def _parse_message_with_graph(
+    async def _parse_message_with_graph(
         self,
         message: UserMessage,
         tracker: Optional[DialogueStateTracker] = None,
@@ -766,12 +845,15 @@ class MessageProcessor:
         Returns:
             Parsed data extracted from the message.
         """
-        results = self.graph_runner.run(
-            inputs={PLACEHOLDER_MESSAGE: [message], PLACEHOLDER_TRACKER: tracker},
-            targets=[self.model_metadata.nlu_target],
-        )
-        parsed_messages = results[self.model_metadata.nlu_target]
-        parsed_message = parsed_messages[0]
+        if self._nlu_batcher is not None:
+            parsed_message = await self._nlu_batcher.parse(message)
+        else:
+            results = await self._run_graph(
+                inputs={PLACEHOLDER_MESSAGE: [message], PLACEHOLDER_TRACKER: tracker},
+                targets=[self.model_metadata.nlu_target],
+            )
+            parsed_message = results[self.model_metadata.nlu_target][0]
+
         parse_data = {
             TEXT: "",
             INTENT: {INTENT_NAME_KEY: None, PREDICTED_CONFIDENCE_KEY: 0.0},
@@ -782,6 +864,34 @@ class MessageProcessor:
         )
         return parse_data
 
+    async def _parse_messages_with_graph(
+        self, messages: List[UserMessage]
+    ) -> List[Message]:
+        """Runs the NLU part of the graph for a batch of messages.
+
+        Only used if the NLU part of the graph doesn't depend on the tracker.
+
+        Args:
+            messages: Messages to parse.
+
+        Returns:
+            The parsed messages in the order of `messages`.
+        """
+        results = await self._run_graph(
+            inputs={PLACEHOLDER_MESSAGE: messages, PLACEHOLDER_TRACKER: None},
+            targets=[self.model_metadata.nlu_target],
+        )
+        return results[self.model_metadata.nlu_target]
+
+    def _nlu_target_needs_tracker(self) -> bool:
+        nlu_schema = self.model_metadata.predict_schema.minimal_graph_schema(
+            [self.model_metadata.nlu_target]
+        )
+        return any(
+            PLACEHOLDER_TRACKER in node.needs.values()
+            for node in nlu_schema.nodes.values()
+        )
+
     async def _handle_message_with_tracker(
         self, message: UserMessage, tracker: DialogueStateTracker
     ) -> None:
@@ -858,7 +968,9 @@ class MessageProcessor:
         while should_predict_another_action and self._should_handle_message(tracker):
             # this actually just calls the policy's method by the same name
             try:
-                action, prediction = self.predict_next_with_tracker_if_should(tracker)
+                action, prediction = await self.predict_next_with_tracker_if_should(
+                    tracker
+                )
             except ActionLimitReached:
                 logger.warning(
                     "Circuit breaker tripped. Stopped predicting "
@@ -1100,7 +1212,7 @@ class MessageProcessor:
         """
         await self.tracker_store.save(tracker)
 
-    def _predict_next_with_tracker(
+    async def _predict_next_with_tracker(
         self, tracker: DialogueStateTracker
     ) -> PolicyPrediction:
         """Collect predictions from ensemble and return action and predictions."""
@@ -1123,8 +1235,43 @@ class MessageProcessor:
         if not target:
             raise ValueError("Cannot predict next action if there is no core target.")
 
-        results = self.graph_runner.run(
+        results = await self._run_graph(
             inputs={PLACEHOLDER_TRACKER: tracker}, targets=[target]
         )
         policy_prediction = results[target]
         return policy_prediction
+
+    async def _run_graph(
+        self, inputs: Dict[Text, Any], targets: List[Text]
+    ) -> Dict[Text, Any]:
+        """Runs the model graph without blocking the event loop if configured to.
+
+        Args:
+            inputs: Input nodes which are added to the graph.
+            targets: Nodes whose output is needed.
+
+        Returns:
+            A mapping of target node name to output value.
+        """
+        if not self.max_concurrent_inferences:
+            return await self._run_graph_in_executor(inputs, targets)
+
+        if self._inference_semaphore is None:
+            self._inference_semaphore = asyncio.Semaphore(
+                self.max_concurrent_inferences
+            )
+
+        async with self._inference_semaphore:
+            return await self._run_graph_in_executor(inputs, targets)
+
+    async def _run_graph_in_executor(
+        self, inputs: Dict[Text, Any], targets: List[Text]
+    ) -> Dict[Text, Any]:
+        if self._graph_executor is None:
+            return self.graph_runner.run(inputs=inputs, targets=targets)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._graph_executor,
+            functools.partial(self.graph_runner.run, inputs=inputs, targets=targets),
+        )
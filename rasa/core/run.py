@@ -276,10 +276,16 @@ async def close_resources(app: Sanic, _: AbstractEventLoop) -> None:
         logger.debug("No agent found when shutting down server.")
         return
 
+    # the tracker store might still stream events when writing pending changes
+    await current_agent.tracker_store.close()
+
     event_broker = current_agent.tracker_store.event_broker
     if event_broker:
         await event_broker.close()
 
+    if current_agent.nlg:
+        await current_agent.nlg.close()
+
     action_endpoint = current_agent.action_endpoint
     if action_endpoint:
         await action_endpoint.session.close()
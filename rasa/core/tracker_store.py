@@ -1,4 +1,5 @@
 from __future__ import annotations
+import abc
 import contextlib
 import itertools
 import json
@@ -16,6 +17,7 @@ from typing import (
     List,
     Optional,
     Text,
+    Tuple,
     Union,
     TYPE_CHECKING,
     Generator,
@@ -31,7 +33,7 @@ import rasa.shared.utils.cli
 import rasa.shared.utils.common
 import rasa.shared.utils.io
 from rasa.plugin import plugin_manager
-from rasa.shared.core.constants import ACTION_LISTEN_NAME
+from rasa.shared.core.constants import ACTION_LISTEN_NAME, ACTION_SESSION_START_NAME
 from rasa.core.brokers.broker import EventBroker
 from rasa.core.constants import (
     POSTGRESQL_SCHEMA,
@@ -40,7 +42,7 @@ from rasa.core.constants import (
 )
 from rasa.shared.core.conversation import Dialogue
 from rasa.shared.core.domain import Domain
-from rasa.shared.core.events import SessionStarted, Event
+from rasa.shared.core.events import SessionStarted, Event, deserialise_events
 from rasa.shared.core.trackers import (
     ActionExecuted,
     DialogueStateTracker,
@@ -59,6 +61,7 @@ if TYPE_CHECKING:
     from sqlalchemy.engine.base import Engine
     from sqlalchemy.orm import Session, Query
     from sqlalchemy import Sequence
+    from redis.client import Pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +131,244 @@ class SerializedTrackerAsDict(SerializedTrackerRepresentation[Dict]):
         return d
 
 
+# endpoint config key to select the format in which trackers are serialised
+TRACKER_SERIALISER_KEY = "serialiser"
+JSON_TRACKER_SERIALISER = "json"
+MSGPACK_TRACKER_SERIALISER = "msgpack"
+
+# prefix of trackers serialised with `MsgpackTrackerSerialiser`, followed by the
+# format version; serialised json always starts with `{`
+MSGPACK_TRACKER_PREFIX = b"\x00RT"
+MSGPACK_TRACKER_FORMAT_VERSION = 1
+
+# string fields of serialised events which are stored in the string table of
+# `MsgpackTrackerSerialiser` together with the event types
+MSGPACK_INTERNED_EVENT_FIELDS: List[Tuple[Text, ...]] = [
+    ("name",),
+    ("policy",),
+    ("parse_data", "intent", INTENT_NAME_KEY),
+]
+
+
+class TrackerSerialiser(abc.ABC):
+    """Serialises trackers to the format in which tracker stores persist them."""
+
+    # whether serialised trackers are `bytes` instead of `str`
+    is_binary = False
+
+    @abc.abstractmethod
+    def serialise(self, tracker: DialogueStateTracker) -> Union[Text, bytes]:
+        """Serialises the events of a tracker.
+
+        Args:
+            tracker: The tracker to serialise.
+
+        Returns:
+            The serialised tracker.
+        """
+
+        ...
+
+    @abc.abstractmethod
+    def serialise_event(self, event: Event) -> Union[Text, bytes]:
+        """Serialises a single event.
+
+        Args:
+            event: The event to serialise.
+
+        Returns:
+            The serialised event.
+        """
+
+        ...
+
+
+class JsonTrackerSerialiser(TrackerSerialiser):
+    """Serialises trackers as JSON text."""
+
+    def serialise(self, tracker: DialogueStateTracker) -> Text:
+        """Serialises the events of a tracker as JSON."""
+        return SerializedTrackerAsText.serialise_tracker(tracker)
+
+    def serialise_event(self, event: Event) -> Text:
+        """Serialises a single event as JSON."""
+        return json.dumps(event.as_dict())
+
+
+class MsgpackTrackerSerialiser(TrackerSerialiser):
+    """Serialises trackers in a compact, versioned msgpack format.
+
+    Event types and the names of actions, slots, policies and intents are stored
+    once in a string table and referenced by their index from the events.
+    """
+
+    is_binary = True
+
+    def serialise(self, tracker: DialogueStateTracker) -> bytes:
+        """Serialises the events of a tracker with msgpack."""
+        import msgpack
+
+        dialogue = tracker.as_dialogue()
+        strings: Dict[Text, int] = {}
+        events = []
+        for event in dialogue.events:
+            serialised_event = event.as_dict()
+            event_type = strings.setdefault(serialised_event.pop("event"), len(strings))
+            interned_fields = []
+            for path in MSGPACK_INTERNED_EVENT_FIELDS:
+                serialised_event, value = _pop_string_field(serialised_event, path)
+                interned_fields.append(
+                    None if value is None else strings.setdefault(value, len(strings))
+                )
+            events.append([event_type, interned_fields, serialised_event])
+
+        return (
+            MSGPACK_TRACKER_PREFIX
+            + bytes([MSGPACK_TRACKER_FORMAT_VERSION])
+            + msgpack.packb([dialogue.name, list(strings), events])
+        )
+
+    def serialise_event(self, event: Event) -> bytes:
+        """Serialises a single event with msgpack."""
+        import msgpack
+
+        return msgpack.packb(event.as_dict())
+
+    @staticmethod
+    def deserialise(serialised_tracker: bytes) -> Dialogue:
+        """Deserialises a tracker which was serialised with `serialise`.
+
+        Args:
+            serialised_tracker: The serialised tracker.
+
+        Returns:
+            The dialogue containing the events of the tracker.
+
+        Raises:
+            TrackerDeserialisationException: If the tracker was serialised with an
+                unknown version of the format.
+        """
+        import msgpack
+
+        version = serialised_tracker[len(MSGPACK_TRACKER_PREFIX)]
+        if version != MSGPACK_TRACKER_FORMAT_VERSION:
+            raise TrackerDeserialisationException(
+                f"Tracker cannot be deserialised. It was serialised with version "
+                f"{version} of the msgpack tracker format, which is not supported "
+                f"by this version of Rasa."
+            )
+
+        name, strings, events = msgpack.unpackb(
+            serialised_tracker[len(MSGPACK_TRACKER_PREFIX) + 1 :],
+            strict_map_key=False,
+        )
+        serialised_events = []
+        for event_type, interned_fields, serialised_event in events:
+            serialised_event["event"] = strings[event_type]
+            for path, index in zip(MSGPACK_INTERNED_EVENT_FIELDS, interned_fields):
+                if index is not None:
+                    _set_field(serialised_event, path, strings[index])
+            serialised_events.append(serialised_event)
+
+        return Dialogue.from_parameters({"name": name, "events": serialised_events})
+
+
+def _pop_string_field(
+    data: Dict[Text, Any], path: Tuple[Text, ...]
+) -> Tuple[Dict[Text, Any], Optional[Text]]:
+    """Removes a string value from nested dictionaries without modifying them.
+
+    Returns:
+        The dictionary without the value (copied along the path if the value was
+        removed) and the removed value or `None` if there is no string at `path`.
+    """
+    key, *rest = path
+    value = data.get(key)
+    if not rest:
+        if not isinstance(value, str):
+            return data, None
+        data = dict(data)
+        del data[key]
+        return data, value
+
+    if not isinstance(value, dict):
+        return data, None
+    child, removed = _pop_string_field(value, tuple(rest))
+    if removed is None:
+        return data, None
+    data = dict(data)
+    data[key] = child
+    return data, removed
+
+
+def _set_field(data: Dict[Text, Any], path: Tuple[Text, ...], value: Any) -> None:
+    *parents, key = path
+    for parent in parents:
+        data = data[parent]
+    data[key] = value
+
+
+def create_tracker_serialiser(name: Optional[Text] = None) -> TrackerSerialiser:
+    """Creates the tracker serialiser which is configured for a tracker store.
+
+    Args:
+        name: Name of the serialiser, either `json` (default) or `msgpack`.
+
+    Returns:
+        The tracker serialiser.
+    """
+    if name is None or name.lower() == JSON_TRACKER_SERIALISER:
+        return JsonTrackerSerialiser()
+    if name.lower() == MSGPACK_TRACKER_SERIALISER:
+        return MsgpackTrackerSerialiser()
+
+    raise RasaException(
+        f"Unknown tracker serialiser '{name}'. Please use one of "
+        f"'{JSON_TRACKER_SERIALISER}' or '{MSGPACK_TRACKER_SERIALISER}'."
+    )
+
+
+def deserialise_dialogue(serialised_tracker: Union[Text, bytes]) -> Dialogue:
+    """Deserialises a tracker independent of the serialiser which was used.
+
+    Args:
+        serialised_tracker: A tracker serialised by any `TrackerSerialiser`.
+
+    Returns:
+        The dialogue containing the events of the tracker.
+    """
+    if isinstance(serialised_tracker, bytes) and serialised_tracker.startswith(
+        MSGPACK_TRACKER_PREFIX
+    ):
+        return MsgpackTrackerSerialiser.deserialise(serialised_tracker)
+
+    return Dialogue.from_parameters(json.loads(serialised_tracker))
+
+
+def deserialise_stored_events(
+    serialised_events: List[Union[Text, bytes]]
+) -> List[Event]:
+    """Deserialises events which were serialised with `serialise_event`.
+
+    Args:
+        serialised_events: Events serialised by any `TrackerSerialiser`.
+
+    Returns:
+        The deserialised events.
+    """
+    event_dicts = []
+    for serialised_event in serialised_events:
+        # a msgpack map never starts with the byte of `{`
+        if isinstance(serialised_event, str) or serialised_event.startswith(b"{"):
+            event_dicts.append(json.loads(serialised_event))
+        else:
+            import msgpack
+
+            event_dicts.append(msgpack.unpackb(serialised_event, strict_map_key=False))
+
+    return deserialise_events(event_dicts)
+
+
 class TrackerStore:
     """Represents common behavior and interface for all `TrackerStore`s."""
 
@@ -143,11 +384,15 @@ class TrackerStore:
             domain: The `Domain` to initialize the `DialogueStateTracker`.
             event_broker: An event broker to publish any new events to another
                 destination.
-            kwargs: Additional kwargs.
+            kwargs: Additional kwargs. `serialiser` selects the format in which
+                trackers are serialised (`json` or `msgpack`).
         """
         self._domain = domain or Domain.empty()
         self.event_broker = event_broker
         self.max_event_history: Optional[int] = None
+        self.tracker_serialiser = create_tracker_serialiser(
+            kwargs.get(TRACKER_SERIALISER_KEY)  # type: ignore[arg-type]
+        )
 
     @staticmethod
     def create(
@@ -347,7 +592,7 @@ class TrackerStore:
         tracker = self.init_tracker(sender_id)
 
         try:
-            dialogue = Dialogue.from_parameters(json.loads(serialised_tracker))
+            dialogue = deserialise_dialogue(serialised_tracker)
         except UnicodeDecodeError as e:
             raise TrackerDeserialisationException(
                 "Tracker cannot be deserialised. "
@@ -368,6 +613,10 @@ class TrackerStore:
     def domain(self, domain: Optional[Domain]) -> None:
         self._domain = domain or Domain.empty()
 
+    async def close(self) -> None:
+        """Writes pending changes and closes the connections of the tracker store."""
+        pass
+
 
 class InMemoryTrackerStore(TrackerStore, SerializedTrackerAsText):
     """Stores conversation history in memory."""
@@ -379,13 +628,13 @@ class InMemoryTrackerStore(TrackerStore, SerializedTrackerAsText):
         **kwargs: Dict[Text, Any],
     ) -> None:
         """Initializes the tracker store."""
-        self.store: Dict[Text, Text] = {}
+        self.store: Dict[Text, Union[Text, bytes]] = {}
         super().__init__(domain, event_broker, **kwargs)
 
     async def save(self, tracker: DialogueStateTracker) -> None:
         """Updates and saves the current conversation state."""
         await self.stream_events(tracker)
-        serialised = InMemoryTrackerStore.serialise_tracker(tracker)
+        serialised = self.tracker_serialiser.serialise(tracker)
         self.store[tracker.sender_id] = serialised
 
     async def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
@@ -459,11 +708,20 @@ class RedisTrackerStore(TrackerStore, SerializedTrackerAsText):
         ssl_keyfile: Optional[Text] = None,
         ssl_certfile: Optional[Text] = None,
         ssl_ca_certs: Optional[Text] = None,
+        append_only_events: bool = False,
         **kwargs: Dict[Text, Any],
     ) -> None:
-        """Initializes the tracker store."""
+        """Initializes the tracker store.
+
+        With `append_only_events` the events of a conversation are stored in a Redis
+        list to which only the new events of a tracker are appended on save. A hash
+        under the tracker key keeps the position of the latest session start, so
+        that only the events of the latest session are fetched on retrieve.
+        """
         import redis
 
+        super().__init__(domain, event_broker, **kwargs)
+
         self.red = redis.StrictRedis(
             host=host,
             port=port,
@@ -474,17 +732,17 @@ class RedisTrackerStore(TrackerStore, SerializedTrackerAsText):
             ssl_keyfile=ssl_keyfile,
             ssl_certfile=ssl_certfile,
             ssl_ca_certs=ssl_ca_certs,
-            decode_responses=True,
+            # binary trackers can't be decoded, keys are decoded in `keys`
+            decode_responses=not self.tracker_serialiser.is_binary,
         )
         self.record_exp = record_exp
+        self.append_only_events = append_only_events
 
         self.key_prefix = DEFAULT_REDIS_TRACKER_STORE_KEY_PREFIX
         if key_prefix:
             logger.debug(f"Setting non-default redis key prefix: '{key_prefix}'.")
             self._set_key_prefix(key_prefix)
 
-        super().__init__(domain, event_broker, **kwargs)
-
     def _set_key_prefix(self, key_prefix: Text) -> None:
         if isinstance(key_prefix, str) and key_prefix.isalnum():
             self.key_prefix = key_prefix + ":" + DEFAULT_REDIS_TRACKER_STORE_KEY_PREFIX
@@ -501,11 +759,16 @@ class RedisTrackerStore(TrackerStore, SerializedTrackerAsText):
         self, tracker: DialogueStateTracker, timeout: Optional[float] = None
     ) -> None:
         """Saves the current conversation state."""
-        await self.stream_events(tracker)
+        if not self.append_only_events:
+            await self.stream_events(tracker)
 
         if not timeout and self.record_exp:
             timeout = self.record_exp
 
+        if self.append_only_events:
+            await self._append_new_events(tracker, timeout)
+            return
+
         stored = self.red.get(self.key_prefix + tracker.sender_id)
 
         if stored is not None:
@@ -513,7 +776,7 @@ class RedisTrackerStore(TrackerStore, SerializedTrackerAsText):
 
             tracker = self._merge_trackers(prior_tracker, tracker)
 
-        serialised_tracker = self.serialise_tracker(tracker)
+        serialised_tracker = self.tracker_serialiser.serialise(tracker)
         self.red.set(
             self.key_prefix + tracker.sender_id, serialised_tracker, ex=timeout
         )
@@ -555,6 +818,13 @@ class RedisTrackerStore(TrackerStore, SerializedTrackerAsText):
             sender_id: Conversation ID to fetch the tracker for.
             fetch_all_sessions: Whether to fetch all sessions or only the last one.
         """
+        if self.append_only_events:
+            metadata = self._event_list_metadata(sender_id)
+            if metadata is not None:
+                return self._retrieve_from_event_list(
+                    sender_id, metadata, fetch_all_sessions
+                )
+
         stored = self.red.get(self.key_prefix + sender_id)
         if stored is None:
             logger.debug(f"Could not find tracker for conversation ID '{sender_id}'.")
@@ -576,7 +846,198 @@ class RedisTrackerStore(TrackerStore, SerializedTrackerAsText):
 
     async def keys(self) -> Iterable[Text]:
         """Returns keys of the Redis Tracker Store."""
-        return self.red.keys(self.key_prefix + "*")
+        keys = self.red.keys(self.key_prefix + "*")
+        if self.tracker_serialiser.is_binary:
+            return [key.decode() for key in keys]
+        return keys
+
+    def _events_key(self, sender_id: Text) -> Text:
+        # must not match the pattern of `keys`
+        return self.key_prefix[:-1] + "_events:" + sender_id
+
+    def _event_list_metadata(self, sender_id: Text) -> Optional[Dict[Text, Text]]:
+        """Returns the metadata of the event list of a conversation.
+
+        Returns:
+            The metadata, which is empty if the conversation is not stored, or
+            `None` if the conversation is stored as a single serialised tracker.
+        """
+        import redis
+
+        try:
+            metadata = self.red.hgetall(self.key_prefix + sender_id)
+        except redis.exceptions.ResponseError:
+            # the key holds a string instead of a hash
+            return None
+        return {
+            (key.decode() if isinstance(key, bytes) else key): (
+                value.decode() if isinstance(value, bytes) else value
+            )
+            for key, value in metadata.items()
+        }
+
+    def _retrieve_from_event_list(
+        self, sender_id: Text, metadata: Dict[Text, Text], fetch_all_sessions: bool
+    ) -> Optional[DialogueStateTracker]:
+        if not metadata:
+            logger.debug(f"Could not find tracker for conversation ID '{sender_id}'.")
+            return None
+
+        start = 0 if fetch_all_sessions else int(metadata["session_start"])
+        events = deserialise_stored_events(
+            self.red.lrange(self._events_key(sender_id), start, -1)
+        )
+
+        tracker = self.init_tracker(sender_id)
+        tracker.recreate_from_dialogue(Dialogue(sender_id, events))
+        return tracker
+
+    async def _append_new_events(
+        self, tracker: DialogueStateTracker, timeout: Optional[float]
+    ) -> None:
+        sender_id = tracker.sender_id
+        metadata = self._event_list_metadata(sender_id)
+        if metadata is None:
+            metadata = self._migrate_to_event_list(sender_id, timeout)
+
+        new_events = self._events_not_in_event_list(tracker, metadata)
+        if not new_events:
+            return
+
+        if self.event_broker:
+            await self._stream_new_events(self.event_broker, new_events, sender_id)
+
+        self._write_to_event_list(sender_id, new_events, metadata, timeout)
+
+    @staticmethod
+    def _events_not_in_event_list(
+        tracker: DialogueStateTracker, metadata: Dict[Text, Text]
+    ) -> List[Event]:
+        events = list(tracker.events)
+        if not metadata:
+            return events
+
+        # new events follow the last stored event
+        last_timestamp = float(metadata["last_event_timestamp"])
+        for index in range(len(events) - 1, -1, -1):
+            if (
+                events[index].timestamp == last_timestamp
+                and events[index].type_name == metadata["last_event_type"]
+            ):
+                return events[index + 1 :]
+
+        # the tracker doesn't contain the last stored event, which happens if it was
+        # restored from other events; assume it continues the latest session
+        number_of_events_since_last_session = int(metadata["event_count"]) - int(
+            metadata["session_start"]
+        )
+        return events[number_of_events_since_last_session:]
+
+    def _write_to_event_list(
+        self,
+        sender_id: Text,
+        new_events: List[Event],
+        metadata: Dict[Text, Text],
+        timeout: Optional[float],
+    ) -> None:
+        pipeline = self.red.pipeline()
+        self._queue_event_list_write(pipeline, sender_id, new_events, metadata, timeout)
+        pipeline.execute()
+
+    def _queue_event_list_write(
+        self,
+        pipeline: "Pipeline",
+        sender_id: Text,
+        new_events: List[Event],
+        metadata: Dict[Text, Text],
+        timeout: Optional[float],
+    ) -> None:
+        """Adds the commands which append `new_events` to the event list to a pipeline.
+
+        Args:
+            pipeline: Pipeline which executes the commands in a transaction.
+            sender_id: Conversation ID of the events.
+            new_events: Events which are not stored yet.
+            metadata: Current metadata of the event list.
+            timeout: Expiry of the conversation in seconds.
+        """
+        event_count = int(metadata.get("event_count", 0))
+        session_start = int(metadata.get("session_start", 0))
+        for index, event in enumerate(new_events):
+            if (
+                isinstance(event, ActionExecuted)
+                and event.action_name == ACTION_SESSION_START_NAME
+            ):
+                session_start = event_count + index
+
+        key = self.key_prefix + sender_id
+        events_key = self._events_key(sender_id)
+        pipeline.rpush(
+            events_key,
+            *[self.tracker_serialiser.serialise_event(event) for event in new_events],
+        )
+        pipeline.hset(
+            key,
+            mapping={
+                "event_count": event_count + len(new_events),
+                "session_start": session_start,
+                "last_event_timestamp": repr(new_events[-1].timestamp),
+                "last_event_type": new_events[-1].type_name,
+            },
+        )
+        if timeout:
+            pipeline.expire(key, int(timeout))
+            pipeline.expire(events_key, int(timeout))
+
+    def _migrate_to_event_list(
+        self, sender_id: Text, timeout: Optional[float]
+    ) -> Dict[Text, Text]:
+        """Moves the events of a single serialised tracker to an event list.
+
+        The serialised tracker is replaced by the event list in a single
+        transaction, so it is kept if anything fails before the event list is
+        written.
+
+        Args:
+            sender_id: Conversation ID of the tracker.
+            timeout: Expiry of the conversation in seconds.
+
+        Returns:
+            The metadata of the event list.
+        """
+        import redis
+
+        key = self.key_prefix + sender_id
+        with self.red.pipeline() as pipeline:
+            while True:
+                try:
+                    # retry if the tracker is changed before the transaction is done
+                    pipeline.watch(key)
+                    stored = pipeline.get(key)
+                    if stored is None:
+                        return {}
+
+                    logger.debug(
+                        f"Storing the events of conversation '{sender_id}' in a list."
+                    )
+                    prior_tracker = self.deserialise_tracker(sender_id, stored)
+
+                    pipeline.multi()
+                    pipeline.delete(key, self._events_key(sender_id))
+                    if prior_tracker is not None and prior_tracker.events:
+                        self._queue_event_list_write(
+                            pipeline,
+                            sender_id,
+                            list(prior_tracker.events),
+                            {},
+                            timeout,
+                        )
+                    pipeline.execute()
+                    break
+                except redis.WatchError:
+                    continue
+
+        return self._event_list_metadata(sender_id) or {}
 
     @staticmethod
     def _merge_trackers(
@@ -759,6 +1220,14 @@ class DynamoTrackerStore(TrackerStore, SerializedTrackerAsDict):
         return sender_ids
 
 
+# fields of the conversation documents in which the `MongoTrackerStore` keeps the
+# number of events and the index of the latest `SessionStarted` event
+MONGO_EVENT_COUNT_KEY = "event_count"
+MONGO_SESSION_START_INDEX_KEY = "session_start_index"
+# `$slice` requires a limit, this one is large enough for any session
+MONGO_MAX_SLICE_LENGTH = 2**31 - 1
+
+
 class MongoTrackerStore(TrackerStore, SerializedTrackerAsText):
     """Stores conversation history in Mongo.
 
@@ -818,12 +1287,25 @@ class MongoTrackerStore(TrackerStore, SerializedTrackerAsText):
         """Saves the current conversation state."""
         await self.stream_events(tracker)
 
-        additional_events = self._additional_events(tracker)
+        event_count, session_start_index = self._session_index(tracker.sender_id)
+        additional_events = list(
+            self._events_after_stored_session(
+                tracker, event_count - session_start_index
+            )
+        )
+
+        for index, event in enumerate(additional_events):
+            if isinstance(event, SessionStarted):
+                session_start_index = event_count + index
 
         self.conversations.update_one(
             {"sender_id": tracker.sender_id},
             {
-                "$set": self._current_tracker_state_without_events(tracker),
+                "$set": {
+                    **self._current_tracker_state_without_events(tracker),
+                    MONGO_EVENT_COUNT_KEY: event_count + len(additional_events),
+                    MONGO_SESSION_START_INDEX_KEY: session_start_index,
+                },
                 "$push": {
                     "events": {"$each": [e.as_dict() for e in additional_events]}
                 },
@@ -841,17 +1323,50 @@ class MongoTrackerStore(TrackerStore, SerializedTrackerAsText):
             List of serialised events that aren't currently stored.
 
         """
-        stored = self.conversations.find_one({"sender_id": tracker.sender_id}) or {}
-        all_events = self._events_from_serialized_tracker(stored)
+        event_count, session_start_index = self._session_index(tracker.sender_id)
 
-        number_events_since_last_session = len(
-            self._events_since_last_session_start(all_events)
+        return self._events_after_stored_session(
+            tracker, event_count - session_start_index
         )
 
+    @staticmethod
+    def _events_after_stored_session(
+        tracker: DialogueStateTracker, number_events_since_last_session: int
+    ) -> Iterator:
         return itertools.islice(
             tracker.events, number_events_since_last_session, len(tracker.events)
         )
 
+    def _session_index(self, sender_id: Text) -> Tuple[int, int]:
+        """Returns the number of stored events and the index of the latest session.
+
+        Conversations stored before the session index was persisted are indexed
+        from their events.
+
+        Args:
+            sender_id: The conversation ID.
+
+        Returns:
+            The number of stored events and the index of the latest `SessionStarted`
+            event (`0` if there is none).
+        """
+        stored = (
+            self.conversations.find_one(
+                {"sender_id": sender_id},
+                {MONGO_EVENT_COUNT_KEY: 1, MONGO_SESSION_START_INDEX_KEY: 1},
+            )
+            or {}
+        )
+        if MONGO_SESSION_START_INDEX_KEY in stored:
+            return stored[MONGO_EVENT_COUNT_KEY], stored[MONGO_SESSION_START_INDEX_KEY]
+
+        stored = self.conversations.find_one({"sender_id": sender_id}) or {}
+        all_events = self._events_from_serialized_tracker(stored)
+        number_events_since_last_session = len(
+            self._events_since_last_session_start(all_events)
+        )
+        return len(all_events), len(all_events) - number_events_since_last_session
+
     @staticmethod
     def _events_from_serialized_tracker(serialised: Dict) -> List[Dict]:
         return serialised.get("events", [])
@@ -879,6 +1394,25 @@ class MongoTrackerStore(TrackerStore, SerializedTrackerAsText):
     async def _retrieve(
         self, sender_id: Text, fetch_events_from_all_sessions: bool
     ) -> Optional[List[Dict[Text, Any]]]:
+        if not fetch_events_from_all_sessions:
+            # only load the events of the latest session from the database
+            stored = self.conversations.find_one(
+                {"sender_id": sender_id}, {MONGO_SESSION_START_INDEX_KEY: 1}
+            )
+            if stored and MONGO_SESSION_START_INDEX_KEY in stored:
+                stored = self.conversations.find_one(
+                    {"sender_id": sender_id},
+                    {
+                        "events": {
+                            "$slice": [
+                                stored[MONGO_SESSION_START_INDEX_KEY],
+                                MONGO_MAX_SLICE_LENGTH,
+                            ]
+                        }
+                    },
+                )
+                return self._events_from_serialized_tracker(stored or {})
+
         stored = self.conversations.find_one({"sender_id": sender_id})
 
         # look for conversations which have used an `int` sender_id in the past
@@ -1058,6 +1592,21 @@ class SQLTrackerStore(TrackerStore, SerializedTrackerAsText):
         action_name = sa.Column(sa.String(255))
         data = sa.Column(sa.Text)
 
+        __table_args__ = (
+            sa.Index("ix_events_sender_id_timestamp", "sender_id", "timestamp"),
+        )
+
+    class SQLSessionIndex(Base):
+        """Latest conversation session of a conversation in the SQL Tracker Store."""
+
+        __tablename__ = "session_index"
+
+        sender_id = sa.Column(sa.String(255), primary_key=True)
+        # timestamp of the latest `SessionStarted` event, `None` if there is none
+        session_start = sa.Column(sa.Float)
+        # number of events since (and including) the latest `SessionStarted` event
+        number_of_events = sa.Column(sa.Integer, nullable=False)
+
     def __init__(
         self,
         domain: Optional[Domain] = None,
@@ -1094,6 +1643,9 @@ class SQLTrackerStore(TrackerStore, SerializedTrackerAsText):
 
                 try:
                     self.Base.metadata.create_all(self.engine)
+                    # `create_all` doesn't add indices to existing tables
+                    for index in self.SQLEvent.__table__.indexes:
+                        index.create(self.engine, checkfirst=True)
                 except (
                     sqlalchemy.exc.OperationalError,
                     sqlalchemy.exc.ProgrammingError,
@@ -1263,12 +1815,21 @@ class SQLTrackerStore(TrackerStore, SerializedTrackerAsText):
         self, sender_id: Text, fetch_events_from_all_sessions: bool
     ) -> Optional[DialogueStateTracker]:
         with self.session_scope() as session:
-
-            serialised_events = self._event_query(
-                session,
-                sender_id,
-                fetch_events_from_all_sessions=fetch_events_from_all_sessions,
-            ).all()
+            session_index = (
+                None
+                if fetch_events_from_all_sessions
+                else session.get(self.SQLSessionIndex, sender_id)
+            )
+            if session_index is not None:
+                serialised_events = self._session_event_query(
+                    session, sender_id, session_index.session_start
+                ).all()
+            else:
+                serialised_events = self._event_query(
+                    session,
+                    sender_id,
+                    fetch_events_from_all_sessions=fetch_events_from_all_sessions,
+                ).all()
 
             events = [json.loads(event.data) for event in serialised_events]
 
@@ -1325,13 +1886,43 @@ class SQLTrackerStore(TrackerStore, SerializedTrackerAsText):
 
         return event_query.order_by(self.SQLEvent.timestamp)
 
+    def _session_event_query(
+        self, session: "Session", sender_id: Text, session_start: Optional[float]
+    ) -> "Query":
+        """Provide the query to retrieve the events of the latest session.
+
+        Args:
+            session: Current database session.
+            sender_id: Sender id whose conversation events should be retrieved.
+            session_start: Timestamp of the latest `SessionStarted` event taken from
+                the session index.
+
+        Returns:
+            Query to get the conversation events.
+        """
+        event_query = session.query(self.SQLEvent).filter(
+            self.SQLEvent.sender_id == sender_id
+        )
+        if session_start is not None:
+            event_query = event_query.filter(self.SQLEvent.timestamp >= session_start)
+
+        return event_query.order_by(self.SQLEvent.timestamp)
+
     async def save(self, tracker: DialogueStateTracker) -> None:
         """Update database with events from the current conversation."""
         await self.stream_events(tracker)
 
         with self.session_scope() as session:
+            session_index = self._get_or_create_session_index(
+                session, tracker.sender_id
+            )
             # only store recent events
-            events = self._additional_events(session, tracker)
+            events = list(
+                itertools.islice(
+                    tracker.events, session_index.number_of_events, len(tracker.events)
+                )
+            )
+            self._update_session_index(session_index, events)
 
             for event in events:
                 data = event.as_dict()
@@ -1360,14 +1951,55 @@ class SQLTrackerStore(TrackerStore, SerializedTrackerAsText):
         self, session: "Session", tracker: DialogueStateTracker
     ) -> Iterator:
         """Return events from the tracker which aren't currently stored."""
-        number_of_events_since_last_session = self._event_query(
-            session, tracker.sender_id, fetch_events_from_all_sessions=False
-        ).count()
+        number_of_events_since_last_session = self._get_or_create_session_index(
+            session, tracker.sender_id
+        ).number_of_events
 
         return itertools.islice(
             tracker.events, number_of_events_since_last_session, len(tracker.events)
         )
 
+    def _get_or_create_session_index(
+        self, session: "Session", sender_id: Text
+    ) -> "SQLTrackerStore.SQLSessionIndex":
+        """Returns the session index of a conversation.
+
+        The index of conversations which were stored before the session index was
+        persisted is created from their events.
+        """
+        session_index = session.get(self.SQLSessionIndex, sender_id)
+        if session_index is not None:
+            return session_index
+
+        session_start = (
+            session.query(sa.func.max(self.SQLEvent.timestamp))
+            .filter(
+                self.SQLEvent.sender_id == sender_id,
+                self.SQLEvent.type_name == SessionStarted.type_name,
+            )
+            .scalar()
+        )
+        session_index = self.SQLSessionIndex(
+            sender_id=sender_id,
+            session_start=session_start,
+            number_of_events=self._session_event_query(
+                session, sender_id, session_start
+            ).count(),
+        )
+        session.add(session_index)
+        return session_index
+
+    @staticmethod
+    def _update_session_index(
+        session_index: "SQLTrackerStore.SQLSessionIndex", new_events: List[Event]
+    ) -> None:
+        number_of_events = session_index.number_of_events + len(new_events)
+        for index, event in enumerate(new_events):
+            if isinstance(event, SessionStarted):
+                session_index.session_start = event.timestamp
+                number_of_events = len(new_events) - index
+        session_index.number_of_events = number_of_events
+
 
 class FailSafeTrackerStore(TrackerStore):
     """Tracker store wrapper.
@@ -1453,6 +2085,12 @@ class FailSafeTrackerStore(TrackerStore):
             self.on_tracker_store_error(e)
             await self.fallback_tracker_store.save(tracker)
 
+    async def close(self) -> None:
+        """Closes the primary and the fallback tracker store."""
+        await self._tracker_store.close()
+        if self._fallback_tracker_store:
+            await self._fallback_tracker_store.close()
+
     async def retrieve_full_tracker(
         self, sender_id: Text
     ) -> Optional[DialogueStateTracker]:
@@ -1658,3 +2296,8 @@ class AwaitableTrackerStore(TrackerStore):
             if isawaitable(result)
             else result  # type: ignore[return-value]
         )
+
+    async def close(self) -> None:
+        """Wrapper to call `close` method of primary tracker store."""
+        result = self._tracker_store.close()
+        return await result if isawaitable(result) else result
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 import abc
+import dataclasses
 import logging
 import os
 import shutil
+import threading
+import time
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Text, Any, Optional, Tuple, List
+from typing import Text, Any, Optional, Tuple, List, Dict
+from urllib.parse import urlparse
 
 from packaging import version
 from sqlalchemy.engine import URL
+from tarsafe import TarSafe
 
 from sqlalchemy.exc import OperationalError
 from typing_extensions import Protocol, runtime_checkable
@@ -18,7 +24,9 @@ import rasa
 import rasa.model
 import rasa.utils.common
 import rasa.shared.utils.common
+import rasa.shared.utils.io
 from rasa.constants import MINIMUM_COMPATIBLE_VERSION
+from rasa.shared.exceptions import RasaException
 import sqlalchemy as sa
 import sqlalchemy.orm
 from sqlalchemy.ext.declarative import declarative_base, DeclarativeMeta
@@ -31,9 +39,33 @@ DEFAULT_CACHE_LOCATION = Path(".rasa", "cache")
 DEFAULT_CACHE_NAME = "cache.db"
 DEFAULT_CACHE_SIZE_MB = 1000
 
+# maximum number of parameters of a single SQLite query (for old SQLite versions)
+SQLITE_MAX_VARIABLES = 999
+
 CACHE_LOCATION_ENV = "RASA_CACHE_DIRECTORY"
 CACHE_DB_NAME_ENV = "RASA_CACHE_NAME"
 CACHE_SIZE_ENV = "RASA_MAX_CACHE_SIZE"
+# fraction of the maximum cache size which is filled after evicting items, e.g.
+# `0.8` frees additional space so that not every write requires an eviction
+DEFAULT_CACHE_EVICTION_TARGET = 1.0
+CACHE_EVICTION_TARGET_ENV = "RASA_CACHE_EVICTION_TARGET"
+REMOTE_CACHE_URL_ENV = "RASA_REMOTE_CACHE_URL"
+AWS_ENDPOINT_URL_ENV = "AWS_ENDPOINT_URL"
+AWS_DEFAULT_REGION_ENV = "AWS_DEFAULT_REGION"
+
+
+@dataclasses.dataclass
+class TrainingCacheStatistics:
+    """Describes how a `TrainingCache` was used since it was created."""
+
+    fingerprint_hits: int = 0
+    fingerprint_misses: int = 0
+    result_hits: int = 0
+    result_misses: int = 0
+    evicted_results: int = 0
+    evicted_bytes: int = 0
+    remote_fingerprint_hits: int = 0
+    remote_result_hits: int = 0
 
 
 class TrainingCache(abc.ABC):
@@ -43,6 +75,11 @@ class TrainingCache(abc.ABC):
     training runs.
     """
 
+    @property
+    def statistics(self) -> TrainingCacheStatistics:
+        """Returns hit, miss, and eviction counts since the cache was created."""
+        return TrainingCacheStatistics()
+
     @abc.abstractmethod
     def cache_output(
         self,
@@ -160,8 +197,10 @@ class LocalTrainingCache(TrainingCache):
         output_fingerprint_key = sa.Column(sa.String(), nullable=False, index=True)
         last_used = sa.Column(sa.DateTime(timezone=True), nullable=False)
         rasa_version = sa.Column(sa.String(255), nullable=False)
-        result_location = sa.Column(sa.String())
+        result_location = sa.Column(sa.String(), index=True)
         result_type = sa.Column(sa.String())
+        # size of the cached result in bytes
+        result_size = sa.Column(sa.BigInteger())
 
     def __init__(self) -> None:
         """Creates cache.
@@ -174,10 +213,18 @@ class LocalTrainingCache(TrainingCache):
             os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE_MB)
         )
 
+        self._eviction_target = float(
+            os.environ.get(CACHE_EVICTION_TARGET_ENV, DEFAULT_CACHE_EVICTION_TARGET)
+        )
+
         self._cache_database_name = os.environ.get(
             CACHE_DB_NAME_ENV, DEFAULT_CACHE_NAME
         )
 
+        self._statistics = TrainingCacheStatistics()
+        # nodes of the graph can be trained in parallel threads
+        self._lock = threading.RLock()
+
         if not self._cache_location.exists() and not self._is_disabled():
             logger.debug(
                 f"Creating caching directory '{self._cache_location}' because "
@@ -189,6 +236,9 @@ class LocalTrainingCache(TrainingCache):
 
         self._drop_cache_entries_from_incompatible_versions()
 
+        if not self._is_disabled():
+            self._add_missing_result_sizes()
+
     @staticmethod
     def _get_cache_location() -> Path:
         return Path(os.environ.get(CACHE_LOCATION_ENV, DEFAULT_CACHE_LOCATION))
@@ -201,14 +251,70 @@ class LocalTrainingCache(TrainingCache):
         else:
             database = str(self._cache_location / self._cache_database_name)
 
+        engine_kwargs: Dict[Text, Any] = {}
+        if not database:
+            # Share the in-memory database between threads
+            engine_kwargs = {
+                "poolclass": sa.pool.StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+
         # Use `future=True` as we are using the 2.x query style
         engine = sa.create_engine(
-            URL.create(drivername="sqlite", database=database), future=True
+            URL.create(drivername="sqlite", database=database),
+            future=True,
+            **engine_kwargs,
         )
         self.Base.metadata.create_all(engine)
+        self._add_missing_columns(engine)
 
         return sa.orm.sessionmaker(engine)
 
+    def _add_missing_columns(self, engine: sa.engine.Engine) -> None:
+        # `create_all` doesn't add columns to tables of older cache versions
+        table = self.CacheEntry.__table__
+        existing_columns = {
+            column["name"] for column in sa.inspect(engine).get_columns(table.name)
+        }
+        with engine.begin() as connection:
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(engine.dialect)
+                    connection.execute(
+                        sa.text(
+                            f"ALTER TABLE {table.name} "
+                            f"ADD COLUMN {column.name} {column_type}"
+                        )
+                    )
+
+    def _add_missing_result_sizes(self) -> None:
+        """Records the sizes of results which were cached by older Rasa versions."""
+        with self._sessionmaker.begin() as session:
+            query = sa.select(self.CacheEntry).where(
+                self.CacheEntry.result_location != sa.null(),
+                self.CacheEntry.result_size == sa.null(),
+            )
+            for entry in session.execute(query).scalars().all():
+                entry.result_size = self._result_size(Path(entry.result_location))
+
+    @staticmethod
+    def _result_size(path: Path) -> int:
+        if path.is_file():
+            return path.stat().st_size
+        if path.is_dir():
+            return rasa.utils.common.directory_size_in_bytes(path)
+        return 0
+
+    def _untracked_content(self, tracked_locations: List[Text]) -> List[Path]:
+        # cached results are always direct children of the cache directory
+        tracked_names = {Path(location).name for location in tracked_locations}
+        return [
+            Path(item.path)
+            for item in os.scandir(self._cache_location)
+            if item.name not in tracked_names
+            and not item.name.startswith(self._cache_database_name)
+        ]
+
     def _drop_cache_entries_from_incompatible_versions(self) -> None:
         incompatible_entries = self._find_incompatible_cache_entries()
 
@@ -265,28 +371,41 @@ class LocalTrainingCache(TrainingCache):
         if self._is_disabled():
             return
 
-        cache_dir, output_type = None, None
-        if isinstance(output, Cacheable):
-            cache_dir, output_type = self._cache_output_to_disk(output, model_storage)
+        # the result must be in the database before other threads free space in
+        # the cache as it would be deleted as untracked content otherwise
+        with self._lock:
+            cache_dir, output_type, output_size = None, None, None
+            if isinstance(output, Cacheable):
+                cache_dir, output_type, output_size = self._cache_output_to_disk(
+                    output, model_storage
+                )
 
-        try:
-            self._add_cache_entry(
-                cache_dir, fingerprint_key, output_fingerprint, output_type
-            )
-        except OperationalError:
-            if cache_dir:
-                shutil.rmtree(cache_dir)
+            try:
+                self._add_cache_entry(
+                    cache_dir,
+                    fingerprint_key,
+                    output_fingerprint,
+                    output_type,
+                    output_size,
+                )
+            except OperationalError:
+                if cache_dir:
+                    shutil.rmtree(cache_dir)
 
-            raise
+                raise
 
     def _add_cache_entry(
         self,
         cache_dir: Optional[Text],
         fingerprint_key: Text,
         output_fingerprint: Text,
-        output_type: Text,
+        output_type: Optional[Text],
+        output_size: Optional[int] = None,
     ) -> None:
-        with self._sessionmaker.begin() as session:
+        with self._lock, self._sessionmaker.begin() as session:
+            previous_entry = session.get(self.CacheEntry, fingerprint_key)
+            replaced_location = previous_entry and previous_entry.result_location
+
             cache_entry = self.CacheEntry(
                 fingerprint_key=fingerprint_key,
                 output_fingerprint_key=output_fingerprint,
@@ -294,16 +413,30 @@ class LocalTrainingCache(TrainingCache):
                 rasa_version=rasa.__version__,
                 result_location=cache_dir,
                 result_type=output_type,
+                result_size=output_size,
             )
             session.merge(cache_entry)
 
+            if replaced_location and replaced_location != cache_dir:
+                self._delete_unreferenced_result(session, replaced_location)
+
+    def _delete_unreferenced_result(
+        self, session: sa.orm.Session, result_location: Text
+    ) -> None:
+        query = sa.select(self.CacheEntry.fingerprint_key).where(
+            self.CacheEntry.result_location == result_location
+        )
+        if session.execute(query).first() is None:
+            shutil.rmtree(result_location, ignore_errors=True)
+
     def _is_disabled(self) -> bool:
         return self._max_cache_size == 0.0
 
     def _cache_output_to_disk(
         self, output: Cacheable, model_storage: ModelStorage
-    ) -> Tuple[Optional[Text], Optional[Text]]:
+    ) -> Tuple[Optional[Text], Optional[Text], Optional[int]]:
         tempdir_name = rasa.utils.common.get_temp_dir_name()
+        write_started = time.time()
 
         # Use `TempDirectoryPath` instead of `tempfile.TemporaryDirectory` as this
         # leads to errors on Windows when the context manager tries to delete an
@@ -322,69 +455,201 @@ class LocalTrainingCache(TrainingCache):
                     f"Caching output of type '{type(output).__name__}' failed with the "
                     f"following error:\n{e}"
                 )
-                return None, None
+                return None, None, None
 
-            output_size = rasa.utils.common.directory_size_in_mb(tmp_path)
-            if output_size > self._max_cache_size:
-                logger.debug(
-                    f"Caching result of type '{type(output).__name__}' was skipped "
-                    f"because it exceeds the maximum cache size of "
-                    f"{self._max_cache_size} MiB."
-                )
-                return None, None
+            output_type = rasa.shared.utils.common.module_path_from_instance(output)
+            cache_path, output_size = self._move_to_cache(
+                tmp_path, output_type, write_started
+            )
+            if cache_path is None:
+                return None, None, None
 
-            while (
-                rasa.utils.common.directory_size_in_mb(
-                    self._cache_location,
-                    filenames_to_exclude=[self._cache_database_name],
-                )
-                + output_size
-                > self._max_cache_size
-            ):
-                self._drop_least_recently_used_item()
+            return cache_path, output_type, output_size
 
-            output_type = rasa.shared.utils.common.module_path_from_instance(output)
-            cache_path = shutil.move(temp_dir, self._cache_location)
+    def _move_to_cache(
+        self, directory: Path, output_type: Text, write_started: float
+    ) -> Tuple[Optional[Text], Optional[int]]:
+        """Moves a directory with a cached result into the cache.
 
-            return cache_path, output_type
+        Args:
+            directory: The directory which contains the persisted `Cacheable`.
+            output_type: The module path of the `Cacheable`.
+            write_started: The time when persisting the `Cacheable` started.
 
-    def _drop_least_recently_used_item(self) -> None:
-        with self._sessionmaker.begin() as session:
-            query_for_least_recently_used_entry = sa.select(self.CacheEntry).order_by(
-                self.CacheEntry.last_used.asc()
+        Returns:
+            The location of the result in the cache and its size in bytes or `None`
+            if the result is too large to be cached.
+        """
+        output_size = rasa.utils.common.directory_size_in_bytes(directory)
+        if output_size > self._max_cache_size_in_bytes():
+            logger.debug(
+                f"Caching result of type '{output_type}' was skipped "
+                f"because it exceeds the maximum cache size of "
+                f"{self._max_cache_size} MiB."
             )
-            oldest_cache_item = (
-                session.execute(query_for_least_recently_used_entry).scalars().first()
+            return None, None
+
+        self._ensure_free_space(output_size, write_started)
+
+        return shutil.move(str(directory), self._cache_location), output_size
+
+    def _max_cache_size_in_bytes(self) -> float:
+        # MiB to bytes
+        return self._max_cache_size * 1_048_576
+
+    def _cached_results_by_last_use(
+        self, session: sa.orm.Session
+    ) -> List[sa.engine.Row]:
+        # Several entries can share a result if they have the same output
+        last_used = sa.func.max(self.CacheEntry.last_used)
+        query = (
+            sa.select(
+                self.CacheEntry.result_location,
+                sa.func.coalesce(sa.func.max(self.CacheEntry.result_size), 0).label(
+                    "result_size"
+                ),
             )
+            .where(self.CacheEntry.result_location != sa.null())
+            .group_by(self.CacheEntry.result_location)
+            .order_by(last_used.asc())
+        )
+        return session.execute(query).all()
 
-            if not oldest_cache_item:
-                self._purge_cache_dir_content()
-                return
+    def _ensure_free_space(self, required_size: int, write_started: float) -> None:
+        """Evicts the least recently used results if `required_size` doesn't fit.
 
-            self._delete_cached_result(oldest_cache_item)
-            delete_query = sa.delete(self.CacheEntry).where(
-                self.CacheEntry.fingerprint_key == oldest_cache_item.fingerprint_key
-            )
-            session.execute(delete_query)
+        The sizes of cached results are taken from the database, so only content
+        which doesn't belong to the cache needs to be measured on disk. Results are
+        evicted in bulk so that the cache is filled up to the eviction target (a
+        fraction of the maximum cache size) after adding `required_size` bytes.
 
-            logger.debug(
-                f"Deleted item with fingerprint "
-                f"'{oldest_cache_item.fingerprint_key}' to free space."
+        Content of the cache directory which isn't tracked by the database is
+        deleted first. Content which was modified after `write_started` is kept, as
+        it might belong to another process which is about to add it to the cache.
+        """
+        max_cache_size = self._max_cache_size_in_bytes()
+
+        with self._sessionmaker.begin() as session:
+            cached_results = self._cached_results_by_last_use(session)
+            untracked_content = self._untracked_content(
+                [result.result_location for result in cached_results]
             )
+            untracked_sizes = {
+                item: self._result_size(item) for item in untracked_content
+            }
+            cached_size = sum(untracked_sizes.values()) + sum(
+                result.result_size for result in cached_results
+            )
+            if cached_size + required_size <= max_cache_size:
+                return
 
-    def _purge_cache_dir_content(self) -> None:
-        for item in self._cache_location.glob("*"):
-            if item.name == self._cache_database_name:
+            # Content which isn't part of the cache is removed first
+            cached_size -= self._purge_cache_dir_content(untracked_sizes, write_started)
+
+            target_size = max_cache_size * min(self._eviction_target, 1.0)
+            locations_to_evict = []
+            for result in cached_results:
+                if cached_size + required_size <= target_size:
+                    break
+                locations_to_evict.append(result.result_location)
+                cached_size -= result.result_size
+
+            for chunk_start in range(0, len(locations_to_evict), SQLITE_MAX_VARIABLES):
+                chunk = locations_to_evict[
+                    chunk_start : chunk_start + SQLITE_MAX_VARIABLES
+                ]
+                session.execute(
+                    sa.delete(self.CacheEntry).where(
+                        self.CacheEntry.result_location.in_(chunk)
+                    )
+                )
+
+        for location in locations_to_evict:
+            shutil.rmtree(location, ignore_errors=True)
+
+        self._statistics.evicted_results += len(locations_to_evict)
+        self._statistics.evicted_bytes += sum(
+            result.result_size for result in cached_results[: len(locations_to_evict)]
+        )
+        logger.debug(f"Deleted {len(locations_to_evict)} cached results to free space.")
+
+    def _purge_cache_dir_content(
+        self, untracked_sizes: Dict[Path, int], write_started: float
+    ) -> int:
+        """Deletes content which isn't part of the cache and returns its size."""
+        purged_size = 0
+        for item, size in untracked_sizes.items():
+            try:
+                if item.stat().st_mtime >= write_started:
+                    continue
+            except FileNotFoundError:
                 continue
 
+            purged_size += size
             if item.is_dir():
-                shutil.rmtree(item)
+                shutil.rmtree(item, ignore_errors=True)
             else:
-                item.unlink()
+                item.unlink(missing_ok=True)
+
+        return purged_size
+
+    def _add_cached_result(
+        self, output_fingerprint_key: Text, directory: Path, output_type: Text
+    ) -> Optional[Path]:
+        """Adds a result which was persisted elsewhere to the cache.
+
+        The result is attached to all cache entries which point to its output
+        fingerprint but don't have a cached result yet.
+
+        Args:
+            output_fingerprint_key: The fingerprint of the result.
+            directory: The directory which contains the persisted `Cacheable`. It is
+                moved into the cache.
+            output_type: The module path of the `Cacheable`.
+
+        Returns:
+            The location of the result in the cache or `None` if it wasn't added.
+        """
+        if self._is_disabled():
+            return None
+
+        write_started = time.time()
+        with self._lock:
+            with self._sessionmaker.begin() as session:
+                query = sa.select(self.CacheEntry).where(
+                    self.CacheEntry.output_fingerprint_key == output_fingerprint_key,
+                    self.CacheEntry.result_location == sa.null(),
+                )
+                entries = session.execute(query).scalars().all()
+                if not entries:
+                    return None
+
+            cache_path, output_size = self._move_to_cache(
+                directory, output_type, write_started
+            )
+            if cache_path is None:
+                return None
+
+            with self._sessionmaker.begin() as session:
+                session.execute(
+                    sa.update(self.CacheEntry)
+                    .where(
+                        self.CacheEntry.output_fingerprint_key
+                        == output_fingerprint_key,
+                        self.CacheEntry.result_location == sa.null(),
+                    )
+                    .values(
+                        result_location=cache_path,
+                        result_type=output_type,
+                        result_size=output_size,
+                    )
+                )
+
+        return Path(cache_path)
 
     def get_cached_output_fingerprint(self, fingerprint_key: Text) -> Optional[Text]:
         """Returns cached output fingerprint (see parent class for full docstring)."""
-        with self._sessionmaker.begin() as session:
+        with self._lock, self._sessionmaker.begin() as session:
             query = sa.select(self.CacheEntry).filter_by(
                 fingerprint_key=fingerprint_key
             )
@@ -393,14 +658,30 @@ class LocalTrainingCache(TrainingCache):
             if match:
                 # This result was used during a fingerprint run.
                 match.last_used = datetime.utcnow()
+                self._statistics.fingerprint_hits += 1
                 return match.output_fingerprint_key
 
+            self._statistics.fingerprint_misses += 1
             return None
 
     def get_cached_result(
         self, output_fingerprint_key: Text, node_name: Text, model_storage: ModelStorage
     ) -> Optional[Cacheable]:
         """Returns a potentially cached output (see parent class for full docstring)."""
+        # hold the lock so that the result isn't evicted while it's loaded
+        with self._lock:
+            result = self._get_cached_result_from_disk(
+                output_fingerprint_key, node_name, model_storage
+            )
+            if result is None:
+                self._statistics.result_misses += 1
+            else:
+                self._statistics.result_hits += 1
+        return result
+
+    def _get_cached_result_from_disk(
+        self, output_fingerprint_key: Text, node_name: Text, model_storage: ModelStorage
+    ) -> Optional[Cacheable]:
         result_location, result_type = self._get_cached_result(output_fingerprint_key)
 
         if not result_location:
@@ -422,6 +703,11 @@ class LocalTrainingCache(TrainingCache):
             output_fingerprint_key,
         )
 
+    @property
+    def statistics(self) -> TrainingCacheStatistics:
+        """Returns cache statistics (see parent class for full docstring)."""
+        return dataclasses.replace(self._statistics)
+
     def _get_cached_result(
         self, output_fingerprint_key: Text
     ) -> Tuple[Optional[Path], Optional[Text]]:
@@ -468,3 +754,420 @@ class LocalTrainingCache(TrainingCache):
                 f"cache. Error:\n{e}"
             )
             return None
+
+
+class CacheBlobStore(abc.ABC):
+    """Stores immutable files (blobs) which are shared between training caches.
+
+    Blobs are content-addressed, i.e. a key always refers to the same content.
+    Writers therefore never have to coordinate: a blob which is written
+    concurrently by multiple writers has the same content regardless of which write
+    wins, but readers must never see partially written blobs.
+    """
+
+    @abc.abstractmethod
+    def upload(self, key: Text, path: Path) -> None:
+        """Stores the file at `path` under `key`.
+
+        Args:
+            key: The key of the blob.
+            path: The file which is stored.
+        """
+        ...
+
+    @abc.abstractmethod
+    def download(self, key: Text, target_path: Path) -> bool:
+        """Retrieves a blob.
+
+        Args:
+            key: The key of the blob.
+            target_path: The file the blob is written to.
+
+        Returns:
+            `False` if there is no blob for `key`.
+        """
+        ...
+
+    @abc.abstractmethod
+    def exists(self, key: Text) -> bool:
+        """Checks whether there is a blob for `key`."""
+        ...
+
+
+class FileSystemBlobStore(CacheBlobStore):
+    """Stores blobs in a (shared) directory, e.g. a network file system."""
+
+    def __init__(self, root: Path) -> None:
+        """Creates the store.
+
+        Args:
+            root: The directory which contains the blobs.
+        """
+        self.root = root
+
+    def _path(self, key: Text) -> Path:
+        return self.root / key
+
+    def upload(self, key: Text, path: Path) -> None:
+        """Stores a blob (see parent class for full docstring)."""
+        target_path = self._path(key)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a file which is unique to this writer and rename it afterwards.
+        # The rename is atomic so that readers either see the complete blob or none.
+        temporary_path = target_path.with_name(
+            f".{target_path.name}.{uuid.uuid4().hex}.tmp"
+        )
+        try:
+            shutil.copyfile(path, temporary_path)
+            os.replace(temporary_path, target_path)
+        finally:
+            if temporary_path.exists():
+                temporary_path.unlink()
+
+    def download(self, key: Text, target_path: Path) -> bool:
+        """Retrieves a blob (see parent class for full docstring)."""
+        try:
+            shutil.copyfile(self._path(key), target_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def exists(self, key: Text) -> bool:
+        """Checks whether there is a blob (see parent class for full docstring)."""
+        return self._path(key).is_file()
+
+
+class S3BlobStore(CacheBlobStore):
+    """Stores blobs in an S3-compatible object store.
+
+    Objects only become visible once they were uploaded completely, so concurrent
+    writers can't corrupt blobs.
+    """
+
+    def __init__(
+        self,
+        bucket_name: Text,
+        prefix: Text = "",
+        endpoint_url: Optional[Text] = None,
+        region_name: Optional[Text] = None,
+    ) -> None:
+        """Creates the store.
+
+        Args:
+            bucket_name: The bucket which contains the blobs.
+            prefix: Prefix of the object keys of the blobs.
+            endpoint_url: Endpoint of the object store. Defaults to AWS S3.
+            region_name: Region of the bucket.
+        """
+        import boto3
+
+        self.bucket_name = bucket_name
+        self.prefix = prefix.strip("/")
+        self.s3 = boto3.client("s3", endpoint_url=endpoint_url, region_name=region_name)
+
+    def _object_key(self, key: Text) -> Text:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    @staticmethod
+    def _is_missing_object_error(error: Exception) -> bool:
+        error_code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return error_code in {"404", "NoSuchKey", "NotFound"}
+
+    def upload(self, key: Text, path: Path) -> None:
+        """Stores a blob (see parent class for full docstring)."""
+        self.s3.upload_file(str(path), self.bucket_name, self._object_key(key))
+
+    def download(self, key: Text, target_path: Path) -> bool:
+        """Retrieves a blob (see parent class for full docstring)."""
+        import botocore.exceptions
+
+        try:
+            self.s3.download_file(
+                self.bucket_name, self._object_key(key), str(target_path)
+            )
+        except botocore.exceptions.ClientError as e:
+            if self._is_missing_object_error(e):
+                return False
+            raise
+        return True
+
+    def exists(self, key: Text) -> bool:
+        """Checks whether there is a blob (see parent class for full docstring)."""
+        import botocore.exceptions
+
+        try:
+            self.s3.head_object(Bucket=self.bucket_name, Key=self._object_key(key))
+        except botocore.exceptions.ClientError as e:
+            if self._is_missing_object_error(e):
+                return False
+            raise
+        return True
+
+
+def blob_store_from_url(url: Text) -> CacheBlobStore:
+    """Creates the blob store for a URL.
+
+    Args:
+        url: Either `s3://<bucket>/<optional prefix>` for an S3-compatible object
+            store (the endpoint can be set via the `AWS_ENDPOINT_URL` environment
+            variable) or the path of a (shared) directory, optionally prefixed with
+            `file://`.
+
+    Returns:
+        The blob store.
+    """
+    parsed_url = urlparse(url)
+    if parsed_url.scheme == "s3":
+        return S3BlobStore(
+            parsed_url.netloc,
+            prefix=parsed_url.path,
+            endpoint_url=os.environ.get(AWS_ENDPOINT_URL_ENV),
+            region_name=os.environ.get(AWS_DEFAULT_REGION_ENV),
+        )
+    if parsed_url.scheme == "file":
+        return FileSystemBlobStore(Path(parsed_url.path))
+    if parsed_url.scheme and len(parsed_url.scheme) > 1:
+        # Single letter schemes are Windows drive letters
+        raise RasaException(
+            f"The remote training cache '{url}' is not supported. Please use "
+            f"either an 's3://' URL or a directory path."
+        )
+    return FileSystemBlobStore(Path(url))
+
+
+class RemoteTrainingCache(TrainingCache):
+    """Shares training results between machines (see parent class for docstring).
+
+    Output fingerprints are stored under their fingerprint key and `Cacheable`
+    outputs are stored as archives under their output fingerprint in a
+    `CacheBlobStore`. All lookups go through a `LocalTrainingCache` first, which
+    also keeps a copy of everything retrieved from the remote store.
+    """
+
+    def __init__(
+        self, blob_store: CacheBlobStore, local_cache: LocalTrainingCache
+    ) -> None:
+        """Creates the cache.
+
+        Args:
+            blob_store: The shared store of the cached outputs.
+            local_cache: The cache which is used as read-through layer.
+        """
+        self._blob_store = blob_store
+        self._local_cache = local_cache
+        self._remote_fingerprint_hits = 0
+        self._remote_result_hits = 0
+        self._statistics_lock = threading.Lock()
+
+    @property
+    def statistics(self) -> TrainingCacheStatistics:
+        """Returns cache statistics (see parent class for full docstring).
+
+        Misses of the local cache which were hits of the remote cache are counted as
+        both.
+        """
+        return dataclasses.replace(
+            self._local_cache.statistics,
+            remote_fingerprint_hits=self._remote_fingerprint_hits,
+            remote_result_hits=self._remote_result_hits,
+        )
+
+    @staticmethod
+    def _fingerprint_key(fingerprint_key: Text) -> Text:
+        return f"fingerprints/{fingerprint_key}.json"
+
+    @staticmethod
+    def _result_key(output_fingerprint_key: Text) -> Text:
+        return f"results/{output_fingerprint_key}.tar.gz"
+
+    @staticmethod
+    def _result_metadata_key(output_fingerprint_key: Text) -> Text:
+        return f"results/{output_fingerprint_key}.json"
+
+    def cache_output(
+        self,
+        fingerprint_key: Text,
+        output: Any,
+        output_fingerprint: Text,
+        model_storage: ModelStorage,
+    ) -> None:
+        """Adds the output to the cache (see parent class for full docstring)."""
+        self._local_cache.cache_output(
+            fingerprint_key, output, output_fingerprint, model_storage
+        )
+
+        try:
+            if isinstance(output, Cacheable):
+                self._upload_result(output, output_fingerprint, model_storage)
+            self._upload_json(
+                self._fingerprint_key(fingerprint_key),
+                {
+                    "output_fingerprint_key": output_fingerprint,
+                    "rasa_version": rasa.__version__,
+                },
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to add the output of type '{type(output).__name__}' to the "
+                f"remote training cache. Error:\n{e}"
+            )
+
+    def _upload_result(
+        self, output: Cacheable, output_fingerprint: Text, model_storage: ModelStorage
+    ) -> None:
+        metadata_key = self._result_metadata_key(output_fingerprint)
+        if self._blob_store.exists(metadata_key):
+            # Somebody else cached the same output already
+            return
+
+        tempdir_name = rasa.utils.common.get_temp_dir_name()
+        with rasa.utils.common.TempDirectoryPath(tempdir_name) as temp_dir:
+            result_location, result_type = self._local_cache._get_cached_result(
+                output_fingerprint
+            )
+            if not result_location or not result_location.is_dir():
+                result_location = Path(temp_dir, "result")
+                result_location.mkdir()
+                output.to_cache(result_location, model_storage)
+                result_type = rasa.shared.utils.common.module_path_from_instance(output)
+
+            archive_path = Path(temp_dir, "result.tar.gz")
+            with TarSafe.open(archive_path, "w:gz") as tar:
+                tar.add(result_location, arcname="")
+
+            # The metadata is uploaded last as it marks the result as complete
+            self._blob_store.upload(self._result_key(output_fingerprint), archive_path)
+            self._upload_json(
+                metadata_key,
+                {"result_type": result_type, "rasa_version": rasa.__version__},
+            )
+
+    def _upload_json(self, key: Text, content: Dict[Text, Any]) -> None:
+        tempdir_name = rasa.utils.common.get_temp_dir_name()
+        with rasa.utils.common.TempDirectoryPath(tempdir_name) as temp_dir:
+            path = Path(temp_dir, "blob.json")
+            rasa.shared.utils.io.dump_obj_as_json_to_file(path, content)
+            self._blob_store.upload(key, path)
+
+    def _download_json(self, key: Text) -> Optional[Dict[Text, Any]]:
+        tempdir_name = rasa.utils.common.get_temp_dir_name()
+        with rasa.utils.common.TempDirectoryPath(tempdir_name) as temp_dir:
+            path = Path(temp_dir, "blob.json")
+            if not self._blob_store.download(key, path):
+                return None
+            content = rasa.shared.utils.io.read_json_file(path)
+
+        if version.parse(MINIMUM_COMPATIBLE_VERSION) > version.parse(
+            content.get("rasa_version", "0.0.0")
+        ):
+            return None
+        return content
+
+    def get_cached_output_fingerprint(self, fingerprint_key: Text) -> Optional[Text]:
+        """Returns cached output fingerprint (see parent class for full docstring)."""
+        output_fingerprint = self._local_cache.get_cached_output_fingerprint(
+            fingerprint_key
+        )
+        if output_fingerprint:
+            return output_fingerprint
+
+        try:
+            content = self._download_json(self._fingerprint_key(fingerprint_key))
+        except Exception as e:
+            logger.warning(
+                f"Failed to look up '{fingerprint_key}' in the remote training "
+                f"cache. Error:\n{e}"
+            )
+            return None
+
+        if not content:
+            return None
+
+        output_fingerprint = content["output_fingerprint_key"]
+        with self._statistics_lock:
+            self._remote_fingerprint_hits += 1
+        if not self._local_cache._is_disabled():
+            self._local_cache._add_cache_entry(
+                None, fingerprint_key, output_fingerprint, None
+            )
+        return output_fingerprint
+
+    def get_cached_result(
+        self, output_fingerprint_key: Text, node_name: Text, model_storage: ModelStorage
+    ) -> Optional[Cacheable]:
+        """Returns a potentially cached output (see parent class for full docstring)."""
+        cached_result = self._local_cache.get_cached_result(
+            output_fingerprint_key, node_name, model_storage
+        )
+        if cached_result is not None:
+            return cached_result
+
+        tempdir_name = rasa.utils.common.get_temp_dir_name()
+        with rasa.utils.common.TempDirectoryPath(tempdir_name) as temp_dir:
+            try:
+                metadata = self._download_json(
+                    self._result_metadata_key(output_fingerprint_key)
+                )
+                archive_path = Path(temp_dir, "result.tar.gz")
+                if not metadata or not self._blob_store.download(
+                    self._result_key(output_fingerprint_key), archive_path
+                ):
+                    logger.debug(
+                        f"No remotely cached output found for "
+                        f"'{output_fingerprint_key}'."
+                    )
+                    return None
+
+                result_location = Path(temp_dir, "result")
+                with TarSafe.open(archive_path, "r:gz") as tar:
+                    tar.extractall(result_location)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to retrieve '{output_fingerprint_key}' from the remote "
+                    f"training cache. Error:\n{e}"
+                )
+                return None
+
+            result_type = metadata["result_type"]
+            local_location = self._local_cache._add_cached_result(
+                output_fingerprint_key, result_location, result_type
+            )
+
+            cached_result = LocalTrainingCache._load_from_cache(
+                local_location or result_location,
+                result_type,
+                node_name,
+                model_storage,
+                output_fingerprint_key,
+            )
+            if cached_result is not None:
+                with self._statistics_lock:
+                    self._remote_result_hits += 1
+            return cached_result
+
+
+def create_training_cache() -> TrainingCache:
+    """Creates the training cache which is configured via environment variables.
+
+    If `RASA_REMOTE_CACHE_URL` is set, results are shared via the remote training
+    cache at this URL (see `blob_store_from_url`). The `LocalTrainingCache` is used
+    otherwise.
+    """
+    local_cache = LocalTrainingCache()
+
+    remote_cache_url = os.environ.get(REMOTE_CACHE_URL_ENV)
+    if not remote_cache_url:
+        return local_cache
+
+    return RemoteTrainingCache(blob_store_from_url(remote_cache_url), local_cache)
+
+
+def get_cache_location() -> Path:
+    """Returns the directory of the local training cache.
+
+    Graph components can keep data which is reused across trainings in their own
+    subdirectory of it. This data isn't part of the training cache, i.e. it counts
+    towards the size of the cache and is deleted if the cache runs out of space.
+    """
+    return LocalTrainingCache._get_cache_location()
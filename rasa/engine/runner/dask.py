@@ -1,9 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional, Text
-
-import dask
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Text, Tuple
 
 from rasa.engine.exceptions import GraphRunError
 from rasa.engine.graph import ExecutionContext, GraphNode, GraphNodeHook, GraphSchema
@@ -13,8 +11,30 @@ from rasa.engine.storage.storage import ModelStorage
 logger = logging.getLogger(__name__)
 
 
+# node name and the names of the nodes (or inputs) it needs
+ExecutionStep = Tuple[Text, Tuple[Text, ...]]
+
+
+class ExecutionPlan(NamedTuple):
+    """Topologically sorted steps to run a graph for a set of targets."""
+
+    steps: List[ExecutionStep]
+    # number of steps which need a value, for all values which aren't targets
+    dependent_counts: Dict[Text, int]
+
+    def remaining_dependents(self) -> Dict[Text, int]:
+        """Returns a copy of the dependent counts which can be updated during a run."""
+        return dict(self.dependent_counts)
+
+
 class DaskGraphRunner(GraphRunner):
-    """Dask implementation of a `GraphRunner`."""
+    """Dask style implementation of a `GraphRunner`.
+
+    The graph is run with a lightweight in-process scheduler which follows the
+    semantics of `dask.get`. The topologically sorted execution plan is computed once
+    per set of targets and then reused for every run. Outputs of nodes are released
+    as soon as all nodes which need them are done, unless they are targets.
+    """
 
     def __init__(
         self,
@@ -38,6 +58,7 @@ class DaskGraphRunner(GraphRunner):
             graph_schema, model_storage, execution_context, hooks
         )
         self._execution_context: ExecutionContext = execution_context
+        self._execution_plans: Dict[Tuple[Text, ...], ExecutionPlan] = {}
 
     @classmethod
     def create(
@@ -64,20 +85,72 @@ class DaskGraphRunner(GraphRunner):
             for node_name, schema_node in graph_schema.nodes.items()
         }
 
-    def _build_dask_graph(self, schema: GraphSchema) -> Dict[Text, Any]:
-        """Builds a dask graph from the instantiated graph.
-
-        For more information about dask graphs
-        see: https://docs.dask.org/en/latest/spec.html
-        """
-        run_graph = {
-            node_name: (
-                self._instantiated_nodes[node_name],
-                *schema_node.needs.values(),
+    def _execution_plan(self, targets: List[Text]) -> ExecutionPlan:
+        """Returns the cached execution plan for the given targets."""
+        key = tuple(targets)
+        if key not in self._execution_plans:
+            minimal_schema = self._graph_schema.minimal_graph_schema(targets)
+            steps = self._build_execution_plan(minimal_schema)
+            self._execution_plans[key] = ExecutionPlan(
+                steps, self._count_dependents(steps, targets)
             )
-            for node_name, schema_node in schema.nodes.items()
-        }
-        return run_graph
+
+        return self._execution_plans[key]
+
+    @staticmethod
+    def _count_dependents(
+        steps: List[ExecutionStep], targets: List[Text]
+    ) -> Dict[Text, int]:
+        """Counts the steps which need each value which isn't a target."""
+        dependent_counts: Dict[Text, int] = {}
+        for _, needs in steps:
+            for need in set(needs):
+                if need not in targets:
+                    dependent_counts[need] = dependent_counts.get(need, 0) + 1
+
+        return dependent_counts
+
+    @staticmethod
+    def _release_needs(
+        needs: Tuple[Text, ...],
+        remaining_dependents: Dict[Text, int],
+        values: Dict[Text, Any],
+    ) -> None:
+        """Drops the values which aren't needed by any further step."""
+        for need in set(needs):
+            if need not in remaining_dependents:
+                continue
+
+            remaining_dependents[need] -= 1
+            if remaining_dependents[need] == 0:
+                values.pop(need, None)
+
+    @staticmethod
+    def _build_execution_plan(schema: GraphSchema) -> List[ExecutionStep]:
+        """Sorts the nodes of the schema so that every node runs after its needs."""
+        plan: List[ExecutionStep] = []
+        done: Set[Text] = set()
+        in_progress: Set[Text] = set()
+
+        def add_node(node_name: Text) -> None:
+            if node_name in done or node_name not in schema.nodes:
+                return
+            if node_name in in_progress:
+                raise GraphRunError(f"Cycle detected at node '{node_name}'.")
+
+            in_progress.add(node_name)
+            needs = tuple(schema.nodes[node_name].needs.values())
+            for dependency in needs:
+                add_node(dependency)
+            in_progress.discard(node_name)
+
+            done.add(node_name)
+            plan.append((node_name, needs))
+
+        for node_name in schema.nodes:
+            add_node(node_name)
+
+        return plan
 
     def run(
         self,
@@ -86,30 +159,40 @@ class DaskGraphRunner(GraphRunner):
     ) -> Dict[Text, Any]:
         """Runs the graph (see parent class for full docstring)."""
         run_targets = targets if targets else self._graph_schema.target_names
-        minimal_schema = self._graph_schema.minimal_graph_schema(run_targets)
-        run_graph = self._build_dask_graph(minimal_schema)
+        plan = self._execution_plan(run_targets)
 
+        values: Dict[Text, Any] = {}
         if inputs:
-            self._add_inputs_to_graph(inputs, run_graph)
+            self._add_inputs_to_graph(inputs, values)
 
         logger.debug(
             f"Running graph with inputs: {inputs}, targets: {targets} "
             f"and {self._execution_context}."
         )
 
+        remaining_dependents = plan.remaining_dependents()
         try:
-            dask_result = dask.get(run_graph, run_targets)
-            return dict(dask_result)
+            for node_name, needs in plan.steps:
+                # like dask, pass the name of a need if it can't be resolved
+                values[node_name] = self._instantiated_nodes[node_name](
+                    *[values.get(need, need) for need in needs]
+                )
+                self._release_needs(needs, remaining_dependents, values)
+            return dict(values[target] for target in run_targets)
         except RuntimeError as e:
             raise GraphRunError("Error running runner.") from e
 
-    @staticmethod
-    def _add_inputs_to_graph(inputs: Optional[Dict[Text, Any]], graph: Any) -> None:
+    def _add_inputs_to_graph(
+        self, inputs: Optional[Dict[Text, Any]], graph: Dict[Text, Any]
+    ) -> None:
         if inputs is None:
             return
 
         for input_name, input_value in inputs.items():
-            if isinstance(input_value, str) and input_value in graph.keys():
+            if (
+                isinstance(input_value, str)
+                and input_value in self._graph_schema.nodes.keys()
+            ):
                 raise GraphRunError(
                     f"Input value '{input_value}' clashes with a node name. Make sure "
                     f"that none of the input names passed to the `run` method are the "
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set, Text, Type
+
+import rasa.shared.utils.io
+from rasa.engine.exceptions import GraphRunError
+from rasa.engine.graph import ExecutionContext, GraphNodeHook, GraphSchema
+from rasa.engine.runner.dask import DaskGraphRunner
+from rasa.engine.runner.interface import GraphRunner
+from rasa.engine.storage.storage import ModelStorage
+from rasa.utils.tensorflow.constants import RANDOM_SEED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRAINING_WORKERS = 1
+TRAINING_WORKERS_ENV = "RASA_TRAINING_WORKERS"
+TRAINING_MEMORY_BUDGET_ENV = "RASA_TRAINING_MEMORY_BUDGET"
+
+
+def _memory_usage_in_mb() -> Optional[float]:
+    """Returns the resident memory of the current process in MiB if available."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / 1_048_576
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1_048_576
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class ParallelGraphRunner(DaskGraphRunner):
+    """Runs independent nodes of the graph concurrently.
+
+    Nodes are executed by a pool of threads as soon as all their needs are done, in
+    the order of the execution plan. Threads are used instead of processes as graph
+    components do their heavy lifting in libraries which release the GIL (e.g.
+    TensorFlow or NumPy) and as components, their inputs, and their outputs then
+    don't have to be transferred between processes. Every node writes to its own
+    `Resource` in the `ModelStorage`.
+
+    If a memory budget is given, no further nodes are started while the process
+    uses more memory than the budget, but at least one node is always running.
+
+    Training with more than one worker isn't reproducible even if a `random_seed`
+    is configured: components seed process-global random number generators (e.g.
+    the ones of `random`, `numpy` and TensorFlow) which are then shared by all
+    nodes running at the same time.
+    """
+
+    def __init__(
+        self,
+        graph_schema: GraphSchema,
+        model_storage: ModelStorage,
+        execution_context: ExecutionContext,
+        hooks: Optional[List[GraphNodeHook]] = None,
+        max_workers: int = DEFAULT_TRAINING_WORKERS,
+        memory_budget_in_mb: Optional[float] = None,
+    ) -> None:
+        """Initializes a `ParallelGraphRunner`.
+
+        Args:
+            graph_schema: The graph schema that will be run.
+            model_storage: Storage which graph components can use to persist and load
+                themselves.
+            execution_context: Information about the current graph run to be passed to
+                each node.
+            hooks: These are called before and after the execution of each node.
+            max_workers: Maximum number of concurrently running nodes.
+            memory_budget_in_mb: Memory usage of the process in MiB above which no
+                further nodes are started. `None` for no budget.
+        """
+        super().__init__(graph_schema, model_storage, execution_context, hooks)
+        self._max_workers = max(1, max_workers)
+
+        if self._max_workers > 1 and any(
+            node.config.get(RANDOM_SEED) is not None
+            for node in graph_schema.nodes.values()
+        ):
+            rasa.shared.utils.io.raise_warning(
+                f"Graph nodes are run by {self._max_workers} workers in parallel. "
+                f"Results aren't reproducible even though a '{RANDOM_SEED}' is "
+                f"configured as components seed process-global random number "
+                f"generators which are shared by all workers. Set "
+                f"'{TRAINING_WORKERS_ENV}' to 1 for reproducible results."
+            )
+
+        if memory_budget_in_mb is not None and _memory_usage_in_mb() is None:
+            rasa.shared.utils.io.raise_warning(
+                "The memory budget for running graph nodes in parallel is ignored "
+                "as the memory usage can't be determined on this system. Install "
+                "'psutil' to enable it."
+            )
+            memory_budget_in_mb = None
+        self._memory_budget_in_mb = memory_budget_in_mb
+
+    @classmethod
+    def create(
+        cls,
+        graph_schema: GraphSchema,
+        model_storage: ModelStorage,
+        execution_context: ExecutionContext,
+        hooks: Optional[List[GraphNodeHook]] = None,
+    ) -> ParallelGraphRunner:
+        """Creates the runner (see parent class for full docstring).
+
+        The number of workers and the memory budget are read from the
+        `RASA_TRAINING_WORKERS` and `RASA_TRAINING_MEMORY_BUDGET` (in MiB)
+        environment variables.
+        """
+        memory_budget = os.environ.get(TRAINING_MEMORY_BUDGET_ENV)
+        return cls(
+            graph_schema,
+            model_storage,
+            execution_context,
+            hooks,
+            max_workers=int(
+                os.environ.get(TRAINING_WORKERS_ENV, DEFAULT_TRAINING_WORKERS)
+            ),
+            memory_budget_in_mb=float(memory_budget) if memory_budget else None,
+        )
+
+    def _has_memory_left(self) -> bool:
+        if self._memory_budget_in_mb is None:
+            return True
+
+        memory_usage = _memory_usage_in_mb()
+        return memory_usage is None or memory_usage < self._memory_budget_in_mb
+
+    def run(
+        self,
+        inputs: Optional[Dict[Text, Any]] = None,
+        targets: Optional[List[Text]] = None,
+    ) -> Dict[Text, Any]:
+        """Runs the graph (see parent class for full docstring)."""
+        run_targets = targets if targets else self._graph_schema.target_names
+        plan = self._execution_plan(run_targets)
+
+        values: Dict[Text, Any] = {}
+        if inputs:
+            self._add_inputs_to_graph(inputs, values)
+
+        logger.debug(
+            f"Running graph with inputs: {inputs}, targets: {targets}, "
+            f"{self._max_workers} workers and {self._execution_context}."
+        )
+
+        steps = plan.steps
+        remaining_dependents = plan.remaining_dependents()
+        position_in_plan = {node_name: i for i, (node_name, _) in enumerate(steps)}
+        needs_of_node = dict(steps)
+        pending_needs: Dict[Text, Set[Text]] = {}
+        dependents: Dict[Text, List[Text]] = defaultdict(list)
+        for node_name, needs in steps:
+            pending_needs[node_name] = {
+                need for need in needs if need in position_in_plan
+            }
+            for need in pending_needs[node_name]:
+                dependents[need].append(node_name)
+
+        # positions of the nodes which can run, i.e. all their needs are done
+        ready = [
+            position_in_plan[node_name]
+            for node_name, _ in steps
+            if not pending_needs[node_name]
+        ]
+        running: Dict[Future, Text] = {}
+
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="graph_runner"
+        )
+        try:
+            while ready or running:
+                while (
+                    ready
+                    and len(running) < self._max_workers
+                    and (not running or self._has_memory_left())
+                ):
+                    node_name = steps[ready.pop(0)][0]
+                    # like dask, pass the name of a need if it can't be resolved
+                    future = executor.submit(
+                        self._instantiated_nodes[node_name],
+                        *[values.get(need, need) for need in needs_of_node[node_name]],
+                    )
+                    running[future] = node_name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_name = running.pop(future)
+                    values[node_name] = future.result()
+                    self._release_needs(
+                        needs_of_node[node_name], remaining_dependents, values
+                    )
+
+                    for dependent in dependents[node_name]:
+                        pending_needs[dependent].discard(node_name)
+                        if not pending_needs[dependent]:
+                            bisect.insort(ready, position_in_plan[dependent])
+
+            return dict(values[target] for target in run_targets)
+        except RuntimeError as e:
+            raise GraphRunError("Error running runner.") from e
+        finally:
+            # don't start any further nodes but wait for running ones
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+def graph_runner_class_for_training() -> Type[GraphRunner]:
+    """Returns the graph runner which is used to train models.
+
+    Independent nodes are trained in parallel if `RASA_TRAINING_WORKERS` is set to
+    more than one worker.
+    """
+    workers = int(os.environ.get(TRAINING_WORKERS_ENV, DEFAULT_TRAINING_WORKERS))
+    if workers > 1:
+        return ParallelGraphRunner
+    return DaskGraphRunner
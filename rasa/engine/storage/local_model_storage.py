@@ -1,22 +1,27 @@
 from __future__ import annotations
 
+import json
 import logging
+import os
 import shutil
 import sys
+import tarfile
 import tempfile
+import threading
 import uuid
 from contextlib import contextmanager
 from datetime import datetime
-from pathlib import Path
-from tarsafe import TarSafe
-from typing import Generator, Optional, Text, Tuple, Union
+from pathlib import Path, PurePosixPath
+from tarsafe import TarSafe, TarSafeException
+from typing import Any, Dict, Generator, Iterable, List, Optional, Text, Tuple, Union
 
 import rasa.utils.common
 import rasa.shared.utils.io
 from rasa.engine.storage.storage import ModelMetadata, ModelStorage
 from rasa.engine.graph import GraphModelConfiguration
 from rasa.engine.storage.resource import Resource
-from rasa.exceptions import UnsupportedModelVersionError
+from rasa.exceptions import ModelArchiveChanged, UnsupportedModelVersionError
+from rasa.shared.exceptions import FileNotFoundException
 from rasa.shared.core.domain import Domain
 import rasa.model
 
@@ -26,6 +31,11 @@ logger = logging.getLogger(__name__)
 MODEL_ARCHIVE_COMPONENTS_DIR = "components"
 MODEL_ARCHIVE_METADATA_FILE = "metadata.json"
 
+# Model archives with this suffix aren't compressed so that their resources can be
+# extracted on demand
+UNCOMPRESSED_MODEL_ARCHIVE_SUFFIX = ".tar"
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+
 
 @contextmanager
 def windows_safe_temporary_directory(
@@ -57,11 +67,47 @@ def windows_safe_temporary_directory(
 
 
 class LocalModelStorage(ModelStorage):
-    """Stores and provides output of `GraphComponents` on local disk."""
+    """Stores and provides output of `GraphComponents` on local disk.
+
+    Resources of uncompressed model archives are extracted on demand when they are
+    accessed for the first time. The archive hence has to outlive the storage and
+    must not be modified while it's used.
+    """
 
-    def __init__(self, storage_path: Path) -> None:
-        """Creates storage (see parent class for full docstring)."""
+    def __init__(
+        self,
+        storage_path: Path,
+        model_archive_path: Optional[Path] = None,
+        archived_resources: Optional[Dict[Text, List[tarfile.TarInfo]]] = None,
+        model_archive_stat: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """Creates storage (see parent class for full docstring).
+
+        Args:
+            storage_path: Directory which contains the persisted graph components.
+            model_archive_path: Uncompressed model archive which contains the
+                resources which haven't been extracted yet.
+            archived_resources: Archive members of each resource which wasn't
+                extracted yet.
+            model_archive_stat: Size and modification time of the model archive
+                when `archived_resources` were read from it.
+        """
         self._storage_path = storage_path
+        self._model_archive_path = model_archive_path
+        self._archived_resources = archived_resources or {}
+        self._model_archive_stat = model_archive_stat
+        # resources can be accessed by graph nodes which run in parallel threads
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[Text, Any]:
+        # the storage is pickled when components are sent to other processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[Text, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     @classmethod
     def create(cls, storage_path: Path) -> ModelStorage:
@@ -72,7 +118,12 @@ class LocalModelStorage(ModelStorage):
     def from_model_archive(
         cls, storage_path: Path, model_archive_path: Union[Text, Path]
     ) -> Tuple[LocalModelStorage, ModelMetadata]:
-        """Initializes storage from archive (see parent class for full docstring)."""
+        """Initializes storage from archive (see parent class for full docstring).
+
+        Compressed archives are extracted right away as they can only be read
+        sequentially. Resources of uncompressed archives are extracted when they are
+        accessed for the first time.
+        """
         if next(storage_path.glob("*"), None):
             raise ValueError(
                 f"The model storage with path '{storage_path}' is "
@@ -80,87 +131,207 @@ class LocalModelStorage(ModelStorage):
                 f"empty model storage."
             )
 
-        with windows_safe_temporary_directory() as temporary_directory:
-            temporary_directory_path = Path(temporary_directory)
+        if cls._is_compressed_archive(model_archive_path):
+            with TarSafe.open(model_archive_path, mode="r:gz") as tar:
+                metadata, _ = cls._read_archive(tar, model_archive_path, storage_path)
+            logger.debug(f"Extracted model to '{storage_path}'.")
 
-            cls._extract_archive_to_directory(
-                model_archive_path, temporary_directory_path
-            )
-            logger.debug(f"Extracted model to '{temporary_directory_path}'.")
+            return cls(storage_path), metadata
 
-            cls._initialize_model_storage_from_model_archive(
-                temporary_directory_path, storage_path
-            )
-
-            metadata = cls._load_metadata(temporary_directory_path)
+        model_archive_stat = cls._archive_stat(model_archive_path)
+        with TarSafe.open(model_archive_path, mode="r:") as tar:
+            metadata, archived_resources = cls._read_archive(tar, model_archive_path)
+        logger.debug(
+            f"Indexed {len(archived_resources)} resources of model "
+            f"'{model_archive_path}' for extraction on demand."
+        )
 
-            return (cls(storage_path), metadata)
+        return (
+            cls(
+                storage_path,
+                Path(model_archive_path),
+                archived_resources,
+                model_archive_stat,
+            ),
+            metadata,
+        )
 
     @classmethod
     def metadata_from_archive(
         cls, model_archive_path: Union[Text, Path]
     ) -> ModelMetadata:
-        """Retrieves metadata from archive (see parent class for full docstring)."""
-        with windows_safe_temporary_directory() as temporary_directory:
-            temporary_directory_path = Path(temporary_directory)
+        """Retrieves metadata from archive (see parent class for full docstring).
+
+        The archive is only read up to the metadata which is the first member of
+        archives of the current format.
+        """
+        with TarSafe.open(model_archive_path, mode="r:*") as tar:
+            for member in tar:
+                cls._assert_not_rasa2_member(tar, member)
+                if cls._path_in_archive(member) == PurePosixPath(
+                    MODEL_ARCHIVE_METADATA_FILE
+                ):
+                    return cls._load_metadata(tar, member)
+
+        raise FileNotFoundException(
+            f"Model archive '{model_archive_path}' doesn't contain a "
+            f"'{MODEL_ARCHIVE_METADATA_FILE}' file."
+        )
+
+    @staticmethod
+    def _archive_stat(model_archive_path: Union[Text, Path]) -> Tuple[int, int]:
+        stat = os.stat(model_archive_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _is_compressed_archive(model_archive_path: Union[Text, Path]) -> bool:
+        with open(model_archive_path, "rb") as archive:
+            return archive.read(len(GZIP_MAGIC_NUMBER)) == GZIP_MAGIC_NUMBER
 
-            cls._extract_archive_to_directory(
-                model_archive_path, temporary_directory_path
+    @classmethod
+    def _read_archive(
+        cls,
+        tar: TarSafe,
+        model_archive_path: Union[Text, Path],
+        extraction_directory: Optional[Path] = None,
+    ) -> Tuple[ModelMetadata, Dict[Text, List[tarfile.TarInfo]]]:
+        """Reads the model metadata and the resources in a single pass.
+
+        Args:
+            tar: The opened model archive.
+            model_archive_path: The path to the model archive.
+            extraction_directory: If given, the resources are extracted to this
+                directory. Otherwise, their archive members are collected.
+
+        Returns:
+            The model metadata and the archive members of each resource which wasn't
+            extracted.
+        """
+        metadata = None
+        archived_resources: Dict[Text, List[tarfile.TarInfo]] = {}
+
+        for member in tar:
+            cls._assert_not_rasa2_member(tar, member)
+
+            path = cls._path_in_archive(member)
+            if path == PurePosixPath(MODEL_ARCHIVE_METADATA_FILE):
+                metadata = cls._load_metadata(tar, member)
+            elif len(path.parts) > 1 and path.parts[0] == MODEL_ARCHIVE_COMPONENTS_DIR:
+                if extraction_directory:
+                    cls._extract_member(tar, member, extraction_directory)
+                else:
+                    archived_resources.setdefault(path.parts[1], []).append(member)
+
+        if metadata is None:
+            raise FileNotFoundException(
+                f"Model archive '{model_archive_path}' doesn't contain a "
+                f"'{MODEL_ARCHIVE_METADATA_FILE}' file."
             )
-            metadata = cls._load_metadata(temporary_directory_path)
 
-            return metadata
+        return metadata, archived_resources
 
     @staticmethod
-    def _extract_archive_to_directory(
-        model_archive_path: Union[Text, Path], temporary_directory: Path
+    def _path_in_archive(member: tarfile.TarInfo) -> PurePosixPath:
+        return PurePosixPath(member.name)
+
+    @classmethod
+    def _extract_member(
+        cls, tar: TarSafe, member: tarfile.TarInfo, storage_path: Path
     ) -> None:
-        with TarSafe.open(model_archive_path, mode="r:gz") as tar:
-            if sys.platform == "win32":
-                # on Windows by default there is a restriction on long
-                # path names; using the prefix below allows to bypass
-                # this restriction in environments where it's not possible
-                # to override this behavior, mostly for internal policy reasons
-                # reference: https://stackoverflow.com/a/49102229
-                tar.extractall(f"\\\\?\\{temporary_directory}")
-            else:
-                tar.extractall(temporary_directory)
-        LocalModelStorage._assert_not_rasa2_archive(temporary_directory)
+        """Extracts a member of the components directory to the model storage."""
+        relative_path = PurePosixPath(*cls._path_in_archive(member).parts[1:])
+        if ".." in relative_path.parts:
+            raise TarSafeException(
+                f"Attempted directory traversal for member: {member.name}"
+            )
 
-    @staticmethod
-    def _assert_not_rasa2_archive(temporary_directory: Union[Text, Path]) -> None:
-        fingerprint_file = Path(temporary_directory) / "fingerprint.json"
-        if fingerprint_file.is_file():
-            serialized_fingerprint = rasa.shared.utils.io.read_json_file(
-                fingerprint_file
+        target = storage_path.joinpath(*relative_path.parts)
+        if sys.platform == "win32":
+            # on Windows by default there is a restriction on long
+            # path names; using the prefix below allows to bypass
+            # this restriction in environments where it's not possible
+            # to override this behavior, mostly for internal policy reasons
+            # reference: https://stackoverflow.com/a/49102229
+            target = Path(f"\\\\?\\{target}")
+
+        if member.isdir():
+            target.mkdir(parents=True, exist_ok=True)
+        elif member.isfile():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with tar.extractfile(member) as source, open(target, "wb") as file:
+                shutil.copyfileobj(source, file)
+        else:
+            raise TarSafeException(
+                f"Model archives can only contain files and directories but "
+                f"'{member.name}' is neither."
             )
+
+    @staticmethod
+    def _assert_not_rasa2_member(tar: TarSafe, member: tarfile.TarInfo) -> None:
+        if LocalModelStorage._path_in_archive(member) == PurePosixPath(
+            "fingerprint.json"
+        ):
+            serialized_fingerprint = json.loads(tar.extractfile(member).read())
             raise UnsupportedModelVersionError(
                 model_version=serialized_fingerprint["version"]
             )
 
     @staticmethod
-    def _initialize_model_storage_from_model_archive(
-        temporary_directory: Path, storage_path: Path
-    ) -> None:
-        for path in (temporary_directory / MODEL_ARCHIVE_COMPONENTS_DIR).glob("*"):
-            shutil.move(str(path), str(storage_path))
-
-    @staticmethod
-    def _load_metadata(directory: Path) -> ModelMetadata:
-        serialized_metadata = rasa.shared.utils.io.read_json_file(
-            directory / MODEL_ARCHIVE_METADATA_FILE
-        )
+    def _load_metadata(tar: TarSafe, member: tarfile.TarInfo) -> ModelMetadata:
+        serialized_metadata = json.loads(tar.extractfile(member).read())
 
         return ModelMetadata.from_dict(serialized_metadata)
 
+    def _extract_resources(self, resource_names: Iterable[Text]) -> None:
+        """Extracts resources from the model archive if they weren't extracted yet."""
+        with self._lock:
+            archived_resource_names = [
+                resource_name
+                for resource_name in resource_names
+                if resource_name in self._archived_resources
+            ]
+            if not archived_resource_names:
+                return
+
+            self._assert_archive_unchanged()
+            members = [
+                member
+                for resource_name in archived_resource_names
+                for member in self._archived_resources.pop(resource_name)
+            ]
+
+            with TarSafe.open(self._model_archive_path, mode="r:") as tar:
+                for member in members:
+                    self._extract_member(tar, member, self._storage_path)
+
+    def _assert_archive_unchanged(self) -> None:
+        """Makes sure that the archive members still point to the right content."""
+        try:
+            model_archive_stat = self._archive_stat(self._model_archive_path)
+        except FileNotFoundError:
+            raise ModelArchiveChanged(
+                f"The model archive '{self._model_archive_path}' was removed while "
+                f"the model was loaded from it. Model archives which end with "
+                f"'{UNCOMPRESSED_MODEL_ARCHIVE_SUFFIX}' have to exist as long as "
+                f"the model is used."
+            )
+
+        if model_archive_stat != self._model_archive_stat:
+            raise ModelArchiveChanged(
+                f"The model archive '{self._model_archive_path}' was modified while "
+                f"the model was loaded from it. Model archives which end with "
+                f"'{UNCOMPRESSED_MODEL_ARCHIVE_SUFFIX}' must not be overwritten as "
+                f"long as the model is used. Please load the model again."
+            )
+
     @contextmanager
     def write_to(self, resource: Resource) -> Generator[Path, None, None]:
         """Persists data for a resource (see parent class for full docstring)."""
         logger.debug(f"Resource '{resource.name}' was requested for writing.")
         directory = self._directory_for_resource(resource)
 
-        if not directory.exists():
-            directory.mkdir()
+        self._extract_resources([resource.name])
+        directory.mkdir(exist_ok=True)
 
         yield directory
 
@@ -175,6 +346,7 @@ class LocalModelStorage(ModelStorage):
         logger.debug(f"Resource '{resource.name}' was requested for reading.")
         directory = self._directory_for_resource(resource)
 
+        self._extract_resources([resource.name])
         if not directory.exists():
             raise ValueError(
                 f"Resource '{resource.name}' does not exist. Please make "
@@ -193,17 +365,21 @@ class LocalModelStorage(ModelStorage):
         model_configuration: GraphModelConfiguration,
         domain: Domain,
     ) -> ModelMetadata:
-        """Creates model package (see parent class for full docstring)."""
+        """Creates model package (see parent class for full docstring).
+
+        The metadata is the first member of the archive so that it can be read
+        without reading the whole archive. Archives with the `.tar` suffix aren't
+        compressed so that their resources can be extracted on demand when the model
+        is loaded.
+        """
         logger.debug(f"Start to created model package for path '{model_archive_path}'.")
 
+        self._extract_resources(list(self._archived_resources))
+
         with windows_safe_temporary_directory() as temp_dir:
 
             temporary_directory = Path(temp_dir)
 
-            shutil.copytree(
-                self._storage_path, temporary_directory / MODEL_ARCHIVE_COMPONENTS_DIR
-            )
-
             model_metadata = self._create_model_metadata(domain, model_configuration)
             self._persist_metadata(model_metadata, temporary_directory)
 
@@ -213,8 +389,16 @@ class LocalModelStorage(ModelStorage):
             if not model_archive_path.parent.exists():
                 model_archive_path.parent.mkdir(parents=True)
 
-            with TarSafe.open(model_archive_path, "w:gz") as tar:
-                tar.add(temporary_directory, arcname="")
+            mode = "w:gz"
+            if model_archive_path.suffix == UNCOMPRESSED_MODEL_ARCHIVE_SUFFIX:
+                mode = "w"
+
+            with TarSafe.open(model_archive_path, mode) as tar:
+                tar.add(
+                    temporary_directory / MODEL_ARCHIVE_METADATA_FILE,
+                    arcname=MODEL_ARCHIVE_METADATA_FILE,
+                )
+                tar.add(self._storage_path, arcname=MODEL_ARCHIVE_COMPONENTS_DIR)
 
         logger.debug(f"Model package created in path '{model_archive_path}'.")
 
@@ -1,5 +1,7 @@
+import functools
 import inspect
 import logging
+import threading
 from typing import Any, Dict, Text, Type
 from typing_extensions import Protocol, runtime_checkable
 import pkg_resources
@@ -11,6 +13,25 @@ logger = logging.getLogger(__name__)
 
 import_name_to_package_map = {"sklearn": "scikit_learn"}
 
+# `inspect.getsource` parses source files with `ast` which isn't thread-safe in all
+# Python versions, but nodes may be fingerprinted in parallel threads
+_source_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _component_source(graph_component_class: Type[GraphComponent]) -> Text:
+    """Returns the source code of a component class which is looked up once."""
+    with _source_lock:
+        return inspect.getsource(graph_component_class)
+
+
+@functools.lru_cache(maxsize=None)
+def _package_version(package: Text) -> Text:
+    """Returns the installed version of a package which is looked up once."""
+    return pkg_resources.get_distribution(
+        import_name_to_package_map.get(package, package)
+    ).version
+
 
 @runtime_checkable
 class Fingerprintable(Protocol):
@@ -37,16 +58,19 @@ def calculate_fingerprint_key(
         The fingerprint key.
     """
     dependency_versions = {
-        package: pkg_resources.get_distribution(
-            import_name_to_package_map.get(package, package)
-        ).version
+        package: _package_version(package)
         for package in graph_component_class.required_packages()
     }
     fingerprint_data = {
         "node_name": rasa.utils.common.module_path_from_class(graph_component_class),
-        "component_implementation": inspect.getsource(graph_component_class),
+        "component_implementation": _component_source(graph_component_class),
         "config": config,
-        "inputs": inputs,
+        # inputs are represented by their own fingerprint so that the cached output
+        # fingerprints of the fingerprint run match the actual inputs of training
+        "inputs": {
+            name: rasa.shared.utils.io.deep_container_fingerprint(value)
+            for name, value in inputs.items()
+        },
         "dependency_versions": dependency_versions,
     }
 
@@ -104,6 +104,8 @@ class GraphTrainer:
 
         graph_runner.run(inputs={PLACEHOLDER_IMPORTER: importer})
 
+        logger.debug(f"Training cache statistics: {self._cache.statistics}.")
+
         return self._model_storage.create_model_package(
             output_filename, model_configuration, domain
         )
@@ -34,6 +34,10 @@ class ModelNotFound(RasaException):
     """Raised when a model is not found in the path provided by the user."""
 
 
+class ModelArchiveChanged(RasaException):
+    """Raised when a model archive changed while resources are read from it."""
+
+
 class NoEventsToMigrateError(RasaException):
     """Raised when no events to be migrated are found."""
 
@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 
 # TODO: rename this whole module.
 
+# Model archives with the `.tar` suffix aren't compressed
+MODEL_ARCHIVE_SUFFIXES = (".tar.gz", ".tar")
+
 
 def get_local_model(model_path: Text = DEFAULT_MODELS_PATH) -> Text:
     """Returns verified path to local model archive.
@@ -43,7 +46,7 @@ def get_local_model(model_path: Text = DEFAULT_MODELS_PATH) -> Text:
                 f"Could not find any Rasa model files in '{model_path}'."
             )
         model_path = file_model_path
-    elif not model_path.endswith(".tar.gz"):
+    elif not model_path.endswith(MODEL_ARCHIVE_SUFFIXES):
         raise ModelNotFound(f"Path '{model_path}' does not point to a Rasa model file.")
 
     return model_path
@@ -65,7 +68,11 @@ def get_latest_model(model_path: Text = DEFAULT_MODELS_PATH) -> Optional[Text]:
     if not os.path.exists(model_path) or os.path.isfile(model_path):
         model_path = os.path.dirname(model_path)
 
-    list_of_files = glob.glob(os.path.join(model_path, "*.tar.gz"))
+    list_of_files = [
+        model_file
+        for suffix in MODEL_ARCHIVE_SUFFIXES
+        for model_file in glob.glob(os.path.join(model_path, f"*{suffix}"))
+    ]
 
     if len(list_of_files) == 0:
         return None
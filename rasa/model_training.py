@@ -5,9 +5,9 @@ from typing import Text, NamedTuple, Optional, List, Union, Dict, Any
 import randomname
 
 import rasa.engine.validation
-from rasa.engine.caching import LocalTrainingCache
+import rasa.engine.caching
 from rasa.engine.recipes.recipe import Recipe
-from rasa.engine.runner.dask import DaskGraphRunner
+import rasa.engine.runner.parallel
 from rasa.engine.storage.local_model_storage import LocalModelStorage
 from rasa.engine.storage.storage import ModelStorage
 from rasa.engine.training.components import FingerprintStatus
@@ -270,8 +270,12 @@ def _train_graph(
         model_storage = _create_model_storage(
             is_finetuning, model_to_finetune, Path(temp_model_dir)
         )
-        cache = LocalTrainingCache()
-        trainer = GraphTrainer(model_storage, cache, DaskGraphRunner)
+        cache = rasa.engine.caching.create_training_cache()
+        trainer = GraphTrainer(
+            model_storage,
+            cache,
+            rasa.engine.runner.parallel.graph_runner_class_for_training(),
+        )
 
         if dry_run:
             fingerprint_status = trainer.fingerprint(
@@ -317,7 +321,7 @@ def _determine_model_name(
 ) -> Text:
     if fixed_model_name:
         model_file = Path(fixed_model_name)
-        if not model_file.name.endswith(".tar.gz"):
+        if not model_file.name.endswith(rasa.model.MODEL_ARCHIVE_SUFFIXES):
             return model_file.with_suffix(".tar.gz").name
 
         return fixed_model_name
@@ -1,10 +1,16 @@
 from __future__ import annotations
+import copy
 import time
 import json
 import logging
 import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import Any, List, Optional, Text, Dict
+from requests.adapters import HTTPAdapter
+from typing import Any, List, Optional, Text, Dict, Tuple
 
 import rasa.utils.endpoints as endpoints_utils
 from rasa.engine.graph import GraphComponent, ExecutionContext
@@ -55,6 +61,207 @@ def convert_duckling_format_to_rasa(
     return extracted
 
 
+class DucklingHTTPClient:
+    """Sends parse requests to a duckling server.
+
+    Requests reuse pooled keep-alive connections, batches of texts are parsed
+    concurrently, and successful responses are cached for `cache_ttl` seconds.
+    Call `close` once the client isn't used anymore.
+    """
+
+    def __init__(
+        self,
+        url: Text,
+        timeout: Optional[float] = None,
+        max_connections: int = 10,
+        cache_size: int = 1000,
+        cache_ttl: float = 60,
+        reference_time_bucket: float = 1,
+    ) -> None:
+        """Creates the client.
+
+        Args:
+            url: URL of the duckling server.
+            timeout: Timeout of a single request in seconds.
+            max_connections: Maximum number of pooled connections and concurrent
+                requests.
+            cache_size: Maximum number of cached responses. `0` disables the cache.
+            cache_ttl: Number of seconds a response is cached.
+            reference_time_bucket: Width of the time windows in seconds which share
+                cached responses. Reference times are rounded down to the start of
+                their window.
+        """
+        self.parse_url = endpoints_utils.concat_url(url, "/parse")
+        self.timeout = timeout
+        self.max_connections = max(1, max_connections)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.reference_time_bucket_in_ms = max(1, int(reference_time_bucket * 1000))
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self._cache: OrderedDict[
+            Tuple, Tuple[float, List[Dict[Text, Any]]]
+        ] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def parse(self, payload: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        """Parses a text with duckling.
+
+        Args:
+            payload: Form data of the request, including the `text` and the
+                `reftime` in milliseconds.
+
+        Returns:
+            JSON response from duckling server with parse data.
+        """
+        if not self.cache_size:
+            return self._request(payload) or []
+
+        payload = self._with_bucketed_reference_time(payload)
+        cache_key = self._cache_key(payload)
+        matches = self._cached(cache_key)
+        if matches is None:
+            matches = self._request(payload)
+            if matches is None:
+                # don't cache failures so that the request is retried next time
+                return []
+            self._add_to_cache(cache_key, matches)
+        return matches
+
+    def parse_batch(
+        self, payloads: List[Dict[Text, Any]]
+    ) -> List[List[Dict[Text, Any]]]:
+        """Parses several texts concurrently.
+
+        Args:
+            payloads: Form data of the requests.
+
+        Returns:
+            The responses in the order of `payloads`.
+        """
+        unique_payloads: List[Dict[Text, Any]] = []
+        positions: List[int] = []
+        positions_by_key: Dict[Tuple, int] = {}
+        for payload in payloads:
+            if not self.cache_size:
+                positions.append(len(unique_payloads))
+                unique_payloads.append(payload)
+                continue
+
+            # texts which appear repeatedly in the batch are only sent once
+            cache_key = self._cache_key(self._with_bucketed_reference_time(payload))
+            if cache_key not in positions_by_key:
+                positions_by_key[cache_key] = len(unique_payloads)
+                unique_payloads.append(payload)
+            positions.append(positions_by_key[cache_key])
+
+        if len(unique_payloads) <= 1:
+            results = [self.parse(payload) for payload in unique_payloads]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_connections, thread_name_prefix="duckling"
+                )
+                # stop the threads if the client is discarded without being closed
+                weakref.finalize(self, self._executor.shutdown, wait=False)
+            results = list(self._executor.map(self.parse, unique_payloads))
+
+        return [copy.deepcopy(results[position]) for position in positions]
+
+    def close(self) -> None:
+        """Stops the threads and closes the connections of the client."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._session.close()
+
+    @staticmethod
+    def _cache_key(payload: Dict[Text, Any]) -> Tuple:
+        return tuple(sorted((key, str(value)) for key, value in payload.items()))
+
+    def _with_bucketed_reference_time(
+        self, payload: Dict[Text, Any]
+    ) -> Dict[Text, Any]:
+        reference_time = payload.get("reftime")
+        if reference_time is None:
+            return payload
+
+        reference_time = int(reference_time)
+        return {
+            **payload,
+            "reftime": reference_time
+            - reference_time % self.reference_time_bucket_in_ms,
+        }
+
+    def _cached(self, cache_key: Tuple) -> Optional[List[Dict[Text, Any]]]:
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is None:
+                return None
+
+            expires_at, matches = cached
+            if expires_at < time.monotonic():
+                del self._cache[cache_key]
+                return None
+
+            self._cache.move_to_end(cache_key)
+            # callers modify the parsed matches
+            return copy.deepcopy(matches)
+
+    def _add_to_cache(self, cache_key: Tuple, matches: List[Dict[Text, Any]]) -> None:
+        with self._cache_lock:
+            self._cache[cache_key] = (
+                time.monotonic() + self.cache_ttl,
+                copy.deepcopy(matches),
+            )
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _request(self, payload: Dict[Text, Any]) -> Optional[List[Dict[Text, Any]]]:
+        """Sends the request to the duckling server.
+
+        Returns:
+            The parse data or `None` if the request failed.
+        """
+        try:
+            headers = {
+                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
+            }
+            response = self._session.post(
+                self.parse_url, data=payload, headers=headers, timeout=self.timeout
+            )
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(
+                    f"Failed to get a proper response from remote "
+                    f"duckling at '{self.parse_url}. "
+                    f"Status Code: {response.status_code}. "
+                    f"Response: {response.text}"
+                )
+                return None
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ReadTimeout,
+        ) as e:
+            logger.error(
+                "Failed to connect to duckling http server. Make sure "
+                "the duckling server is running/healthy/not stale and the proper host "
+                "and port are set in the configuration. More "
+                "information on how to run the server can be found on "
+                "github: "
+                "https://github.com/facebook/duckling#quickstart "
+                "Error: {}".format(e)
+            )
+            return None
+
+
 @DefaultV1Recipe.register(
     DefaultV1Recipe.ComponentType.ENTITY_EXTRACTOR, is_trainable=False
 )
@@ -80,6 +287,17 @@ class DucklingEntityExtractor(GraphComponent, EntityExtractorMixin):
             # duckling server. If not set the default timeout of duckling HTTP URL
             # is set to 3 seconds.
             "timeout": 3,
+            # maximum number of concurrent requests and pooled connections to the
+            # duckling server
+            "max_connections": 10,
+            # number of cached duckling responses, 0 disables the cache
+            "cache_size": 1000,
+            # number of seconds a duckling response is cached
+            "cache_ttl": 60,
+            # messages whose reference times fall into the same window of this many
+            # seconds share cached responses; relative expressions are resolved
+            # relative to the start of the window
+            "reference_time_bucket": 1,
         }
 
     def __init__(self, config: Dict[Text, Any]) -> None:
@@ -89,6 +307,7 @@ class DucklingEntityExtractor(GraphComponent, EntityExtractorMixin):
             config: The extractor's config.
         """
         self.component_config = config
+        self._client: Optional[DucklingHTTPClient] = None
 
     @classmethod
     def create(
@@ -118,6 +337,26 @@ class DucklingEntityExtractor(GraphComponent, EntityExtractorMixin):
             "reftime": reference_time,
         }
 
+    def _duckling_client(self) -> DucklingHTTPClient:
+        """Returns the client for the configured duckling server."""
+        url = self._url()
+        if self._client is None or self._client.parse_url != (
+            endpoints_utils.concat_url(url, "/parse")
+        ):
+            if self._client is not None:
+                self._client.close()
+
+            config = {**self.get_default_config(), **self.component_config}
+            self._client = DucklingHTTPClient(
+                url,
+                timeout=config.get("timeout"),
+                max_connections=config["max_connections"],
+                cache_size=config["cache_size"],
+                cache_ttl=config["cache_ttl"],
+                reference_time_bucket=config["reference_time_bucket"],
+            )
+        return self._client
+
     def _duckling_parse(self, text: Text, reference_time: int) -> List[Dict[Text, Any]]:
         """Sends the request to the duckling server and parses the result.
 
@@ -128,42 +367,7 @@ class DucklingEntityExtractor(GraphComponent, EntityExtractorMixin):
         Returns:
             JSON response from duckling server with parse data.
         """
-        parse_url = endpoints_utils.concat_url(self._url(), "/parse")
-        try:
-            payload = self._payload(text, reference_time)
-            headers = {
-                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
-            }
-            response = requests.post(
-                parse_url,
-                data=payload,
-                headers=headers,
-                timeout=self.component_config.get("timeout"),
-            )
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(
-                    f"Failed to get a proper response from remote "
-                    f"duckling at '{parse_url}. "
-                    f"Status Code: {response.status_code}. "
-                    f"Response: {response.text}"
-                )
-                return []
-        except (
-            requests.exceptions.ConnectionError,
-            requests.exceptions.ReadTimeout,
-        ) as e:
-            logger.error(
-                "Failed to connect to duckling http server. Make sure "
-                "the duckling server is running/healthy/not stale and the proper host "
-                "and port are set in the configuration. More "
-                "information on how to run the server can be found on "
-                "github: "
-                "https://github.com/facebook/duckling#quickstart "
-                "Error: {}".format(e)
-            )
-            return []
+        return self._duckling_client().parse(self._payload(text, reference_time))
 
     @staticmethod
     def _reference_time_from_message(message: Message) -> int:
@@ -192,9 +396,13 @@ class DucklingEntityExtractor(GraphComponent, EntityExtractorMixin):
             )
             return messages
 
-        for message in messages:
-            reference_time = self._reference_time_from_message(message)
-            matches = self._duckling_parse(message.get(TEXT), reference_time)
+        payloads = [
+            self._payload(message.get(TEXT), self._reference_time_from_message(message))
+            for message in messages
+        ]
+        all_matches = self._duckling_client().parse_batch(payloads)
+
+        for message, matches in zip(messages, all_matches):
             all_extracted = convert_duckling_format_to_rasa(matches)
             dimensions = self.component_config["dimensions"]
             extracted = self.filter_irrelevant_entities(all_extracted, dimensions)
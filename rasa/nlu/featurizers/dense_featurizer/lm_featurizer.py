@@ -78,6 +78,9 @@ class LanguageModelFeaturizer(DenseFeaturizer, GraphComponent):
             # an optional path to a specific directory to download
             # and cache the pre-trained model weights.
             "cache_dir": None,
+            # maximum number of messages which are fed to the language model at
+            # once. Messages are grouped into batches of similar length.
+            "batch_size": 64,
         }
 
     @classmethod
@@ -660,6 +663,8 @@ class LanguageModelFeaturizer(DenseFeaturizer, GraphComponent):
 
     def _get_docs_for_batch(
         self,
+        batch_tokens: List[List[Token]],
+        batch_token_ids: List[List[int]],
         batch_examples: List[Message],
         attribute: Text,
         inference_mode: bool = False,
@@ -667,20 +672,17 @@ class LanguageModelFeaturizer(DenseFeaturizer, GraphComponent):
         """Computes language model docs for all examples in the batch.
 
         Args:
+            batch_tokens: List of token objects for each example in the batch.
+            batch_token_ids: List of token ids of each example in the batch.
             batch_examples: Batch of message objects for which language model docs
             need to be computed.
             attribute: Property of message to be processed, one of ``TEXT`` or
             ``RESPONSE``.
             inference_mode: Whether the call is during inference or during training.
 
-
         Returns:
             List of language model docs for each message in batch.
         """
-        batch_tokens, batch_token_ids = self._get_token_ids_for_batch(
-            batch_examples, attribute
-        )
-
         (
             batch_sentence_features,
             batch_sequence_features,
@@ -700,6 +702,45 @@ class LanguageModelFeaturizer(DenseFeaturizer, GraphComponent):
 
         return batch_docs
 
+    def _get_docs_in_length_buckets(
+        self, examples: List[Message], attribute: Text, inference_mode: bool = False
+    ) -> List[Dict[Text, Any]]:
+        """Computes language model docs for all examples in length-bucketed batches.
+
+        Examples are sorted by their number of language model tokens before they are
+        split into batches of at most `batch_size` examples. This keeps the padding
+        which is fed to the language model small.
+
+        Args:
+            examples: Message objects for which language model docs need to be
+            computed.
+            attribute: Property of message to be processed, one of ``TEXT`` or
+            ``RESPONSE``.
+            inference_mode: Whether the call is during inference or during training.
+
+        Returns:
+            List of language model docs for each message in the order of `examples`.
+        """
+        tokens, token_ids = self._get_token_ids_for_batch(examples, attribute)
+
+        order = sorted(range(len(examples)), key=lambda index: len(token_ids[index]))
+        batch_size = max(1, self._config["batch_size"])
+
+        docs: List[Dict[Text, Any]] = [{} for _ in examples]
+        for batch_start_index in range(0, len(order), batch_size):
+            batch_indices = order[batch_start_index : batch_start_index + batch_size]
+            batch_docs = self._get_docs_for_batch(
+                [tokens[index] for index in batch_indices],
+                [token_ids[index] for index in batch_indices],
+                [examples[index] for index in batch_indices],
+                attribute,
+                inference_mode,
+            )
+            for index, doc in zip(batch_indices, batch_docs):
+                docs[index] = doc
+
+        return docs
+
     def process_training_data(self, training_data: TrainingData) -> TrainingData:
         """Computes tokens and dense features for each message in training data.
 
@@ -707,55 +748,35 @@ class LanguageModelFeaturizer(DenseFeaturizer, GraphComponent):
             training_data: NLU training data to be tokenized and featurized
             config: NLU pipeline config consisting of all components.
         """
-        batch_size = 64
-
         for attribute in DENSE_FEATURIZABLE_ATTRIBUTES:
-
-            non_empty_examples = list(
-                filter(lambda x: x.get(attribute), training_data.training_examples)
-            )
-
-            batch_start_index = 0
-
-            while batch_start_index < len(non_empty_examples):
-
-                batch_end_index = min(
-                    batch_start_index + batch_size, len(non_empty_examples)
-                )
-                # Collect batch examples
-                batch_messages = non_empty_examples[batch_start_index:batch_end_index]
-
-                # Construct a doc with relevant features
-                # extracted(tokens, dense_features)
-                batch_docs = self._get_docs_for_batch(batch_messages, attribute)
-
-                for index, ex in enumerate(batch_messages):
-                    self._set_lm_features(batch_docs[index], ex, attribute)
-                batch_start_index += batch_size
+            self._featurize_attribute(training_data.training_examples, attribute)
 
         return training_data
 
     def process(self, messages: List[Message]) -> List[Message]:
         """Processes messages by computing tokens and dense features."""
-        for message in messages:
-            self._process_message(message)
-        return messages
-
-    def _process_message(self, message: Message) -> Message:
-        """Processes a message by computing tokens and dense features."""
         # processing featurizers operates only on TEXT and ACTION_TEXT attributes,
         # because all other attributes are labels which are featurized during
         # training and their features are stored by the model itself.
-        for attribute in {TEXT, ACTION_TEXT}:
-            if message.get(attribute):
-                self._set_lm_features(
-                    self._get_docs_for_batch(
-                        [message], attribute=attribute, inference_mode=True
-                    )[0],
-                    message,
-                    attribute,
-                )
-        return message
+        for attribute in (TEXT, ACTION_TEXT):
+            self._featurize_attribute(messages, attribute, inference_mode=True)
+        return messages
+
+    def _featurize_attribute(
+        self, messages: List[Message], attribute: Text, inference_mode: bool = False
+    ) -> None:
+        """Adds dense features of `attribute` to all messages which have it."""
+        non_empty_examples = [message for message in messages if message.get(attribute)]
+        if not non_empty_examples:
+            return
+
+        # Construct a doc with relevant features
+        # extracted(tokens, dense_features)
+        docs = self._get_docs_in_length_buckets(
+            non_empty_examples, attribute, inference_mode
+        )
+        for doc, message in zip(docs, non_empty_examples):
+            self._set_lm_features(doc, message, attribute)
 
     def _set_lm_features(
         self, doc: Dict[Text, Any], message: Message, attribute: Text = TEXT
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import logging
-import re
 from typing import Any, Dict, List, Optional, Text, Tuple, Type
 import numpy as np
 import scipy.sparse
@@ -75,6 +74,9 @@ class RegexFeaturizer(SparseFeaturizer, GraphComponent):
         self.known_patterns = known_patterns if known_patterns else []
         self.case_sensitive = config["case_sensitive"]
         self.finetune_mode = execution_context.is_finetuning
+        self._pattern_matcher = pattern_utils.PatternMatcher(
+            self.known_patterns, self.case_sensitive
+        )
 
     @classmethod
     def create(
@@ -125,6 +127,9 @@ class RegexFeaturizer(SparseFeaturizer, GraphComponent):
             self._merge_new_patterns(patterns_from_data)
         else:
             self.known_patterns = patterns_from_data
+        self._pattern_matcher = pattern_utils.PatternMatcher(
+            self.known_patterns, self.case_sensitive
+        )
 
         self._persist()
         return self._resource
@@ -191,10 +196,6 @@ class RegexFeaturizer(SparseFeaturizer, GraphComponent):
             # nothing to featurize
             return None, None
 
-        flags = 0  # default flag
-        if not self.case_sensitive:
-            flags = re.IGNORECASE
-
         sequence_length = len(tokens)
 
         num_patterns = len(self.known_patterns)
@@ -202,25 +203,42 @@ class RegexFeaturizer(SparseFeaturizer, GraphComponent):
         sequence_features = np.zeros([sequence_length, num_patterns])
         sentence_features = np.zeros([1, num_patterns])
 
+        token_starts = [t.start for t in tokens]
+        token_ends = [t.end for t in tokens]
+        tokens_are_sorted = all(
+            token_starts[i] <= token_starts[i + 1]
+            and token_ends[i] <= token_ends[i + 1]
+            for i in range(sequence_length - 1)
+        )
+
+        matches = self._pattern_matcher.matches(message.get(attribute))
         for pattern_index, pattern in enumerate(self.known_patterns):
-            matches = list(
-                re.finditer(pattern["pattern"], message.get(attribute), flags=flags)
-            )
+            matched_token_indices = set()
+            for start, end in matches[pattern_index]:
+                if tokens_are_sorted:
+                    matched_token_indices.update(
+                        pattern_utils.overlapping_tokens(
+                            token_starts, token_ends, start, end
+                        )
+                    )
+                else:
+                    matched_token_indices.update(
+                        token_index
+                        for token_index, t in enumerate(tokens)
+                        if t.start < end and t.end > start
+                    )
 
             for token_index, t in enumerate(tokens):
                 patterns = t.get("pattern", default={})
-                patterns[pattern["name"]] = False
-
-                for match in matches:
-                    if t.start < match.end() and t.end > match.start():
-                        patterns[pattern["name"]] = True
-                        sequence_features[token_index][pattern_index] = 1.0
-                        if attribute in [RESPONSE, TEXT, ACTION_TEXT]:
-                            # sentence vector should contain all patterns
-                            sentence_features[0][pattern_index] = 1.0
-
+                patterns[pattern["name"]] = token_index in matched_token_indices
                 t.set("pattern", patterns)
 
+            for token_index in matched_token_indices:
+                sequence_features[token_index][pattern_index] = 1.0
+                if attribute in [RESPONSE, TEXT, ACTION_TEXT]:
+                    # sentence vector should contain all patterns
+                    sentence_features[0][pattern_index] = 1.0
+
         return (
             scipy.sparse.coo_matrix(sequence_features),
             scipy.sparse.coo_matrix(sentence_features),
@@ -1,5 +1,6 @@
+import bisect
 import re
-from typing import Dict, List, Text, Union
+from typing import Dict, List, Optional, Pattern, Text, Tuple, Union
 
 import rasa.shared.utils.io
 from rasa.shared.nlu.training_data.training_data import TrainingData
@@ -166,3 +167,244 @@ def extract_patterns(
             )
 
     return patterns
+
+
+# Characters which `re.IGNORECASE` considers equal although their lowercase forms
+# differ. Each group is mapped to its first character when folding the case.
+_CASE_INSENSITIVE_EQUIVALENCES = (
+    "i\u0131",
+    "s\u017f",
+    "\u00b5\u03bc",
+    "\u0345\u03b9\u1fbe",
+    "\u0390\u1fd3",
+    "\u03b0\u1fe3",
+    "\u03b2\u03d0",
+    "\u03b5\u03f5",
+    "\u03b8\u03d1",
+    "\u03ba\u03f0",
+    "\u03c0\u03d6",
+    "\u03c1\u03f1",
+    "\u03c2\u03c3",
+    "\u03c6\u03d5",
+    "\u1e61\u1e9b",
+    "\ufb05\ufb06",
+)
+_FOLDED_CHARACTERS = {
+    character: group[0]
+    for group in _CASE_INSENSITIVE_EQUIVALENCES
+    for character in group
+}
+
+
+def _fold_character(character: Text) -> Text:
+    folded = _FOLDED_CHARACTERS.get(character)
+    if folded is None:
+        # `re` lowercases single characters, so e.g. "İ" becomes "i" and not "i̇"
+        lowercased = character.lower()[0]
+        folded = _FOLDED_CHARACTERS.get(lowercased, lowercased)
+        _FOLDED_CHARACTERS[character] = folded
+    return folded
+
+
+def _fold_case(text: Text) -> Text:
+    """Folds the case of `text` the same way as `re.IGNORECASE` compares characters.
+
+    The folded text has the same length as `text`, so that positions in the folded
+    text are valid positions in the original text.
+    """
+    return "".join([_fold_character(character) for character in text])
+
+
+def _lookup_elements_from_regex(pattern: Text) -> Optional[Tuple[List[Text], bool]]:
+    r"""Restores the elements of a lookup table from its regex.
+
+    Args:
+        pattern: A regex pattern.
+
+    Returns:
+        The elements of the lookup table and whether the regex uses `\b` around
+        the elements, or `None` if the pattern isn't an alternation of literals
+        as created by `_generate_lookup_regex`.
+    """
+    if not (pattern.startswith("(") and pattern.endswith(")")):
+        return None
+
+    # split the alternatives while keeping escaped characters together
+    alternatives: List[List[Text]] = [[]]
+    body = pattern[1:-1]
+    index = 0
+    while index < len(body):
+        if body[index] == "\\":
+            alternatives[-1].append(body[index : index + 2])
+            index += 2
+        elif body[index] == "|":
+            alternatives.append([])
+            index += 1
+        else:
+            alternatives[-1].append(body[index])
+            index += 1
+
+    use_word_boundaries = all(
+        len(alternative) >= 2 and alternative[0] == "\\b" and alternative[-1] == "\\b"
+        for alternative in alternatives
+    )
+    if use_word_boundaries:
+        alternatives = [alternative[1:-1] for alternative in alternatives]
+
+    elements = []
+    for alternative in alternatives:
+        if not alternative:
+            return None
+        # `re.escape` doesn't escape alphanumeric characters, so e.g. `\d` is a
+        # special sequence and not an escaped literal
+        if any(len(part) > 1 and part[1].isalnum() for part in alternative):
+            return None
+        elements.append("".join(part[-1] for part in alternative))
+
+    lookup_table = {"elements": elements}
+    if _generate_lookup_regex(lookup_table, use_word_boundaries) != pattern:
+        return None
+    return elements, use_word_boundaries
+
+
+def _is_word_character(character: Text) -> bool:
+    # this is how `re` defines `\w` for unicode strings
+    return character.isalnum() or character == "_"
+
+
+class PatternMatcher:
+    """Finds the matches of several regex patterns in a text.
+
+    Patterns which are alternations of literals (e.g. the regexes created for
+    lookup tables) are not run as regexes. Instead, their elements are stored in a
+    single dictionary which is probed once per position and element length of the
+    text. All remaining patterns are compiled once when the matcher is created.
+
+    The matches are the same as the ones found by `re.finditer`.
+    """
+
+    def __init__(
+        self, patterns: List[Dict[Text, Text]], case_sensitive: bool = True
+    ) -> None:
+        """Creates a matcher.
+
+        Args:
+            patterns: The patterns as extracted by `extract_patterns`.
+            case_sensitive: Whether the patterns are matched case sensitive.
+        """
+        self.num_patterns = len(patterns)
+        self.case_sensitive = case_sensitive
+        self._flags = 0 if case_sensitive else re.IGNORECASE
+
+        self._regexes: Dict[int, Pattern] = {}
+        # maps the (case folded) elements to the pattern indices and the position
+        # of the element within these patterns
+        self._elements: Dict[Text, List[Tuple[int, int]]] = {}
+        self._uses_word_boundaries: Dict[int, bool] = {}
+
+        for pattern_index, pattern in enumerate(patterns):
+            lookup = _lookup_elements_from_regex(pattern["pattern"])
+            if lookup is None:
+                self._regexes[pattern_index] = re.compile(
+                    pattern["pattern"], flags=self._flags
+                )
+                continue
+
+            elements, use_word_boundaries = lookup
+            self._uses_word_boundaries[pattern_index] = use_word_boundaries
+            seen_elements = set()
+            for element_index, element in enumerate(elements):
+                if not case_sensitive:
+                    element = _fold_case(element)
+                # the regex would always match the first of two equal elements
+                if element in seen_elements:
+                    continue
+                seen_elements.add(element)
+                self._elements.setdefault(element, []).append(
+                    (pattern_index, element_index)
+                )
+
+        self._element_lengths = sorted({len(element) for element in self._elements})
+        self._all_use_word_boundaries = all(self._uses_word_boundaries.values())
+
+    def matches(self, text: Text) -> List[List[Tuple[int, int]]]:
+        """Finds the matches of all patterns.
+
+        Args:
+            text: The text which should be searched.
+
+        Returns:
+            For each pattern the start and end positions of its matches in the order
+            in which `re.finditer` would return them.
+        """
+        matches: List[List[Tuple[int, int]]] = [[] for _ in range(self.num_patterns)]
+
+        for pattern_index, regex in self._regexes.items():
+            matches[pattern_index] = [match.span() for match in regex.finditer(text)]
+
+        if self._elements:
+            for pattern_index, spans in self._match_elements(text).items():
+                matches[pattern_index] = spans
+
+        return matches
+
+    def _match_elements(self, text: Text) -> Dict[int, List[Tuple[int, int]]]:
+        searched_text = text if self.case_sensitive else _fold_case(text)
+        is_word = [_is_word_character(character) for character in text] + [False]
+        is_boundary = [
+            is_word[position] != is_word[position - 1] if position else is_word[0]
+            for position in range(len(text) + 1)
+        ]
+
+        # for each pattern and start position the element which the regex would
+        # try first, given as element index and end position
+        candidates: Dict[int, Dict[int, Tuple[int, int]]] = {}
+        for start in range(len(text)):
+            if self._all_use_word_boundaries and not is_boundary[start]:
+                continue
+            for length in self._element_lengths:
+                end = start + length
+                if end > len(text):
+                    break
+                hits = self._elements.get(searched_text[start:end])
+                if not hits:
+                    continue
+                for pattern_index, element_index in hits:
+                    if self._uses_word_boundaries[pattern_index] and not (
+                        is_boundary[start] and is_boundary[end]
+                    ):
+                        continue
+                    starts = candidates.setdefault(pattern_index, {})
+                    if start not in starts or element_index < starts[start][0]:
+                        starts[start] = (element_index, end)
+
+        # like the regex, take the leftmost match and continue after its end
+        matches: Dict[int, List[Tuple[int, int]]] = {}
+        for pattern_index, starts in candidates.items():
+            spans = matches[pattern_index] = []
+            position = 0
+            for start in sorted(starts):
+                if start >= position:
+                    end = starts[start][1]
+                    spans.append((start, end))
+                    position = end
+        return matches
+
+
+def overlapping_tokens(
+    token_starts: List[int], token_ends: List[int], start: int, end: int
+) -> range:
+    """Finds the tokens which overlap with a span of the text.
+
+    Args:
+        token_starts: The sorted start positions of the tokens.
+        token_ends: The sorted end positions of the tokens.
+        start: The start of the span.
+        end: The end of the span.
+
+    Returns:
+        The indices of the tokens which start before `end` and end after `start`.
+    """
+    first = bisect.bisect_right(token_ends, start)
+    last = bisect.bisect_left(token_starts, end)
+    return range(first, max(first, last))
@@ -1307,7 +1307,7 @@ def create_app(
             )
 
         try:
-            result = app.ctx.agent.predict_next_with_tracker(tracker, verbosity)
+            result = await app.ctx.agent.predict_next_with_tracker(tracker, verbosity)
 
             return response.json(result)
         except Exception as e:
@@ -54,7 +54,7 @@ import rasa.shared.utils.validation
 import rasa.shared.utils.io
 import rasa.shared.utils.common
 import rasa.shared.core.slot_mappings
-from rasa.shared.core.events import SlotSet, UserUttered
+from rasa.shared.core.events import ActionExecuted, Event, SlotSet, UserUttered
 from rasa.shared.core.slots import Slot, CategoricalSlot, TextSlot, AnySlot, ListSlot
 from rasa.shared.utils.validation import KEY_TRAINING_DATA_FORMAT_VERSION
 from rasa.shared.nlu.constants import (
@@ -1351,48 +1351,12 @@ class Domain:
         Return:
             A list of states.
         """
-        states: List[State] = []
-        last_ml_action_sub_state = None
-        turn_was_hidden = False
-        for tr, hide_rule_turn in tracker.generate_all_prior_trackers():
-            if ignore_rule_only_turns:
-                # remember previous ml action based on the last non hidden turn
-                # we need this to override previous action in the ml state
-                if not turn_was_hidden:
-                    last_ml_action_sub_state = self._get_prev_action_sub_state(tr)
-
-                # followup action or happy path loop prediction
-                # don't change the fact whether dialogue turn should be hidden
-                if (
-                    not tr.followup_action
-                    and not tr.latest_action_name == tr.active_loop_name
-                ):
-                    turn_was_hidden = hide_rule_turn
-
-                if turn_was_hidden:
-                    continue
-
-            state = self.get_active_state(tr, omit_unset_slots=omit_unset_slots)
-
-            if ignore_rule_only_turns:
-                # clean state from only rule features
-                self._remove_rule_only_features(state, rule_only_data)
-                # make sure user input is the same as for previous state
-                # for non action_listen turns
-                if states:
-                    self._substitute_rule_only_user_input(state, states[-1])
-                # substitute previous rule action with last_ml_action_sub_state
-                if last_ml_action_sub_state:
-                    # FIXME: better type annotation for `State` would require
-                    # a larger refactoring (e.g. switch to dataclass)
-                    state[rasa.shared.core.constants.PREVIOUS_ACTION] = cast(
-                        SubState,
-                        last_ml_action_sub_state,
-                    )
-
-            states.append(self._clean_state(state))
-
-        return states
+        return TrackerStatesCache(
+            self,
+            omit_unset_slots=omit_unset_slots,
+            ignore_rule_only_turns=ignore_rule_only_turns,
+            rule_only_data=rule_only_data,
+        ).states_for_tracker(tracker)
 
     def slots_for_entities(self, entities: List[Dict[Text, Any]]) -> List[SlotSet]:
         """Creates slot events for entities if from_entity mapping matches.
@@ -1921,6 +1885,177 @@ class Domain:
         return action_names
 
 
+class TrackerStatesCache:
+    """Creates the states of a tracker's history incrementally.
+
+    The cache remembers the applied events which it already replayed, the tracker
+    they were replayed on and the states which were created for them. When asked for
+    the states of a tracker whose applied events extend the replayed events, only the
+    newly appended events are replayed and featurized. In any other case (e.g. after
+    a `Restarted`, `SessionStarted`, `ActionReverted` or `UserUtteranceReverted`
+    event) the cache is rebuilt from scratch.
+    """
+
+    def __init__(
+        self,
+        domain: Domain,
+        omit_unset_slots: bool = False,
+        ignore_rule_only_turns: bool = False,
+        rule_only_data: Optional[Dict[Text, Any]] = None,
+    ) -> None:
+        """Creates an empty cache.
+
+        Args:
+            domain: The domain which is used to create the states.
+            omit_unset_slots: If `True` do not include the initial values of slots.
+            ignore_rule_only_turns: If True ignore dialogue turns that are present
+                only in rules.
+            rule_only_data: Slots and loops,
+                which only occur in rules but not in stories.
+        """
+        self.domain = domain
+        self.omit_unset_slots = omit_unset_slots
+        self.ignore_rule_only_turns = ignore_rule_only_turns
+        self.rule_only_data = rule_only_data
+
+        self._replayed_events: List[Event] = []
+        self._replay_tracker: Optional["DialogueStateTracker"] = None
+        self._states: List[State] = []
+        self._last_ml_action_sub_state: Optional[Dict[Text, Text]] = None
+        self._turn_was_hidden = False
+
+    def is_compatible(
+        self, domain: Domain, rule_only_data: Optional[Dict[Text, Any]]
+    ) -> bool:
+        """Checks whether the cached states can be reused.
+
+        Args:
+            domain: The domain which should be used to create the states.
+            rule_only_data: Slots and loops,
+                which only occur in rules but not in stories.
+
+        Returns:
+            `True` if the cache was created for the same domain and rule only data.
+        """
+        return self.domain is domain and self.rule_only_data == rule_only_data
+
+    def states_for_tracker(self, tracker: "DialogueStateTracker") -> List[State]:
+        """Creates the states for each state of the tracker's history.
+
+        Args:
+            tracker: Dialogue state tracker containing the dialogue so far.
+
+        Returns:
+            A list of states.
+        """
+        applied_events = tracker.applied_events()
+        if self._replay_tracker is None or not self._extends_replayed_events(
+            applied_events
+        ):
+            self._reset(tracker)
+
+        replay_tracker = cast("DialogueStateTracker", self._replay_tracker)
+        for event in applied_events[len(self._replayed_events) :]:
+            if isinstance(event, ActionExecuted):
+                (
+                    state,
+                    self._last_ml_action_sub_state,
+                    self._turn_was_hidden,
+                ) = self._state_for_turn(
+                    replay_tracker,
+                    event.hide_rule_turn,
+                    self._last_ml_action_sub_state,
+                    self._turn_was_hidden,
+                )
+                if state is not None:
+                    self._states.append(state)
+
+            replay_tracker.update(event)
+            self._replayed_events.append(event)
+
+        # the state after the latest event is not cached since its hidden turn
+        # bookkeeping depends on whether more events are going to follow
+        states = self._states[:]
+        state, _, _ = self._state_for_turn(
+            replay_tracker, False, self._last_ml_action_sub_state, self._turn_was_hidden
+        )
+        if state is not None:
+            states.append(state)
+
+        # callers are allowed to modify the returned states
+        return [
+            {state_type: dict(sub_state) for state_type, sub_state in state.items()}
+            for state in states
+        ]
+
+    def _extends_replayed_events(self, applied_events: List[Event]) -> bool:
+        if len(applied_events) < len(self._replayed_events):
+            return False
+
+        return all(
+            replayed is applied
+            for replayed, applied in zip(self._replayed_events, applied_events)
+        )
+
+    def _reset(self, tracker: "DialogueStateTracker") -> None:
+        self._replayed_events = []
+        self._replay_tracker = tracker.init_copy()
+        self._states = []
+        self._last_ml_action_sub_state = None
+        self._turn_was_hidden = False
+
+    def _state_for_turn(
+        self,
+        tracker: "DialogueStateTracker",
+        hide_rule_turn: bool,
+        last_ml_action_sub_state: Optional[Dict[Text, Text]],
+        turn_was_hidden: bool,
+    ) -> Tuple[Optional[State], Optional[Dict[Text, Text]], bool]:
+        if self.ignore_rule_only_turns:
+            # remember previous ml action based on the last non hidden turn
+            # we need this to override previous action in the ml state
+            if not turn_was_hidden:
+                last_ml_action_sub_state = self.domain._get_prev_action_sub_state(
+                    tracker
+                )
+
+            # followup action or happy path loop prediction
+            # don't change the fact whether dialogue turn should be hidden
+            if (
+                not tracker.followup_action
+                and not tracker.latest_action_name == tracker.active_loop_name
+            ):
+                turn_was_hidden = hide_rule_turn
+
+            if turn_was_hidden:
+                return None, last_ml_action_sub_state, turn_was_hidden
+
+        state = self.domain.get_active_state(
+            tracker, omit_unset_slots=self.omit_unset_slots
+        )
+
+        if self.ignore_rule_only_turns:
+            # clean state from only rule features
+            self.domain._remove_rule_only_features(state, self.rule_only_data)
+            # make sure user input is the same as for previous state
+            # for non action_listen turns
+            if self._states:
+                self.domain._substitute_rule_only_user_input(state, self._states[-1])
+            # substitute previous rule action with last_ml_action_sub_state
+            if last_ml_action_sub_state:
+                # FIXME: better type annotation for `State` would require
+                # a larger refactoring (e.g. switch to dataclass)
+                state[rasa.shared.core.constants.PREVIOUS_ACTION] = cast(
+                    SubState, last_ml_action_sub_state
+                )
+
+        return (
+            self.domain._clean_state(state),
+            last_ml_action_sub_state,
+            turn_was_hidden,
+        )
+
+
 def warn_about_duplicates_found_during_domain_merging(
     duplicates: Dict[Text, List[Text]]
 ) -> None:
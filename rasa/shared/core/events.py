@@ -276,6 +276,13 @@ class Event(ABC):
 
     type_name = "event"
 
+    # maps type names to event classes, reset whenever a new event class is defined
+    _classes_by_type_name: Optional[Dict[Text, Type["Event"]]] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        Event._classes_by_type_name = None
+
     def __init__(
         self,
         timestamp: Optional[float] = None,
@@ -376,9 +383,15 @@ class Event(ABC):
         type_name: Text, default: Optional[Type["Event"]] = None
     ) -> Optional[Type["Event"]]:
         """Returns a slots class by its type name."""
-        for cls in rasa.shared.utils.common.all_subclasses(Event):
-            if cls.type_name == type_name:
-                return cls
+        if Event._classes_by_type_name is None:
+            classes_by_type_name: Dict[Text, Type[Event]] = {}
+            for cls in rasa.shared.utils.common.all_subclasses(Event):
+                classes_by_type_name.setdefault(cls.type_name, cls)
+            Event._classes_by_type_name = classes_by_type_name
+
+        event_class = Event._classes_by_type_name.get(type_name)
+        if event_class is not None:
+            return event_class
         if type_name == "topic":
             return None  # backwards compatibility to support old TopicSet evts
         elif default is not None:
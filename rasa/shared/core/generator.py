@@ -123,7 +123,9 @@ class TrackerWithCachedStates(DialogueStateTracker):
             # Retrieving them from cache with omit_unset_slots=True is not possible as
             # this information is lost after a position in the event stream is turned
             # into a state
-            states = super().past_states(domain, omit_unset_slots=omit_unset_slots)
+            states = domain.states_for_tracker_history(
+                self, omit_unset_slots=omit_unset_slots
+            )
             states_for_hashing = deque(self.freeze_current_state(s) for s in states)
         else:
             # if don't have it cached, we use the domain to calculate the states
@@ -132,7 +134,7 @@ class TrackerWithCachedStates(DialogueStateTracker):
             # with the default value
             states_for_hashing = self._states_for_hashing
             if not states_for_hashing:
-                states = super().past_states(domain)
+                states = domain.states_for_tracker_history(self)
                 states_for_hashing = deque(self.freeze_current_state(s) for s in states)
 
             self._states_for_hashing = states_for_hashing
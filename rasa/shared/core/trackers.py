@@ -61,7 +61,7 @@ from rasa.shared.core.events import (
     ActionExecutionRejected,
     DefinePrevUserUtteredFeaturization,
 )
-from rasa.shared.core.domain import Domain, State
+from rasa.shared.core.domain import Domain, State, TrackerStatesCache
 from rasa.shared.core.slots import AnySlot, Slot
 
 if TYPE_CHECKING:
@@ -227,6 +227,10 @@ class DialogueStateTracker:
         self.model_id: Optional[Text] = None
         self.assistant_id: Optional[Text] = None
 
+        # incrementally created past states per
+        # (`omit_unset_slots`, `ignore_rule_only_turns`) combination
+        self._past_states_caches: Dict[Tuple[bool, bool], TrackerStatesCache] = {}
+
     ###
     # Public tracker interface
     ###
@@ -307,6 +311,9 @@ class DialogueStateTracker:
     ) -> List[State]:
         """Generates the past states of this tracker based on the history.
 
+        The states are cached on the tracker so that subsequent calls only need to
+        featurize the events which were appended in the meantime.
+
         Args:
             domain: The Domain.
             omit_unset_slots: If `True` do not include the initial values of slots.
@@ -318,12 +325,22 @@ class DialogueStateTracker:
         Returns:
             A list of states
         """
-        return domain.states_for_tracker_history(
-            self,
-            omit_unset_slots=omit_unset_slots,
-            ignore_rule_only_turns=ignore_rule_only_turns,
-            rule_only_data=rule_only_data,
-        )
+        cache_key = (omit_unset_slots, ignore_rule_only_turns)
+        cache = self._past_states_caches.get(cache_key)
+        if cache is None or not cache.is_compatible(domain, rule_only_data):
+            cache = TrackerStatesCache(
+                domain,
+                omit_unset_slots=omit_unset_slots,
+                ignore_rule_only_turns=ignore_rule_only_turns,
+                rule_only_data=rule_only_data,
+            )
+            self._past_states_caches[cache_key] = cache
+
+        return cache.states_for_tracker(self)
+
+    def clear_past_states_cache(self) -> None:
+        """Drops the incrementally created past states of this tracker."""
+        self._past_states_caches = {}
 
     def change_loop_to(self, loop_name: Optional[Text]) -> None:
         """Set the currently active loop.
@@ -640,6 +657,7 @@ class DialogueStateTracker:
             )
 
         self._reset()
+        self.clear_past_states_cache()
         self.events.extend(dialogue.events)
         self.replay_events()
 
@@ -686,6 +704,12 @@ class DialogueStateTracker:
         self.events.append(event)
         event.apply_to(self)
 
+        if isinstance(
+            event, (Restarted, SessionStarted, ActionReverted, UserUtteranceReverted)
+        ):
+            # these events rewrite the applied history
+            self.clear_past_states_cache()
+
     def update_with_events(
         self,
         new_events: List[Event],
@@ -204,10 +204,10 @@ def deep_container_fingerprint(
 ) -> Text:
     """Calculate a hash which is stable.
 
-    Works for lists and dictionaries. For keys and values, we recursively call
-    `hash(...)` on them. In case of a dict, the hash is independent of the containers
-    key order. Keep in mind that a list with items in a different order
-    will not create the same hash!
+    Works for lists and dictionaries. In case of a dict, the hash is independent of the
+    containers key order. Keep in mind that a list with items in a different order
+    will not create the same hash! Elements which have a `fingerprint` method are
+    represented by their fingerprint.
 
     Args:
         obj: dictionary or list to be hashed.
@@ -226,6 +226,53 @@ def deep_container_fingerprint(
         return get_text_hash(str(obj), encoding)
 
 
+# tags elements which are represented by their fingerprint when hashing containers
+_FINGERPRINT_TAG = "__fp__"
+_JSON_SCALAR_TYPES = (str, int, float, bool)
+
+
+def _json_for_fingerprint(obj: Any, encoding: Text) -> Any:
+    """Converts an object to JSON-native types so that it can be hashed at once.
+
+    Elements which aren't JSON-native, e.g. tuples or objects with a `fingerprint`
+    method, are replaced by their fingerprint with a type tag so that they don't hash
+    the same as a list or a string.
+
+    Raises:
+        TypeError: If a dictionary has keys which aren't strings.
+    """
+    if obj is None or type(obj) in _JSON_SCALAR_TYPES:
+        return obj
+    if isinstance(obj, list):
+        return [_json_for_fingerprint(element, encoding) for element in obj]
+    if isinstance(obj, dict):
+        if not all(type(key) is str for key in obj):
+            raise TypeError("Only dictionaries with string keys are JSON-native.")
+        return {
+            key: _json_for_fingerprint(value, encoding) for key, value in obj.items()
+        }
+    fingerprint = getattr(obj, "fingerprint", None)
+    if callable(fingerprint):
+        return {_FINGERPRINT_TAG: fingerprint()}
+    return {_FINGERPRINT_TAG: deep_container_fingerprint(obj, encoding)}
+
+
+def _get_serialized_container_fingerprint(
+    container: Union[List[Any], Dict[Any, Any]], encoding: Text
+) -> Optional[Text]:
+    """Hashes the container in a single pass using its canonical JSON representation.
+
+    Returns:
+        The hash or `None` if the container can't be represented as JSON, e.g. as
+        its keys are not strings.
+    """
+    try:
+        json_container = _json_for_fingerprint(container, encoding)
+    except TypeError:
+        return None
+    return get_text_hash(json.dumps(json_container, sort_keys=True), encoding)
+
+
 def get_dictionary_fingerprint(
     dictionary: Dict[Any, Any], encoding: Text = DEFAULT_ENCODING
 ) -> Text:
@@ -241,6 +288,10 @@ def get_dictionary_fingerprint(
     Returns:
         The hash of the dictionary
     """
+    fingerprint = _get_serialized_container_fingerprint(dictionary, encoding)
+    if fingerprint is not None:
+        return fingerprint
+
     stringified = json.dumps(
         {
             deep_container_fingerprint(k, encoding): deep_container_fingerprint(
@@ -265,6 +316,10 @@ def get_list_fingerprint(
     Returns:
         the fingerprint of the list
     """
+    fingerprint = _get_serialized_container_fingerprint(elements, encoding)
+    if fingerprint is not None:
+        return fingerprint
+
     stringified = json.dumps(
         [deep_container_fingerprint(element, encoding) for element in elements]
     )
@@ -504,16 +504,31 @@ def directory_size_in_mb(
     Returns:
         Directory size in MiB.
     """
+    # bytes to MiB
+    return directory_size_in_bytes(path, filenames_to_exclude) / 1_048_576
+
+
+def directory_size_in_bytes(
+    path: Path, filenames_to_exclude: Optional[List[Text]] = None
+) -> int:
+    """Calculates the size of a directory.
+
+    Args:
+        path: The path to the directory.
+        filenames_to_exclude: Allows excluding certain files from the calculation.
+
+    Returns:
+        Directory size in bytes.
+    """
     filenames_to_exclude = filenames_to_exclude or []
-    size = 0.0
+    size = 0
     for root, _dirs, files in os.walk(path):
         for filename in files:
             if filename in filenames_to_exclude:
                 continue
             size += (Path(root) / filename).stat().st_size
 
-    # bytes to MiB
-    return size / 1_048_576
+    return size
 
 
 def copy_directory(source: Path, destination: Path) -> None:
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import functools
 from typing import Dict, Text, Any, List, Optional
@@ -369,12 +370,13 @@ class ActionBotfrontForm(Action):
         tracker: "DialogueStateTracker",
         domain: "Domain",
     ) -> List[Event]:
-        events = []
+        slot_events = []
+        utterances = []
         for slot, value in list(slot_dict.items()):
             validation_rule = self.get_field_for_slot(slot, "validation")
             validated = validate_with_rule(value, validation_rule)
 
-            events += [SlotSet(slot, value if validated else None)]
+            slot_events.append(SlotSet(slot, value if validated else None))
 
             # is it changing during this conversational turn? if it did, then:
             # either tracker value is different, or if tracker was updated
@@ -385,12 +387,27 @@ class ActionBotfrontForm(Action):
                 and tracker.events[-1].key == slot
                 and tracker.events[-1].value == value
             ):
-                events += await self.utter_post_validation(
-                    slot, value, validated, output_channel, nlg, tracker, domain
+                utterances.append(
+                    self.utter_post_validation(
+                        slot, value, validated, output_channel, nlg, tracker, domain
+                    )
                 )
+            else:
+                utterances.append(self._no_utterance())
+
+        # the templates of all slots are generated concurrently
+        events = []
+        for slot_event, utterance_events in zip(
+            slot_events, await asyncio.gather(*utterances)
+        ):
+            events += [slot_event, *utterance_events]
 
         return events
 
+    @staticmethod
+    async def _no_utterance() -> List[Event]:
+        return []
+
     async def validate(
         self,
         output_channel: "OutputChannel",
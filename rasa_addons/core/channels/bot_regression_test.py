@@ -1,6 +1,10 @@
 import rasa
+import rasa.utils.endpoints
+import asyncio
+import json
 import logging
 import inspect
+import uuid
 from rasa.core.channels.channel import (
     UserMessage,
     InputChannel,
@@ -9,13 +13,24 @@ from rasa.core.channels.rest import RestInput
 from sanic.request import Request
 from sanic import Blueprint, response
 from asyncio import CancelledError
-from typing import Text, List, Dict, Any, Optional, Callable, Awaitable
+from typing import (
+    Text,
+    List,
+    Dict,
+    Any,
+    Optional,
+    Callable,
+    Awaitable,
+    AsyncIterator,
+)
 from sanic.response import HTTPResponse
 from rasa_addons.core.channels.rest import BotfrontRestOutput
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_PARALLEL_TEST_CASES = 10
+
 
 class BotRegressionTestOutput(BotfrontRestOutput):
     def name(self) -> Text:
@@ -34,16 +49,44 @@ class BotRegressionTestOutput(BotfrontRestOutput):
 
 
 class BotRegressionTestInput(RestInput):
+    @classmethod
+    def from_credentials(cls, credentials: Optional[Dict[Text, Any]]) -> InputChannel:
+        credentials = credentials or {}
+        return cls(
+            credentials.get(
+                "max_parallel_test_cases", DEFAULT_MAX_PARALLEL_TEST_CASES
+            )
+        )
+
+    def __init__(
+        self, max_parallel_test_cases: int = DEFAULT_MAX_PARALLEL_TEST_CASES
+    ) -> None:
+        """Creates the channel.
+
+        Args:
+            max_parallel_test_cases: Maximum number of test cases which are run
+                concurrently by default.
+        """
+        self.max_parallel_test_cases = max_parallel_test_cases
+
     def name(self) -> Text:
         return "bot_regression_test"
 
+    @staticmethod
+    def generate_sender_id() -> Text:
+        # concurrently run test cases must not share a conversation; the prefix
+        # identifies test conversations in the tracker store
+        return "bot_regression_test_{:%Y-%m-%d_%H:%M:%S}_{}".format(
+            datetime.now(), uuid.uuid4().hex
+        )
+
     async def simulate_messages(
         self,
         steps: List[Dict[Text, Any]],
         language: Text,
         on_new_message: Callable[[UserMessage], Awaitable[None]],
     ) -> List[Dict[Text, Any]]:
-        sender_id = "bot_regression_test_{:%Y-%m-%d_%H:%M:%S}".format(datetime.now())
+        sender_id = self.generate_sender_id()
         collector = BotRegressionTestOutput()
         for step in steps:
             if "user" in step:
@@ -157,29 +200,105 @@ class BotRegressionTestInput(RestInput):
     def check_success(steps: List[Dict[Text, Any]]) -> bool:
         return next((False for step in steps if "theme" in step), True)
 
+    async def run_test_case(
+        self,
+        test_case: Dict[Text, Any],
+        project_id: Text,
+        on_new_message: Callable[[UserMessage], Awaitable[None]],
+    ) -> Dict[Text, Any]:
+        collector = await self.simulate_messages(
+            test_case.get("steps"), test_case.get("language"), on_new_message
+        )
+        test_results = self.compare_step_lists(
+            collector.messages, test_case.get("steps")
+        )
+        return {
+            "_id": test_case.get("_id"),
+            "testResults": test_results,
+            "success": self.check_success(test_results),
+            "projectId": project_id,
+        }
+
+    def schedule_test_cases(
+        self,
+        test_cases: List[Dict[Text, Any]],
+        project_id: Text,
+        on_new_message: Callable[[UserMessage], Awaitable[None]],
+        max_parallel_test_cases: Optional[int] = None,
+    ) -> List[asyncio.Future]:
+        """Starts running the test cases concurrently.
+
+        Args:
+            test_cases: The test cases to run.
+            project_id: The project the test cases belong to.
+            on_new_message: Handler of the simulated user messages.
+            max_parallel_test_cases: Maximum number of concurrently run test cases.
+                Defaults to the limit of the channel.
+
+        Returns:
+            One future per test case which resolves to the test case's result.
+        """
+        limit = max_parallel_test_cases or self.max_parallel_test_cases
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def run_limited(test_case: Dict[Text, Any]) -> Dict[Text, Any]:
+            async with semaphore:
+                return await self.run_test_case(test_case, project_id, on_new_message)
+
+        return [asyncio.ensure_future(run_limited(t)) for t in test_cases]
+
+    async def iterate_test_results(
+        self,
+        test_cases: List[Dict[Text, Any]],
+        project_id: Text,
+        on_new_message: Callable[[UserMessage], Awaitable[None]],
+        max_parallel_test_cases: Optional[int] = None,
+    ) -> AsyncIterator[Dict[Text, Any]]:
+        """Runs the test cases concurrently and yields each result once complete."""
+        tasks = self.schedule_test_cases(
+            test_cases, project_id, on_new_message, max_parallel_test_cases
+        )
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # e.g. the client closed the stream
+            for task in tasks:
+                task.cancel()
+
     async def run_tests(
         self,
         test_cases: List[Dict[Text, Any]],
         project_id: Text,
         on_new_message: Callable[[UserMessage], Awaitable[None]],
+        max_parallel_test_cases: Optional[int] = None,
     ) -> List[Dict[Text, Any]]:
-        all_results = []
-        for test_case in test_cases:
-            collector = await self.simulate_messages(
-                test_case.get("steps"), test_case.get("language"), on_new_message
-            )
-            test_results = self.compare_step_lists(
-                collector.messages, test_case.get("steps")
-            )
-            all_results.append(
-                {
-                    "_id": test_case.get("_id"),
-                    "testResults": test_results,
-                    "success": self.check_success(test_results),
-                    "projectId": project_id,
-                }
-            )
-        return all_results
+        """Runs the test cases concurrently and returns results in test case order."""
+        tasks = self.schedule_test_cases(
+            test_cases, project_id, on_new_message, max_parallel_test_cases
+        )
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stream_test_results(
+        self,
+        test_cases: List[Dict[Text, Any]],
+        project_id: Text,
+        on_new_message: Callable[[UserMessage], Awaitable[None]],
+        max_parallel_test_cases: Optional[int] = None,
+    ) -> Callable[[Any], Awaitable[None]]:
+        """Streams the result of each test case as a line of JSON once complete."""
+
+        async def stream(resp: Any) -> None:
+            async for result in self.iterate_test_results(
+                test_cases, project_id, on_new_message, max_parallel_test_cases
+            ):
+                await resp.write(json.dumps(result) + "\n")
+
+        return stream
 
     def blueprint(
         self, on_new_message: Callable[[UserMessage], Awaitable[None]]
@@ -198,7 +317,24 @@ class BotRegressionTestInput(RestInput):
         async def receive(request: Request) -> HTTPResponse:
             test_cases = request.json.get("test_cases")
             project_id = request.json.get("project_id")
-            results = await self.run_tests(test_cases, project_id, on_new_message)
+            max_parallel_test_cases = rasa.utils.endpoints.int_arg(
+                request, "max_parallel_test_cases", self.max_parallel_test_cases
+            )
+            should_use_stream = rasa.utils.endpoints.bool_arg(
+                request, "stream", default=False
+            )
+
+            if should_use_stream:
+                return response.stream(
+                    self.stream_test_results(
+                        test_cases, project_id, on_new_message, max_parallel_test_cases
+                    ),
+                    content_type="application/x-ndjson",
+                )
+
+            results = await self.run_tests(
+                test_cases, project_id, on_new_message, max_parallel_test_cases
+            )
             return response.json(results)
 
         return custom_webhook
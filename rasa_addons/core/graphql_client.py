@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+import urllib.error
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 100
+DEFAULT_KEEPALIVE_TIMEOUT = 30
+DEFAULT_GRAPHQL_TIMEOUT = 30
+
+
+class GraphQLClient:
+    """Asynchronous GraphQL client which reuses pooled keep-alive connections.
+
+    One `aiohttp.ClientSession` is created lazily per event loop and shared by all
+    queries, so consecutive requests to Botfront don't pay for a new TCP (and TLS)
+    handshake each time.
+    """
+
+    def __init__(
+        self,
+        url: Text,
+        api_key: Optional[Text] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        timeout: float = DEFAULT_GRAPHQL_TIMEOUT,
+    ) -> None:
+        """Creates a client for the GraphQL endpoint at `url`.
+
+        Args:
+            url: URL of the GraphQL endpoint.
+            api_key: Value of the `Authorization` header. Defaults to the `API_KEY`
+                environment variable.
+            pool_size: Maximum number of simultaneously open connections.
+            keepalive_timeout: Seconds an idle connection is kept open for reuse.
+            timeout: Total timeout of a single request in seconds.
+        """
+        self.url = url
+        api_key = api_key or os.environ.get("API_KEY")
+        self.headers = {"Authorization": api_key} if api_key else {}
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def query(self, query: Text, variables: Dict[Text, Any]) -> Dict[Text, Any]:
+        """Executes a GraphQL query or mutation.
+
+        Args:
+            query: The GraphQL document.
+            variables: Variables of the document.
+
+        Returns:
+            The `data` field of the response.
+
+        Raises:
+            urllib.error.URLError: If the request failed or the response contains
+                GraphQL errors.
+        """
+        data, errors = await self.query_with_errors(query, variables)
+        if errors:
+            raise urllib.error.URLError(error_message(errors))
+        return data
+
+    async def query_with_errors(
+        self, query: Text, variables: Dict[Text, Any]
+    ) -> Tuple[Dict[Text, Any], List[Dict[Text, Any]]]:
+        """Executes a GraphQL query which can partially fail.
+
+        Args:
+            query: The GraphQL document.
+            variables: Variables of the document.
+
+        Returns:
+            The `data` field of the response, which contains the results of the
+            fields which didn't fail, and the GraphQL errors of the failed fields.
+
+        Raises:
+            urllib.error.URLError: If the request failed.
+        """
+        try:
+            async with self._get_session().post(
+                self.url, json={"query": query, "variables": variables}
+            ) as response:
+                body = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            raise urllib.error.URLError(f"{e.__class__.__name__}: {e}") from e
+
+        if not isinstance(body, dict):
+            raise urllib.error.URLError(f"Unexpected response from {self.url}.")
+        return body.get("data") or {}, body.get("errors") or []
+
+    async def close(self) -> None:
+        """Closes the pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+
+def error_message(errors: List[Dict[Text, Any]]) -> Text:
+    """Joins the messages of GraphQL errors."""
+    return ", ".join([str(e.get("message")) for e in errors])
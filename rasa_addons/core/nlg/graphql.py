@@ -1,6 +1,14 @@
+import asyncio
+import copy
 import logging
-from typing import Text, Any, Dict, Optional, List
+from typing import Text, Any, Dict, Optional, List, Tuple
+from rasa_addons.core.graphql_client import (
+    DEFAULT_POOL_SIZE,
+    GraphQLClient,
+    error_message,
+)
 from rasa_addons.core.nlg.nlg_helper import rewrite_url
+from rasa_addons.utils import LRUCache
 from rasa.core.constants import DEFAULT_REQUEST_TIMEOUT
 from rasa.core.nlg.generator import NaturalLanguageGenerator
 from rasa.shared.core.trackers import DialogueStateTracker, EventVerbosity
@@ -11,8 +19,28 @@ from rasa.core.nlg.interpolator import interpolate
 
 logger = logging.getLogger(__name__)
 
+# send the whole tracker including all events to the NLG endpoint
+FULL_TRACKER_PAYLOAD = "full"
+# only send the slots, the latest message and the other tracker properties
+# without the events
+MINIMAL_TRACKER_PAYLOAD = "minimal"
 
-NLG_QUERY = """
+DEFAULT_RESPONSE_CACHE_SIZE = 1000
+
+# passed by `ActionBotResponse`, doesn't change between conversations
+DOMAIN_RESPONSES_ARGUMENT = "domain_responses"
+
+KEYS_TO_INTERPOLATE = [
+    "text",
+    "image",
+    "custom",
+    "buttons",
+    "attachment",
+    "quick_replies",
+]
+
+
+NLG_FRAGMENTS = """
 fragment CarouselElementFields on CarouselElement {
     title
     subtitle
@@ -20,7 +48,21 @@ fragment CarouselElementFields on CarouselElement {
     default_action { title, type, ...on WebUrlButton { url }, ...on PostbackButton { payload } }
     buttons { title, type, ...on WebUrlButton { url }, ...on PostbackButton { payload } }
 }
-query(
+"""
+
+NLG_RESPONSE_FIELDS = """{
+        metadata
+        ...on TextPayload { text }
+        ...on QuickRepliesPayload { text, quick_replies { title, type, ...on WebUrlButton { url }, ...on PostbackButton { payload } } }
+        ...on TextWithButtonsPayload { text, buttons { title, type, ...on WebUrlButton { url }, ...on PostbackButton { payload } } }
+        ...on ImagePayload { text, image }
+        ...on CarouselPayload { template_type, elements { ...CarouselElementFields } }
+        ...on CustomPayload { customText: text, customImage: image, customQuickReplies: quick_replies, customButtons: buttons, customElements: elements, custom, customAttachment: attachment }
+    }"""
+
+NLG_QUERY = (
+    NLG_FRAGMENTS
+    + """query(
     $template: String!
     $arguments: Any
     $tracker: ConversationInput
@@ -31,17 +73,38 @@ query(
         arguments: $arguments
         tracker: $tracker
         channel: $channel
-    ) {
-        metadata
-        ...on TextPayload { text }
-        ...on QuickRepliesPayload { text, quick_replies { title, type, ...on WebUrlButton { url }, ...on PostbackButton { payload } } }
-        ...on TextWithButtonsPayload { text, buttons { title, type, ...on WebUrlButton { url }, ...on PostbackButton { payload } } }
-        ...on ImagePayload { text, image }
-        ...on CarouselPayload { template_type, elements { ...CarouselElementFields } }
-        ...on CustomPayload { customText: text, customImage: image, customQuickReplies: quick_replies, customButtons: buttons, customElements: elements, custom, customAttachment: attachment }
-    }
+    ) """
+    + NLG_RESPONSE_FIELDS
+    + """
 }
 """
+)
+
+
+def batched_nlg_query(batch_size: int) -> Text:
+    """Query requesting `batch_size` responses with aliased `getResponse` fields.
+
+    The variables of the i-th response are suffixed with `_i` and its result is
+    returned under the alias `response_i`.
+    """
+    variables = []
+    fields = []
+    for i in range(batch_size):
+        variables.append(
+            f"    $template_{i}: String!\n"
+            f"    $arguments_{i}: Any\n"
+            f"    $tracker_{i}: ConversationInput\n"
+            f"    $channel_{i}: NlgRequestChannel\n"
+        )
+        fields.append(
+            f"    response_{i}: getResponse(\n"
+            f"        template: $template_{i}\n"
+            f"        arguments: $arguments_{i}\n"
+            f"        tracker: $tracker_{i}\n"
+            f"        channel: $channel_{i}\n"
+            f"    ) {NLG_RESPONSE_FIELDS}\n"
+        )
+    return NLG_FRAGMENTS + "query(\n" + "".join(variables) + ") {\n" + "".join(fields) + "}\n"
 
 
 def nlg_response_format_spec():
@@ -88,11 +151,15 @@ def nlg_request_format(
     template_name: Text,
     tracker: DialogueStateTracker,
     output_channel: Text,
+    tracker_payload: Text = FULL_TRACKER_PAYLOAD,
     **kwargs: Any,
 ) -> Dict[Text, Any]:
     """Create the json body for the NLG json body for the request."""
 
-    tracker_state = tracker.current_state(EventVerbosity.ALL)
+    if tracker_payload == MINIMAL_TRACKER_PAYLOAD:
+        tracker_state = tracker.current_state(EventVerbosity.NONE)
+    else:
+        tracker_state = tracker.current_state(EventVerbosity.ALL)
 
     return {
         "template": template_name,
@@ -103,15 +170,55 @@ def nlg_request_format(
 
 
 class GraphQLNaturalLanguageGenerator(NaturalLanguageGenerator):
-    """Like Rasa's CallbackNLG, but queries Botfront's GraphQL endpoint"""
+    """Like Rasa's CallbackNLG, but queries Botfront's GraphQL endpoint
+
+    Endpoint options:
+        tracker_payload: `full` (default) sends all tracker events with each
+            request, `minimal` only sends the slots, the latest message and the
+            other tracker properties. The arguments of the request are the same.
+        response_cache_ttl: seconds responses are cached per template, language
+            and channel. Only use it if responses don't depend on the conversation
+            (e.g. no conditional variations); slots are still interpolated locally.
+            Disabled by default.
+        response_cache_size: maximum number of cached responses.
+        pool_size: maximum number of connections to the GraphQL endpoint.
+        batch_requests: whether responses which are generated concurrently (e.g.
+            all responses of an action) are requested with a single query.
+            Enabled by default.
+    """
 
     def __init__(self, **kwargs) -> None:
         self.nlg_endpoint = kwargs.get("endpoint_config")
         self.url_substitution_patterns = []
+        self.tracker_payload = FULL_TRACKER_PAYLOAD
+        self.response_cache = None
+        self.graphql_client = None
+        self.batch_requests = True
+        self._pending_requests = []
+        # keep references so that running batches are not garbage collected
+        self._running_batches = set()
         if self.nlg_endpoint:
+            endpoint_kwargs = self.nlg_endpoint.kwargs
             self.url_substitution_patterns = (
-                self.nlg_endpoint.kwargs.get("url_substitutions") or []
+                endpoint_kwargs.get("url_substitutions") or []
             )
+            self.tracker_payload = endpoint_kwargs.get(
+                "tracker_payload", FULL_TRACKER_PAYLOAD
+            )
+            response_cache_ttl = endpoint_kwargs.get("response_cache_ttl")
+            if response_cache_ttl:
+                self.response_cache = LRUCache(
+                    endpoint_kwargs.get(
+                        "response_cache_size", DEFAULT_RESPONSE_CACHE_SIZE
+                    ),
+                    response_cache_ttl,
+                )
+            if "graphql" in self.nlg_endpoint.url:
+                self.graphql_client = GraphQLClient(
+                    self.nlg_endpoint.url,
+                    pool_size=endpoint_kwargs.get("pool_size", DEFAULT_POOL_SIZE),
+                )
+            self.batch_requests = endpoint_kwargs.get("batch_requests", True)
 
     async def generate(
         self,
@@ -127,66 +234,51 @@ class GraphQLNaturalLanguageGenerator(NaturalLanguageGenerator):
         )
         language = tracker.latest_message.metadata.get("language") or fallback_language
 
-        body = nlg_request_format(
-            template_name,
-            tracker,
-            output_channel,
-            **kwargs,
-            language=language,
-            projectId=os.environ.get("BF_PROJECT_ID"),
-        )
-
         logger.debug(
             "Requesting NLG for {} from {}."
             "".format(template_name, self.nlg_endpoint.url)
         )
 
         try:
-            if "graphql" in self.nlg_endpoint.url:
-                from sgqlc.endpoint.http import HTTPEndpoint
-
-                logging.getLogger("sgqlc.endpoint.http").setLevel(logging.WARNING)
-
-                api_key = os.environ.get("API_KEY")
-                headers = [{"Authorization": api_key}] if api_key else []
-                response = HTTPEndpoint(self.nlg_endpoint.url, *headers)(
-                    NLG_QUERY, body
+            if self.graphql_client is not None:
+                # responses requested with additional arguments may depend on them
+                cache_key = (template_name, language, output_channel)
+                use_cache = self.response_cache is not None and not any(
+                    value
+                    for key, value in kwargs.items()
+                    if key != DOMAIN_RESPONSES_ARGUMENT
                 )
-                if response.get("errors"):
-                    raise urllib.error.URLError(
-                        ", ".join([e.get("message") for e in response.get("errors")])
+                response = self.response_cache.get(cache_key) if use_cache else None
+                if response is None:
+                    body = nlg_request_format(
+                        template_name,
+                        tracker,
+                        output_channel,
+                        tracker_payload=self.tracker_payload,
+                        **kwargs,
+                        language=language,
+                        projectId=os.environ.get("BF_PROJECT_ID"),
                     )
-                response = response.get("data", {}).get("getResponse", {})
-                rewrite_url(response, self.url_substitution_patterns)
-                if "customText" in response:
-                    response["text"] = response.pop("customText")
-                if "customImage" in response:
-                    response["image"] = response.pop("customImage")
-                if "customQuickReplies" in response:
-                    response["quick_replies"] = response.pop("customQuickReplies")
-                if "customButtons" in response:
-                    response["buttons"] = response.pop("customButtons")
-                if "customElements" in response:
-                    response["elements"] = response.pop("customElements")
-                if "customAttachment" in response:
-                    response["attachment"] = response.pop("customAttachment")
-                metadata = response.pop("metadata", {}) or {}
-                for key in metadata:
-                    response[key] = metadata[key]
-                response["template_name"] = template_name
-
-                keys_to_interpolate = [
-                    "text",
-                    "image",
-                    "custom",
-                    "buttons",
-                    "attachment",
-                    "quick_replies",
-                ]
-                for key in keys_to_interpolate:
+                    response = self._format_graphql_response(
+                        await self._request_response(body), template_name
+                    )
+                    if use_cache:
+                        self.response_cache[cache_key] = response
+                response = copy.deepcopy(response)
+
+                for key in KEYS_TO_INTERPOLATE:
                     if key in response:
                         response[key] = interpolate(response[key], tracker.current_slot_values())
             else:
+                body = nlg_request_format(
+                    template_name,
+                    tracker,
+                    output_channel,
+                    tracker_payload=self.tracker_payload,
+                    **kwargs,
+                    language=language,
+                    projectId=os.environ.get("BF_PROJECT_ID"),
+                )
                 response = await self.nlg_endpoint.request(
                     method="post", json=body, timeout=DEFAULT_REQUEST_TIMEOUT
                 )
@@ -206,6 +298,109 @@ class GraphQLNaturalLanguageGenerator(NaturalLanguageGenerator):
             )
             return {"text": template_name}
 
+    async def close(self) -> None:
+        """Closes the pooled connections to the GraphQL endpoint."""
+        if self.graphql_client is not None:
+            await self.graphql_client.close()
+
+    async def _request_response(self, body: Dict[Text, Any]) -> Dict[Text, Any]:
+        if not self.batch_requests:
+            data = await self.graphql_client.query(NLG_QUERY, body)
+            return data.get("getResponse") or {}
+
+        # requests made in the same iteration of the event loop (e.g. by responses
+        # generated with `asyncio.gather`) are sent together
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending_requests:
+            loop.call_soon(self._send_pending_requests)
+        self._pending_requests.append((body, future))
+        return await future
+
+    def _send_pending_requests(self) -> None:
+        batch, self._pending_requests = self._pending_requests, []
+        task = asyncio.ensure_future(self._send_batch(batch))
+        self._running_batches.add(task)
+        task.add_done_callback(self._running_batches.discard)
+
+    async def _send_batch(
+        self, batch: List[Tuple[Dict[Text, Any], "asyncio.Future"]]
+    ) -> None:
+        try:
+            if len(batch) == 1:
+                # errors of a single response are raised by `query`
+                data = await self.graphql_client.query(NLG_QUERY, batch[0][0])
+                responses = [data.get("getResponse")]
+                errors_by_alias = {}
+            else:
+                variables = {
+                    f"{name}_{i}": value
+                    for i, (body, _) in enumerate(batch)
+                    for name, value in body.items()
+                }
+                data, errors = await self.graphql_client.query_with_errors(
+                    batched_nlg_query(len(batch)), variables
+                )
+                errors_by_alias = self._errors_by_alias(errors, len(batch))
+                responses = [data.get(f"response_{i}") for i in range(len(batch))]
+
+            for i, ((_, future), response) in enumerate(zip(batch, responses)):
+                if future.done():
+                    continue
+                alias_errors = errors_by_alias.get(f"response_{i}")
+                if alias_errors:
+                    future.set_exception(
+                        urllib.error.URLError(error_message(alias_errors))
+                    )
+                else:
+                    future.set_result(response or {})
+        except Exception as e:
+            # callers must never wait for a batch which failed
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    @staticmethod
+    def _errors_by_alias(
+        errors: List[Dict[Text, Any]], batch_size: int
+    ) -> Dict[Text, List[Dict[Text, Any]]]:
+        """Assigns GraphQL errors to the aliases of the batched query they belong to.
+
+        Errors without a path (e.g. validation errors of the whole query) belong to
+        every alias.
+        """
+        errors_by_alias: Dict[Text, List[Dict[Text, Any]]] = {}
+        for error in errors:
+            path = error.get("path")
+            aliases = (
+                [path[0]] if path else [f"response_{i}" for i in range(batch_size)]
+            )
+            for alias in aliases:
+                errors_by_alias.setdefault(alias, []).append(error)
+        return errors_by_alias
+
+    def _format_graphql_response(
+        self, response: Dict[Text, Any], template_name: Text
+    ) -> Dict[Text, Any]:
+        rewrite_url(response, self.url_substitution_patterns)
+        if "customText" in response:
+            response["text"] = response.pop("customText")
+        if "customImage" in response:
+            response["image"] = response.pop("customImage")
+        if "customQuickReplies" in response:
+            response["quick_replies"] = response.pop("customQuickReplies")
+        if "customButtons" in response:
+            response["buttons"] = response.pop("customButtons")
+        if "customElements" in response:
+            response["elements"] = response.pop("customElements")
+        if "customAttachment" in response:
+            response["attachment"] = response.pop("customAttachment")
+        metadata = response.pop("metadata", {}) or {}
+        for key in metadata:
+            response[key] = metadata[key]
+        response["template_name"] = template_name
+        return response
+
     @staticmethod
     def validate_response(content: Optional[Dict[Text, Any]]) -> bool:
         """Validate the NLG response. Raises exception on failure."""
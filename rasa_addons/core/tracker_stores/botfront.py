@@ -1,19 +1,16 @@
+import asyncio
 import logging
 import jsonpickle
-import requests
-import time
 import os
 import re
-from threading import Thread
+import urllib.error
 
 from rasa.core.tracker_store import TrackerStore
 from rasa.shared.core.trackers import DialogueStateTracker, EventVerbosity
-
-from sgqlc.endpoint.http import HTTPEndpoint
-import urllib.error
+from rasa_addons.core.graphql_client import DEFAULT_POOL_SIZE, GraphQLClient
+from rasa_addons.utils import LRUCache
 
 logger = logging.getLogger(__name__)
-logging.getLogger("sgqlc.endpoint.http").setLevel(logging.WARNING)
 
 jsonpickle.set_preferred_backend("json")
 jsonpickle.set_encoder_options("json", ensure_ascii=False)
@@ -62,14 +59,6 @@ mutation updateTracker(
 """
 
 
-def _start_sweeper(tracker_store, break_time):
-    while True:
-        try:
-            tracker_store.sweep()
-        finally:
-            time.sleep(break_time)
-
-
 class BotfrontTrackerStore(TrackerStore):
     def __init__(self, domain, host, **kwargs):
 
@@ -77,17 +66,28 @@ class BotfrontTrackerStore(TrackerStore):
         self.tracker_persist_time = kwargs.get("tracker_persist_time", 3600)
         self.test_tracker_persist_time = kwargs.get("test_tracker_persist_time", 240)
         self.max_events = kwargs.get("max_events", 100)
-        self.trackers = {}
-        self.test_trackers = {}
-        self.trackers_info = (
-            {}
-        )  # in this stucture we will keep the last index and the last timestamp of events in the db for a said tracker
-        self.sweeper = Thread(target=_start_sweeper, args=(self, 30))
-        self.sweeper.setDaemon(True)
-        self.sweeper.start()
-        api_key = os.environ.get("API_KEY")
-        headers = [{"Authorization": api_key}] if api_key else []
-        self.graphql_endpoint = HTTPEndpoint(host, *headers)
+        self.max_cached_trackers = kwargs.get("max_cached_trackers", 10000)
+        # local copies are dropped once they were not used for their persist time
+        # or when more than `max_cached_trackers` conversations are cached. Every
+        # entry holds the serialized tracker together with the last index and the
+        # last timestamp of its events in the db, so that both expire together
+        self.trackers = LRUCache(self.max_cached_trackers, self.tracker_persist_time)
+        self.test_trackers = LRUCache(
+            self.max_cached_trackers, self.test_tracker_persist_time
+        )
+        # with write-behind enabled, saves are only applied to the local copy and
+        # all saves of a sender within `write_behind_delay` seconds are sent to
+        # Botfront with a single mutation
+        self.write_behind = kwargs.get("write_behind", False)
+        self.write_behind_delay = kwargs.get("write_behind_delay", 0.5)
+        # failed writes are retried with the next flush of the sender
+        self.write_behind_retries = kwargs.get("write_behind_retries", 3)
+        self._unsaved_trackers = {}
+        self._write_tasks = {}
+        self._write_retries = {}
+        self.graphql_client = GraphQLClient(
+            host, pool_size=kwargs.get("pool_size", DEFAULT_POOL_SIZE)
+        )
         self.host = host
         self.environement = os.environ.get("BOTFRONT_ENV", "development")
         self.botfront_test_regex = re.compile('^bot_regression_test_')
@@ -95,14 +95,9 @@ class BotfrontTrackerStore(TrackerStore):
         super(BotfrontTrackerStore, self).__init__(domain, event_broker=kwargs.get("event_broker"))
         logger.debug("BotfrontTrackerStore tracker store created")
 
-    def _graphql_query(self, query, params):
+    async def _graphql_query(self, query, params):
         try:
-            response = self.graphql_endpoint(query, params)
-            if response.get("errors"):
-                raise urllib.error.URLError(
-                    ", ".join([e.get("message") for e in response.get("errors")])
-                )
-            return response.get("data")
+            return await self.graphql_client.query(query, params)
         except urllib.error.URLError as e:
             message = e.reason
             logger.error(
@@ -110,8 +105,8 @@ class BotfrontTrackerStore(TrackerStore):
             )
             return {}
 
-    def _fetch_tracker(self, sender_id, lastIndex):
-        data = self._graphql_query(
+    async def _fetch_tracker(self, sender_id, lastIndex):
+        data = await self._graphql_query(
             GET_TRACKER,
             {
                 "senderId": sender_id,
@@ -122,8 +117,8 @@ class BotfrontTrackerStore(TrackerStore):
         )
         return data.get("trackerStore")
 
-    def _insert_tracker_gql(self, sender_id, tracker):
-        data = self._graphql_query(
+    async def _insert_tracker_gql(self, sender_id, tracker):
+        data = await self._graphql_query(
             INSERT_TRACKER,
             {
                 "senderId": sender_id,
@@ -134,8 +129,8 @@ class BotfrontTrackerStore(TrackerStore):
         )
         return data.get("insertTrackerStore")
 
-    def _update_tracker_gql(self, sender_id, tracker):
-        data = self._graphql_query(
+    async def _update_tracker_gql(self, sender_id, tracker):
+        data = await self._graphql_query(
             UPDATE_TRACKER,
             {
                 "senderId": sender_id,
@@ -146,67 +141,132 @@ class BotfrontTrackerStore(TrackerStore):
         )
         return data.get("updateTrackerStore")
 
+    def _get_local_tracker(self, sender_id):
+        entry = self.trackers.get(sender_id)
+        return entry["tracker"] if entry is not None else None
+
+    def _set_local_tracker(self, sender_id, tracker):
+        entry = self.trackers.get(sender_id) or {}
+        self.trackers[sender_id] = {**entry, "tracker": tracker}
+
     def _get_last_index(self, sender_id):
-        info = self.trackers_info.get(sender_id, -1)
-        if info == -1:
-            return info
-        elif info.get("last_index") is None:
+        entry = self.trackers.get(sender_id)
+        if entry is None or entry.get("last_index") is None:
             return -1
-        else:
-            return info.get("last_index")
+        return entry["last_index"]
 
     def _get_last_timestamp(self, sender_id):
-        info = self.trackers_info.get(sender_id, 0)
-        if info == 0:
-            return info
-        elif info.get("last_timestamp") is None:
+        entry = self.trackers.get(sender_id)
+        if entry is None or entry.get("last_timestamp") is None:
             return 0
-        else:
-            return info.get("last_timestamp")
+        return entry["last_timestamp"]
 
     def _store_tracker_info(self, sender_id, tracker_info):
-        if tracker_info is not None:
-            self.trackers_info[sender_id] = {
-                "last_index": tracker_info["lastIndex"],
-                "last_timestamp": tracker_info["lastTimestamp"],
-            }
+        entry = self.trackers.get(sender_id)
+        # the info is dropped together with the local copy of the tracker
+        if tracker_info is not None and entry is not None:
+            entry["last_index"] = tracker_info["lastIndex"]
+            entry["last_timestamp"] = tracker_info["lastTimestamp"]
 
-    def save(self, canonical_tracker):
-        serialized_tracker = self._serialize_tracker_to_dict(canonical_tracker)
+    async def save(self, canonical_tracker):
         sender_id = canonical_tracker.sender_id
         if self.botfront_test_regex.match(sender_id):
             self.test_trackers[sender_id] = canonical_tracker
-            return serialized_tracker["events"]
+            return
         # call the event broker below the test exit so that the logs aren't filled with testing data
         if self.event_broker:
-            self.stream_events(canonical_tracker)
-
-        # Fetch here just in case retrieve wasn't called first
-        tracker = self.trackers.get(sender_id)
-
-        if tracker is None:  # the tracker does not exist localy ( first save)
-            updated_info = self._insert_tracker_gql(sender_id, serialized_tracker)
-            self.trackers[sender_id] = serialized_tracker
-            # update the last index and last time stamp for future uses
-            self._store_tracker_info(sender_id, updated_info)
-            return serialized_tracker["events"]
-        else:  # the tracker  exist localy
-            # Insert only the new examples
-            last_timestamp = self._get_last_timestamp(sender_id)
-            new_events = list(
-                filter(
-                    lambda x: x["timestamp"] > last_timestamp,
-                    serialized_tracker["events"],
+            await self.stream_events(canonical_tracker)
+
+        serialized_tracker = self._serialize_tracker_to_dict(canonical_tracker)
+        # the tracker exists locally if it was saved before or fetched from remote
+        is_new = self._get_local_tracker(sender_id) is None
+        self._set_local_tracker(sender_id, serialized_tracker)
+
+        if self.write_behind:
+            if sender_id in self._unsaved_trackers:
+                # a pending first save still has to insert the tracker
+                is_new = is_new or self._unsaved_trackers[sender_id][1]
+            self._unsaved_trackers[sender_id] = (serialized_tracker, is_new)
+            if sender_id not in self._write_tasks:
+                self._write_tasks[sender_id] = asyncio.ensure_future(
+                    self._write_behind(sender_id)
                 )
-            )
+            return
+
+        await self._write_tracker(sender_id, serialized_tracker, is_new)
+
+    async def _write_tracker(self, sender_id, serialized_tracker, is_new):
+        if is_new:  # the tracker does not exist localy ( first save)
+            updated_info = await self._insert_tracker_gql(sender_id, serialized_tracker)
+        else:  # the tracker exist localy
+            # Insert only the new events
+            last_timestamp = self._get_last_timestamp(sender_id)
+            new_events = [
+                event
+                for event in serialized_tracker["events"]
+                if event["timestamp"] > last_timestamp
+            ]
             tracker_shallow_copy = {key: val for key, val in serialized_tracker.items()}
             tracker_shallow_copy["events"] = new_events
             # only send the new events to the remote tracker
-            updated_info = self._update_tracker_gql(sender_id, tracker_shallow_copy)
-            # update the last index and last time stamp for future uses
-            self._store_tracker_info(sender_id, updated_info)
-            self.trackers[sender_id] = serialized_tracker
-            return serialized_tracker["events"]
+            updated_info = await self._update_tracker_gql(
+                sender_id, tracker_shallow_copy
+            )
+        # update the last index and last time stamp for future uses
+        self._store_tracker_info(sender_id, updated_info)
+        # failed mutations are logged by `_graphql_query` and don't return info
+        return updated_info is not None
+
+    async def _write_behind(self, sender_id):
+        try:
+            # saves arriving while a mutation is in flight are coalesced into the
+            # next one, so there is never more than one write per sender at a time
+            while sender_id in self._unsaved_trackers:
+                await asyncio.sleep(self.write_behind_delay)
+                serialized_tracker, is_new = self._unsaved_trackers.pop(sender_id)
+                try:
+                    written = await self._write_tracker(
+                        sender_id, serialized_tracker, is_new
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Could not write tracker '{sender_id}' to {self.host}: {e}"
+                    )
+                    written = False
+                if written:
+                    self._write_retries.pop(sender_id, None)
+                else:
+                    self._requeue_failed_write(sender_id, serialized_tracker, is_new)
+        finally:
+            self._write_tasks.pop(sender_id, None)
+
+    def _requeue_failed_write(self, sender_id, serialized_tracker, is_new):
+        if sender_id in self._unsaved_trackers:
+            # the newer save contains all events of the failed one
+            newer_tracker, newer_is_new = self._unsaved_trackers[sender_id]
+            self._unsaved_trackers[sender_id] = (newer_tracker, is_new or newer_is_new)
+            return
+
+        retries = self._write_retries.get(sender_id, 0)
+        if retries < self.write_behind_retries:
+            self._write_retries[sender_id] = retries + 1
+            self._unsaved_trackers[sender_id] = (serialized_tracker, is_new)
+        else:
+            self._write_retries.pop(sender_id, None)
+            logger.error(
+                f"Giving up writing tracker '{sender_id}' to {self.host} after "
+                f"{retries} retries."
+            )
+
+    async def flush(self):
+        """Waits until all pending write-behind saves reached Botfront."""
+        while self._write_tasks:
+            await asyncio.gather(*list(self._write_tasks.values()))
+
+    async def close(self):
+        """Writes pending saves and closes the connections to Botfront."""
+        await self.flush()
+        await self.graphql_client.close()
 
     def _convert_tracker(self, sender_id, tracker):
         if self.domain:
@@ -222,7 +282,7 @@ class BotfrontTrackerStore(TrackerStore):
             return None
 
     def _update_tracker(self, sender_id, remote_tracker):
-        old_tracker = self.trackers.get(sender_id)
+        old_tracker = self._get_local_tracker(sender_id)
         if old_tracker is not None:
             events = old_tracker.get("events")
             remote_events = remote_tracker.get("events")
@@ -234,25 +294,32 @@ class BotfrontTrackerStore(TrackerStore):
                 new_events = [*events, *remote_events]
             new_tracker = {**old_tracker, **remote_tracker}
             new_tracker["events"] = new_events
-            self.trackers[sender_id] = new_tracker
+            self._set_local_tracker(sender_id, new_tracker)
             return new_tracker
         else:
-            self.trackers[sender_id] = remote_tracker
+            self._set_local_tracker(sender_id, remote_tracker)
             return remote_tracker
 
-    def retrieve(self, sender_id):
+    async def retrieve(self, sender_id):
         if self.botfront_test_regex.match(sender_id):
             return self.test_trackers.get(sender_id)
+        current_tracker = self._get_local_tracker(sender_id)
+        # while a write-behind save is pending the local copy is the most recent one
+        if sender_id in self._write_tasks:
+            if sender_id in self._unsaved_trackers:
+                current_tracker = self._unsaved_trackers[sender_id][0]
+            if current_tracker is not None:
+                return self._convert_tracker(sender_id, current_tracker)
         last_index = self._get_last_index(sender_id)
         # retreive all new info since the last sync (given by last index)
-        new_tracker_info = self._fetch_tracker(sender_id, last_index)
-        current_tracker = self.trackers.get(sender_id)
+        new_tracker_info = await self._fetch_tracker(sender_id, last_index)
+        current_tracker = self._get_local_tracker(sender_id)
         # do not chane the order of these ifs
         # ortherwise you will get synchornication issues when working with multiple rasa instances
         # the tracker exist on the remote and may exist locally
         if new_tracker_info is not None:
-            self._store_tracker_info(sender_id, new_tracker_info)
             tracker = self._update_tracker(sender_id, new_tracker_info.get("tracker"))
+            self._store_tracker_info(sender_id, new_tracker_info)
             return self._convert_tracker(sender_id, tracker)
 
         # the tracker do not exist yet
@@ -262,34 +329,6 @@ class BotfrontTrackerStore(TrackerStore):
         # the tracker exist localy an there is no new infos
         return self._convert_tracker(sender_id, current_tracker)
 
-    def cleanup_trackers(self, trackers, persist_time):
-        for key in list(
-            trackers.keys()
-        ):
-            ## wraped in a try block so if an exception occurs it does not stop the sweep mechanism
-            try:
-                tracker = trackers.get(key)
-                max_event_time = time.time() - persist_time
-                latest_event = float("inf")
-                try:
-                    latest_event = tracker.latest_message.timestamp
-                except:
-                    latest_event = tracker.get("latest_event_time", float("inf"))
-                    pass
-                if latest_event < max_event_time:
-                    logger.debug("SWEEPER: Removing botfront test tracker {}".format(key))
-                    if key in trackers:
-                        del trackers[key]
-                    if key in self.trackers_info:
-                        del self.trackers_info[key]
-            except Exception as e:
-                print(e)
-                pass
-
-    def sweep(self):
-        self.cleanup_trackers(self.test_trackers, self.test_tracker_persist_time)
-        self.cleanup_trackers(self.trackers, self.tracker_persist_time)
-
     @staticmethod
     def _serialize_tracker_to_dict(canonical_tracker):
         return canonical_tracker.current_state(EventVerbosity.ALL)
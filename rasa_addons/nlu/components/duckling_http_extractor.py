@@ -1,57 +1,23 @@
 import time
 import logging
-import requests
 from rasa.nlu.extractors.duckling_entity_extractor import DucklingEntityExtractor, convert_duckling_format_to_rasa
 from rasa.shared.utils.io import raise_warning
 from rasa.shared.nlu.training_data.message import Message
 
 from typing import Any, List, Optional, Text, Dict
 from rasa.shared.constants import DOCS_URL_COMPONENTS
-from rasa.shared.nlu.constants import ENTITIES
+from rasa.shared.nlu.constants import ENTITIES, TEXT
 
 logger = logging.getLogger(__name__)
 
 
 class DucklingHTTPExtractorWithTimezone(DucklingEntityExtractor):
 
-    def _duckling_parse(self, text: Text, reference_time: int, timezone) -> List[Dict[Text, Any]]:
-        """Sends the request to the duckling server and parses the result."""
-
-        try:
-            payload = self._payload(text, reference_time)
-            payload["tz"] = timezone # mod
-            headers = {
-                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
-            }
-            response = requests.post(
-                self._url() + "/parse",
-                data=payload,
-                headers=headers,
-                timeout=self.component_config.get("timeout"),
-            )
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(
-                    "Failed to get a proper response from remote "
-                    "duckling. Status Code: {}. Response: {}"
-                    "".format(response.status_code, response.text)
-                )
-                return []
-        except (
-            requests.exceptions.ConnectionError,
-            requests.exceptions.ReadTimeout,
-        ) as e:
-            logger.error(
-                "Failed to connect to duckling http server. Make sure "
-                "the duckling server is running/healthy/not stale and the proper host "
-                "and port are set in the configuration. More "
-                "information on how to run the server can be found on "
-                "github: "
-                "https://github.com/facebook/duckling#quickstart "
-                "Error: {}".format(e)
-            )
-            return []
+    def _payload_with_timezone(self, text: Text, reference_time: int, timezone) -> Dict[Text, Any]:
+        """Returns the payload of the request to the duckling server."""
+        payload = self._payload(text, reference_time)
+        payload["tz"] = timezone # mod
+        return payload
 
     @staticmethod
     def _timezone_from_config_or_request(component_config, timezone):
@@ -83,7 +49,7 @@ class DucklingHTTPExtractorWithTimezone(DucklingEntityExtractor):
                 )
         return int(time.time()) * 1000
 
-    def process(self, message: Message, **kwargs: Any) -> None:
+    def process(self, messages: List[Message], **kwargs: Any) -> List[Message]:
 
         if self._url() is not None:
             # mod >
@@ -91,18 +57,22 @@ class DucklingHTTPExtractorWithTimezone(DucklingEntityExtractor):
             timezone = self._timezone_from_config_or_request(
                 self.component_config, params.get("timezone", None)
             )
-            reference_time = self._reference_time_from_message_or_request(
-                message, params.get("reference_time", None)
-            )
-            matches = self._duckling_parse(message.text, reference_time, timezone)
+            # every message carries its own timezone and reference time so that
+            # all messages are parsed with a single batch of concurrent requests
+            payloads = [
+                self._payload_with_timezone(
+                    message.get(TEXT),
+                    self._reference_time_from_message_or_request(
+                        message, params.get("reference_time", None)
+                    ),
+                    timezone,
+                )
+                for message in messages
+            ]
+            all_matches = self._duckling_client().parse_batch(payloads)
             # </ mod
-            all_extracted = convert_duckling_format_to_rasa(matches)
-            dimensions = self.component_config["dimensions"]
-            extracted = DucklingEntityExtractor.filter_irrelevant_entities(
-                all_extracted, dimensions
-            )
         else:
-            extracted = []
+            all_matches = [[] for _ in messages]
             raise_warning(
                 "Duckling HTTP component in pipeline, but no "
                 "`url` configuration in the config "
@@ -111,7 +81,15 @@ class DucklingHTTPExtractorWithTimezone(DucklingEntityExtractor):
                 docs=DOCS_URL_COMPONENTS + "#ducklinghttpextractor",
             )
 
-        extracted = self.add_extractor_name(extracted)
-        message.set(
-            ENTITIES, message.get(ENTITIES, []) + extracted, add_to_output=True,
-        )
\ No newline at end of file
+        dimensions = self.component_config["dimensions"]
+        for message, matches in zip(messages, all_matches):
+            all_extracted = convert_duckling_format_to_rasa(matches)
+            extracted = DucklingEntityExtractor.filter_irrelevant_entities(
+                all_extracted, dimensions
+            )
+            extracted = self.add_extractor_name(extracted)
+            message.set(
+                ENTITIES, message.get(ENTITIES, []) + extracted, add_to_output=True,
+            )
+
+        return messages
@@ -1,130 +1,310 @@
-import os
-import warnings
-import rasa
-
-from typing import Any, Text, Dict, Optional
+from __future__ import annotations
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Text, Tuple
 
 import rasa.shared.utils.io
-from rasa.nlu import utils
-from rasa.model_training import train_nlu
-from rasa.nlu.components import Component
-from rasa.nlu.config import RasaNLUModelConfig
+from rasa.engine.graph import ExecutionContext, GraphComponent
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.shared.exceptions import InvalidConfigException
+from rasa.shared.nlu.constants import (
+    ENTITIES,
+    ENTITY_ATTRIBUTE_TYPE,
+    ENTITY_ATTRIBUTE_VALUE,
+)
 from rasa.shared.nlu.training_data.message import Message
 from rasa.shared.nlu.training_data.training_data import TrainingData
-from rasa.nlu.model import Metadata
 
 from fuzzy_matcher import process
 
+logger = logging.getLogger(__name__)
+
 
-class Gazette(Component):
-    name = "Gazette"
+class GazetteIndex:
+    """Inverted index from character n-grams to the gazette values containing them.
 
-    defaults = {"max_num_suggestions": 5, "entities": []}
+    Only values which share n-grams with the queried value are candidates for fuzzy
+    matching, ranked by the number of shared n-grams.
+    """
 
     def __init__(
-        self, component_config: Text = None, gazette: Optional[Dict] = None
+        self,
+        values: List[Text],
+        ngram_size: int,
+        postings: Optional[Dict[Text, List[int]]] = None,
     ) -> None:
+        """Creates the index.
 
-        super(Gazette, self).__init__(component_config)
-        self.gazette = gazette if gazette else {}
-        if gazette:
-            self._load_config()
-        self.limit = self.component_config.get("max_num_suggestions")
-        self.entities = self.component_config.get("entities", [])
-
-    def process(self, message: Message, **kwargs: Any) -> None:
-
-        entities = message.get("entities", [])
-        new_entities = []
-
-        for entity in entities:
-            config = self._find_entity(entity, self.entities)
-            if config is None or not isinstance(entity["value"], str):
-                new_entities.append(entity)
-                continue
-
-            matches = process.extract(
-                entity["value"],
-                self.gazette.get(entity["entity"], []),
-                limit=self.limit,
-                scorer=config["mode"],
-            )
-            primary, score = matches[0] if len(matches) else (None, None)
+        Args:
+            values: The values of a gazette table.
+            ngram_size: Number of characters per n-gram.
+            postings: Previously built postings for `values`. If not given, they are
+                built from `values`.
+        """
+        self.values = values
+        self.ngram_size = ngram_size
+
+        if postings is None:
+            postings = {}
+            for value_index, value in enumerate(values):
+                for ngram in self.ngrams(value, ngram_size):
+                    postings.setdefault(ngram, []).append(value_index)
+        self.postings = postings
+
+    @staticmethod
+    def ngrams(value: Text, ngram_size: int) -> Set[Text]:
+        """Returns the n-grams of the normalized value.
+
+        Like the default processor of `fuzzy_matcher`, the value is lowercased and
+        non-alphanumeric characters are treated as whitespace.
+        """
+        normalized = "".join(
+            character if character.isalnum() else " " for character in value.lower()
+        )
+        padded = " " + " ".join(normalized.split()) + " "
+        if len(padded) <= ngram_size:
+            return {padded}
+        return {
+            padded[start : start + ngram_size]
+            for start in range(len(padded) - ngram_size + 1)
+        }
+
+    def candidates(self, value: Text, max_candidates: int) -> List[Text]:
+        """Finds the values which share most n-grams with `value`.
+
+        Args:
+            value: The value to look up.
+            max_candidates: Maximum number of returned values.
+
+        Returns:
+            The candidates in the order in which they appear in the gazette.
+        """
+        shared_ngrams: Counter = Counter()
+        for ngram in self.ngrams(value, self.ngram_size):
+            shared_ngrams.update(self.postings.get(ngram, []))
+
+        best = shared_ngrams.most_common(max_candidates)
+        return [self.values[value_index] for value_index in sorted(i for i, _ in best)]
+
+    def as_dict(self) -> Dict[Text, Any]:
+        """Returns a JSON serializable representation of the index."""
+        return {"ngram_size": self.ngram_size, "postings": self.postings}
 
-            if primary is not None and score > config["min_score"]:
-                entity["value"] = primary
-                entity["gazette_matches"] = [
-                    {"value": value, "score": num} for value, num in matches
-                ]
-                new_entities.append(entity)
 
-        message.set("entities", new_entities)
+@DefaultV1Recipe.register(
+    DefaultV1Recipe.ComponentType.ENTITY_EXTRACTOR, is_trainable=True
+)
+class Gazette(GraphComponent):
+    """Replaces entity values with the closest value of a gazette table.
 
-    def train(
-        self, training_data: TrainingData, cfg: RasaNLUModelConfig, **kwargs: Any
+    Entities which are configured in `entities` but don't have a close enough match
+    in the gazette are removed.
+    """
+
+    GAZETTE_FILENAME = "gazette.json"
+    INDEX_FILENAME = "gazette_index.json"
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        """The component's default config (see parent class for full docstring)."""
+        return {
+            # number of gazette matches which are added to an entity
+            "max_num_suggestions": 5,
+            # entities which are matched against the gazette, each with a `name`
+            # and optionally a fuzzy matching `mode` and a `min_score`
+            "entities": [],
+            # number of characters of the n-grams which are used to find candidates
+            "ngram_size": 3,
+            # maximum number of candidates which are scored per entity value
+            "max_candidates": 100,
+        }
+
+    def __init__(
+        self,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        gazette: Optional[Dict[Text, List[Text]]] = None,
+        indices: Optional[Dict[Text, GazetteIndex]] = None,
     ) -> None:
-        gazette_dict = {}
-        if hasattr(training_data, "gazette") and type(training_data.gazette) == list:
-            for item in training_data.gazette:
-                name = item["value"]
-                table = item["gazette"]
-                gazette_dict[name] = table
-            self.gazette = gazette_dict
+        """Creates the component.
 
-    def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
-        file_name = file_name + ".json"
-        utils.write_json_to_file(os.path.join(model_dir, file_name), self.gazette, indent=4)
+        Args:
+            config: The component's config.
+            model_storage: Storage which the component can use to persist and load
+                itself.
+            resource: Resource locator for this component which can be used to persist
+                and load itself from the `model_storage`.
+            gazette: The values of each gazette table.
+            indices: The indices of the gazette tables. Indices which are missing
+                are built from `gazette`.
+        """
+        self._config = {**self.get_default_config(), **config}
+        self._model_storage = model_storage
+        self._resource = resource
+
+        self.limit = self._config["max_num_suggestions"]
+        self.gazette = gazette if gazette else {}
+        self.entities = self._entity_configs()
+        self._indices = self._build_indices(indices or {})
 
-        return {"file": file_name}
-    
     @classmethod
-    def load(
+    def create(
         cls,
-        component_meta: Dict[Text, Any],
-        model_dir: Text = None,
-        model_metadata: Metadata = None,
-        cached_component: Optional["Gazette"] = None,
-        **kwargs: Any
-    ) -> "Gazette":
-        try:
-            file = os.path.join(model_dir, component_meta.get("file", "gazette.json"))
-            return Gazette(component_meta, rasa.shared.utils.io.read_json_file(file))
-        except:
-            warnings.warn("Could not load gazette.")
-            return Gazette(component_meta, None)
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> Gazette:
+        """Creates a new untrained component (see parent class for full docstring)."""
+        return cls(config, model_storage, resource)
 
-    @staticmethod
-    def _find_entity(entity, entities):
-        for rep in entities:
-            if entity["entity"] == rep["name"]:
-                return rep
-        return None
-
-    def _load_config(self):
-        entities = []
-        for rep in self.component_config.get("entities", []):
-            assert (
-                "name" in rep
-            ), "Must provide the entity name for the gazette entity configuration: {}".format(
-                rep
-            )
-            assert (
-                rep["name"] in self.gazette
-            ), "Could not find entity name {0} in gazette {1}".format(
-                rep["name"], self.gazette
-            )
+    def _entity_configs(self) -> Dict[Text, Dict[Text, Any]]:
+        entity_configs = {}
+        for entity_config in self._config["entities"]:
+            if "name" not in entity_config:
+                raise InvalidConfigException(
+                    f"Must provide the entity name for the gazette entity "
+                    f"configuration: {entity_config}"
+                )
+            if self.gazette and entity_config["name"] not in self.gazette:
+                raise InvalidConfigException(
+                    f"Could not find entity name '{entity_config['name']}' in the "
+                    f"gazette."
+                )
+
+            entity_configs[entity_config["name"]] = {
+                "name": entity_config["name"],
+                "mode": str(entity_config.get("mode", "ratio")),
+                "min_score": int(entity_config.get("min_score", 80)),
+            }
+        return entity_configs
+
+    def _build_indices(
+        self, indices: Dict[Text, GazetteIndex]
+    ) -> Dict[Text, GazetteIndex]:
+        ngram_size = self._config["ngram_size"]
+        return {
+            name: indices[name]
+            if name in indices and indices[name].ngram_size == ngram_size
+            else GazetteIndex(values, ngram_size)
+            for name, values in self.gazette.items()
+        }
+
+    def train(self, training_data: TrainingData) -> Resource:
+        """Builds the gazette and its indices from the training data."""
+        gazette = {}
+        if hasattr(training_data, "gazette") and isinstance(
+            training_data.gazette, list
+        ):
+            for item in training_data.gazette:
+                gazette[item["value"]] = item["gazette"]
+
+        self.gazette = gazette
+        self.entities = self._entity_configs()
+        self._indices = self._build_indices({})
+
+        self.persist()
+        return self._resource
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        """Replaces the entity values of the messages with their gazette matches.
+
+        Entity values which appear repeatedly within `messages` are only matched
+        once.
+
+        Returns:
+            The given messages which have been modified in-place.
+        """
+        matches_cache: Dict[Tuple[Text, Text], List[Tuple[Text, int]]] = {}
+
+        for message in messages:
+            new_entities = []
+            for entity in message.get(ENTITIES, []):
+                entity_config = self.entities.get(entity[ENTITY_ATTRIBUTE_TYPE])
+                value = entity[ENTITY_ATTRIBUTE_VALUE]
+                if entity_config is None or not isinstance(value, str):
+                    new_entities.append(entity)
+                    continue
+
+                cache_key = (entity[ENTITY_ATTRIBUTE_TYPE], value)
+                if cache_key not in matches_cache:
+                    matches_cache[cache_key] = self._find_matches(value, entity_config)
+                matches = matches_cache[cache_key]
+
+                primary, score = matches[0] if matches else (None, None)
+                if primary is not None and score > entity_config["min_score"]:
+                    entity[ENTITY_ATTRIBUTE_VALUE] = primary
+                    entity["gazette_matches"] = [
+                        {"value": match, "score": match_score}
+                        for match, match_score in matches
+                    ]
+                    new_entities.append(entity)
 
-            supported_properties = ["mode", "min_score"]
-            defaults = ["ratio", 80]
-            types = [str, int]
+            message.set(ENTITIES, new_entities)
 
-            new_element = {"name": rep["name"]}
-            for prop, default, t in zip(supported_properties, defaults, types):
-                if prop not in rep:
-                    new_element[prop] = default
-                else:
-                    new_element[prop] = t(rep[prop])
+        return messages
 
-            entities.append(new_element)
+    def _find_matches(
+        self, value: Text, entity_config: Dict[Text, Any]
+    ) -> List[Tuple[Text, int]]:
+        index = self._indices.get(entity_config["name"])
+        if index is None:
+            return []
 
-        self.component_config["entities"] = entities
+        candidates = index.candidates(value, self._config["max_candidates"])
+        if not candidates:
+            return []
+
+        return process.extract(
+            value, candidates, limit=self.limit, scorer=entity_config["mode"]
+        )
+
+    def persist(self) -> None:
+        """Persists the gazette and its indices."""
+        with self._model_storage.write_to(self._resource) as model_dir:
+            rasa.shared.utils.io.dump_obj_as_json_to_file(
+                model_dir / self.GAZETTE_FILENAME, self.gazette
+            )
+            rasa.shared.utils.io.dump_obj_as_json_to_file(
+                model_dir / self.INDEX_FILENAME,
+                {name: index.as_dict() for name, index in self._indices.items()},
+            )
+
+    @classmethod
+    def load(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,
+    ) -> Gazette:
+        """Loads trained component (see parent class for full docstring)."""
+        try:
+            with model_storage.read_from(resource) as model_dir:
+                gazette = rasa.shared.utils.io.read_json_file(
+                    model_dir / cls.GAZETTE_FILENAME
+                )
+                serialized_indices = {}
+                if (model_dir / cls.INDEX_FILENAME).is_file():
+                    serialized_indices = rasa.shared.utils.io.read_json_file(
+                        model_dir / cls.INDEX_FILENAME
+                    )
+        except (ValueError, FileNotFoundError):
+            rasa.shared.utils.io.raise_warning(
+                f"Failed to load {cls.__name__} from model storage. Resource "
+                f"'{resource.name}' doesn't exist."
+            )
+            return cls(config, model_storage, resource)
+
+        indices = {
+            name: GazetteIndex(
+                gazette[name], serialized["ngram_size"], serialized["postings"]
+            )
+            for name, serialized in serialized_indices.items()
+            if name in gazette
+        }
+        return cls(config, model_storage, resource, gazette, indices)
@@ -1,119 +1,255 @@
-import os
-import warnings
-
-from typing import Any, Text, Dict, Optional, List
-
-from rasa.nlu.components import Component
-from rasa.nlu.config import RasaNLUModelConfig
+from __future__ import annotations
+import json
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Text, Tuple
+
+import numpy as np
+
+import rasa.shared.utils.io
+from rasa.engine.graph import ExecutionContext, GraphComponent
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.shared.nlu.constants import (
+    ENTITIES,
+    ENTITY_ATTRIBUTE_TYPE,
+    ENTITY_ATTRIBUTE_VALUE,
+    INTENT,
+    INTENT_NAME_KEY,
+    INTENT_RANKING_KEY,
+    TEXT,
+)
 from rasa.shared.nlu.training_data.message import Message
 from rasa.shared.nlu.training_data.training_data import TrainingData
-from rasa.nlu.model import Metadata
 
+logger = logging.getLogger(__name__)
 
-class IntentRankingCanonicalExampleInjector(Component):
-    """
-        Will remember the first encountered intent/entity-value combination
-        in the training data, and inject it under a "canonical" key in each
-        member of intent_ranking.
+# entity types and their values serialized as JSON, so that values which are lists
+# or dictionaries (e.g. time intervals) are hashable
+EntityPairs = FrozenSet[Tuple[Text, Text]]
+
+# number of set bits of every byte
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+
+class CanonicalExampleIndex:
+    """Finds the canonical example of an intent with the closest entities.
+
+    Each entity combination of the intent is stored as a bitset over the
+    entity-value pairs of the intent, so that the size of the symmetric difference
+    to all combinations is computed at once.
     """
 
-    name = "IntentRankingCanonicalExampleInjector"
+    def __init__(self, canonicals: Dict[EntityPairs, Text]) -> None:
+        """Creates the index.
+
+        Args:
+            canonicals: Canonical example for each entity combination in the order
+                in which the combinations appear in the training data.
+        """
+        self.canonicals = canonicals
+        self._texts = list(canonicals.values())
 
-    defaults = {}
+        self._pair_positions: Dict[Tuple[Text, Text], int] = {}
+        for pairs in canonicals:
+            for pair in pairs:
+                self._pair_positions.setdefault(pair, len(self._pair_positions))
+
+        combinations = np.zeros(
+            (len(canonicals), len(self._pair_positions)), dtype=bool
+        )
+        for row, pairs in enumerate(canonicals):
+            for pair in pairs:
+                combinations[row, self._pair_positions[pair]] = True
+        self._bitsets = np.packbits(combinations, axis=1)
+
+    def nearest(self, entity_pairs: EntityPairs) -> Optional[Text]:
+        """Returns the canonical example whose entities differ least from the given.
+
+        Ties are resolved in favor of the combination which appeared first in the
+        training data.
+        """
+        if not self._texts:
+            return None
+        if entity_pairs in self.canonicals:
+            return self.canonicals[entity_pairs]
+
+        # pairs which are unknown for the intent add the same difference to all
+        # combinations and are hence ignored
+        query = np.zeros(len(self._pair_positions), dtype=bool)
+        for pair in entity_pairs:
+            position = self._pair_positions.get(pair)
+            if position is not None:
+                query[position] = True
+
+        differences = _POPCOUNT[np.bitwise_xor(self._bitsets, np.packbits(query))].sum(
+            axis=1
+        )
+        return self._texts[int(np.argmin(differences))]
+
+
+@DefaultV1Recipe.register(
+    DefaultV1Recipe.ComponentType.INTENT_CLASSIFIER, is_trainable=True
+)
+class IntentRankingCanonicalExampleInjector(GraphComponent):
+    """Injects a canonical example into each member of the intent ranking.
+
+    The canonical example of an intent/entity-value combination is the first
+    example of this combination in the training data. Each member of
+    `intent_ranking` gets the canonical example of its intent whose entities are
+    closest to the entities of the message under the "canonical" key.
+    """
+
+    CANONICALS_FILENAME = "canonicals.json"
 
     def __init__(
         self,
-        component_config: Optional[Dict[Text, Any]] = None,
-        canonicals: Optional[Dict] = {},
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        canonicals: Optional[Dict[Text, Dict[EntityPairs, Text]]] = None,
     ) -> None:
+        """Creates the component.
+
+        Args:
+            config: The component's config.
+            model_storage: Storage which the component can use to persist and load
+                itself.
+            resource: Resource locator for this component which can be used to persist
+                and load itself from the `model_storage`.
+            canonicals: Canonical example for each intent and entity combination.
+        """
+        self._config = config
+        self._model_storage = model_storage
+        self._resource = resource
+
+        self.canonicals = canonicals if canonicals else {}
+        self._indices = {
+            intent: CanonicalExampleIndex(intent_canonicals)
+            for intent, intent_canonicals in self.canonicals.items()
+        }
 
-        super(IntentRankingCanonicalExampleInjector, self).__init__(component_config)
-        self.canonicals = canonicals
+    @classmethod
+    def create(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> IntentRankingCanonicalExampleInjector:
+        """Creates a new untrained component (see parent class for full docstring)."""
+        return cls(config, model_storage, resource)
 
     @staticmethod
-    def generate_entity_pairs(entities):
-        return frozenset((e.get("entity"), e.get("value")) for e in entities)
+    def generate_entity_pairs(entities: List[Dict[Text, Any]]) -> EntityPairs:
+        """Returns the entity-value pairs of the entities."""
+        return frozenset(
+            (
+                e.get(ENTITY_ATTRIBUTE_TYPE),
+                json.dumps(e.get(ENTITY_ATTRIBUTE_VALUE), sort_keys=True, default=str),
+            )
+            for e in entities
+        )
 
-    def generate_canonicals(self, nlu_data):
+    def generate_canonicals(
+        self, nlu_data: List[Message]
+    ) -> Dict[Text, Dict[EntityPairs, Text]]:
+        """Collects the first example of each intent and entity combination."""
         # could be done by inspecting metadata of items, but here
         # canonical-first order is assumed
-        canonicals = {}
+        canonicals: Dict[Text, Dict[EntityPairs, Text]] = {}
         for datum in nlu_data:
             intent, text, entities = (
-                datum.get("intent", ""),
-                datum.get("text", ""),
-                datum.get("entities", []),
+                datum.get(INTENT, ""),
+                datum.get(TEXT, ""),
+                datum.get(ENTITIES, []),
             )
-            entities = self.generate_entity_pairs(entities)
-            if intent not in canonicals:
-                canonicals[intent] = {}
-            if entities not in canonicals[intent]:
-                canonicals[intent][entities] = text
+            entity_pairs = self.generate_entity_pairs(entities)
+            canonicals.setdefault(intent, {}).setdefault(entity_pairs, text)
 
         return canonicals
 
-    def train(
-        self, training_data: TrainingData, cfg: RasaNLUModelConfig, **kwargs: Any
-    ) -> None:
-
+    def train(self, training_data: TrainingData) -> Resource:
+        """Collects the canonical examples from the training data."""
         self.canonicals = self.generate_canonicals(training_data.training_examples)
-
-    def get_canonical(self, intent, entities):
-        if intent not in self.canonicals.keys():
+        self._indices = {
+            intent: CanonicalExampleIndex(intent_canonicals)
+            for intent, intent_canonicals in self.canonicals.items()
+        }
+
+        self.persist()
+        return self._resource
+
+    def get_canonical(
+        self, intent: Optional[Text], entities: List[Dict[Text, Any]]
+    ) -> Optional[Text]:
+        """Returns the canonical example of the intent closest to the entities."""
+        index = self._indices.get(intent)
+        if index is None:
             return None
-        entities = self.generate_entity_pairs(entities)
-        canonicals = self.canonicals[intent]
-        if len(canonicals or {}) < 1:
-            return None
-        if entities in canonicals:
-            return canonicals[entities]
-        matches = sorted(
-            canonicals.keys(), key=lambda k: len(k.symmetric_difference(entities)),
-        )
-        return canonicals[matches[0]]
-
-    def process(self, message: Message, **kwargs: Any) -> None:
-        intent_ranking, entities = (
-            message.get("intent_ranking", []),
-            message.get("entities", []),
-        )
-
-        for i in range(len(intent_ranking)):
-            intent_ranking[i]["canonical"] = self.get_canonical(
-                intent_ranking[i].get("name"), entities
+        return index.nearest(self.generate_entity_pairs(entities))
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        """Adds the canonical examples to the intent rankings of the messages.
+
+        Returns:
+            The given messages which have been modified in-place.
+        """
+        for message in messages:
+            intent_ranking = message.get(INTENT_RANKING_KEY, [])
+            entity_pairs = self.generate_entity_pairs(message.get(ENTITIES, []))
+
+            for ranked_intent in intent_ranking:
+                index = self._indices.get(ranked_intent.get(INTENT_NAME_KEY))
+                ranked_intent["canonical"] = (
+                    index.nearest(entity_pairs) if index is not None else None
+                )
+
+            message.set(INTENT_RANKING_KEY, intent_ranking, add_to_output=True)
+
+        return messages
+
+    def persist(self) -> None:
+        """Persists the canonical examples."""
+        serialized = {
+            intent: [
+                {ENTITIES: [list(pair) for pair in entity_pairs], TEXT: text}
+                for entity_pairs, text in intent_canonicals.items()
+            ]
+            for intent, intent_canonicals in self.canonicals.items()
+        }
+        with self._model_storage.write_to(self._resource) as model_dir:
+            rasa.shared.utils.io.dump_obj_as_json_to_file(
+                model_dir / self.CANONICALS_FILENAME, serialized
             )
 
-        message.set(
-            "intent_ranking", intent_ranking, add_to_output=True,
-        )
-
     @classmethod
     def load(
         cls,
-        meta: Dict[Text, Any],
-        model_dir: Text = None,
-        model_metadata: Metadata = None,
-        cached_component: Optional["IntentRankingCanonicalExampleInjector"] = None,
-        **kwargs: Any
-    ) -> "IntentRankingCanonicalExampleInjector":
-
-        from rasa.utils.io import pickle_load
-
-        file_name = meta.get("file")
-        path = os.path.join(model_dir, file_name)
-
-        if os.path.exists(path):
-            return cls(meta, **pickle_load(path))
-        else:
-            return cls(meta)
-
-    def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
-
-        from rasa.utils.io import pickle_dump
-
-        file_name = file_name + ".pickle"
-        path = os.path.join(model_dir, file_name)
-        persisted = {"canonicals": self.canonicals}
-        pickle_dump(path, persisted)
-
-        return {"file": file_name}
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,
+    ) -> IntentRankingCanonicalExampleInjector:
+        """Loads trained component (see parent class for full docstring)."""
+        try:
+            with model_storage.read_from(resource) as model_dir:
+                serialized = rasa.shared.utils.io.read_json_file(
+                    model_dir / cls.CANONICALS_FILENAME
+                )
+        except (ValueError, FileNotFoundError):
+            logger.debug(
+                f"Failed to load {cls.__name__} from model storage. Resource "
+                f"'{resource.name}' doesn't exist."
+            )
+            return cls(config, model_storage, resource)
+
+        canonicals = {
+            intent: {
+                frozenset(tuple(pair) for pair in canonical[ENTITIES]): canonical[TEXT]
+                for canonical in intent_canonicals
+            }
+            for intent, intent_canonicals in serialized.items()
+        }
+        return cls(config, model_storage, resource, canonicals)
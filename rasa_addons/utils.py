@@ -1,4 +1,6 @@
 import logging
+import time
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
@@ -17,3 +19,61 @@ def get_latest_parse_data_language(all_events):
 
     except StopIteration:
         return None
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Mapping bounded in size which also expires entries after a time-to-live.
+
+    Entries are evicted in least-recently-used order once `max_size` is reached and
+    dropped lazily when they are accessed more than `ttl` seconds after they were
+    last written or read.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, stored_at = entry
+        if self._expired(stored_at):
+            del self._entries[key]
+            return default
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __delitem__(self, key):
+        del self._entries[key]
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def __len__(self):
+        return len(self._entries)
+
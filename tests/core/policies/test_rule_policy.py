@@ -1,8 +1,13 @@
+import concurrent.futures
+import json
 from pathlib import Path
-from typing import Text, Callable, Dict, Any, Optional, cast
+from typing import Text, Callable, Dict, Any, List, Optional, cast
 
 import dataclasses
+from unittest.mock import Mock
+
 import pytest
+from _pytest.monkeypatch import MonkeyPatch
 
 from rasa.engine.graph import ExecutionContext
 from rasa.engine.storage.resource import Resource
@@ -36,6 +41,8 @@ from rasa.shared.core.constants import (
     RULE_ONLY_SLOTS,
     RULE_ONLY_LOOPS,
     ACTION_UNLIKELY_INTENT_NAME,
+    SHOULD_NOT_BE_SET,
+    SLOTS,
 )
 from rasa.shared.core.training_data.story_reader.yaml_story_reader import (
     YAMLStoryReader,
@@ -3169,3 +3176,259 @@ def test_initial_values_are_not_incorporated_into_rule_policy(
     policy.train(trackers, domain)
 
     assert not any(["has_said_hi" in rule for rule in policy.lookup[RULES]])
+
+
+@pytest.mark.parametrize(
+    "conversation_states",
+    [
+        [
+            {},
+            {PREVIOUS_ACTION: {ACTION_NAME: ACTION_LISTEN_NAME}, USER: {INTENT: "a"}},
+        ],
+        [
+            {PREVIOUS_ACTION: {ACTION_NAME: ACTION_LISTEN_NAME}, USER: {INTENT: "a"}},
+            {PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}, SLOTS: {"s": (1.0,)}},
+        ],
+        [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}, SLOTS: {"s": (1.0,)}}],
+        [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}, ACTIVE_LOOP: {LOOP_NAME: "f"}}],
+        [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}, USER: {INTENT: "b"}}],
+        [{SLOTS: {"s": (1.0,)}}],
+    ],
+)
+def test_rule_index_finds_same_rules_as_matching_every_rule(
+    policy: RulePolicy, conversation_states: List[Dict[Text, Any]]
+):
+    rule_states = [
+        [{PREVIOUS_ACTION: {ACTION_NAME: ACTION_LISTEN_NAME}, USER: {INTENT: "a"}}],
+        [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}}],
+        [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}, SLOTS: {"s": [1.0]}}],
+        [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}, SLOTS: {"s": [2.0]}}],
+        [
+            {
+                PREVIOUS_ACTION: {ACTION_NAME: "utter_a"},
+                ACTIVE_LOOP: {LOOP_NAME: SHOULD_NOT_BE_SET},
+            }
+        ],
+        [
+            {},
+            {PREVIOUS_ACTION: {ACTION_NAME: ACTION_LISTEN_NAME}, USER: {INTENT: "a"}},
+        ],
+        [
+            {PREVIOUS_ACTION: {ACTION_NAME: "utter_b"}},
+            {PREVIOUS_ACTION: {ACTION_NAME: ACTION_LISTEN_NAME}, USER: {INTENT: "a"}},
+            {PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}},
+        ],
+        [{SLOTS: {"s": [1.0]}}],
+        [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}, USER: {"entities": [["e"]]}}],
+    ]
+    lookup = {json.dumps(states, sort_keys=True): "action" for states in rule_states}
+    policy.lookup[RULES] = lookup
+
+    expected_keys = set(lookup.keys())
+    for turn_index, state in enumerate(reversed(conversation_states)):
+        expected_keys = {
+            key
+            for key in expected_keys
+            if policy._is_rule_applicable(key, turn_index, state)
+        }
+
+    assert policy._get_possible_keys(RULES, conversation_states) == expected_keys
+
+
+def test_rule_index_is_recompiled_if_lookup_changes(policy: RulePolicy):
+    states = [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}}]
+    rule_key = json.dumps(states, sort_keys=True)
+    lookup = {rule_key: "action"}
+    policy.lookup[RULES] = lookup
+
+    assert policy._get_possible_keys(RULES, states) == {rule_key}
+
+    lookup.pop(rule_key)
+    assert policy._get_possible_keys(RULES, states) == set()
+
+    lookup[rule_key] = "action"
+    assert policy._get_possible_keys(RULES, states) == {rule_key}
+
+    # the number of rules stays the same
+    lookup.pop(rule_key)
+    lookup[json.dumps([{PREVIOUS_ACTION: {ACTION_NAME: "utter_b"}}])] = "action"
+    assert policy._get_possible_keys(RULES, states) == set()
+
+
+def test_rule_index_of_replaced_lookup_is_released(policy: RulePolicy):
+    states = [{PREVIOUS_ACTION: {ACTION_NAME: "utter_a"}}]
+    rule_key = json.dumps(states, sort_keys=True)
+
+    policy.lookup[RULES] = {rule_key: "action"}
+    assert policy._get_possible_keys(RULES, states) == {rule_key}
+    policy.lookup[RULES] = {}
+    assert policy._get_possible_keys(RULES, states) == set()
+
+    assert len(policy._rule_indices) == 1
+
+
+def _trackers_with_deleted_rule_and_contradiction(
+    domain: Domain,
+) -> List[TrackerWithCachedStates]:
+    rule = TrackerWithCachedStates.from_events(
+        "conditioned on action",
+        domain=domain,
+        slots=domain.slots,
+        evts=[
+            ActionExecuted(RULE_SNIPPET_ACTION_NAME),
+            ActionExecuted("utter_1"),
+            ActionExecuted(ACTION_LISTEN_NAME),
+            UserUttered(intent={"name": "intent_1"}),
+            ActionExecuted("utter_2"),
+        ],
+        is_rule_tracker=True,
+    )
+    stories = [
+        TrackerWithCachedStates.from_events(
+            f"story {i}",
+            domain=domain,
+            slots=domain.slots,
+            evts=[
+                UserUttered(intent={"name": "intent_1"}),
+                ActionExecuted("utter_1"),
+                ActionExecuted("utter_2"),
+            ],
+        )
+        for i in range(3)
+    ]
+    return [rule, *stories]
+
+
+@pytest.fixture()
+def domain_with_two_utterances() -> Domain:
+    return Domain.from_yaml(
+        f"""
+        version: "{LATEST_TRAINING_DATA_FORMAT_VERSION}"
+        intents:
+        - intent_1
+        actions:
+        - utter_1
+        - utter_2
+        """
+    )
+
+
+def test_parallel_contradiction_check_has_same_result_as_sequential_check(
+    policy_with_config: Callable[..., RulePolicy], domain_with_two_utterances: Domain
+):
+    trackers = _trackers_with_deleted_rule_and_contradiction(domain_with_two_utterances)
+
+    sequential_policy = policy_with_config()
+    sequential_policy.train(trackers, domain_with_two_utterances)
+
+    parallel_policy = policy_with_config({"contradiction_check_processes": 2})
+    parallel_policy.train(trackers, domain_with_two_utterances)
+
+    assert parallel_policy.lookup == sequential_policy.lookup
+    assert len(parallel_policy.lookup[RULES]) == 1
+
+
+def test_parallel_contradiction_check_raises_for_contradicting_rules(
+    policy_with_config: Callable[..., RulePolicy]
+):
+    utter_anti_greet_action = "utter_anti_greet"
+    domain = Domain.from_yaml(
+        f"""
+        version: "{LATEST_TRAINING_DATA_FORMAT_VERSION}"
+        intents:
+        - {GREET_INTENT_NAME}
+        actions:
+        - {UTTER_GREET_ACTION}
+        - {utter_anti_greet_action}
+        """
+    )
+    anti_greet_story = TrackerWithCachedStates.from_events(
+        "anti greet story",
+        domain=domain,
+        slots=domain.slots,
+        evts=[
+            ActionExecuted(RULE_SNIPPET_ACTION_NAME),
+            ActionExecuted(ACTION_LISTEN_NAME),
+            UserUttered(intent={"name": GREET_INTENT_NAME}),
+            ActionExecuted(utter_anti_greet_action),
+            ActionExecuted(ACTION_LISTEN_NAME),
+        ],
+    )
+
+    policy = policy_with_config({"contradiction_check_processes": 2})
+    with pytest.raises(InvalidRule) as execinfo:
+        policy.train([GREET_RULE, anti_greet_story], domain)
+
+    assert anti_greet_story.sender_id in execinfo.value.message
+
+
+def test_contradiction_check_uses_cached_results(
+    policy_with_config: Callable[..., RulePolicy],
+    domain_with_two_utterances: Domain,
+    monkeypatch: MonkeyPatch,
+):
+    caching_config = {"cache_contradiction_checks": True}
+    trackers = _trackers_with_deleted_rule_and_contradiction(domain_with_two_utterances)
+    policy_with_config(caching_config).train(trackers, domain_with_two_utterances)
+
+    policy = policy_with_config(caching_config)
+    analyze_tracker = Mock(wraps=policy._analyze_tracker)
+    monkeypatch.setattr(policy, policy._analyze_tracker.__name__, analyze_tracker)
+    policy.train(trackers, domain_with_two_utterances)
+
+    analyze_tracker.assert_not_called()
+    assert len(policy.lookup[RULES]) == 1
+
+    # adding a story only requires checking the new story
+    new_story = TrackerWithCachedStates.from_events(
+        "new story",
+        domain=domain_with_two_utterances,
+        slots=domain_with_two_utterances.slots,
+        evts=[UserUttered(intent={"name": "intent_1"}), ActionExecuted("utter_2")],
+    )
+    policy = policy_with_config(caching_config)
+    analyze_tracker = Mock(wraps=policy._analyze_tracker)
+    monkeypatch.setattr(policy, policy._analyze_tracker.__name__, analyze_tracker)
+    policy.train([*trackers, new_story], domain_with_two_utterances)
+
+    assert [call.args[0] for call in analyze_tracker.call_args_list] == [new_story]
+
+
+def test_parallel_contradiction_check_starts_processes_once(
+    policy_with_config: Callable[..., RulePolicy],
+    domain_with_two_utterances: Domain,
+    monkeypatch: MonkeyPatch,
+):
+    # the deleted rule requires checking the remaining trackers again
+    trackers = _trackers_with_deleted_rule_and_contradiction(domain_with_two_utterances)
+    executor_class = Mock(wraps=concurrent.futures.ProcessPoolExecutor)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", executor_class)
+
+    policy = policy_with_config({"contradiction_check_processes": 2})
+    policy.train(trackers, domain_with_two_utterances)
+
+    executor_class.assert_called_once()
+    assert len(policy.lookup[RULES]) == 1
+
+
+def test_contradiction_checks_of_different_projects_are_cached_separately(
+    policy_with_config: Callable[..., RulePolicy],
+    domain_with_two_utterances: Domain,
+    monkeypatch: MonkeyPatch,
+):
+    caching_config = {"cache_contradiction_checks": True}
+    trackers = _trackers_with_deleted_rule_and_contradiction(domain_with_two_utterances)
+    other_domain = domain_with_two_utterances.merge(
+        Domain.from_dict({"actions": ["utter_3"]})
+    )
+    policy_with_config(caching_config).train(trackers, domain_with_two_utterances)
+    policy_with_config(caching_config).train(
+        _trackers_with_deleted_rule_and_contradiction(other_domain), other_domain
+    )
+
+    policy = policy_with_config(caching_config)
+    analyze_tracker = Mock(wraps=policy._analyze_tracker)
+    monkeypatch.setattr(policy, policy._analyze_tracker.__name__, analyze_tracker)
+    policy.train(trackers, domain_with_two_utterances)
+
+    analyze_tracker.assert_not_called()
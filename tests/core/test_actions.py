@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import textwrap
 from datetime import datetime
@@ -316,6 +317,47 @@ async def test_remote_action_logs_events(
     assert events[2] == SlotSet("name", "rasa")
 
 
+async def test_remote_action_generates_responses_concurrently(
+    default_channel: OutputChannel,
+    default_tracker: DialogueStateTracker,
+    domain: Domain,
+):
+    class SlowNaturalLanguageGenerator(NaturalLanguageGenerator):
+        def __init__(self) -> None:
+            self.running = 0
+            self.max_running = 0
+
+        async def generate(
+            self,
+            utter_action: Text,
+            tracker: DialogueStateTracker,
+            output_channel: Text,
+            **kwargs: Any,
+        ) -> Optional[Dict[Text, Any]]:
+            self.running += 1
+            self.max_running = max(self.running, self.max_running)
+            # the first response takes longest to generate
+            await asyncio.sleep(0.01 * int(utter_action[-1]))
+            self.running -= 1
+            return {"text": utter_action}
+
+    nlg = SlowNaturalLanguageGenerator()
+    endpoint = EndpointConfig("https://example.com/webhooks/actions")
+    remote_action = action.RemoteAction("my_action", endpoint)
+    response = {
+        "events": [],
+        "responses": [{"response": f"utter_{i}"} for i in (3, 2, 1)],
+    }
+
+    with aioresponses() as mocked:
+        mocked.post("https://example.com/webhooks/actions", payload=response)
+
+        events = await remote_action.run(default_channel, nlg, default_tracker, domain)
+
+    assert nlg.max_running == 3
+    assert [event.text for event in events] == ["utter_3", "utter_2", "utter_1"]
+
+
 async def test_remote_action_utterances_with_none_values(
     default_channel: OutputChannel,
     default_tracker: DialogueStateTracker,
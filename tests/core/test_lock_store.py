@@ -3,7 +3,7 @@ import logging
 import sys
 import time
 from pathlib import Path
-from typing import Text
+from typing import Optional, Text, TYPE_CHECKING
 from unittest.mock import Mock, patch
 
 import numpy as np
@@ -26,21 +26,31 @@ from rasa.shared.constants import INTENT_MESSAGE_PREFIX
 from rasa.shared.exceptions import ConnectionException
 from rasa.utils.endpoints import EndpointConfig, read_endpoint_config
 
+if TYPE_CHECKING:
+    from fakeredis import FakeServer
+
 
 class FakeRedisLockStore(RedisLockStore):
     """Fake `RedisLockStore` using `fakeredis` library."""
 
     # skipcq: PYL-W0231
     # noinspection PyMissingConstructor
-    def __init__(self):
+    def __init__(
+        self, event_driven: bool = False, server: Optional["FakeServer"] = None
+    ):
         import fakeredis
+        import fakeredis.aioredis
 
-        self.red = fakeredis.FakeStrictRedis()
+        server = server or fakeredis.FakeServer()
+        self.red = fakeredis.FakeStrictRedis(server=server)
+        self.async_red = fakeredis.aioredis.FakeRedis(server=server)
 
         # added in redis==3.3.0, but not yet in fakeredis
         self.red.connection_pool.connection_class.health_check_interval = 0
 
         self.key_prefix = DEFAULT_REDIS_LOCK_STORE_KEY_PREFIX
+        self.event_driven = event_driven
+        self._init_event_driven_locking()
 
 
 def test_issue_ticket():
@@ -385,6 +395,71 @@ async def test_redis_lock_store_with_valid_prefix(monkeypatch: MonkeyPatch):
             pass
 
 
+@pytest.mark.parametrize(
+    "lock_store", [InMemoryLockStore(), FakeRedisLockStore(event_driven=True)]
+)
+async def test_waiting_ticket_is_served_once_lock_is_released(lock_store: LockStore):
+    if isinstance(lock_store, RedisLockStore):
+        pytest.importorskip("lupa")
+
+    conversation_id = "some id"
+    served = []
+
+    async def locking_task(number: int) -> None:
+        async with lock_store.lock(conversation_id, wait_time_in_seconds=60):
+            served.append(number)
+            await asyncio.sleep(0.01)
+
+    # waiting tickets would be served after a minute without a release notification
+    await asyncio.wait_for(
+        asyncio.gather(*[locking_task(number) for number in range(3)]), timeout=5
+    )
+
+    assert served == [0, 1, 2]
+    assert lock_store.get_lock(conversation_id) is None
+
+
+async def test_event_driven_redis_lock_store_is_woken_up_by_other_instance():
+    pytest.importorskip("lupa")
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    lock_store = FakeRedisLockStore(event_driven=True, server=server)
+    other_instance = FakeRedisLockStore(event_driven=True, server=server)
+
+    conversation_id = "some id"
+    ticket = other_instance.issue_ticket(conversation_id)
+
+    async def release_from_other_instance() -> None:
+        await asyncio.sleep(0.1)
+        other_instance.cleanup(conversation_id, ticket)
+
+    release = asyncio.ensure_future(release_from_other_instance())
+    async with lock_store.lock(conversation_id, wait_time_in_seconds=60) as lock:
+        assert lock.now_serving == ticket + 1
+    await asyncio.wait_for(release, timeout=5)
+
+
+def test_event_driven_redis_lock_store_issues_tickets_atomically():
+    pytest.importorskip("lupa")
+
+    lock_store = FakeRedisLockStore(event_driven=True)
+    conversation_id = "some id"
+
+    assert lock_store.issue_ticket(conversation_id, 10) == 0
+    # expired tickets are removed when the next ticket is issued
+    assert lock_store.issue_ticket(conversation_id, -1) == 1
+    assert lock_store.issue_ticket(conversation_id, 10) == 1
+
+    lock = lock_store.get_lock(conversation_id)
+    assert [ticket.number for ticket in lock.tickets] == [0, 1]
+
+    lock_store.cleanup(conversation_id, 0)
+    lock_store.cleanup(conversation_id, 1)
+    assert lock_store.get_lock(conversation_id) is None
+    assert not lock_store.red.keys()
+
+
 def test_create_lock_store_from_endpoint_config(endpoints_path: Text):
     store = read_endpoint_config(endpoints_path, endpoint_type="lock_store")
     tracker_store = RedisLockStore(
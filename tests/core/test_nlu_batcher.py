@@ -0,0 +1,83 @@
+import asyncio
+from typing import List, Text
+
+import pytest
+
+from rasa.core.channels import UserMessage
+from rasa.core.nlu_batcher import NLUBatcher
+from rasa.shared.exceptions import RasaException
+from rasa.shared.nlu.constants import TEXT
+from rasa.shared.nlu.training_data.message import Message
+
+
+class BatchRecorder:
+    def __init__(self) -> None:
+        self.batches: List[List[Text]] = []
+
+    async def parse_batch(self, messages: List[UserMessage]) -> List[Message]:
+        self.batches.append([message.text for message in messages])
+        return [Message({TEXT: message.text.upper()}) for message in messages]
+
+
+async def test_batcher_flushes_when_batch_is_full():
+    recorder = BatchRecorder()
+    batcher = NLUBatcher(
+        recorder.parse_batch, max_batch_size=3, max_wait_time_in_seconds=10
+    )
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*[batcher.parse(UserMessage(text)) for text in "abc"]),
+        timeout=1,
+    )
+
+    assert [result.get(TEXT) for result in results] == ["A", "B", "C"]
+    assert recorder.batches == [["a", "b", "c"]]
+
+
+async def test_batcher_flushes_after_wait_time():
+    recorder = BatchRecorder()
+    batcher = NLUBatcher(
+        recorder.parse_batch, max_batch_size=10, max_wait_time_in_seconds=0.01
+    )
+
+    results = await asyncio.gather(*[batcher.parse(UserMessage(t)) for t in "abcde"])
+
+    assert [result.get(TEXT) for result in results] == ["A", "B", "C", "D", "E"]
+    assert recorder.batches == [["a", "b", "c", "d", "e"]]
+
+
+async def test_batcher_splits_into_multiple_batches():
+    recorder = BatchRecorder()
+    batcher = NLUBatcher(
+        recorder.parse_batch, max_batch_size=2, max_wait_time_in_seconds=0.01
+    )
+
+    results = await asyncio.gather(*[batcher.parse(UserMessage(t)) for t in "abcde"])
+
+    assert [result.get(TEXT) for result in results] == ["A", "B", "C", "D", "E"]
+    assert recorder.batches == [["a", "b"], ["c", "d"], ["e"]]
+
+
+async def test_batcher_propagates_errors_to_all_callers():
+    async def parse_batch(messages: List[UserMessage]) -> List[Message]:
+        raise ValueError("broken model")
+
+    batcher = NLUBatcher(parse_batch, max_batch_size=2, max_wait_time_in_seconds=0.01)
+
+    results = await asyncio.gather(
+        batcher.parse(UserMessage("a")),
+        batcher.parse(UserMessage("b")),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_batcher_raises_if_results_are_missing():
+    async def parse_batch(messages: List[UserMessage]) -> List[Message]:
+        return []
+
+    batcher = NLUBatcher(parse_batch, max_batch_size=1, max_wait_time_in_seconds=0.01)
+
+    with pytest.raises(RasaException):
+        await batcher.parse(UserMessage("a"))
@@ -21,6 +21,7 @@ from rasa.shared.core.events import (
     EntitiesAdded,
     SlotSet,
 )
+import rasa.shared.utils.io
 from rasa.core import training
 from rasa.core.constants import POLICY_MAX_HISTORY
 from rasa.core.featurizers.tracker_featurizers import (
@@ -459,6 +460,94 @@ class TestMemoizationPolicy(PolicyTestCollection):
             state_key = loaded_policy._create_feature_key(states)
             assert state_key in loaded_policy.lookup
 
+    def test_feature_key_does_not_depend_on_state_representation(
+        self, trained_policy: MemoizationPolicy
+    ):
+        states = [
+            {
+                "user": {"intent": "greet", "entities": ("name",)},
+                "slots": {"name": (1.0,)},
+            }
+        ]
+        same_states = [
+            {
+                "slots": {"name": (1,)},
+                "user": {"entities": ("name",), "intent": "greet"},
+            }
+        ]
+        other_states = [{"user": {"intent": "greet", "entities": ("name",)}}]
+
+        key = trained_policy._create_feature_key(states)
+
+        assert key == trained_policy._create_feature_key(same_states)
+        assert key != trained_policy._create_feature_key(other_states)
+        assert key != trained_policy._create_feature_key(states + other_states)
+        assert trained_policy._create_feature_key([]) is None
+
+    @pytest.mark.parametrize("enable_feature_string_compression", [True, False])
+    def test_load_migrates_legacy_lookup(
+        self,
+        enable_feature_string_compression: bool,
+        featurizer: TrackerFeaturizer,
+        model_storage: ModelStorage,
+        execution_context: ExecutionContext,
+        default_domain: Domain,
+        stories_path: Text,
+    ):
+        config = {
+            "enable_feature_string_compression": enable_feature_string_compression
+        }
+        policy = self.create_policy(
+            featurizer, model_storage, Resource("policy"), execution_context, config
+        )
+        trackers = train_trackers(default_domain, stories_path, augmentation_factor=0)
+        states, actions = policy.featurizer.training_states_and_labels(
+            trackers, default_domain
+        )
+        lookup = policy._create_lookup_from_states(states, actions)
+        policy._use_legacy_feature_keys = True
+        legacy_lookup = policy._create_lookup_from_states(states, actions)
+        assert legacy_lookup.keys() != lookup.keys()
+
+        legacy_resource = Resource(uuid.uuid4().hex)
+        with model_storage.write_to(legacy_resource) as path:
+            rasa.shared.utils.io.dump_obj_as_json_to_file(
+                path / policy._metadata_filename(), {"lookup": legacy_lookup}
+            )
+
+        loaded_policy = policy.__class__.load(
+            self._config(config), model_storage, legacy_resource, execution_context
+        )
+
+        assert not loaded_policy._use_legacy_feature_keys
+        assert loaded_policy.lookup == lookup
+
+    def test_load_keeps_legacy_lookup_which_cannot_be_migrated(
+        self,
+        trained_policy: MemoizationPolicy,
+        model_storage: ModelStorage,
+        execution_context: ExecutionContext,
+    ):
+        # the feature string of this intent can't be parsed unambiguously
+        states = [{"user": {"intent": "greet, hello"}}]
+        trained_policy._use_legacy_feature_keys = True
+        legacy_lookup = {trained_policy._create_feature_key(states): "utter_greet"}
+        trained_policy._use_legacy_feature_keys = False
+
+        legacy_resource = Resource(uuid.uuid4().hex)
+        with model_storage.write_to(legacy_resource) as path:
+            rasa.shared.utils.io.dump_obj_as_json_to_file(
+                path / trained_policy._metadata_filename(), {"lookup": legacy_lookup}
+            )
+
+        loaded_policy = trained_policy.__class__.load(
+            trained_policy.config, model_storage, legacy_resource, execution_context
+        )
+
+        assert loaded_policy._use_legacy_feature_keys
+        assert loaded_policy.lookup == legacy_lookup
+        assert loaded_policy._recall_states(states) == "utter_greet"
+
     @pytest.mark.parametrize(
         "tracker_events_with_action, tracker_events_without_action",
         [
@@ -1,4 +1,5 @@
 import asyncio
+import concurrent.futures
 import datetime
 from http import HTTPStatus
 import os.path
@@ -17,7 +18,7 @@ import json
 from _pytest.monkeypatch import MonkeyPatch
 from _pytest.logging import LogCaptureFixture
 from aioresponses import aioresponses
-from typing import Optional, Text, List, Callable, Type, Any
+from typing import Optional, Text, List, Callable, Type, Any, Dict
 from unittest import mock
 
 from rasa.core.lock_store import InMemoryLockStore
@@ -115,6 +116,103 @@ async def test_message_id_logging(default_processor: MessageProcessor):
     assert logged_event.message_id is not None
 
 
+async def test_parsing_and_prediction_in_graph_executor(
+    trained_default_agent_model: Text, domain: Domain
+):
+    processor = MessageProcessor(
+        trained_default_agent_model,
+        InMemoryTrackerStore(domain),
+        InMemoryLockStore(),
+        NaturalLanguageGenerator(),
+        graph_executor_workers=2,
+        max_concurrent_inferences=1,
+    )
+    parse_data = await processor.parse_message(UserMessage("hello"))
+    assert parse_data["intent"][INTENT_NAME_KEY] in processor.domain.intents
+
+    tracker = DialogueStateTracker.from_events(
+        "some_id",
+        evts=[ActionExecuted(ACTION_LISTEN_NAME), UserUttered("hello", parse_data)],
+        slots=domain.slots,
+    )
+    tracker.followup_action = None
+    action, _ = await processor.predict_next_with_tracker_if_should(tracker)
+    assert action.name() in processor.domain.action_names_or_texts
+
+
+def test_graph_executor_is_shared_between_processors(
+    trained_default_agent_model: Text, domain: Domain
+):
+    processors = [
+        MessageProcessor(
+            trained_default_agent_model,
+            InMemoryTrackerStore(domain),
+            InMemoryLockStore(),
+            NaturalLanguageGenerator(),
+            graph_executor_workers=2,
+        )
+        for _ in range(2)
+    ]
+
+    assert processors[0]._graph_executor is not None
+    assert processors[0]._graph_executor is processors[1]._graph_executor
+
+
+async def test_parsing_with_nlu_batching(
+    trained_default_agent_model: Text,
+    default_processor: MessageProcessor,
+    domain: Domain,
+):
+    processor = MessageProcessor(
+        trained_default_agent_model,
+        InMemoryTrackerStore(domain),
+        InMemoryLockStore(),
+        NaturalLanguageGenerator(),
+        nlu_batch_size=4,
+    )
+    assert processor._nlu_batcher is not None
+
+    texts = ["hello", "goodbye", "I am sad", "hi there", "bye"]
+    batched_results = await asyncio.gather(
+        *[processor.parse_message(UserMessage(text)) for text in texts]
+    )
+
+    for text, batched_result in zip(texts, batched_results):
+        expected = await default_processor.parse_message(UserMessage(text))
+        assert batched_result["text"] == text
+        assert batched_result["intent"] == expected["intent"]
+        assert batched_result["entities"] == expected["entities"]
+
+
+async def test_graph_runs_are_bound_by_max_concurrent_inferences(
+    default_processor: MessageProcessor, monkeypatch: MonkeyPatch
+):
+    running = 0
+    max_running = 0
+
+    def run(*args: Any, **kwargs: Any) -> Dict[Text, Any]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(running, max_running)
+        time.sleep(0.05)
+        running -= 1
+        return {}
+
+    monkeypatch.setattr(default_processor.graph_runner, "run", run)
+    monkeypatch.setattr(
+        default_processor,
+        "_graph_executor",
+        concurrent.futures.ThreadPoolExecutor(max_workers=4),
+    )
+    monkeypatch.setattr(default_processor, "max_concurrent_inferences", 2)
+
+    await asyncio.gather(
+        *[default_processor._run_graph(inputs={}, targets=[]) for _ in range(6)]
+    )
+
+    assert max_running == 2
+
+
 async def test_parsing(default_processor: MessageProcessor):
     with mock.patch(
         "rasa.core.processor.MessageProcessor._parse_message_with_graph"
@@ -1401,7 +1499,7 @@ async def test_predict_next_action_with_hidden_rules(
         ],
         slots=domain.slots,
     )
-    action, prediction = processor.predict_next_with_tracker_if_should(tracker)
+    action, prediction = await processor.predict_next_with_tracker_if_should(tracker)
     assert action._name == rule_action
     assert prediction.hide_rule_turn
 
@@ -1409,7 +1507,7 @@ async def test_predict_next_action_with_hidden_rules(
         tracker, action, [SlotSet(rule_slot, rule_slot)], prediction
     )
 
-    action, prediction = processor.predict_next_with_tracker_if_should(tracker)
+    action, prediction = await processor.predict_next_with_tracker_if_should(tracker)
     assert isinstance(action, ActionListen)
     assert prediction.hide_rule_turn
 
@@ -1418,7 +1516,7 @@ async def test_predict_next_action_with_hidden_rules(
     tracker.events.append(UserUttered(intent={"name": story_intent}))
 
     # rules are hidden correctly if memo policy predicts next actions correctly
-    action, prediction = processor.predict_next_with_tracker_if_should(tracker)
+    action, prediction = await processor.predict_next_with_tracker_if_should(tracker)
     assert action._name == story_action
     assert not prediction.hide_rule_turn
 
@@ -1426,12 +1524,12 @@ async def test_predict_next_action_with_hidden_rules(
         tracker, action, [SlotSet(story_slot, story_slot)], prediction
     )
 
-    action, prediction = processor.predict_next_with_tracker_if_should(tracker)
+    action, prediction = await processor.predict_next_with_tracker_if_should(tracker)
     assert isinstance(action, ActionListen)
     assert not prediction.hide_rule_turn
 
 
-def test_predict_next_action_raises_limit_reached_exception(
+async def test_predict_next_action_raises_limit_reached_exception(
     default_processor: MessageProcessor,
 ):
     tracker = DialogueStateTracker.from_events(
@@ -1446,7 +1544,7 @@ def test_predict_next_action_raises_limit_reached_exception(
 
     default_processor.max_number_of_predictions = 1
     with pytest.raises(ActionLimitReached):
-        default_processor.predict_next_with_tracker_if_should(tracker)
+        await default_processor.predict_next_with_tracker_if_should(tracker)
 
 
 async def test_processor_logs_text_tokens_in_tracker(
@@ -1529,27 +1627,27 @@ async def test_parse_message_full_model(trained_moodbot_path: Text):
     assert result["intent"]["name"]
 
 
-def test_predict_next_with_tracker_nlu_only(trained_nlu_model: Text):
+async def test_predict_next_with_tracker_nlu_only(trained_nlu_model: Text):
     processor = Agent.load(model_path=trained_nlu_model).processor
     tracker = DialogueStateTracker("some_id", [])
     tracker.followup_action = None
-    result = processor.predict_next_with_tracker(tracker)
+    result = await processor.predict_next_with_tracker(tracker)
     assert result is None
 
 
-def test_predict_next_with_tracker_core_only(trained_core_model: Text):
+async def test_predict_next_with_tracker_core_only(trained_core_model: Text):
     processor = Agent.load(model_path=trained_core_model).processor
     tracker = DialogueStateTracker("some_id", [])
     tracker.followup_action = None
-    result = processor.predict_next_with_tracker(tracker)
+    result = await processor.predict_next_with_tracker(tracker)
     assert result["policy"] == "MemoizationPolicy"
 
 
-def test_predict_next_with_tracker_full_model(trained_rasa_model: Text):
+async def test_predict_next_with_tracker_full_model(trained_rasa_model: Text):
     processor = Agent.load(model_path=trained_rasa_model).processor
     tracker = DialogueStateTracker("some_id", [])
     tracker.followup_action = None
-    result = processor.predict_next_with_tracker(tracker)
+    result = await processor.predict_next_with_tracker(tracker)
     assert result["policy"] == "MemoizationPolicy"
 
 
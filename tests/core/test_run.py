@@ -1,5 +1,5 @@
 import warnings
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import aiohttp
 import pytest
@@ -80,13 +80,18 @@ async def test_load_agent_on_start_with_bad_model_file(
         assert any("No valid model found at" in str(w.message) for w in warnings)
 
 
-async def test_close_resources(loop: AbstractEventLoop):
-    broker = SQLEventBroker()
+async def test_close_resources(loop: AbstractEventLoop, tmp_path: Path):
+    broker = SQLEventBroker(db=str(tmp_path / "events.db"))
     app = Mock()
     app.ctx.agent.tracker_store.event_broker = broker
+    app.ctx.agent.tracker_store.close = AsyncMock()
+    app.ctx.agent.nlg.close = AsyncMock()
     app.ctx.agent.action_endpoint.session = aiohttp.ClientSession()
     app.ctx.agent.model_server.session = aiohttp.ClientSession()
 
     with warnings.catch_warnings() as record:
         await run.close_resources(app, loop)
         assert record is None
+
+    app.ctx.agent.tracker_store.close.assert_awaited_once()
+    app.ctx.agent.nlg.close.assert_awaited_once()
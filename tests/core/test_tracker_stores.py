@@ -18,6 +18,7 @@ from moto import mock_dynamodb
 from pymongo.errors import OperationFailure
 
 from rasa.core.agent import Agent
+from rasa.core.brokers.broker import EventBroker
 from rasa.nlu.tokenizers.whitespace_tokenizer import WhitespaceTokenizer
 from rasa.shared.constants import DEFAULT_SENDER_ID
 from sqlalchemy.dialects.postgresql.base import PGDialect
@@ -54,6 +55,8 @@ from rasa.core.tracker_store import (
     DynamoTrackerStore,
     FailSafeTrackerStore,
     AwaitableTrackerStore,
+    MSGPACK_TRACKER_PREFIX,
+    TrackerDeserialisationException,
 )
 from rasa.shared.core.trackers import DialogueStateTracker, TrackerEventDiffEngine
 from rasa.shared.nlu.training_data.message import Message
@@ -335,6 +338,91 @@ async def test_tracker_serialisation():
     assert tracker == store.deserialise_tracker(DEFAULT_SENDER_ID, serialised)
 
 
+def _tracker_with_names_to_intern() -> DialogueStateTracker:
+    return DialogueStateTracker.from_events(
+        DEFAULT_SENDER_ID,
+        [
+            ActionExecuted(ACTION_LISTEN_NAME, policy="RulePolicy", confidence=1.0),
+            UserUttered(
+                "hi", {"name": "greet", "confidence": 0.9}, metadata={"a": "b"}
+            ),
+            SlotSet("cuisine", "French"),
+            ActionExecuted("utter_greet", policy="TEDPolicy", confidence=0.8),
+            BotUttered("Hey!", {"buttons": []}, {"utter_action": "utter_greet"}),
+            ActionExecuted(ACTION_LISTEN_NAME, policy="RulePolicy", confidence=1.0),
+            UserUttered("hi again", {"name": "greet", "confidence": 0.8}),
+        ],
+    )
+
+
+async def test_msgpack_tracker_serialisation():
+    store = InMemoryTrackerStore(test_domain, serialiser="msgpack")
+    tracker = _tracker_with_names_to_intern()
+
+    serialised = store.tracker_serialiser.serialise(tracker)
+
+    assert serialised.startswith(MSGPACK_TRACKER_PREFIX)
+    assert len(serialised) < len(store.serialise_tracker(tracker))
+    assert tracker == store.deserialise_tracker(DEFAULT_SENDER_ID, serialised)
+    # interning names must not modify the events of the tracker
+    assert tracker.events[1].intent_name == "greet"
+
+
+async def test_msgpack_tracker_store_reads_json_trackers():
+    json_store = InMemoryTrackerStore(test_domain)
+    tracker = _tracker_with_names_to_intern()
+    await json_store.save(tracker)
+
+    msgpack_store = InMemoryTrackerStore(test_domain, serialiser="msgpack")
+    msgpack_store.store = json_store.store
+
+    assert await msgpack_store.retrieve(DEFAULT_SENDER_ID) == tracker
+
+    await msgpack_store.save(tracker)
+    assert msgpack_store.store[DEFAULT_SENDER_ID].startswith(MSGPACK_TRACKER_PREFIX)
+    assert await msgpack_store.retrieve(DEFAULT_SENDER_ID) == tracker
+
+
+def test_msgpack_tracker_with_unknown_format_version():
+    store = InMemoryTrackerStore(test_domain, serialiser="msgpack")
+    serialised = store.tracker_serialiser.serialise(_tracker_with_names_to_intern())
+    prefix_length = len(MSGPACK_TRACKER_PREFIX)
+    serialised = (
+        serialised[:prefix_length] + bytes([255]) + serialised[prefix_length + 1 :]
+    )
+
+    with pytest.raises(TrackerDeserialisationException):
+        store.deserialise_tracker(DEFAULT_SENDER_ID, serialised)
+
+
+def test_unknown_tracker_serialiser():
+    with pytest.raises(RasaException):
+        InMemoryTrackerStore(test_domain, serialiser="pickle")
+
+
+async def test_redis_tracker_store_with_msgpack_serialiser(
+    monkeypatch: MonkeyPatch,
+):
+    import redis
+
+    monkeypatch.setattr(
+        redis,
+        "StrictRedis",
+        lambda **kwargs: fakeredis.FakeStrictRedis(
+            decode_responses=kwargs["decode_responses"]
+        ),
+    )
+    store = RedisTrackerStore(test_domain, serialiser="msgpack")
+    tracker = _tracker_with_names_to_intern()
+
+    await store.save(tracker)
+
+    assert await store.retrieve(DEFAULT_SENDER_ID) == tracker
+    assert list(await store.keys()) == [
+        DEFAULT_REDIS_TRACKER_STORE_KEY_PREFIX + DEFAULT_SENDER_ID
+    ]
+
+
 @pytest.mark.parametrize(
     "full_url",
     [
@@ -1105,6 +1193,60 @@ async def test_sql_tracker_store_retrieve(
     assert list(tracker.events) == events_after_restart[1:]
 
 
+async def test_sql_tracker_store_persists_session_index(
+    domain: Domain,
+    tracker_with_restarted_event: DialogueStateTracker,
+    events_after_restart: List[Event],
+    tmp_path: Path,
+) -> None:
+    tracker_store = SQLTrackerStore(domain, db=str(tmp_path / "rasa.db"))
+    sender_id = tracker_with_restarted_event.sender_id
+    await tracker_store.save(tracker_with_restarted_event)
+
+    with tracker_store.session_scope() as session:
+        session_index = session.get(tracker_store.SQLSessionIndex, sender_id)
+        assert session_index.session_start == events_after_restart[1].timestamp
+        assert session_index.number_of_events == len(events_after_restart) - 1
+
+    tracker = await tracker_store.retrieve(sender_id)
+    tracker.update(BotUttered("Hi again!"))
+    await tracker_store.save(tracker)
+
+    tracker = await tracker_store.retrieve(sender_id)
+    assert list(tracker.events) == events_after_restart[1:] + [BotUttered("Hi again!")]
+    assert len((await tracker_store.retrieve_full_tracker(sender_id)).events) == (
+        len(tracker_with_restarted_event.events) + 1
+    )
+
+
+async def test_sql_tracker_store_indexes_conversations_without_session_index(
+    domain: Domain,
+    tracker_with_restarted_event: DialogueStateTracker,
+    events_after_restart: List[Event],
+    tmp_path: Path,
+) -> None:
+    tracker_store = SQLTrackerStore(domain, db=str(tmp_path / "rasa.db"))
+    sender_id = tracker_with_restarted_event.sender_id
+    await tracker_store.save(tracker_with_restarted_event)
+    # conversations stored by older versions of Rasa have no session index
+    with tracker_store.session_scope() as session:
+        session.query(tracker_store.SQLSessionIndex).delete()
+        session.commit()
+
+    tracker = await tracker_store.retrieve(sender_id)
+    assert list(tracker.events) == events_after_restart[1:]
+
+    tracker.update(BotUttered("Hi again!"))
+    await tracker_store.save(tracker)
+
+    with tracker_store.session_scope() as session:
+        session_index = session.get(tracker_store.SQLSessionIndex, sender_id)
+        assert session_index.number_of_events == len(events_after_restart)
+    assert len((await tracker_store.retrieve_full_tracker(sender_id)).events) == (
+        len(tracker_with_restarted_event.events) + 1
+    )
+
+
 async def test_in_memory_tracker_store_retrieve_full_tracker(
     domain: Domain,
     tracker_with_restarted_event: DialogueStateTracker,
@@ -1162,15 +1304,67 @@ async def test_mongo_tracker_store_retrieve(
     assert list(tracker.events) == events_after_restart[1:]
 
 
+async def test_mongo_tracker_store_persists_session_index(
+    domain: Domain,
+    tracker_with_restarted_event: DialogueStateTracker,
+    events_after_restart: List[Event],
+) -> None:
+    tracker_store = MockedMongoTrackerStore(domain)
+    sender_id = tracker_with_restarted_event.sender_id
+    await tracker_store.save(tracker_with_restarted_event)
+
+    stored = tracker_store.conversations.find_one({"sender_id": sender_id})
+    number_of_events = len(tracker_with_restarted_event.events)
+    assert stored["event_count"] == number_of_events
+    assert stored["session_start_index"] == (
+        number_of_events - len(events_after_restart) + 1
+    )
+
+    tracker = await tracker_store.retrieve(sender_id)
+    tracker.update(BotUttered("Hi again!"))
+    await tracker_store.save(tracker)
+
+    tracker = await tracker_store.retrieve(sender_id)
+    assert list(tracker.events) == events_after_restart[1:] + [BotUttered("Hi again!")]
+
+
+async def test_mongo_tracker_store_retrieve_without_session_index(
+    domain: Domain,
+    tracker_with_restarted_event: DialogueStateTracker,
+    events_after_restart: List[Event],
+) -> None:
+    tracker_store = MockedMongoTrackerStore(domain)
+    sender_id = tracker_with_restarted_event.sender_id
+    await tracker_store.save(tracker_with_restarted_event)
+    # conversations stored by older versions of Rasa have no session index
+    tracker_store.conversations.update_one(
+        {"sender_id": sender_id},
+        {"$unset": {"event_count": "", "session_start_index": ""}},
+    )
+
+    tracker = await tracker_store.retrieve(sender_id)
+    assert list(tracker.events) == events_after_restart[1:]
+
+    tracker.update(BotUttered("Hi again!"))
+    await tracker_store.save(tracker)
+
+    stored = tracker_store.conversations.find_one({"sender_id": sender_id})
+    assert stored["event_count"] == len(tracker_with_restarted_event.events) + 1
+    assert len(stored["events"]) == len(tracker_with_restarted_event.events) + 1
+
+
 class MockedRedisTrackerStore(RedisTrackerStore):
     def __init__(
         self,
         domain: Domain,
+        append_only_events: bool = False,
+        event_broker: Optional[EventBroker] = None,
     ) -> None:
         self.red = fakeredis.FakeStrictRedis()
         self.key_prefix = DEFAULT_REDIS_TRACKER_STORE_KEY_PREFIX
         self.record_exp = None
-        super(RedisTrackerStore, self).__init__(domain, None)
+        self.append_only_events = append_only_events
+        super(RedisTrackerStore, self).__init__(domain, event_broker)
 
 
 async def test_redis_tracker_store_retrieve_full_tracker(
@@ -1200,6 +1394,122 @@ async def test_redis_tracker_store_retrieve(
     assert list(tracker.events) == events_after_restart
 
 
+async def test_redis_tracker_store_append_only_events(
+    domain: Domain,
+    tracker_with_restarted_event: DialogueStateTracker,
+    events_after_restart: List[Event],
+) -> None:
+    tracker_store = MockedRedisTrackerStore(domain, append_only_events=True)
+    sender_id = tracker_with_restarted_event.sender_id
+    events_key = "tracker_events:" + sender_id
+
+    await tracker_store.save(tracker_with_restarted_event)
+
+    tracker = await tracker_store.retrieve(sender_id)
+    assert list(tracker.events) == events_after_restart
+    assert (
+        await tracker_store.retrieve_full_tracker(sender_id)
+        == tracker_with_restarted_event
+    )
+    number_of_events = len(tracker_with_restarted_event.events)
+    assert tracker_store.red.llen(events_key) == number_of_events
+
+    tracker.update(BotUttered("Hi again!", timestamp=14))
+    await tracker_store.save(tracker)
+    await tracker_store.save(tracker)
+
+    assert tracker_store.red.llen(events_key) == number_of_events + 1
+    tracker = await tracker_store.retrieve(sender_id)
+    assert list(tracker.events) == events_after_restart + [
+        BotUttered("Hi again!", timestamp=14)
+    ]
+    assert list(await tracker_store.keys()) == [
+        (DEFAULT_REDIS_TRACKER_STORE_KEY_PREFIX + sender_id).encode()
+    ]
+
+
+async def test_redis_tracker_store_append_only_events_streams_new_events(
+    domain: Domain,
+) -> None:
+    event_broker = Mock()
+    tracker_store = MockedRedisTrackerStore(
+        domain, append_only_events=True, event_broker=event_broker
+    )
+    tracker = DialogueStateTracker.from_events(
+        "some-sender", [ActionExecuted(ACTION_LISTEN_NAME, timestamp=1)]
+    )
+    await tracker_store.save(tracker)
+
+    tracker = await tracker_store.retrieve("some-sender")
+    tracker.update(UserUttered("hi", timestamp=2))
+    await tracker_store.save(tracker)
+
+    published = [call.args[0] for call in event_broker.publish.call_args_list]
+    assert [body["event"] for body in published] == ["action", "user"]
+
+
+async def test_redis_tracker_store_append_only_events_migrates_stored_trackers(
+    domain: Domain,
+    tracker_with_restarted_event: DialogueStateTracker,
+    events_after_restart: List[Event],
+) -> None:
+    tracker_store = MockedRedisTrackerStore(domain)
+    sender_id = tracker_with_restarted_event.sender_id
+    await tracker_store.save(tracker_with_restarted_event)
+
+    tracker_store.append_only_events = True
+    tracker = await tracker_store.retrieve(sender_id)
+    assert list(tracker.events) == events_after_restart
+
+    tracker.update(BotUttered("Hi again!", timestamp=14))
+    await tracker_store.save(tracker)
+
+    assert tracker_store.red.llen("tracker_events:" + sender_id) == (
+        len(tracker_with_restarted_event.events) + 1
+    )
+    tracker = await tracker_store.retrieve(sender_id)
+    assert list(tracker.events) == events_after_restart + [
+        BotUttered("Hi again!", timestamp=14)
+    ]
+
+
+async def test_redis_tracker_store_migration_uses_expiry_of_save(
+    domain: Domain, tracker_with_restarted_event: DialogueStateTracker
+) -> None:
+    tracker_store = MockedRedisTrackerStore(domain)
+    sender_id = tracker_with_restarted_event.sender_id
+    await tracker_store.save(tracker_with_restarted_event)
+
+    tracker_store.append_only_events = True
+    tracker = await tracker_store.retrieve(sender_id)
+    tracker.update(BotUttered("Hi again!", timestamp=14))
+    await tracker_store.save(tracker, timeout=100)
+
+    assert 0 < tracker_store.red.ttl("tracker:" + sender_id) <= 100
+    assert 0 < tracker_store.red.ttl("tracker_events:" + sender_id) <= 100
+
+
+async def test_redis_tracker_store_migration_keeps_tracker_if_it_fails(
+    domain: Domain,
+    tracker_with_restarted_event: DialogueStateTracker,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    tracker_store = MockedRedisTrackerStore(domain)
+    sender_id = tracker_with_restarted_event.sender_id
+    await tracker_store.save(tracker_with_restarted_event)
+    stored = tracker_store.red.get("tracker:" + sender_id)
+
+    tracker_store.append_only_events = True
+    monkeypatch.setattr(
+        tracker_store, "deserialise_tracker", Mock(side_effect=ValueError())
+    )
+    with pytest.raises(ValueError):
+        await tracker_store.save(tracker_with_restarted_event)
+
+    assert tracker_store.red.get("tracker:" + sender_id) == stored
+    assert not tracker_store.red.exists("tracker_events:" + sender_id)
+
+
 async def test_redis_tracker_store_merge_trackers_same_session() -> None:
     start_session_sequence = [
         ActionExecuted(ACTION_SESSION_START_NAME),
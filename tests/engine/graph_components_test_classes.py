@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import weakref
 from pathlib import Path
 from typing import Dict, Optional, Text, Any, List
 
@@ -104,6 +105,32 @@ class ProvideX(GraphComponent):
         return self.x
 
 
+class Payload:
+    pass
+
+
+class ReferencePayload(GraphComponent):
+    @classmethod
+    def create(
+        cls,
+        config: Dict,
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,
+    ) -> ReferencePayload:
+        return cls()
+
+    def provide(self) -> Payload:
+        return Payload()
+
+    def reference(self, payload: Payload) -> weakref.ref:
+        return weakref.ref(payload)
+
+    def is_released(self, reference: weakref.ref) -> bool:
+        return reference() is None
+
+
 class FileReader(GraphComponent):
     def __init__(self, file_path: Path) -> None:
         self._file_path = file_path
@@ -1,11 +1,12 @@
 from __future__ import annotations
 from typing import Optional
+from unittest.mock import ANY
 
 import pytest
 
 from rasa.engine.graph import ExecutionContext, GraphSchema, SchemaNode
 from rasa.engine.exceptions import GraphRunError
-from rasa.engine.runner.dask import DaskGraphRunner
+from rasa.engine.runner.dask import DaskGraphRunner, ExecutionPlan
 from rasa.engine.storage.storage import ModelStorage
 from tests.engine.graph_components_test_classes import (
     AddInputs,
@@ -14,6 +15,7 @@ from tests.engine.graph_components_test_classes import (
     ProvideX,
     SubtractByX,
     PersistableTestComponent,
+    ReferencePayload,
 )
 
 
@@ -326,3 +328,92 @@ def test_loading_from_previous_node(default_model_storage: ModelStorage):
     results = runner.run()
 
     assert results["load"] == test_value
+
+
+def test_execution_plan_is_cached_per_targets(default_model_storage: ModelStorage):
+    graph_schema = GraphSchema(
+        {
+            "add": SchemaNode(
+                needs={"i1": "first_input", "i2": "second_input"},
+                uses=AddInputs,
+                fn="add",
+                constructor_name="create",
+                config={},
+            ),
+            "subtract_2": SchemaNode(
+                needs={"i": "add"},
+                uses=SubtractByX,
+                fn="subtract_x",
+                constructor_name="create",
+                config={"x": 2},
+                is_target=True,
+            ),
+        }
+    )
+    runner = DaskGraphRunner(
+        graph_schema=graph_schema,
+        model_storage=default_model_storage,
+        execution_context=ExecutionContext(graph_schema=graph_schema, model_id="1"),
+    )
+
+    assert runner.run(inputs={"first_input": 3, "second_input": 4}) == {"subtract_2": 5}
+    assert runner.run(inputs={"first_input": 1, "second_input": 4}) == {"subtract_2": 3}
+    assert runner.run(inputs={"first_input": 3, "second_input": 4}, targets=["add"])
+
+    assert runner._execution_plans == {
+        ("subtract_2",): ExecutionPlan(
+            [
+                ("add", ("first_input", "second_input")),
+                ("subtract_2", ("add",)),
+            ],
+            {"first_input": 1, "second_input": 1, "add": 1},
+        ),
+        ("add",): ExecutionPlan(
+            [("add", ("first_input", "second_input"))],
+            {"first_input": 1, "second_input": 1},
+        ),
+    }
+
+
+def payload_schema() -> GraphSchema:
+    return GraphSchema(
+        {
+            "provide": SchemaNode(
+                needs={},
+                uses=ReferencePayload,
+                fn="provide",
+                constructor_name="create",
+                config={},
+            ),
+            "reference": SchemaNode(
+                needs={"payload": "provide"},
+                uses=ReferencePayload,
+                fn="reference",
+                constructor_name="create",
+                config={},
+            ),
+            "is_released": SchemaNode(
+                needs={"reference": "reference"},
+                uses=ReferencePayload,
+                fn="is_released",
+                constructor_name="create",
+                config={},
+                is_target=True,
+            ),
+        }
+    )
+
+
+def test_outputs_are_released_once_not_needed(default_model_storage: ModelStorage):
+    graph_schema = payload_schema()
+    runner = DaskGraphRunner(
+        graph_schema=graph_schema,
+        model_storage=default_model_storage,
+        execution_context=ExecutionContext(graph_schema=graph_schema, model_id="1"),
+    )
+
+    assert runner.run() == {"is_released": True}
+    assert runner.run(targets=["provide", "is_released"]) == {
+        "provide": ANY,
+        "is_released": False,
+    }
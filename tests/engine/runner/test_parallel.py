@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional, Text
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+import rasa.engine.runner.parallel
+from rasa.engine.exceptions import GraphComponentException, GraphRunError
+from rasa.engine.graph import ExecutionContext, GraphComponent, GraphSchema, SchemaNode
+from rasa.engine.runner.dask import DaskGraphRunner
+from rasa.engine.runner.parallel import (
+    ParallelGraphRunner,
+    graph_runner_class_for_training,
+)
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from tests.engine.graph_components_test_classes import (
+    AddInputs,
+    AssertComponent,
+    ProvideX,
+    SubtractByX,
+)
+from tests.engine.runner.test_dask import payload_schema
+
+
+class TrackConcurrency(GraphComponent):
+    """Returns its input after a short while and tracks how many run at once."""
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    @classmethod
+    def create(
+        cls,
+        config: Dict,
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,
+    ) -> TrackConcurrency:
+        return cls()
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.running = 0
+        cls.max_running = 0
+
+    def run(self, i: Any) -> int:
+        with self.lock:
+            TrackConcurrency.running += 1
+            TrackConcurrency.max_running = max(
+                TrackConcurrency.max_running, TrackConcurrency.running
+            )
+        time.sleep(0.1)
+        with self.lock:
+            TrackConcurrency.running -= 1
+        return int(i)
+
+
+def _diamond_schema() -> GraphSchema:
+    return GraphSchema(
+        {
+            "add": SchemaNode(
+                needs={"i1": "first_input", "i2": "second_input"},
+                uses=AddInputs,
+                fn="add",
+                constructor_name="create",
+                config={},
+            ),
+            "subtract_1": SchemaNode(
+                needs={"i": "add"},
+                uses=SubtractByX,
+                fn="subtract_x",
+                constructor_name="create",
+                config={"x": 1},
+            ),
+            "subtract_2": SchemaNode(
+                needs={"i": "add"},
+                uses=SubtractByX,
+                fn="subtract_x",
+                constructor_name="create",
+                config={"x": 2},
+            ),
+            "provide": SchemaNode(
+                needs={},
+                uses=ProvideX,
+                fn="provide",
+                constructor_name="create",
+                config={},
+            ),
+            "add_branches": SchemaNode(
+                needs={"i1": "subtract_1", "i2": "subtract_2"},
+                uses=AddInputs,
+                fn="add",
+                constructor_name="create",
+                config={},
+                is_target=True,
+            ),
+            "add_provided": SchemaNode(
+                needs={"i1": "add_branches", "i2": "provide"},
+                uses=AddInputs,
+                fn="add",
+                constructor_name="create",
+                config={},
+                is_target=True,
+            ),
+        }
+    )
+
+
+def _concurrent_schema(branches: int) -> GraphSchema:
+    return GraphSchema(
+        {
+            f"branch_{i}": SchemaNode(
+                needs={"i": "input"},
+                uses=TrackConcurrency,
+                fn="run",
+                constructor_name="create",
+                config={},
+                is_target=True,
+            )
+            for i in range(branches)
+        }
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, 4])
+@pytest.mark.parametrize("targets", [None, ["add_branches"], ["subtract_1"]])
+def test_same_results_as_sequential_runner(
+    max_workers: int, targets: Optional[list], default_model_storage: ModelStorage
+):
+    graph_schema = _diamond_schema()
+    execution_context = ExecutionContext(graph_schema=graph_schema, model_id="1")
+    inputs = {"first_input": 3, "second_input": 4}
+
+    sequential_runner = DaskGraphRunner(
+        graph_schema, default_model_storage, execution_context
+    )
+    parallel_runner = ParallelGraphRunner(
+        graph_schema, default_model_storage, execution_context, max_workers=max_workers
+    )
+
+    expected = sequential_runner.run(inputs=inputs, targets=targets)
+    assert parallel_runner.run(inputs=inputs, targets=targets) == expected
+    # the execution plan is reused
+    assert parallel_runner.run(inputs=inputs, targets=targets) == expected
+
+
+@pytest.mark.parametrize("max_workers, expected_max_running", [(1, 1), (2, 2), (8, 4)])
+def test_independent_nodes_run_concurrently(
+    max_workers: int, expected_max_running: int, default_model_storage: ModelStorage
+):
+    TrackConcurrency.reset()
+    graph_schema = _concurrent_schema(branches=4)
+    runner = ParallelGraphRunner(
+        graph_schema,
+        default_model_storage,
+        ExecutionContext(graph_schema=graph_schema, model_id="1"),
+        max_workers=max_workers,
+    )
+
+    results = runner.run(inputs={"input": 5})
+
+    assert results == {f"branch_{i}": 5 for i in range(4)}
+    assert TrackConcurrency.max_running == expected_max_running
+
+
+def test_memory_budget_limits_concurrency(
+    default_model_storage: ModelStorage, monkeypatch: MonkeyPatch
+):
+    monkeypatch.setattr(
+        rasa.engine.runner.parallel, "_memory_usage_in_mb", lambda: 1024.0
+    )
+    TrackConcurrency.reset()
+    graph_schema = _concurrent_schema(branches=3)
+    runner = ParallelGraphRunner(
+        graph_schema,
+        default_model_storage,
+        ExecutionContext(graph_schema=graph_schema, model_id="1"),
+        max_workers=3,
+        memory_budget_in_mb=512,
+    )
+
+    results = runner.run(inputs={"input": 5})
+
+    assert results == {f"branch_{i}": 5 for i in range(3)}
+    # one node is always running to make progress
+    assert TrackConcurrency.max_running == 1
+
+
+def test_memory_budget_is_ignored_if_memory_usage_is_unknown(
+    default_model_storage: ModelStorage, monkeypatch: MonkeyPatch
+):
+    monkeypatch.setattr(
+        rasa.engine.runner.parallel, "_memory_usage_in_mb", lambda: None
+    )
+    graph_schema = _concurrent_schema(branches=1)
+
+    with pytest.warns(UserWarning, match="memory budget"):
+        runner = ParallelGraphRunner(
+            graph_schema,
+            default_model_storage,
+            ExecutionContext(graph_schema=graph_schema, model_id="1"),
+            max_workers=2,
+            memory_budget_in_mb=512,
+        )
+
+    assert runner.run(inputs={"input": 5}) == {"branch_0": 5}
+
+
+@pytest.mark.parametrize("max_workers, warns", [(1, False), (2, True)])
+def test_warning_if_random_seed_is_configured(
+    max_workers: int, warns: bool, default_model_storage: ModelStorage
+):
+    graph_schema = GraphSchema(
+        {
+            "provide": SchemaNode(
+                needs={},
+                uses=ProvideX,
+                fn="provide",
+                constructor_name="create",
+                config={"random_seed": 42},
+                is_target=True,
+            )
+        }
+    )
+
+    with pytest.warns(None) as records:
+        ParallelGraphRunner(
+            graph_schema,
+            default_model_storage,
+            ExecutionContext(graph_schema=graph_schema, model_id="1"),
+            max_workers=max_workers,
+        )
+
+    assert any("random_seed" in str(record.message) for record in records) == warns
+
+
+def test_outputs_are_released_once_not_needed(default_model_storage: ModelStorage):
+    graph_schema = payload_schema()
+    runner = ParallelGraphRunner(
+        graph_schema,
+        default_model_storage,
+        ExecutionContext(graph_schema=graph_schema, model_id="1"),
+        max_workers=2,
+    )
+
+    assert runner.run() == {"is_released": True}
+
+
+def test_error_in_node_is_raised(default_model_storage: ModelStorage):
+    graph_schema = GraphSchema(
+        {
+            "provide": SchemaNode(
+                needs={},
+                uses=ProvideX,
+                fn="provide",
+                constructor_name="create",
+                config={},
+                is_target=True,
+            ),
+            "assert_false": SchemaNode(
+                needs={"i": "input"},
+                uses=AssertComponent,
+                fn="run_assert",
+                constructor_name="create",
+                config={"value_to_assert": "some_value"},
+                is_target=True,
+            ),
+        }
+    )
+    runner = ParallelGraphRunner(
+        graph_schema,
+        default_model_storage,
+        ExecutionContext(graph_schema=graph_schema, model_id="1"),
+        max_workers=2,
+    )
+
+    with pytest.raises(GraphComponentException):
+        runner.run(inputs={"input": "some_other_value"})
+
+
+def test_input_value_is_node_name(default_model_storage: ModelStorage):
+    graph_schema = _concurrent_schema(branches=1)
+    runner = ParallelGraphRunner(
+        graph_schema,
+        default_model_storage,
+        ExecutionContext(graph_schema=graph_schema, model_id="1"),
+        max_workers=2,
+    )
+
+    with pytest.raises(GraphRunError):
+        runner.run(inputs={"input": "branch_0"})
+
+
+def test_create_reads_environment(
+    default_model_storage: ModelStorage, monkeypatch: MonkeyPatch
+):
+    monkeypatch.setenv("RASA_TRAINING_WORKERS", "3")
+    monkeypatch.setenv("RASA_TRAINING_MEMORY_BUDGET", "2048")
+    graph_schema = _concurrent_schema(branches=1)
+
+    runner = ParallelGraphRunner.create(
+        graph_schema,
+        default_model_storage,
+        ExecutionContext(graph_schema=graph_schema, model_id="1"),
+    )
+
+    assert runner._max_workers == 3
+    assert runner._memory_budget_in_mb == 2048
+
+
+@pytest.mark.parametrize(
+    "workers, expected_class",
+    [
+        (None, DaskGraphRunner),
+        ("1", DaskGraphRunner),
+        ("2", ParallelGraphRunner),
+    ],
+)
+def test_graph_runner_class_for_training(
+    workers: Optional[Text], expected_class: type, monkeypatch: MonkeyPatch
+):
+    if workers is None:
+        monkeypatch.delenv("RASA_TRAINING_WORKERS", raising=False)
+    else:
+        monkeypatch.setenv("RASA_TRAINING_WORKERS", workers)
+
+    assert graph_runner_class_for_training() == expected_class
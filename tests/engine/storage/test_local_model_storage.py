@@ -1,8 +1,11 @@
+import pickle
 import sys
 import uuid
 from datetime import datetime
 from pathlib import Path
-from tarsafe import TarSafe
+from typing import Text
+
+from tarsafe import TarSafe, TarSafeException
 
 import freezegun
 import pytest
@@ -17,7 +20,7 @@ from rasa.engine.storage.local_model_storage import (
 )
 from rasa.engine.storage.storage import ModelStorage, ModelMetadata
 from rasa.engine.storage.resource import Resource
-from rasa.exceptions import UnsupportedModelVersionError
+from rasa.exceptions import ModelArchiveChanged, UnsupportedModelVersionError
 from rasa.shared.core.domain import Domain
 from rasa.shared.data import TrainingType
 from tests.engine.graph_components_test_classes import PersistableTestComponent
@@ -366,3 +369,214 @@ def test_create_model_package_with_non_existing_dir(
     )
 
     assert path.exists()
+
+
+def _empty_model_configuration() -> GraphModelConfiguration:
+    return GraphModelConfiguration(
+        GraphSchema({}),
+        GraphSchema({}),
+        TrainingType.BOTH,
+        "test_assistant",
+        None,
+        None,
+        "nlu",
+    )
+
+
+@pytest.mark.parametrize(
+    "archive_name, expected_mode", [("model.tar.gz", "r:gz"), ("model.tar", "r:")]
+)
+def test_metadata_is_first_member_of_model_package(
+    archive_name: Text, expected_mode: Text, tmp_path: Path
+):
+    (tmp_path / "storage").mkdir()
+    storage = LocalModelStorage.create(tmp_path / "storage")
+    with storage.write_to(Resource("resource1")) as directory:
+        (directory / "file.txt").write_text("test")
+
+    archive_path = tmp_path / archive_name
+    storage.create_model_package(
+        archive_path, _empty_model_configuration(), Domain.empty()
+    )
+
+    with TarSafe.open(archive_path, expected_mode) as tar:
+        assert tar.getnames() == [
+            MODEL_ARCHIVE_METADATA_FILE,
+            "components",
+            "components/resource1",
+            "components/resource1/file.txt",
+        ]
+
+
+def test_resources_of_uncompressed_model_package_are_extracted_on_demand(
+    tmp_path: Path,
+):
+    (tmp_path / "train").mkdir()
+    train_storage = LocalModelStorage.create(tmp_path / "train")
+    for resource_name in ["resource1", "resource2"]:
+        with train_storage.write_to(Resource(resource_name)) as directory:
+            (directory / "sub_dir").mkdir()
+            (directory / "sub_dir" / "file.txt").write_text(resource_name)
+
+    archive_path = tmp_path / "model.tar"
+    packaged_metadata = train_storage.create_model_package(
+        archive_path, _empty_model_configuration(), Domain.empty()
+    )
+
+    load_storage_dir = tmp_path / "load"
+    load_storage_dir.mkdir()
+    load_storage, metadata = LocalModelStorage.from_model_archive(
+        load_storage_dir, archive_path
+    )
+
+    assert metadata.model_id == packaged_metadata.model_id
+    assert not list(load_storage_dir.glob("*"))
+
+    with load_storage.read_from(Resource("resource1")) as directory:
+        assert (directory / "sub_dir" / "file.txt").read_text() == "resource1"
+    assert list(load_storage_dir.glob("*")) == [load_storage_dir / "resource1"]
+
+    with pytest.raises(ValueError):
+        with load_storage.read_from(Resource("unknown resource")):
+            pass
+
+    # Packaging extracts the remaining resources
+    load_storage.create_model_package(
+        tmp_path / "repackaged.tar.gz", _empty_model_configuration(), Domain.empty()
+    )
+    assert (load_storage_dir / "resource2" / "sub_dir" / "file.txt").is_file()
+
+
+def test_write_to_resource_of_uncompressed_model_package(tmp_path: Path):
+    (tmp_path / "train").mkdir()
+    train_storage = LocalModelStorage.create(tmp_path / "train")
+    with train_storage.write_to(Resource("resource1")) as directory:
+        (directory / "old.txt").write_text("old")
+
+    archive_path = tmp_path / "model.tar"
+    train_storage.create_model_package(
+        archive_path, _empty_model_configuration(), Domain.empty()
+    )
+
+    load_storage_dir = tmp_path / "load"
+    load_storage_dir.mkdir()
+    load_storage, _ = LocalModelStorage.from_model_archive(
+        load_storage_dir, archive_path
+    )
+
+    with load_storage.write_to(Resource("resource1")) as directory:
+        (directory / "new.txt").write_text("new")
+
+    with load_storage.read_from(Resource("resource1")) as directory:
+        assert sorted(path.name for path in directory.glob("*")) == [
+            "new.txt",
+            "old.txt",
+        ]
+
+
+@pytest.mark.parametrize("overwrite", [True, False])
+def test_uncompressed_model_package_changed_after_loading(
+    tmp_path: Path, overwrite: bool
+):
+    (tmp_path / "train").mkdir()
+    train_storage = LocalModelStorage.create(tmp_path / "train")
+    with train_storage.write_to(Resource("resource1")) as directory:
+        (directory / "file.txt").write_text("resource1")
+
+    archive_path = tmp_path / "model.tar"
+    train_storage.create_model_package(
+        archive_path, _empty_model_configuration(), Domain.empty()
+    )
+
+    load_storage_dir = tmp_path / "load"
+    load_storage_dir.mkdir()
+    load_storage, _ = LocalModelStorage.from_model_archive(
+        load_storage_dir, archive_path
+    )
+
+    if overwrite:
+        with train_storage.write_to(Resource("resource2")) as directory:
+            (directory / "file.txt").write_text("resource2")
+        train_storage.create_model_package(
+            archive_path, _empty_model_configuration(), Domain.empty()
+        )
+    else:
+        archive_path.unlink()
+
+    with pytest.raises(ModelArchiveChanged):
+        with load_storage.read_from(Resource("resource1")):
+            pass
+
+
+def test_load_model_package_with_metadata_as_last_member(
+    tmp_path: Path, domain: Domain
+):
+    # Model packages of previous versions contain the metadata after the resources
+    model_dir = tmp_path / "model"
+    (model_dir / "components" / "resource1").mkdir(parents=True)
+    (model_dir / "components" / "resource1" / "file.txt").write_text("test")
+    metadata = LocalModelStorage._create_model_metadata(
+        domain, _empty_model_configuration()
+    )
+    rasa.shared.utils.io.dump_obj_as_json_to_file(
+        model_dir / MODEL_ARCHIVE_METADATA_FILE, metadata.as_dict()
+    )
+
+    archive_path = tmp_path / "model.tar.gz"
+    with TarSafe.open(archive_path, "w:gz") as tar:
+        tar.add(model_dir, arcname="")
+
+    assert LocalModelStorage.metadata_from_archive(archive_path).model_id == (
+        metadata.model_id
+    )
+
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    storage, loaded_metadata = LocalModelStorage.from_model_archive(
+        storage_dir, archive_path
+    )
+
+    assert loaded_metadata.model_id == metadata.model_id
+    with storage.read_from(Resource("resource1")) as directory:
+        assert (directory / "file.txt").read_text() == "test"
+
+
+@pytest.mark.parametrize("archive_name", ["model.tar.gz", "model.tar"])
+def test_load_model_package_with_directory_traversal(
+    archive_name: Text, tmp_path: Path, domain: Domain
+):
+    metadata_file = tmp_path / MODEL_ARCHIVE_METADATA_FILE
+    rasa.shared.utils.io.dump_obj_as_json_to_file(
+        metadata_file,
+        LocalModelStorage._create_model_metadata(
+            domain, _empty_model_configuration()
+        ).as_dict(),
+    )
+    malicious_file = tmp_path / "malicious.txt"
+    malicious_file.write_text("evil")
+
+    archive_path = tmp_path / archive_name
+    mode = "w:gz" if archive_name.endswith(".gz") else "w"
+    with TarSafe.open(archive_path, mode) as tar:
+        tar.add(metadata_file, arcname=MODEL_ARCHIVE_METADATA_FILE)
+        tar.add(malicious_file, arcname="components/resource1/../../evil.txt")
+
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    with pytest.raises(TarSafeException):
+        storage, _ = LocalModelStorage.from_model_archive(storage_dir, archive_path)
+        with storage.read_from(Resource("resource1")):
+            pass
+
+    assert not (tmp_path / "evil.txt").exists()
+
+
+def test_pickle_model_storage(default_model_storage: ModelStorage):
+    resource = Resource("some_node123")
+    with default_model_storage.write_to(resource) as resource_directory:
+        (resource_directory / "file.txt").write_text("hi")
+
+    unpickled = pickle.loads(pickle.dumps(default_model_storage))
+
+    with unpickled.read_from(resource) as resource_directory:
+        assert (resource_directory / "file.txt").read_text() == "hi"
@@ -1,25 +1,42 @@
 import dataclasses
 import logging
 import shutil
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Text, Optional, Any, Callable
 from unittest.mock import Mock
 
+from moto import mock_s3
+
+import boto3
 import pytest
+import sqlalchemy as sa
 from _pytest.logging import LogCaptureFixture
 from _pytest.monkeypatch import MonkeyPatch
 from sqlalchemy.exc import OperationalError
 
+import rasa
 import rasa.shared.utils.io
 import rasa.shared.utils.common
+import rasa.utils.common
 from rasa.engine.caching import (
     LocalTrainingCache,
     CACHE_LOCATION_ENV,
     DEFAULT_CACHE_NAME,
     CACHE_SIZE_ENV,
     CACHE_DB_NAME_ENV,
+    CACHE_EVICTION_TARGET_ENV,
+    REMOTE_CACHE_URL_ENV,
     TrainingCache,
+    TrainingCacheStatistics,
+    CacheBlobStore,
+    FileSystemBlobStore,
+    RemoteTrainingCache,
+    S3BlobStore,
+    blob_store_from_url,
+    create_training_cache,
 )
 import tests.conftest
 from rasa.engine.storage.local_model_storage import LocalModelStorage
@@ -489,6 +506,48 @@ def test_cache_exceeds_size_but_not_in_database(
     assert not test_file.is_file()
 
 
+@dataclasses.dataclass
+class CacheableOutputWrittenInParallel(TestCacheableOutput):
+    """Mimics another process which writes to the cache while this one caches."""
+
+    parallel_result: Optional[Path] = None
+
+    def to_cache(self, directory: Path, model_storage: ModelStorage) -> None:
+        super().to_cache(directory, model_storage)
+
+        self.parallel_result.mkdir()
+        tests.conftest.create_test_file_with_size(self.parallel_result, 5)
+
+
+def test_cache_keeps_content_which_is_written_in_parallel(
+    tmp_path: Path, monkeypatch: MonkeyPatch, default_model_storage: ModelStorage
+):
+    monkeypatch.setenv(CACHE_LOCATION_ENV, str(tmp_path))
+    monkeypatch.setenv(CACHE_SIZE_ENV, "5")
+
+    cache = LocalTrainingCache()
+
+    old_content = tests.conftest.create_test_file_with_size(cache._cache_location, 5)
+    # sleep to get a modification time which is older than the write
+    time.sleep(0.1)
+
+    output = CacheableOutputWrittenInParallel(
+        {"something to cache": "dasdaasda"},
+        size_in_mb=2,
+        parallel_result=cache._cache_location / "parallel result",
+    )
+    output_fingerprint = uuid.uuid4().hex
+    cache.cache_output(
+        uuid.uuid4().hex, output, output_fingerprint, default_model_storage
+    )
+
+    assert cache.get_cached_result(
+        output_fingerprint, "some_node", default_model_storage
+    )
+    assert not old_content.is_file()
+    assert output.parallel_result.is_dir()
+
+
 def test_clean_up_of_cached_result_if_database_fails(
     tmp_path: Path,
     monkeypatch: MonkeyPatch,
@@ -553,3 +612,325 @@ def test_resource_with_model_storage(
             temporary_directory / test_filename
         )
         assert cached_content == test_content
+
+
+def _share_output_between_remote_caches(
+    blob_store: CacheBlobStore,
+    tmp_path: Path,
+    local_cache_creator: Callable[..., LocalTrainingCache],
+    default_model_storage: ModelStorage,
+) -> None:
+    writing_cache = RemoteTrainingCache(
+        blob_store, local_cache_creator(tmp_path / "runner 1")
+    )
+    reading_cache = RemoteTrainingCache(
+        blob_store, local_cache_creator(tmp_path / "runner 2")
+    )
+
+    fingerprint_key = uuid.uuid4().hex
+    output = TestCacheableOutput({"something to cache": "dasdaasda"})
+    output_fingerprint = uuid.uuid4().hex
+    writing_cache.cache_output(
+        fingerprint_key, output, output_fingerprint, default_model_storage
+    )
+
+    assert (
+        reading_cache.get_cached_output_fingerprint(fingerprint_key)
+        == output_fingerprint
+    )
+    restored = reading_cache.get_cached_result(
+        output_fingerprint, "some_node", default_model_storage
+    )
+    assert restored == output
+
+    # The result was added to the local cache of the reading side
+    assert restored.cache_dir.parent == tmp_path / "runner 2"
+    assert reading_cache._local_cache.get_cached_result(
+        output_fingerprint, "some_node", default_model_storage
+    )
+
+    assert reading_cache.get_cached_output_fingerprint(uuid.uuid4().hex) is None
+    assert (
+        reading_cache.get_cached_result(
+            uuid.uuid4().hex, "some_node", default_model_storage
+        )
+        is None
+    )
+
+
+def test_remote_cache_with_file_system(
+    tmp_path: Path,
+    local_cache_creator: Callable[..., LocalTrainingCache],
+    default_model_storage: ModelStorage,
+):
+    blob_store = FileSystemBlobStore(tmp_path / "shared")
+
+    _share_output_between_remote_caches(
+        blob_store, tmp_path, local_cache_creator, default_model_storage
+    )
+
+    # Writers don't leave temporary files behind
+    assert not list((tmp_path / "shared").glob("**/*.tmp"))
+
+
+def test_remote_cache_with_s3(
+    tmp_path: Path,
+    local_cache_creator: Callable[..., LocalTrainingCache],
+    default_model_storage: ModelStorage,
+    monkeypatch: MonkeyPatch,
+):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with mock_s3():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="cache")
+        blob_store = S3BlobStore("cache", prefix="rasa", region_name="us-east-1")
+
+        _share_output_between_remote_caches(
+            blob_store, tmp_path, local_cache_creator, default_model_storage
+        )
+
+
+def test_remote_cache_uploads_each_result_once(
+    tmp_path: Path,
+    local_cache_creator: Callable[..., LocalTrainingCache],
+    default_model_storage: ModelStorage,
+):
+    blob_store = FileSystemBlobStore(tmp_path / "shared")
+    cache = RemoteTrainingCache(blob_store, local_cache_creator(tmp_path / "local"))
+
+    output_fingerprint = uuid.uuid4().hex
+    cache.cache_output(
+        uuid.uuid4().hex,
+        TestCacheableOutput({"something to cache": "dasdaasda"}),
+        output_fingerprint,
+        default_model_storage,
+    )
+    result_path = tmp_path / "shared" / "results" / f"{output_fingerprint}.tar.gz"
+    modification_time = result_path.stat().st_mtime_ns
+
+    cache.cache_output(
+        uuid.uuid4().hex,
+        TestCacheableOutput({"something to cache": "dasdaasda"}),
+        output_fingerprint,
+        default_model_storage,
+    )
+
+    assert result_path.stat().st_mtime_ns == modification_time
+    assert len(list((tmp_path / "shared" / "fingerprints").glob("*"))) == 2
+
+
+def test_remote_cache_falls_back_to_local_cache_if_remote_fails(
+    tmp_path: Path,
+    local_cache_creator: Callable[..., LocalTrainingCache],
+    default_model_storage: ModelStorage,
+):
+    blob_store = Mock(spec=CacheBlobStore)
+    blob_store.exists.side_effect = ConnectionError()
+    blob_store.upload.side_effect = ConnectionError()
+    blob_store.download.side_effect = ConnectionError()
+    cache = RemoteTrainingCache(blob_store, local_cache_creator(tmp_path))
+
+    fingerprint_key = uuid.uuid4().hex
+    output = TestCacheableOutput({"something to cache": "dasdaasda"})
+    output_fingerprint = uuid.uuid4().hex
+    cache.cache_output(
+        fingerprint_key, output, output_fingerprint, default_model_storage
+    )
+
+    assert cache.get_cached_output_fingerprint(fingerprint_key) == output_fingerprint
+    assert (
+        cache.get_cached_result(output_fingerprint, "some_node", default_model_storage)
+        == output
+    )
+    assert cache.get_cached_output_fingerprint(uuid.uuid4().hex) is None
+
+
+@pytest.mark.parametrize(
+    "url, expected_type",
+    [
+        ("s3://my-bucket/some/prefix", S3BlobStore),
+        ("file:///some/shared/dir", FileSystemBlobStore),
+        ("/some/shared/dir", FileSystemBlobStore),
+        ("relative/dir", FileSystemBlobStore),
+    ],
+)
+def test_blob_store_from_url(url: Text, expected_type: type):
+    assert isinstance(blob_store_from_url(url), expected_type)
+
+
+def test_create_training_cache(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    local_cache_creator: Callable[..., LocalTrainingCache],
+):
+    local_cache_creator(tmp_path)
+
+    assert isinstance(create_training_cache(), LocalTrainingCache)
+
+    monkeypatch.setenv(REMOTE_CACHE_URL_ENV, str(tmp_path / "shared"))
+    assert isinstance(create_training_cache(), RemoteTrainingCache)
+
+
+def test_evict_in_bulk_down_to_eviction_target(
+    tmp_path: Path, monkeypatch: MonkeyPatch, default_model_storage: ModelStorage
+):
+    monkeypatch.setenv(CACHE_LOCATION_ENV, str(tmp_path))
+    monkeypatch.setenv(CACHE_SIZE_ENV, "10")
+    monkeypatch.setenv(CACHE_EVICTION_TARGET_ENV, "0.5")
+
+    cache = LocalTrainingCache()
+
+    output_fingerprints = [uuid.uuid4().hex for _ in range(5)]
+    for output_fingerprint in output_fingerprints[:4]:
+        cache.cache_output(
+            uuid.uuid4().hex,
+            TestCacheableOutput({"something to cache": "dasdaasda"}, size_in_mb=2),
+            output_fingerprint,
+            default_model_storage,
+        )
+
+    # Measuring the cache doesn't require walking through the cached results
+    directory_size_in_bytes = Mock(wraps=rasa.utils.common.directory_size_in_bytes)
+    monkeypatch.setattr(
+        rasa.utils.common, "directory_size_in_bytes", directory_size_in_bytes
+    )
+
+    cache.cache_output(
+        uuid.uuid4().hex,
+        TestCacheableOutput({"something to cache": "dasdaasda"}, size_in_mb=2),
+        output_fingerprints[4],
+        default_model_storage,
+    )
+
+    assert directory_size_in_bytes.call_count == 1
+
+    # 3 results had to be evicted to be below 5 MiB after adding the new result
+    for output_fingerprint in output_fingerprints[:3]:
+        assert (
+            cache.get_cached_result(
+                output_fingerprint, "some_node", default_model_storage
+            )
+            is None
+        )
+    for output_fingerprint in output_fingerprints[3:]:
+        assert cache.get_cached_result(
+            output_fingerprint, "some_node", default_model_storage
+        )
+
+    statistics = cache.statistics
+    assert statistics.evicted_results == 3
+    assert statistics.evicted_bytes > 3 * 2 * 1_048_576
+    assert rasa.utils.common.directory_size_in_mb(tmp_path, [DEFAULT_CACHE_NAME]) < 5
+
+
+def test_cache_statistics(
+    temp_cache: LocalTrainingCache, default_model_storage: ModelStorage
+):
+    fingerprint_key = uuid.uuid4().hex
+    output_fingerprint = uuid.uuid4().hex
+    temp_cache.cache_output(
+        fingerprint_key,
+        TestCacheableOutput({"something to cache": "dasdaasda"}),
+        output_fingerprint,
+        default_model_storage,
+    )
+
+    temp_cache.get_cached_output_fingerprint(fingerprint_key)
+    temp_cache.get_cached_output_fingerprint(uuid.uuid4().hex)
+    temp_cache.get_cached_output_fingerprint(uuid.uuid4().hex)
+    temp_cache.get_cached_result(output_fingerprint, "some_node", default_model_storage)
+    temp_cache.get_cached_result(uuid.uuid4().hex, "some_node", default_model_storage)
+
+    assert temp_cache.statistics == TrainingCacheStatistics(
+        fingerprint_hits=1, fingerprint_misses=2, result_hits=1, result_misses=1
+    )
+
+
+def test_cache_from_previous_version_gets_result_sizes(
+    tmp_path: Path,
+    local_cache_creator: Callable[..., LocalTrainingCache],
+    default_model_storage: ModelStorage,
+):
+    result_location = tmp_path / "some result"
+    result_location.mkdir()
+    tests.conftest.create_test_file_with_size(result_location, 1)
+
+    # Create a cache database without the `result_size` column
+    engine = sa.create_engine(f"sqlite:///{tmp_path / DEFAULT_CACHE_NAME}")
+    with engine.begin() as connection:
+        connection.execute(
+            sa.text(
+                "CREATE TABLE cache_entry (fingerprint_key VARCHAR PRIMARY KEY, "
+                "output_fingerprint_key VARCHAR NOT NULL, last_used DATETIME NOT NULL, "
+                "rasa_version VARCHAR(255) NOT NULL, result_location VARCHAR, "
+                "result_type VARCHAR)"
+            )
+        )
+        connection.execute(
+            sa.text(
+                "INSERT INTO cache_entry VALUES ('key', 'output', "
+                "'2022-01-01 00:00:00', :version, :location, 'some.Type')"
+            ),
+            {"version": rasa.__version__, "location": str(result_location)},
+        )
+    engine.dispose()
+
+    cache = local_cache_creator(tmp_path)
+
+    with cache._sessionmaker() as session:
+        entry = session.get(LocalTrainingCache.CacheEntry, "key")
+        assert entry.result_size == pytest.approx(1_048_576, abs=1024)
+
+    assert cache.get_cached_output_fingerprint("key") == "output"
+
+
+def test_cache_output_from_threads(
+    temp_cache: LocalTrainingCache, default_model_storage: ModelStorage
+):
+    outputs = {
+        uuid.uuid4().hex: (TestCacheableOutput({"value": i}), uuid.uuid4().hex)
+        for i in range(20)
+    }
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [
+            executor.submit(
+                temp_cache.cache_output,
+                fingerprint_key,
+                output,
+                output_fingerprint,
+                default_model_storage,
+            )
+            for fingerprint_key, (output, output_fingerprint) in outputs.items()
+        ]:
+            future.result()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        cached_fingerprints = executor.map(
+            temp_cache.get_cached_output_fingerprint, outputs.keys()
+        )
+        assert list(cached_fingerprints) == [
+            output_fingerprint for _, output_fingerprint in outputs.values()
+        ]
+
+    for output, output_fingerprint in outputs.values():
+        assert (
+            temp_cache.get_cached_result(
+                output_fingerprint, "some_node", default_model_storage
+            )
+            == output
+        )
+
+
+def test_disabled_cache_can_be_used_from_threads(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+):
+    monkeypatch.setenv(CACHE_LOCATION_ENV, str(tmp_path))
+    monkeypatch.setenv(CACHE_SIZE_ENV, "0")
+
+    cache = LocalTrainingCache()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(cache.get_cached_output_fingerprint, "some_key")
+        assert future.result() is None
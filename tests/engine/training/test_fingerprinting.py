@@ -1,9 +1,10 @@
 import inspect
 import os.path
 import tempfile
-from typing import Dict, Text, Any, Optional
+from typing import Dict, Iterator, Text, Any, Optional
 from unittest.mock import Mock
 from _pytest.monkeypatch import MonkeyPatch
+import pytest
 
 import rasa.shared.utils.io
 from rasa.core.policies.ted_policy import TEDPolicy
@@ -12,10 +13,19 @@ from rasa.engine.storage.resource import Resource
 from rasa.engine.storage.storage import ModelStorage
 from rasa.engine.training import fingerprinting
 from rasa.nlu.classifiers.diet_classifier import DIETClassifier
+from rasa.nlu.featurizers.dense_featurizer.lm_featurizer import LanguageModelFeaturizer
 from rasa.nlu.selectors.response_selector import ResponseSelector
 from tests.engine.training.test_components import FingerprintableText
 
 
+@pytest.fixture(autouse=True)
+def clear_component_sources() -> Iterator[None]:
+    # the sources of components are cached and some tests mock `inspect.getsource`
+    fingerprinting._component_source.cache_clear()
+    yield
+    fingerprinting._component_source.cache_clear()
+
+
 def test_fingerprint_stays_same():
     key1 = fingerprinting.calculate_fingerprint_key(
         TEDPolicy, TEDPolicy.get_default_config(), {"input": FingerprintableText("Hi")}
@@ -75,6 +85,7 @@ def test_fingerprint_changes_due_to_changed_source(monkeypatch: MonkeyPatch):
 
     get_source_mock = Mock(return_value="other implementation")
     monkeypatch.setattr(inspect, inspect.getsource.__name__, get_source_mock)
+    fingerprinting._component_source.cache_clear()
 
     key2 = fingerprinting.calculate_fingerprint_key(
         TEDPolicy, {}, {"input": FingerprintableText("Hi")}
@@ -85,6 +96,30 @@ def test_fingerprint_changes_due_to_changed_source(monkeypatch: MonkeyPatch):
     get_source_mock.assert_called_once_with(TEDPolicy)
 
 
+def test_fingerprint_looks_up_source_and_versions_once(monkeypatch: MonkeyPatch):
+    get_source_mock = Mock(wraps=inspect.getsource)
+    monkeypatch.setattr(inspect, inspect.getsource.__name__, get_source_mock)
+    fingerprinting.calculate_fingerprint_key(
+        LanguageModelFeaturizer, {}, {"input": FingerprintableText("Hi")}
+    )
+
+    get_distribution_mock = Mock()
+    monkeypatch.setattr(
+        fingerprinting.pkg_resources, "get_distribution", get_distribution_mock
+    )
+
+    key1 = fingerprinting.calculate_fingerprint_key(
+        LanguageModelFeaturizer, {}, {"input": FingerprintableText("Hi")}
+    )
+    key2 = fingerprinting.calculate_fingerprint_key(
+        LanguageModelFeaturizer, {}, {"input": FingerprintableText("Bye")}
+    )
+
+    assert key1 != key2
+    get_source_mock.assert_called_once_with(LanguageModelFeaturizer)
+    get_distribution_mock.assert_not_called()
+
+
 def test_fingerprint_changes_when_external_file_changes():
     tmp_file = tempfile.mktemp()
 
@@ -1,7 +1,11 @@
-from typing import Callable, Dict, Text, Any
+import json
+from typing import Callable, Dict, Text, Any, Tuple
+from urllib.parse import parse_qs
 
 import pytest
 import responses
+from _pytest.monkeypatch import MonkeyPatch
+from requests import PreparedRequest
 
 from rasa.engine.graph import ExecutionContext
 from rasa.engine.storage.resource import Resource
@@ -237,3 +241,122 @@ def test_duckling_entity_extractor_dimension_filtering(
         assert len(entities) == 1
         assert entities[0]["text"] == "5"
         assert entities[0]["value"] == 5
+
+
+def _number_match(body: Text, start: int) -> Dict[Text, Any]:
+    return {
+        "body": body,
+        "start": start,
+        "value": {"value": int(body), "type": "value"},
+        "end": start + len(body),
+        "dim": "number",
+    }
+
+
+@pytest.mark.parametrize("cache_size, expected_requests", [(1000, 2), (0, 3)])
+def test_duckling_entity_extractor_caches_responses(
+    create_duckling: Callable[[Dict[Text, Any]], DucklingEntityExtractor],
+    cache_size: int,
+    expected_requests: int,
+):
+    duckling = create_duckling({"cache_size": cache_size})
+
+    def parse(request: PreparedRequest) -> Tuple[int, Dict, Text]:
+        text = parse_qs(request.body)["text"][0]
+        number = text.split()[-1]
+        return 200, {}, json.dumps([_number_match(number, text.index(number))])
+
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, "http://localhost:8000/parse", callback=parse)
+
+        messages = [
+            Message(data={TEXT: "I want 3"}, time=1381536182),
+            Message(data={TEXT: "I want 3"}, time=1381536182),
+            Message(data={TEXT: "I want 15"}, time=1381536182),
+        ]
+        duckling.process(messages)
+
+        assert len(rsps.calls) == expected_requests
+
+    assert [message.get("entities")[0]["value"] for message in messages] == [
+        3,
+        3,
+        15,
+    ]
+    # cached responses are not shared between messages
+    assert messages[0].get("entities")[0] is not messages[1].get("entities")[0]
+
+
+def test_duckling_entity_extractor_does_not_share_cache_between_reference_times(
+    create_duckling: Callable[[Dict[Text, Any]], DucklingEntityExtractor]
+):
+    duckling = create_duckling({"reference_time_bucket": 60})
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(
+            responses.POST,
+            "http://localhost:8000/parse",
+            json=[_number_match("3", 7)],
+        )
+
+        duckling.process(
+            [
+                Message(data={TEXT: "I want 3"}, time=1381536120),
+                Message(data={TEXT: "I want 3"}, time=1381536179),
+                Message(data={TEXT: "I want 3"}, time=1381536180),
+            ]
+        )
+
+        assert len(rsps.calls) == 2
+        reference_times = {
+            parse_qs(call.request.body)["reftime"][0] for call in rsps.calls
+        }
+        assert reference_times == {"1381536120000", "1381536180000"}
+
+
+def test_duckling_entity_extractor_does_not_cache_errors(
+    create_duckling: Callable[[Dict[Text, Any]], DucklingEntityExtractor]
+):
+    duckling = create_duckling({})
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, "http://localhost:8000/parse", status=500)
+        rsps.add(
+            responses.POST,
+            "http://localhost:8000/parse",
+            json=[_number_match("3", 7)],
+        )
+
+        failed = Message(data={TEXT: "I want 3"}, time=1381536182)
+        duckling.process([failed])
+        retried = Message(data={TEXT: "I want 3"}, time=1381536182)
+        duckling.process([retried])
+
+        assert len(rsps.calls) == 2
+
+    assert failed.get("entities") == []
+    assert retried.get("entities")[0]["value"] == 3
+
+
+def test_duckling_client_is_closed_when_url_changes(
+    create_duckling: Callable[[Dict[Text, Any]], DucklingEntityExtractor],
+    monkeypatch: MonkeyPatch,
+):
+    duckling = create_duckling({})
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, "http://localhost:8000/parse", json=[])
+        duckling.process(
+            [
+                Message(data={TEXT: "I want 3"}, time=1381536182),
+                Message(data={TEXT: "I want 4"}, time=1381536182),
+            ]
+        )
+
+    client = duckling._duckling_client()
+    assert client._executor is not None
+
+    monkeypatch.setenv("RASA_DUCKLING_HTTP_URL", "http://duckling:8000")
+
+    assert duckling._duckling_client() is not client
+    assert client._executor is None
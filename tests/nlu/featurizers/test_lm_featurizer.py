@@ -821,3 +821,50 @@ def test_lm_featurizer_correctly_handle_whitespace_token(
     result, _ = lm_featurizer._tokenize_example(message, TEXT)
 
     assert [(token.text, token.start) for token in result] == expected_feature_tokens
+
+
+@pytest.mark.skip_on_windows
+def test_process_featurizes_messages_in_length_buckets(
+    create_language_model_featurizer: Callable[
+        [Dict[Text, Any]], LanguageModelFeaturizer
+    ],
+    whitespace_tokenizer: WhitespaceTokenizer,
+    monkeypatch: MonkeyPatch,
+):
+    monkeypatch.setattr(LanguageModelFeaturizer, "_load_model_instance", lambda _: None)
+    featurizer = create_language_model_featurizer(
+        {"model_name": "bert", "batch_size": 2}
+    )
+    featurizer.pad_token_id = 0
+
+    def lm_tokenize(text: Text) -> Tuple[List[int], List[Text]]:
+        return [len(text)], [text]
+
+    fed_batches = []
+
+    def compute_batch_sequence_features(
+        batch_attention_mask: np.ndarray, padded_token_ids: List[List[int]]
+    ) -> np.ndarray:
+        fed_batches.append(np.sum(batch_attention_mask, axis=1).tolist())
+        # the features of a token depend on the token only
+        token_ids = np.array(padded_token_ids, dtype=np.float32)
+        return np.stack([token_ids, token_ids * 2], axis=-1)
+
+    monkeypatch.setattr(featurizer, "_lm_tokenize", lm_tokenize)
+    monkeypatch.setattr(
+        featurizer, "_compute_batch_sequence_features", compute_batch_sequence_features
+    )
+
+    texts = ["a bb ccc dddd", "hi", "one two three", "x", "hello there"]
+    messages = [Message.build(text=text) for text in texts]
+    whitespace_tokenizer.process(messages)
+
+    featurizer.process(messages)
+
+    # messages with a similar number of tokens are fed together
+    assert fed_batches == [[3, 3], [4, 5], [6]]
+    for text, message in zip(texts, messages):
+        sequence_features, sentence_features = message.get_dense_features(TEXT)
+        expected = [[len(word), 2 * len(word)] for word in text.split()]
+        assert np.array_equal(sequence_features.features, expected)
+        assert sentence_features.features.shape == (1, 2)
@@ -1,3 +1,4 @@
+import re
 from typing import Dict, List, Text
 
 import pytest
@@ -218,3 +219,48 @@ def test_regex_validation(
     assert "Model training failed." in str(e.value)
     assert "not a valid regex." in str(e.value)
     assert "Please update your nlu training data configuration" in str(e.value)
+
+
+@pytest.mark.parametrize(
+    "elements, use_word_boundaries, case_sensitive, text",
+    [
+        (["Max", "John"], True, True, "Max and John met Maxi and max."),
+        (["Max", "John"], True, False, "Max and John met Maxi and max."),
+        (["New York", "New"], False, True, "New York is newer than New Jersey"),
+        (["New", "New York"], False, True, "New York is newer than New Jersey"),
+        (["a.b", "(c)", "e+"], True, True, "x a.b (c) e+ a.b.c"),
+        (["straße", "İstanbul"], True, False, "STRASSE istanbul Straße"),
+        (["σοφία"], True, False, "ΣΟΦΙΑ"),
+        (["aa"], False, True, "aaaaa"),
+        (["ab", "a", "b"], True, True, ""),
+    ],
+)
+def test_pattern_matcher_finds_same_matches_as_regex(
+    elements: List[Text], use_word_boundaries: bool, case_sensitive: bool, text: Text
+):
+    lookup_regex = pattern_utils._generate_lookup_regex(
+        {"elements": elements}, use_word_boundaries
+    )
+    patterns = [
+        {"name": "lookup", "pattern": lookup_regex},
+        {"name": "regex", "pattern": "[A-Z][a-z]+"},
+    ]
+    flags = 0 if case_sensitive else re.IGNORECASE
+
+    matcher = pattern_utils.PatternMatcher(patterns, case_sensitive)
+
+    # lookup tables are matched without running the regex
+    assert 0 not in matcher._regexes
+    assert matcher.matches(text) == [
+        [match.span() for match in re.finditer(pattern["pattern"], text, flags)]
+        for pattern in patterns
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern", ["(\\bMax\\d\\b|\\bJohn\\b)", "(Max|)", "[0-9]{5}", "(a)(b)"]
+)
+def test_pattern_matcher_compiles_patterns_which_are_not_lookups(pattern: Text):
+    matcher = pattern_utils.PatternMatcher([{"name": "pattern", "pattern": pattern}])
+
+    assert matcher._regexes[0].pattern == pattern
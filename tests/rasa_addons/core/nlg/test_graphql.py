@@ -0,0 +1,238 @@
+import asyncio
+import urllib.error
+from typing import Any, Dict, List, Optional, Text
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rasa.shared.core.events import ActionExecuted, UserUttered
+from rasa.shared.core.trackers import DialogueStateTracker
+from rasa.utils.endpoints import EndpointConfig
+from rasa_addons.core.nlg.graphql import (
+    DOMAIN_RESPONSES_ARGUMENT,
+    FULL_TRACKER_PAYLOAD,
+    MINIMAL_TRACKER_PAYLOAD,
+    NLG_QUERY,
+    GraphQLNaturalLanguageGenerator,
+    batched_nlg_query,
+    nlg_request_format,
+)
+
+
+def _nlg(**kwargs: Any) -> GraphQLNaturalLanguageGenerator:
+    nlg = GraphQLNaturalLanguageGenerator(
+        endpoint_config=EndpointConfig("http://botfront/graphql", **kwargs)
+    )
+    nlg.graphql_client.query = AsyncMock()
+    nlg.graphql_client.query_with_errors = AsyncMock()
+    return nlg
+
+
+async def _generate(
+    nlg: GraphQLNaturalLanguageGenerator,
+    template: Text = "utter_greet",
+    tracker: Optional[DialogueStateTracker] = None,
+    output_channel: Text = "rest",
+    **kwargs: Any,
+) -> Dict[Text, Any]:
+    return await asyncio.wait_for(
+        nlg.generate(
+            template,
+            tracker or DialogueStateTracker("some_id", []),
+            output_channel,
+            **kwargs,
+        ),
+        timeout=5,
+    )
+
+
+async def _request_responses(
+    nlg: GraphQLNaturalLanguageGenerator, templates: List[Text]
+) -> List[Any]:
+    return await asyncio.wait_for(
+        asyncio.gather(
+            *[nlg._request_response({"template": template}) for template in templates],
+            return_exceptions=True,
+        ),
+        timeout=5,
+    )
+
+
+async def test_batch_with_single_request():
+    nlg = _nlg()
+    nlg.graphql_client.query.return_value = {"getResponse": {"text": "Hi"}}
+
+    responses = await _request_responses(nlg, ["utter_greet"])
+
+    assert responses == [{"text": "Hi"}]
+    nlg.graphql_client.query.assert_awaited_once_with(
+        NLG_QUERY, {"template": "utter_greet"}
+    )
+    nlg.graphql_client.query_with_errors.assert_not_awaited()
+
+
+async def test_batch_with_single_failing_request():
+    nlg = _nlg()
+    nlg.graphql_client.query.side_effect = urllib.error.URLError("boom")
+
+    responses = await _request_responses(nlg, ["utter_greet"])
+
+    assert isinstance(responses[0], urllib.error.URLError)
+
+
+async def test_batch_with_several_requests():
+    nlg = _nlg()
+    nlg.graphql_client.query_with_errors.return_value = (
+        {"response_0": {"text": "Hi"}, "response_1": {"text": "Bye"}},
+        [],
+    )
+
+    responses = await _request_responses(nlg, ["utter_greet", "utter_bye"])
+
+    assert responses == [{"text": "Hi"}, {"text": "Bye"}]
+    nlg.graphql_client.query_with_errors.assert_awaited_once_with(
+        batched_nlg_query(2),
+        {"template_0": "utter_greet", "template_1": "utter_bye"},
+    )
+
+
+@pytest.mark.parametrize(
+    "errors, failing",
+    [
+        ([{"message": "boom", "path": ["response_1"]}], [False, True, False]),
+        ([{"message": "boom"}], [True, True, True]),
+    ],
+)
+async def test_batch_with_graphql_errors(
+    errors: List[Dict[Text, Any]], failing: List[bool]
+):
+    nlg = _nlg()
+    nlg.graphql_client.query_with_errors.return_value = (
+        {"response_0": {"text": "Hi"}, "response_2": {"text": "Bye"}},
+        errors,
+    )
+
+    responses = await _request_responses(nlg, ["utter_a", "utter_b", "utter_c"])
+
+    expected = [{"text": "Hi"}, {}, {"text": "Bye"}]
+    for response, expected_response, fails in zip(responses, expected, failing):
+        if fails:
+            assert isinstance(response, urllib.error.URLError)
+        else:
+            assert response == expected_response
+
+
+async def test_unexpected_error_fails_every_request_of_batch():
+    nlg = _nlg()
+    nlg.graphql_client.query_with_errors.side_effect = RuntimeError("boom")
+
+    responses = await _request_responses(nlg, ["utter_a", "utter_b"])
+
+    assert all(isinstance(response, RuntimeError) for response in responses)
+
+
+async def test_generate_single_response():
+    nlg = _nlg()
+    nlg.graphql_client.query.return_value = {"getResponse": {"text": "Hi"}}
+
+    response = await _generate(nlg)
+
+    assert response == {"text": "Hi", "template_name": "utter_greet"}
+
+
+@pytest.mark.parametrize(
+    "tracker_payload, sends_events",
+    [(FULL_TRACKER_PAYLOAD, True), (MINIMAL_TRACKER_PAYLOAD, False)],
+)
+def test_nlg_request_format(tracker_payload: Text, sends_events: bool):
+    tracker = DialogueStateTracker.from_events(
+        "some_id",
+        [ActionExecuted("action_listen"), UserUttered("Hi", {"name": "greet"})],
+    )
+    domain_responses = {"utter_greet": [{"text": "Hi"}]}
+
+    body = nlg_request_format(
+        "utter_greet",
+        tracker,
+        "rest",
+        tracker_payload=tracker_payload,
+        **{DOMAIN_RESPONSES_ARGUMENT: domain_responses},
+        language="en",
+    )
+
+    assert body["template"] == "utter_greet"
+    assert body["arguments"] == {
+        DOMAIN_RESPONSES_ARGUMENT: domain_responses,
+        "language": "en",
+    }
+    assert body["channel"] == {"name": "rest"}
+    assert body["tracker"]["latest_message"]["text"] == "Hi"
+    assert bool(body["tracker"]["events"]) == sends_events
+
+
+async def test_response_cache_hit():
+    nlg = _nlg(response_cache_ttl=60)
+    nlg.graphql_client.query.return_value = {"getResponse": {"text": "Hi"}}
+
+    first = await _generate(nlg, **{DOMAIN_RESPONSES_ARGUMENT: {}})
+    second = await _generate(nlg, **{DOMAIN_RESPONSES_ARGUMENT: {}})
+
+    assert first == second == {"text": "Hi", "template_name": "utter_greet"}
+    # cached responses are not shared between calls
+    assert first is not second
+    nlg.graphql_client.query.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "other_request",
+    [
+        {"template": "utter_bye"},
+        {"output_channel": "socketio"},
+        {
+            "tracker": DialogueStateTracker.from_events(
+                "some_id", [UserUttered("Salut", metadata={"language": "fr"})]
+            )
+        },
+    ],
+)
+async def test_response_cache_miss(other_request: Dict[Text, Any]):
+    nlg = _nlg(response_cache_ttl=60)
+    nlg.graphql_client.query.return_value = {"getResponse": {"text": "Hi"}}
+
+    await _generate(nlg)
+    await _generate(nlg, **other_request)
+
+    assert nlg.graphql_client.query.await_count == 2
+
+
+async def test_response_cache_is_bypassed_for_requests_with_arguments():
+    nlg = _nlg(response_cache_ttl=60)
+    nlg.graphql_client.query.return_value = {"getResponse": {"text": "Hi"}}
+
+    await _generate(nlg, button_selected="yes")
+    await _generate(nlg, button_selected="yes")
+
+    assert nlg.graphql_client.query.await_count == 2
+    assert len(nlg.response_cache) == 0
+
+
+async def test_response_cache_expires():
+    nlg = _nlg(response_cache_ttl=0.01)
+    nlg.graphql_client.query.return_value = {"getResponse": {"text": "Hi"}}
+
+    await _generate(nlg)
+    await asyncio.sleep(0.05)
+    await _generate(nlg)
+
+    assert nlg.graphql_client.query.await_count == 2
+
+
+async def test_response_cache_is_disabled_by_default():
+    nlg = _nlg()
+    nlg.graphql_client.query.return_value = {"getResponse": {"text": "Hi"}}
+
+    await _generate(nlg)
+    await _generate(nlg)
+
+    assert nlg.response_cache is None
+    assert nlg.graphql_client.query.await_count == 2
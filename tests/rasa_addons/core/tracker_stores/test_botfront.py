@@ -0,0 +1,122 @@
+import asyncio
+import urllib.error
+from typing import Any
+from unittest.mock import AsyncMock
+
+from rasa.shared.core.domain import Domain
+from rasa.shared.core.events import ActionExecuted, UserUttered
+from rasa.shared.core.trackers import DialogueStateTracker
+from rasa_addons.core.tracker_stores.botfront import (
+    INSERT_TRACKER,
+    UPDATE_TRACKER,
+    BotfrontTrackerStore,
+)
+
+TRACKER_INFO = {"lastIndex": 1, "lastTimestamp": 1}
+
+
+def _tracker_store(**kwargs: Any) -> BotfrontTrackerStore:
+    store = BotfrontTrackerStore(
+        Domain.empty(),
+        "http://botfront/graphql",
+        write_behind=True,
+        write_behind_delay=0,
+        **kwargs,
+    )
+    store.graphql_client.query = AsyncMock()
+    return store
+
+
+def _tracker() -> DialogueStateTracker:
+    return DialogueStateTracker.from_events(
+        "some_id",
+        [ActionExecuted("action_listen"), UserUttered("Hi", {"name": "greet"})],
+    )
+
+
+async def _flush(store: BotfrontTrackerStore) -> None:
+    await asyncio.wait_for(store.flush(), timeout=5)
+
+
+def _sent_mutations(store: BotfrontTrackerStore) -> list:
+    return [call.args[0] for call in store.graphql_client.query.await_args_list]
+
+
+async def test_write_behind_saves_are_coalesced():
+    store = _tracker_store()
+    store.graphql_client.query.return_value = {"insertTrackerStore": TRACKER_INFO}
+
+    await store.save(_tracker())
+    await store.save(_tracker())
+    await _flush(store)
+
+    assert _sent_mutations(store) == [INSERT_TRACKER]
+    assert store._get_last_index("some_id") == 1
+
+
+async def test_failed_write_behind_save_is_retried():
+    store = _tracker_store()
+    store.graphql_client.query.side_effect = [
+        urllib.error.URLError("boom"),
+        {"insertTrackerStore": TRACKER_INFO},
+    ]
+
+    await store.save(_tracker())
+    await _flush(store)
+
+    # the tracker wasn't inserted by the failed mutation
+    assert _sent_mutations(store) == [INSERT_TRACKER, INSERT_TRACKER]
+    assert store._get_last_index("some_id") == 1
+    assert not store._write_retries
+
+
+async def test_failed_write_behind_save_is_merged_with_newer_save():
+    store = _tracker_store()
+    first_save = asyncio.Event()
+
+    async def query(*_: Any) -> Any:
+        if not first_save.is_set():
+            first_save.set()
+            # a newer save arrives while the failing mutation is in flight
+            await store.save(_tracker())
+            raise urllib.error.URLError("boom")
+        return {"insertTrackerStore": TRACKER_INFO}
+
+    store.graphql_client.query.side_effect = query
+
+    await store.save(_tracker())
+    await _flush(store)
+
+    assert _sent_mutations(store) == [INSERT_TRACKER, INSERT_TRACKER]
+
+
+async def test_write_behind_gives_up_after_retries():
+    store = _tracker_store(write_behind_retries=2)
+    store.graphql_client.query.side_effect = urllib.error.URLError("boom")
+
+    await store.save(_tracker())
+    await _flush(store)
+
+    assert _sent_mutations(store) == [INSERT_TRACKER] * 3
+    assert not store._unsaved_trackers
+    assert not store._write_retries
+
+
+async def test_retried_update_sends_events_again():
+    store = _tracker_store()
+    store.graphql_client.query.return_value = {"insertTrackerStore": TRACKER_INFO}
+    await store.save(_tracker())
+    await _flush(store)
+
+    store.graphql_client.query.reset_mock(return_value=True)
+    store.graphql_client.query.side_effect = [
+        urllib.error.URLError("boom"),
+        {"updateTrackerStore": {"lastIndex": 2, "lastTimestamp": 2}},
+    ]
+    await store.save(_tracker())
+    await _flush(store)
+
+    calls = store.graphql_client.query.await_args_list
+    assert _sent_mutations(store) == [UPDATE_TRACKER, UPDATE_TRACKER]
+    assert calls[0].args[1]["tracker"] == calls[1].args[1]["tracker"]
+    assert store._get_last_index("some_id") == 2
@@ -0,0 +1,94 @@
+import json
+from typing import Any, Callable, Dict, List, Text, Tuple
+from urllib.parse import parse_qs
+
+import pytest
+import responses
+from requests import PreparedRequest
+
+from rasa.engine.graph import ExecutionContext
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.shared.nlu.constants import ENTITIES, TEXT
+from rasa.shared.nlu.training_data.message import Message
+from rasa_addons.nlu.components.duckling_http_extractor import (
+    DucklingHTTPExtractorWithTimezone,
+)
+
+
+@pytest.fixture()
+def create_duckling(
+    default_model_storage: ModelStorage, default_execution_context: ExecutionContext
+) -> Callable[[Dict[Text, Any]], DucklingHTTPExtractorWithTimezone]:
+    def inner(config: Dict[Text, Any]) -> DucklingHTTPExtractorWithTimezone:
+        return DucklingHTTPExtractorWithTimezone.create(
+            config={
+                **DucklingHTTPExtractorWithTimezone.get_default_config(),
+                "url": "http://localhost:8000",
+                **config,
+            },
+            model_storage=default_model_storage,
+            execution_context=default_execution_context,
+            resource=Resource("duckling"),
+        )
+
+    return inner
+
+
+def _process_and_record_payloads(
+    duckling: DucklingHTTPExtractorWithTimezone,
+    messages: List[Message],
+    **kwargs: Any,
+) -> List[Dict[Text, List[Text]]]:
+    def parse(request: PreparedRequest) -> Tuple[int, Dict, Text]:
+        text = parse_qs(request.body)["text"][0]
+        number = text.split()[-1]
+        match = {
+            "body": number,
+            "start": text.index(number),
+            "end": text.index(number) + len(number),
+            "value": {"value": int(number), "type": "value"},
+            "dim": "number",
+        }
+        return 200, {}, json.dumps([match])
+
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, "http://localhost:8000/parse", callback=parse)
+        processed = duckling.process(messages, **kwargs)
+
+        assert processed == messages
+        return [parse_qs(call.request.body) for call in rsps.calls]
+
+
+def test_messages_are_parsed_in_a_batch_with_timezone_of_request(
+    create_duckling: Callable[[Dict[Text, Any]], DucklingHTTPExtractorWithTimezone]
+):
+    duckling = create_duckling({"timezone": "Europe/Berlin"})
+    messages = [
+        Message(data={TEXT: "I want 3"}, time=1381536182),
+        Message(data={TEXT: "I want 15"}, time=1381536242),
+    ]
+
+    payloads = _process_and_record_payloads(
+        duckling, messages, timezone="America/Montreal"
+    )
+
+    assert sorted(
+        (payload["text"][0], payload["tz"][0], payload["reftime"][0])
+        for payload in payloads
+    ) == [
+        ("I want 15", "America/Montreal", "1381536242000"),
+        ("I want 3", "America/Montreal", "1381536182000"),
+    ]
+    assert [message.get(ENTITIES)[0]["value"] for message in messages] == [3, 15]
+
+
+def test_timezone_falls_back_to_config(
+    create_duckling: Callable[[Dict[Text, Any]], DucklingHTTPExtractorWithTimezone]
+):
+    duckling = create_duckling({"timezone": "Europe/Berlin"})
+    messages = [Message(data={TEXT: "I want 3"}, time=1381536182)]
+
+    payloads = _process_and_record_payloads(duckling, messages)
+
+    assert [payload["tz"][0] for payload in payloads] == ["Europe/Berlin"]
@@ -21,6 +21,7 @@ import rasa.utils.io
 from rasa.core import training
 from rasa.shared.core.constants import (
     ACTION_LISTEN_NAME,
+    USER,
     ACTION_SESSION_START_NAME,
     LOOP_NAME,
     REQUESTED_SLOT,
@@ -86,6 +87,7 @@ from tests.core.utilities import tracker_from_dialogue, user_uttered, get_tracke
 
 from rasa.shared.nlu.constants import (
     ACTION_NAME,
+    INTENT,
     METADATA_MODEL_ID,
     PREDICTED_CONFIDENCE_KEY,
 )
@@ -539,6 +541,56 @@ def test_revert_user_utterance_event(domain: Domain):
     assert len(list(tracker.generate_all_prior_trackers())) == 3
 
 
+@pytest.mark.parametrize("pair", zip(TEST_DIALOGUES, TEST_DOMAINS_FOR_DIALOGUES))
+@pytest.mark.parametrize("ignore_rule_only_turns", [True, False])
+def test_past_states_are_created_incrementally(pair, ignore_rule_only_turns: bool):
+    dialogue, domainpath = pair
+    domain = Domain.load(domainpath)
+    tracker = DialogueStateTracker(dialogue.name, domain.slots)
+
+    for event in dialogue.events:
+        tracker.update(event)
+
+        assert tracker.past_states(
+            domain, ignore_rule_only_turns=ignore_rule_only_turns
+        ) == domain.states_for_tracker_history(
+            tracker, ignore_rule_only_turns=ignore_rule_only_turns
+        )
+
+
+@pytest.mark.parametrize(
+    "reverting_event",
+    [Restarted(), SessionStarted(), ActionReverted(), UserUtteranceReverted()],
+)
+def test_past_states_cache_is_invalidated(domain: Domain, reverting_event: Event):
+    tracker = DialogueStateTracker("default", domain.slots)
+    intent = {"name": "greet", PREDICTED_CONFIDENCE_KEY: 1.0}
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+    tracker.update(UserUttered("/greet", intent, []))
+    tracker.update(ActionExecuted("utter_greet"))
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+
+    assert len(tracker.past_states(domain)) == 4
+
+    tracker.update(reverting_event)
+
+    assert tracker.past_states(domain) == domain.states_for_tracker_history(tracker)
+
+
+def test_past_states_can_be_modified_by_caller(domain: Domain):
+    tracker = DialogueStateTracker("default", domain.slots)
+    intent = {"name": "greet", PREDICTED_CONFIDENCE_KEY: 1.0}
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+    tracker.update(UserUttered("/greet", intent, []))
+    tracker.update(ActionExecuted("utter_greet"))
+
+    states = tracker.past_states(domain)
+    del states[1][USER][INTENT]
+    states.pop()
+
+    assert tracker.past_states(domain) == domain.states_for_tracker_history(tracker)
+
+
 def test_traveling_back_in_time(domain: Domain):
     tracker = DialogueStateTracker("default", domain.slots)
     # the retrieved tracker should be empty
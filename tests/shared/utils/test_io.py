@@ -626,6 +626,66 @@ def test_deep_container_fingerprint_can_use_instance_fingerprint():
     assert rasa.shared.utils.io.deep_container_fingerprint(f) == f.fingerprint()
 
 
+def test_deep_container_fingerprint_is_independent_of_key_order():
+    assert rasa.shared.utils.io.deep_container_fingerprint(
+        {"a": {"b": 1, "c": [1, 2]}, "d": None}
+    ) == rasa.shared.utils.io.deep_container_fingerprint(
+        {"d": None, "a": {"c": [1, 2], "b": 1}}
+    )
+
+
+def test_deep_container_fingerprint_uses_fingerprint_of_elements():
+    m1 = np.asarray([[0.5, 3.1, 3.0]])
+    m2 = np.asarray([[0.5, 3.1, 3.1]])
+    f1 = Features(m1, "sentence", "text", "CountVectorsFeaturizer")
+    f2 = Features(m2, "sentence", "text", "CountVectorsFeaturizer")
+
+    assert rasa.shared.utils.io.deep_container_fingerprint(
+        {"features": [f1]}
+    ) != rasa.shared.utils.io.deep_container_fingerprint({"features": [f2]})
+
+
+class TextWithFingerprint:
+    def __init__(self, text: Text) -> None:
+        self.text = text
+
+    def fingerprint(self) -> Text:
+        return self.text
+
+
+@pytest.mark.parametrize(
+    "container, other_container",
+    [
+        ([[1, 2]], [(1, 2)]),
+        ({"a": [1, 2]}, {"a": (1, 2)}),
+        ({"a": "x"}, {"a": TextWithFingerprint("x")}),
+        (["x"], [TextWithFingerprint("x")]),
+        ({"a": 1}, {1: 1}),
+        ({"a": "1"}, {"a": 1}),
+    ],
+)
+def test_deep_container_fingerprint_distinguishes_types(
+    container: Any, other_container: Any
+):
+    assert rasa.shared.utils.io.deep_container_fingerprint(
+        container
+    ) != rasa.shared.utils.io.deep_container_fingerprint(other_container)
+
+
+def test_deep_container_fingerprint_with_mixed_keys():
+    # keys of different types can't be sorted
+    container = {1: "a", "b": 2, (3, 4): [5]}
+
+    assert rasa.shared.utils.io.deep_container_fingerprint(
+        container
+    ) == rasa.shared.utils.io.deep_container_fingerprint(
+        dict(reversed(list(container.items())))
+    )
+    assert rasa.shared.utils.io.deep_container_fingerprint(
+        container
+    ) != rasa.shared.utils.io.deep_container_fingerprint({1: "a", "b": 3, (3, 4): [5]})
+
+
 @pytest.mark.skip_on_windows
 def test_handle_print_blocking(monkeypatch: MonkeyPatch):
     mock = MagicMock()
@@ -26,6 +26,18 @@ def test_get_latest_model(tmp_path: Path):
     assert rasa.model.get_latest_model(str(path)) == path_of_latest
 
 
+def test_get_latest_uncompressed_model(tmp_path: Path):
+    Path(tmp_path / "model_one.tar.gz").touch()
+
+    # create second model later to be registered as distinct in Windows
+    time.sleep(0.1)
+    Path(tmp_path / "model_two.tar").touch()
+
+    path_of_latest = os.path.join(tmp_path, "model_two.tar")
+    assert rasa.model.get_latest_model(str(tmp_path)) == path_of_latest
+    assert rasa.model.get_local_model(path_of_latest) == path_of_latest
+
+
 def test_get_local_model(trained_rasa_model: str):
     assert rasa.model.get_local_model(trained_rasa_model) == trained_rasa_model
 